@@ -7,9 +7,10 @@ Computes base probability for each eligibility state using purist approach:
 """
 import logging
 import asyncio
-from typing import Dict, Optional, Callable, Any, Tuple
+from datetime import date
+from typing import Dict, Optional, Callable, Any, List, Tuple
 from nexus.agents.eligibility_v2.models import (
-    CaseState, EligibilityStatus, EvidenceStrength
+    CaseState, EligibilityStatus, EvidenceStrength, EventTense
 )
 from nexus.services.eligibility_v2.propensity_repository import PropensityRepository
 
@@ -139,3 +140,28 @@ class BaseProbabilityCalculator:
                 logger.debug(f"Error emitting base_probability_historical_result: {e}")
         
         return historical_probs, "historical_fallback"
+    
+    async def compute_base_probability_batch(
+        self,
+        case_state: CaseState,
+        visits: List[Tuple[date, EventTense]]
+    ) -> List[Tuple[Dict[EligibilityStatus, float], str]]:
+        """
+        compute_base_probability for each (dos_date, event_tense) without
+        copying the case. Direct evidence does not depend on the visit, and
+        historical lookups are shared by visits with the same dimensions.
+        """
+        if (case_state.eligibility_check.checked and
+            case_state.eligibility_truth.status in (EligibilityStatus.YES, EligibilityStatus.NO)):
+            probs, source = await self.compute_base_probability(case_state)
+            return [(dict(probs), source) for _ in visits]
+        
+        lookups: Dict[Tuple[Tuple[str, str], ...], Dict[EligibilityStatus, float]] = {}
+        results = []
+        for dos_date, event_tense in visits:
+            dims = self.propensity_repo.state_dims(case_state, dos_date, event_tense)
+            key = tuple(sorted(dims.items()))
+            if key not in lookups:
+                lookups[key] = await self.propensity_repo.get_historical_propensity_by_dims(dims)
+            results.append((dict(lookups[key]), "historical_fallback"))
+        return results
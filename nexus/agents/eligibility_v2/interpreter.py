@@ -86,7 +86,7 @@ class EligibilityInterpreter:
                 case_pk=case_pk,
                 turn_id=turn_id,
                 call_type="INTERPRETER",
-                prompt_hash="",
+                prompt_hash=llm_response.get("prompt_hash", ""),
                 response_data=response_data
             )
             
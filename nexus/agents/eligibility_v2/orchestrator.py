@@ -3,11 +3,13 @@ Eligibility Agent V2 - Orchestrator
 
 Main orchestrator that coordinates the eligibility assessment workflow.
 """
+import asyncio
 import logging
 import json
 import hashlib
+import os
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from datetime import date, datetime
 from copy import deepcopy
 
@@ -24,10 +26,23 @@ from nexus.services.eligibility_v2.case_repository import CaseRepository
 from nexus.services.eligibility_v2.turn_repository import TurnRepository
 from nexus.services.eligibility_v2.scoring_repository import ScoringRepository
 from nexus.services.eligibility_v2.llm_call_repository import LLMCallRepository
-from nexus.modules.database import database
+from nexus.services.eligibility_v2.batch_job_repository import BatchJobRepository
+from nexus.services.eligibility_v2.eligibility_response_cache import eligibility_response_cache
+from nexus.core.event_sink import event_sink
+from nexus.modules.metrics import metrics
+from nexus.modules.tracing import tracer
 
 logger = logging.getLogger("nexus.eligibility_v2.orchestrator")
 
+# Patients scored concurrently by a batch job
+BATCH_JOB_CONCURRENCY = int(os.getenv("BATCH_JOB_CONCURRENCY", "16"))
+# Results buffered before one bulk write (also the most work lost on a crash)
+BATCH_JOB_FLUSH_SIZE = int(os.getenv("BATCH_JOB_FLUSH_SIZE", "200"))
+
+TURN_STAGE_SECONDS = metrics.histogram(
+    "nexus_eligibility_turn_stage_seconds", "Eligibility turn time per stage (load.* are patient load sub-stages)", ("stage",)
+)
+
 
 class EligibilityOrchestrator:
     """
@@ -44,6 +59,7 @@ class EligibilityOrchestrator:
         self.turn_repo = TurnRepository()
         self.scoring_repo = ScoringRepository()
         self.llm_call_repo = LLMCallRepository()
+        self.batch_job_repo = BatchJobRepository()
     
     def _log_case_state(self, step_name: str, case_state: Optional[CaseState], patient_id: Optional[str] = None):
         """
@@ -106,6 +122,7 @@ class EligibilityOrchestrator:
         
         logger.info(f"[DEBUG] ========================================")
     
+    @tracer.traced("eligibility.turn", root=True, session_arg="case_id")
     async def process_turn(
         self,
         case_id: str,
@@ -120,6 +137,7 @@ class EligibilityOrchestrator:
             Dict with case_state, score_state, next_questions, improvement_plan, presentation_summary
         """
         logger.info(f"Processing turn for case {case_id}, patient_id={patient_id}")
+        turn_start = time.perf_counter()
         
         # 1. Get or create case
         case_pk = await self.case_repo.get_or_create_case(case_id, session_id)
@@ -134,7 +152,8 @@ class EligibilityOrchestrator:
         # 3. Load patient data if patient_id provided (always fresh, never cached)
         if patient_id:
             await self._emit_process_event(session_id, "patient_loading", "in_progress", "Loading patient EMR record...")
-            case_state = await self._load_patient_data(case_state, patient_id, session_id)
+            with metrics.timer(TURN_STAGE_SECONDS, "patient_loading"), tracer.span("eligibility.patient_loading"):
+                case_state = await self._load_patient_data(case_state, patient_id, session_id)
             await self._emit_process_event(session_id, "patient_loading", "complete", "Patient details loaded")
             self._log_case_state("STEP 2: After Loading Patient Data", case_state, patient_id)
         
@@ -147,11 +166,12 @@ class EligibilityOrchestrator:
         logger.info(f"[DEBUG] {case_state_json[:1500]}")
         logger.info(f"[DEBUG] User input: {ui_event.data}")
         
-        interpret_response = await self.interpreter.interpret(
-            case_state=case_state,
-            ui_event=ui_event,
-            case_pk=case_pk
-        )
+        with metrics.timer(TURN_STAGE_SECONDS, "interpretation"), tracer.span("eligibility.interpretation"):
+            interpret_response = await self.interpreter.interpret(
+                case_state=case_state,
+                ui_event=ui_event,
+                case_pk=case_pk
+            )
         
         logger.info(f"[DEBUG] Interpreter Response:")
         logger.info(f"  - suggested_updates: {interpret_response.suggested_updates.model_dump()}")
@@ -182,7 +202,8 @@ class EligibilityOrchestrator:
         
         # 5. Perform eligibility check if insurance info is available
         if case_state.health_plan.payer_name and case_state.patient.member_id:
-            eligibility_result = await self._check_and_perform_eligibility_check(case_state, session_id)
+            with metrics.timer(TURN_STAGE_SECONDS, "eligibility_check"), tracer.span("eligibility.eligibility_check"):
+                eligibility_result = await self._check_and_perform_eligibility_check(case_state, session_id)
             logger.info(f"[DEBUG] Eligibility Check Result:")
             logger.info(f"  - windows count: {len(eligibility_result.get('eligibility_windows', []))}")
             for i, window in enumerate(eligibility_result.get('eligibility_windows', [])):
@@ -209,24 +230,12 @@ class EligibilityOrchestrator:
                 metadata={"calculation_step": step, **data}
             )
         
-        score_state = await self.scorer.score(case_state, emit_calculation=emit_calculation)
+        with metrics.timer(TURN_STAGE_SECONDS, "scoring"), tracer.span("eligibility.scoring"):
+            score_state = await self.scorer.score(case_state, emit_calculation=emit_calculation)
         self._log_case_state("STEP 5: After Scoring", case_state, patient_id)
         
         # 6.5. If we have visits with probabilities, compute weighted average for case-level probability
-        if case_state.timing.related_visits and len(case_state.timing.related_visits) > 0:
-            weighted_avg = self._compute_weighted_average_probability(case_state.timing.related_visits)
-            if weighted_avg is not None:
-                # Update base_probability with weighted average
-                score_state.base_probability = weighted_avg
-                # Also update state_probabilities if available
-                if score_state.state_probabilities:
-                    # For now, update eligible probability (main one)
-                    # In future, could compute weighted averages for all states
-                    score_state.state_probabilities["eligible"] = weighted_avg
-                logger.info(
-                    f"Updated case-level probability to weighted average: {weighted_avg:.2%} "
-                    f"from {len(case_state.timing.related_visits)} visits"
-                )
+        self._apply_visit_weighted_average(case_state, score_state)
         
         # Prepare scoring summary data for status bar
         scoring_data = {
@@ -256,11 +265,12 @@ class EligibilityOrchestrator:
         
         # 7. Plan
         await self._emit_process_event(session_id, "planning", "in_progress", "Planning phase initiated - generating questions and improvement plan...")
-        plan_response = await self.planner.plan(
-            case_state=case_state,
-            score_state=score_state,
-            completion_status=completion_status
-        )
+        with metrics.timer(TURN_STAGE_SECONDS, "planning"), tracer.span("eligibility.planning"):
+            plan_response = await self.planner.plan(
+                case_state=case_state,
+                score_state=score_state,
+                completion_status=completion_status
+            )
         self._log_case_state("STEP 6: After Planning", case_state, patient_id)
         await self._emit_process_event(
             session_id,
@@ -270,8 +280,10 @@ class EligibilityOrchestrator:
         )
         
         # 8. Save state
-        await self.case_repo.update_case_state(case_pk, case_state)
-        await self.scoring_repo.create_score_run(case_pk, None, score_state, "v1")
+        with metrics.timer(TURN_STAGE_SECONDS, "save"), tracer.span("eligibility.save"):
+            await self.case_repo.update_case_state(case_pk, case_state)
+            await self.scoring_repo.create_score_run(case_pk, None, score_state, "v1")
+        TURN_STAGE_SECONDS.labels("turn").observe(time.perf_counter() - turn_start)
         
         # 9. Return result
         return {
@@ -286,22 +298,176 @@ class EligibilityOrchestrator:
             "completion": completion_status.model_dump()
         }
     
+    def _apply_visit_weighted_average(self, case_state: CaseState, score_state: ScoreState) -> None:
+        """Replaces the case-level probability with the recency-weighted visit average."""
+        if case_state.timing.related_visits and len(case_state.timing.related_visits) > 0:
+            weighted_avg = self._compute_weighted_average_probability(case_state.timing.related_visits)
+            if weighted_avg is not None:
+                # Update base_probability with weighted average
+                score_state.base_probability = weighted_avg
+                # Also update state_probabilities if available
+                if score_state.state_probabilities:
+                    # For now, update eligible probability (main one)
+                    # In future, could compute weighted averages for all states
+                    score_state.state_probabilities["eligible"] = weighted_avg
+                logger.info(
+                    f"Updated case-level probability to weighted average: {weighted_avg:.2%} "
+                    f"from {len(case_state.timing.related_visits)} visits"
+                )
+    
+    async def score_patient(self, patient_id: str) -> Tuple[CaseState, ScoreState]:
+        """
+        Deterministic scoring for one patient, without the LLM interpreter or
+        planner: load EMR data (which runs the 270 check and visit scoring),
+        then score the case. Used by batch jobs.
+        """
+        case_state = await self._load_patient_data(CaseState(), patient_id)
+        score_state = await self.scorer.score(case_state)
+        self._apply_visit_weighted_average(case_state, score_state)
+        return case_state, score_state
+    
+    async def run_batch_job(
+        self,
+        job_id: str,
+        patient_ids: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score every patient of a batch job with a bounded worker pool and
+        bulk-write the results to eligibility_score_runs.
+        
+        Creates the job if patient_ids are given and it doesn't exist yet.
+        Re-running an existing job_id resumes it: patients that already have a
+        stored score run are skipped, so after a crash at most one unflushed
+        buffer (BATCH_JOB_FLUSH_SIZE) is recomputed. Failed patients are
+        counted and retried on the next resume.
+        
+        on_progress (sync or async) receives a progress dict after every
+        flush and once at the end.
+        """
+        concurrency = max(1, concurrency or BATCH_JOB_CONCURRENCY)
+        job = await self.batch_job_repo.get_job(job_id)
+        if not job:
+            if not patient_ids:
+                raise ValueError(f"Unknown batch job {job_id} and no patient_ids given")
+            job = await self.batch_job_repo.create_job(job_id, patient_ids, concurrency)
+        
+        done = await self.batch_job_repo.get_completed_patient_ids(job_id)
+        pending = [p for p in job["patient_ids"] if p not in done]
+        total = len(job["patient_ids"])
+        progress = {
+            "job_id": job_id,
+            "status": "RUNNING",
+            "total": total,
+            "completed": len(done),
+            "failed": 0,
+            "resumed_from": len(done),
+            "patients_per_second": 0.0
+        }
+        logger.info(f"Batch job {job_id}: {len(pending)} of {total} patients to score (concurrency={concurrency})")
+        await self.batch_job_repo.update_status(job_id, "RUNNING", completed=len(done), failed=0)
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for patient_id in pending:
+            queue.put_nowait(patient_id)
+        buffer: List[Tuple[str, CaseState, ScoreState]] = []
+        flush_lock = asyncio.Lock()
+        started = time.monotonic()
+        scored_this_run = 0
+        
+        async def report():
+            elapsed = time.monotonic() - started
+            progress["patients_per_second"] = round(scored_this_run / elapsed, 2) if elapsed > 0 else 0.0
+            if on_progress:
+                result = on_progress(dict(progress))
+                if asyncio.iscoroutine(result):
+                    await result
+        
+        async def flush():
+            nonlocal scored_this_run
+            async with flush_lock:
+                if not buffer:
+                    return
+                batch = buffer[:]
+                del buffer[:]
+                await self.batch_job_repo.save_results(job_id, batch)
+                scored_this_run += len(batch)
+                progress["completed"] += len(batch)
+                await report()
+                await self.batch_job_repo.update_status(
+                    job_id, "RUNNING",
+                    completed=progress["completed"],
+                    failed=progress["failed"],
+                    patients_per_second=progress["patients_per_second"]
+                )
+        
+        async def worker():
+            while True:
+                try:
+                    patient_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    case_state, score_state = await self.score_patient(patient_id)
+                except Exception as e:
+                    progress["failed"] += 1
+                    logger.warning(f"Batch job {job_id}: failed to score {patient_id}: {e}")
+                    continue
+                buffer.append((patient_id, case_state, score_state))
+                if len(buffer) >= BATCH_JOB_FLUSH_SIZE:
+                    await flush()
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, max(1, len(pending))))))
+            await flush()
+        except Exception as e:
+            logger.error(f"Batch job {job_id} failed: {e}", exc_info=True)
+            progress["status"] = "FAILED"
+            await self.batch_job_repo.update_status(
+                job_id, "FAILED", completed=progress["completed"], failed=progress["failed"], error=str(e)
+            )
+            await report()
+            raise
+        
+        progress["status"] = "COMPLETE"
+        await report()
+        await self.batch_job_repo.update_status(
+            job_id, "COMPLETE",
+            completed=progress["completed"],
+            failed=progress["failed"],
+            patients_per_second=progress["patients_per_second"]
+        )
+        logger.info(
+            f"Batch job {job_id} complete: {progress['completed']}/{total} scored, "
+            f"{progress['failed']} failed, {progress['patients_per_second']} patients/s"
+        )
+        return progress
+    
     async def _load_patient_data(
         self,
         case_state: CaseState,
         patient_id: str,
-        session_id: Optional[int] = None
+        session_id: Optional[int] = None,
+        stage_timings: Optional[Dict[str, float]] = None
     ) -> CaseState:
         """
         Load patient data from EMR/tools.
         Always loads fresh data (never cached).
+        
+        Stages run by dependency rather than one after another:
+        - demographics, insurance and visits are fetched concurrently
+        - the 270 check starts once insurance arrives (and demographics, only
+          when insurance has no member ID)
+        - visit scoring starts once the check and the visits are both done
+        Progress messages are emitted in the background and flushed at the end.
+        Per-stage durations (ms) are logged and written into stage_timings if given.
         """
         from nexus.tools.eligibility.gate1_data_retrieval import (
             EMRPatientDemographicsRetriever,
             EMRPatientInsuranceInfoRetriever,
             EMRPatientVisitsRetriever
         )
-        from nexus.tools.eligibility.eligibility_270_transaction import Eligibility270TransactionTool
         
         # Check for test scenario
         from nexus.tools.eligibility.test_scenarios import get_test_scenario
@@ -309,60 +475,97 @@ class EligibilityOrchestrator:
         if test_scenario:
             logger.info(f"[DEBUG] Test scenario detected for {patient_id}: {test_scenario}")
         
-        # Load demographics
-        demographics_tool = EMRPatientDemographicsRetriever()
-        try:
-            demographics = await demographics_tool.run_async(patient_id)
+        load_start = time.perf_counter()
+        timings: Dict[str, float] = stage_timings if stage_timings is not None else {}
+        emits: List[asyncio.Task] = []
+        completion_event: Dict[str, Any] = {}
+        
+        def emit_nowait(coro) -> None:
+            emits.append(asyncio.create_task(coro))
+        
+        async def timed(stage: str, coro):
+            start = time.perf_counter()
+            try:
+                with tracer.span(f"eligibility.load.{stage}"):
+                    return await coro
+            finally:
+                timings[stage] = round((time.perf_counter() - start) * 1000, 1)
+        
+        # Independent EMR fetches all start now
+        demographics_fetch = asyncio.create_task(
+            timed("demographics", EMRPatientDemographicsRetriever().run_async(patient_id))
+        )
+        insurance_fetch = asyncio.create_task(
+            timed("insurance", EMRPatientInsuranceInfoRetriever().run_async(patient_id))
+        )
+        # ±6 months = 180 days
+        visits_fetch = asyncio.create_task(
+            timed("visits", EMRPatientVisitsRetriever().run_async(
+                patient_id=patient_id, lookback_days=180, lookahead_days=180
+            ))
+        )
+        
+        async def demographics_stage() -> Optional[Dict[str, Any]]:
+            # member_id is resolved by eligibility_stage (insurance takes precedence)
+            try:
+                demographics = await demographics_fetch
+            except Exception as e:
+                logger.warning(f"Failed to load demographics for {patient_id}: {e}")
+                emit_nowait(self._emit_thinking_message(session_id, "patient_loading", f"Failed to load demographics: {str(e)}"))
+                return None
+            
             logger.info(f"[DEBUG] Demographics tool returned: {demographics}")
-            if demographics:
-                case_state.patient.member_id = demographics.get("member_id")
-                case_state.patient.first_name = demographics.get("first_name")
-                case_state.patient.last_name = demographics.get("last_name")
-                case_state.patient.date_of_birth = demographics.get("date_of_birth")
-                # Handle sex field - convert string to enum if needed
-                sex_value = demographics.get("sex")
-                if sex_value:
-                    if isinstance(sex_value, str):
-                        try:
-                            from nexus.agents.eligibility_v2.models import Sex
-                            case_state.patient.sex = Sex(sex_value)
-                        except ValueError:
-                            case_state.patient.sex = None
-                    else:
-                        case_state.patient.sex = sex_value
+            if not demographics:
+                logger.info(f"[DEBUG] Demographics tool returned empty dict (test scenario: demographics=NONE)")
+                return demographics
+            
+            case_state.patient.first_name = demographics.get("first_name")
+            case_state.patient.last_name = demographics.get("last_name")
+            case_state.patient.date_of_birth = demographics.get("date_of_birth")
+            # Handle sex field - convert string to enum if needed
+            sex_value = demographics.get("sex")
+            if sex_value:
+                if isinstance(sex_value, str):
+                    try:
+                        case_state.patient.sex = Sex(sex_value)
+                    except ValueError:
+                        case_state.patient.sex = None
                 else:
-                    case_state.patient.sex = None
-                logger.info(f"Loaded demographics for patient {patient_id}")
-                logger.info(f"[DEBUG] After setting demographics: first_name={repr(case_state.patient.first_name)}, last_name={repr(case_state.patient.last_name)}, dob={repr(case_state.patient.date_of_birth)}, member_id={repr(case_state.patient.member_id)}")
-                
-                # Emit thinking message with demographics metadata
-                demographics_summary = f"Retrieved demographics: {demographics.get('first_name')} {demographics.get('last_name')}"
-                if demographics.get("date_of_birth"):
-                    demographics_summary += f", DOB: {demographics.get('date_of_birth')}"
-                if demographics.get("member_id"):
-                    demographics_summary += f", Member ID: {demographics.get('member_id')}"
-                # Add data_type for structured parsing
-                demographics_metadata = {
-                    "data_type": "demographics",
-                    **demographics
-                }
-                await self._emit_thinking_message(session_id, "patient_loading", demographics_summary, demographics_metadata)
+                    case_state.patient.sex = sex_value
             else:
-                logger.info(f"[DEBUG] Demographics tool returned empty dict (test scenario: demographics=NONE)")
-        except Exception as e:
-            logger.warning(f"Failed to load demographics for {patient_id}: {e}")
-            await self._emit_thinking_message(session_id, "patient_loading", f"Failed to load demographics: {str(e)}")
+                case_state.patient.sex = None
+            logger.info(f"Loaded demographics for patient {patient_id}")
+            logger.info(f"[DEBUG] After setting demographics: first_name={repr(case_state.patient.first_name)}, last_name={repr(case_state.patient.last_name)}, dob={repr(case_state.patient.date_of_birth)}")
+            
+            # Emit thinking message with demographics metadata
+            demographics_summary = f"Retrieved demographics: {demographics.get('first_name')} {demographics.get('last_name')}"
+            if demographics.get("date_of_birth"):
+                demographics_summary += f", DOB: {demographics.get('date_of_birth')}"
+            if demographics.get("member_id"):
+                demographics_summary += f", Member ID: {demographics.get('member_id')}"
+            # Add data_type for structured parsing
+            demographics_metadata = {
+                "data_type": "demographics",
+                **demographics
+            }
+            emit_nowait(self._emit_thinking_message(session_id, "patient_loading", demographics_summary, demographics_metadata))
+            return demographics
         
-        # Load insurance
-        insurance_tool = EMRPatientInsuranceInfoRetriever()
-        try:
-            insurance = await insurance_tool.run_async(patient_id)
-            logger.info(f"[DEBUG] Insurance tool returned: {insurance}")
+        demographics_task = asyncio.create_task(demographics_stage())
+        
+        async def eligibility_stage() -> None:
+            try:
+                insurance = await insurance_fetch
+            except Exception as e:
+                logger.warning(f"Failed to load insurance for {patient_id}: {e}")
+                emit_nowait(self._emit_thinking_message(session_id, "patient_loading", f"Failed to load insurance: {str(e)}"))
+                insurance = None
+            
             if insurance:
+                logger.info(f"[DEBUG] Insurance tool returned: {insurance}")
                 case_state.health_plan.payer_name = insurance.get("payer_name")
                 case_state.health_plan.payer_id = insurance.get("payer_id")
                 case_state.health_plan.plan_name = insurance.get("plan_name")
-                case_state.patient.member_id = insurance.get("member_id") or case_state.patient.member_id
                 logger.info(f"Loaded insurance info for patient {patient_id}")
                 logger.info(f"[DEBUG] After setting insurance: payer_name={repr(case_state.health_plan.payer_name)}, payer_id={repr(case_state.health_plan.payer_id)}, plan_name={repr(case_state.health_plan.plan_name)}")
                 
@@ -379,57 +582,44 @@ class EligibilityOrchestrator:
                     "data_type": "insurance",
                     **insurance
                 }
-                await self._emit_thinking_message(session_id, "patient_loading", insurance_summary, insurance_metadata)
-            else:
+                emit_nowait(self._emit_thinking_message(session_id, "patient_loading", insurance_summary, insurance_metadata))
+            elif insurance is not None:
                 logger.info(f"[DEBUG] Insurance tool returned empty dict (test scenario: insurance=NONE)")
-        except Exception as e:
-            logger.warning(f"Failed to load insurance for {patient_id}: {e}")
-            await self._emit_thinking_message(session_id, "patient_loading", f"Failed to load insurance: {str(e)}")
+            
+            # Insurance member ID wins; otherwise fall back to demographics (or the existing value)
+            member_id = (insurance or {}).get("member_id")
+            if not member_id:
+                demographics = await demographics_task
+                member_id = demographics.get("member_id") if demographics else case_state.patient.member_id
+            case_state.patient.member_id = member_id
+            
+            # Perform eligibility check if we have insurance info
+            if case_state.health_plan.payer_name and case_state.patient.member_id:
+                eligibility_result = await timed(
+                    "eligibility_check",
+                    self._check_and_perform_eligibility_check(case_state, session_id)
+                )
+                # Apply eligibility check updates deterministically
+                self._deterministically_update_case_state(
+                    case_state=case_state,
+                    update_source="eligibility_check",
+                    updates={},  # Updates come from eligibility_result
+                    eligibility_check_result=eligibility_result
+                )
         
-        # Perform eligibility check if we have insurance info
-        if case_state.health_plan.payer_name and case_state.patient.member_id:
-            eligibility_result = await self._check_and_perform_eligibility_check(case_state, session_id)
-            # Apply eligibility check updates deterministically
-            case_state = self._deterministically_update_case_state(
-                case_state=case_state,
-                update_source="eligibility_check",
-                updates={},  # Updates come from eligibility_result
-                eligibility_check_result=eligibility_result
-            )
+        eligibility_task = asyncio.create_task(eligibility_stage())
         
-        # Load visits/appointments (±6 months = 180 days)
-        visits_tool = EMRPatientVisitsRetriever()
-        visit_infos = []
-        try:
-            visits = await visits_tool.run_async(patient_id=patient_id, lookback_days=180, lookahead_days=180)
-            if visits:
-                today = date.today()
-                for visit in visits:
-                    visit_date_str = visit.get("visit_date")
-                    if visit_date_str:
-                        try:
-                            # Handle both string and date objects
-                            if isinstance(visit_date_str, str):
-                                visit_date = datetime.strptime(visit_date_str, "%Y-%m-%d").date()
-                            elif isinstance(visit_date_str, date):
-                                visit_date = visit_date_str
-                            else:
-                                logger.debug(f"Could not parse visit date {visit_date_str}: unexpected type")
-                                continue
-                            
-                            visit_info = VisitInfo(
-                                visit_id=visit.get("visit_id"),
-                                visit_date=visit_date,
-                                visit_type=visit.get("visit_type"),
-                                status=visit.get("status"),
-                                provider=visit.get("provider"),
-                                location=visit.get("location")
-                            )
-                            visit_infos.append(visit_info)
-                        except Exception as e:
-                            logger.debug(f"Could not parse visit date {visit_date_str}: {e}")
-                            continue
+        async def visits_stage() -> None:
+            try:
+                visits = await visits_fetch
+                visit_infos = self._parse_visits(visits or [])
+                # Timing and scoring read the 270 result and demographics; they
+                # also must not move dos_date under a check that is still running
+                await asyncio.wait([demographics_task, eligibility_task])
+                if not visits:
+                    return
                 
+                today = date.today()
                 # Deterministically set dos_date from visits if not already set
                 if not case_state.timing.dos_date and visit_infos:
                     # Priority 1: Most future scheduled visit
@@ -469,14 +659,11 @@ class EligibilityOrchestrator:
                 # Compute eligibility and probability for each visit (if eligibility check was performed)
                 if case_state.eligibility_check.checked and visit_infos:
                     logger.info(f"Computing eligibility and probability for {len(visit_infos)} visits")
-                    updated_visits = []
-                    for visit in visit_infos:
-                        updated_visit = await self._compute_visit_eligibility_and_probability(
-                            case_state, visit, self.scorer
-                        )
-                        updated_visits.append(updated_visit)
-                    visit_infos = updated_visits
-                    logger.info(f"Completed eligibility and probability computation for {len(updated_visits)} visits")
+                    visit_infos = await timed(
+                        "visit_scoring",
+                        self._compute_visits_eligibility_and_probability(case_state, visit_infos, self.scorer)
+                    )
+                    logger.info(f"Completed eligibility and probability computation for {len(visit_infos)} visits")
                 
                 case_state.timing.related_visits = visit_infos
                 logger.info(f"Loaded {len(visit_infos)} visits for patient {patient_id}")
@@ -484,79 +671,136 @@ class EligibilityOrchestrator:
                 # Emit thinking message with visits metadata
                 visits_summary_text = f"Retrieved {len(visit_infos)} visit(s)/appointment(s)"
                 if visit_infos:
-                    upcoming = [v for v in visit_infos if v.visit_date and v.visit_date >= date.today()]
-                    past = [v for v in visit_infos if v.visit_date and v.visit_date < date.today()]
+                    upcoming = [v for v in visit_infos if v.visit_date and v.visit_date >= today]
+                    past = [v for v in visit_infos if v.visit_date and v.visit_date < today]
                     if upcoming:
                         visits_summary_text += f" ({len(upcoming)} upcoming, {len(past)} past)"
                     else:
                         visits_summary_text += f" ({len(past)} past)"
                 
-                visits_metadata = []
-                for visit in visit_infos:
-                    # Handle visit_date - could be date object or string
-                    visit_date_str = None
-                    if visit.visit_date:
-                        if isinstance(visit.visit_date, date):
-                            visit_date_str = visit.visit_date.isoformat()
-                        elif isinstance(visit.visit_date, str):
-                            visit_date_str = visit.visit_date
-                    
-                    # Handle eligibility_status - could be enum or string
-                    eligibility_status_str = None
-                    if visit.eligibility_status:
-                        if hasattr(visit.eligibility_status, 'value'):
-                            eligibility_status_str = visit.eligibility_status.value
-                        elif isinstance(visit.eligibility_status, str):
-                            eligibility_status_str = visit.eligibility_status
-                    
-                    # Handle event_tense - could be enum or string
-                    event_tense_str = None
-                    if visit.event_tense:
-                        if hasattr(visit.event_tense, 'value'):
-                            event_tense_str = visit.event_tense.value
-                        elif isinstance(visit.event_tense, str):
-                            event_tense_str = visit.event_tense
-                    
-                    visit_summary = {
-                        "visit_date": visit_date_str,
-                        "visit_type": visit.visit_type,
-                        "status": visit.status,
-                        "eligibility_status": eligibility_status_str,
-                        "eligibility_probability": visit.eligibility_probability,
-                        "event_tense": event_tense_str
-                    }
-                    visits_metadata.append(visit_summary)
+                visits_metadata = [self._visit_summary(visit) for visit in visit_infos]
                 
                 # Add data_type for structured parsing
                 visits_metadata_with_type = {
                     "data_type": "visits",
                     "visits": visits_metadata
                 }
-                await self._emit_thinking_message(session_id, "patient_loading", visits_summary_text, visits_metadata_with_type)
-                
-                # Emit process event with visit details
-                visits_summary = visits_metadata
+                emit_nowait(self._emit_thinking_message(session_id, "patient_loading", visits_summary_text, visits_metadata_with_type))
                 
-                await self._emit_process_event(
-                    session_id,
-                    "patient_loading",
-                    "complete",
-                    f"Patient details loaded - Found {len(visit_infos)} visits/appointments",
-                    {
-                        "patient_summary": {
-                            "name": f"{case_state.patient.first_name} {case_state.patient.last_name}",
-                            "dob": case_state.patient.date_of_birth.isoformat() if case_state.patient.date_of_birth and isinstance(case_state.patient.date_of_birth, date) else (case_state.patient.date_of_birth if case_state.patient.date_of_birth else None),
-                            "insurance": case_state.health_plan.payer_name,
-                            "member_id": case_state.patient.member_id
-                        },
-                        "visits": visits_summary  # Include visits in the process event data
-                    }
-                )
-        except Exception as e:
-            logger.warning(f"Failed to load visits for patient {patient_id}: {e}")
+                # Process event with visit details is sent once all stages are timed
+                completion_event["message"] = f"Patient details loaded - Found {len(visit_infos)} visits/appointments"
+                completion_event["visits"] = visits_metadata
+            except Exception as e:
+                logger.warning(f"Failed to load visits for patient {patient_id}: {e}")
+        
+        try:
+            await visits_stage()
+            await asyncio.gather(demographics_task, eligibility_task)
+        finally:
+            for task in (demographics_fetch, insurance_fetch, visits_fetch, demographics_task, eligibility_task):
+                if not task.done():
+                    task.cancel()
+        
+        timings["total"] = round((time.perf_counter() - load_start) * 1000, 1)
+        for stage, ms in timings.items():
+            if stage != "total":
+                TURN_STAGE_SECONDS.labels(f"load.{stage}").observe(ms / 1000)
+        logger.info(
+            f"Loaded patient {patient_id} in {timings['total']}ms (critical path); stages: "
+            + ", ".join(f"{stage}={ms}ms" for stage, ms in timings.items() if stage != "total")
+        )
+        
+        if completion_event:
+            emit_nowait(self._emit_process_event(
+                session_id,
+                "patient_loading",
+                "complete",
+                completion_event["message"],
+                {
+                    "patient_summary": {
+                        "name": f"{case_state.patient.first_name} {case_state.patient.last_name}",
+                        "dob": case_state.patient.date_of_birth.isoformat() if case_state.patient.date_of_birth and isinstance(case_state.patient.date_of_birth, date) else (case_state.patient.date_of_birth if case_state.patient.date_of_birth else None),
+                        "insurance": case_state.health_plan.payer_name,
+                        "member_id": case_state.patient.member_id
+                    },
+                    "visits": completion_event["visits"],  # Include visits in the process event data
+                    "stage_timings_ms": dict(timings)
+                }
+            ))
+        
+        # Flush background emissions so they stay ahead of the turn's later events
+        if emits:
+            await asyncio.gather(*emits, return_exceptions=True)
         
         return case_state
     
+    @staticmethod
+    def _parse_visits(visits: List[Dict[str, Any]]) -> List[VisitInfo]:
+        """Converts EMR visit rows to VisitInfo, skipping rows without a usable date."""
+        visit_infos = []
+        for visit in visits:
+            visit_date_str = visit.get("visit_date")
+            if visit_date_str:
+                try:
+                    # Handle both string and date objects
+                    if isinstance(visit_date_str, str):
+                        visit_date = datetime.strptime(visit_date_str, "%Y-%m-%d").date()
+                    elif isinstance(visit_date_str, date):
+                        visit_date = visit_date_str
+                    else:
+                        logger.debug(f"Could not parse visit date {visit_date_str}: unexpected type")
+                        continue
+                    
+                    visit_info = VisitInfo(
+                        visit_id=visit.get("visit_id"),
+                        visit_date=visit_date,
+                        visit_type=visit.get("visit_type"),
+                        status=visit.get("status"),
+                        provider=visit.get("provider"),
+                        location=visit.get("location")
+                    )
+                    visit_infos.append(visit_info)
+                except Exception as e:
+                    logger.debug(f"Could not parse visit date {visit_date_str}: {e}")
+                    continue
+        return visit_infos
+    
+    @staticmethod
+    def _visit_summary(visit: VisitInfo) -> Dict[str, Any]:
+        """Serializable summary of a visit for thinking/process event metadata."""
+        # Handle visit_date - could be date object or string
+        visit_date_str = None
+        if visit.visit_date:
+            if isinstance(visit.visit_date, date):
+                visit_date_str = visit.visit_date.isoformat()
+            elif isinstance(visit.visit_date, str):
+                visit_date_str = visit.visit_date
+        
+        # Handle eligibility_status - could be enum or string
+        eligibility_status_str = None
+        if visit.eligibility_status:
+            if hasattr(visit.eligibility_status, 'value'):
+                eligibility_status_str = visit.eligibility_status.value
+            elif isinstance(visit.eligibility_status, str):
+                eligibility_status_str = visit.eligibility_status
+        
+        # Handle event_tense - could be enum or string
+        event_tense_str = None
+        if visit.event_tense:
+            if hasattr(visit.event_tense, 'value'):
+                event_tense_str = visit.event_tense.value
+            elif isinstance(visit.event_tense, str):
+                event_tense_str = visit.event_tense
+        
+        return {
+            "visit_date": visit_date_str,
+            "visit_type": visit.visit_type,
+            "status": visit.status,
+            "eligibility_status": eligibility_status_str,
+            "eligibility_probability": visit.eligibility_probability,
+            "event_tense": event_tense_str
+        }
+    
     async def _compute_visit_eligibility_and_probability(
         self,
         case_state: CaseState,
@@ -569,6 +813,64 @@ class EligibilityOrchestrator:
         if not visit_info.visit_date:
             return visit_info
         
+        self._classify_visit(case_state, visit_info)
+        visit_date = visit_info.visit_date
+        
+        # 3. Compute probability for this visit date
+        try:
+            temp_case_state = deepcopy(case_state)
+            temp_case_state.timing.dos_date = visit_date
+            temp_case_state.timing.event_tense = visit_info.event_tense
+            
+            # For visit scoring, don't emit calculation steps (too verbose)
+            score_state = await scorer.score(temp_case_state, emit_calculation=None)
+            visit_info.eligibility_probability = score_state.base_probability
+            # Store full score_state for drill-down view
+            visit_info.score_state = score_state
+            logger.debug(
+                f"Computed probability for visit {visit_info.visit_id} ({visit_date}): "
+                f"{visit_info.eligibility_probability:.2%}, status={visit_info.eligibility_status}"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to compute probability for visit {visit_info.visit_id}: {e}")
+            visit_info.eligibility_probability = None
+            visit_info.score_state = None
+        
+        return visit_info
+    
+    async def _compute_visits_eligibility_and_probability(
+        self,
+        case_state: CaseState,
+        visits: list[VisitInfo],
+        scorer: EligibilityScorer
+    ) -> list[VisitInfo]:
+        """
+        Batch version of _compute_visit_eligibility_and_probability: classifies
+        every visit, then scores all dated visits in one scorer.score_batch pass
+        (no per-visit CaseState copies, shared lookups).
+        """
+        dated = [v for v in visits if v.visit_date]
+        for visit_info in dated:
+            self._classify_visit(case_state, visit_info)
+        
+        try:
+            score_states = await scorer.score_batch(
+                case_state, [(v.visit_date, v.event_tense) for v in dated]
+            )
+            for visit_info, score_state in zip(dated, score_states):
+                visit_info.eligibility_probability = score_state.base_probability
+                # Store full score_state for drill-down view
+                visit_info.score_state = score_state
+        except Exception as e:
+            logger.warning(f"Failed to compute probabilities for {len(dated)} visits: {e}")
+            for visit_info in dated:
+                visit_info.eligibility_probability = None
+                visit_info.score_state = None
+        
+        return visits
+    
+    def _classify_visit(self, case_state: CaseState, visit_info: VisitInfo) -> None:
+        """Sets event_tense and coverage-window eligibility_status for a dated visit."""
         today = date.today()
         visit_date = visit_info.visit_date
         
@@ -598,28 +900,6 @@ class EligibilityOrchestrator:
                 visit_info.eligibility_status = EligibilityStatus.NOT_ESTABLISHED
         else:
             visit_info.eligibility_status = EligibilityStatus.NOT_ESTABLISHED
-        
-        # 3. Compute probability for this visit date
-        try:
-            temp_case_state = deepcopy(case_state)
-            temp_case_state.timing.dos_date = visit_date
-            temp_case_state.timing.event_tense = visit_info.event_tense
-            
-            # For visit scoring, don't emit calculation steps (too verbose)
-            score_state = await scorer.score(temp_case_state, emit_calculation=None)
-            visit_info.eligibility_probability = score_state.base_probability
-            # Store full score_state for drill-down view
-            visit_info.score_state = score_state
-            logger.debug(
-                f"Computed probability for visit {visit_info.visit_id} ({visit_date}): "
-                f"{visit_info.eligibility_probability:.2%}, status={visit_info.eligibility_status}"
-            )
-        except Exception as e:
-            logger.warning(f"Failed to compute probability for visit {visit_info.visit_id}: {e}")
-            visit_info.eligibility_probability = None
-            visit_info.score_state = None
-        
-        return visit_info
     
     def _compute_weighted_average_probability(self, visits: list[VisitInfo], tau: int = 90) -> Optional[float]:
         """
@@ -757,9 +1037,15 @@ class EligibilityOrchestrator:
         
         try:
             tool = Eligibility270TransactionTool()
-            result = await tool.execute(
-                insurance_id=case_state.patient.member_id,
-                insurance_name=case_state.health_plan.payer_name
+            # Member-level cache shared across cases/sessions; concurrent checks share one call
+            result, from_cache = await eligibility_response_cache.get_or_fetch(
+                case_state.health_plan.payer_id or case_state.health_plan.payer_name,
+                case_state.patient.member_id,
+                case_state.timing.dos_date,
+                lambda: tool.execute(
+                    insurance_id=case_state.patient.member_id,
+                    insurance_name=case_state.health_plan.payer_name
+                )
             )
             
             # Find active window for emitting
@@ -791,7 +1077,7 @@ class EligibilityOrchestrator:
                 "member_id": case_state.patient.member_id,
                 "payer_name": case_state.health_plan.payer_name,
                 "summary": summary,
-                "cached": False
+                "cached": from_cache
             }
             eligibility_message = f"Eligibility check: {status.value}"
             if active_window:
@@ -816,7 +1102,8 @@ class EligibilityOrchestrator:
                     "plan_name": case_state.health_plan.plan_name,
                     "member_id": case_state.patient.member_id,
                     "payer_name": case_state.health_plan.payer_name,
-                    "summary": summary
+                    "summary": summary,
+                    "cached": from_cache
                 }
             )
             
@@ -992,10 +1279,6 @@ class EligibilityOrchestrator:
             return
         
         try:
-            query = """
-            INSERT INTO memory_events (session_id, bucket_type, payload)
-            VALUES (:sid, :bucket, :payload)
-            """
             payload = {
                 "phase": phase,
                 "message": message,
@@ -1004,14 +1287,7 @@ class EligibilityOrchestrator:
             if metadata:
                 payload["metadata"] = metadata
             
-            await database.execute(
-                query=query,
-                values={
-                    "sid": session_id,
-                    "bucket": "THINKING",
-                    "payload": json.dumps(payload)
-                }
-            )
+            await event_sink.submit(session_id, "THINKING", json.dumps(payload))
             logger.debug(f"✅ Emitted thinking message: {phase} - {message[:50]}... (session_id={session_id})")
         except Exception as e:
             logger.warning(f"Failed to emit thinking message: {e}", exc_info=True)
@@ -1026,16 +1302,14 @@ class EligibilityOrchestrator:
     ):
         """
         Emit a process event to memory_events table for thinking view.
+        Without a session (batch scoring) there is no thinking view, so the
+        event is dropped quietly.
         """
         if not session_id:
-            logger.warning(f"⚠️ Cannot emit process event: session_id is None (phase={phase}, status={status})")
+            logger.debug(f"Skipping process event without session (phase={phase}, status={status})")
             return
         
         try:
-            query = """
-            INSERT INTO memory_events (session_id, bucket_type, payload)
-            VALUES (:sid, :bucket, :payload)
-            """
             payload = {
                 "phase": phase,
                 "status": status,
@@ -1045,14 +1319,7 @@ class EligibilityOrchestrator:
             if data:
                 payload["data"] = data
             
-            await database.execute(
-                query=query,
-                values={
-                    "sid": session_id,
-                    "bucket": "ELIGIBILITY_PROCESS",
-                    "payload": json.dumps(payload)
-                }
-            )
+            await event_sink.submit(session_id, "ELIGIBILITY_PROCESS", json.dumps(payload))
             logger.debug(f"✅ Emitted process event: {phase} - {status} (session_id={session_id})")
         except Exception as e:
             logger.warning(f"Failed to emit process event: {e}", exc_info=True)
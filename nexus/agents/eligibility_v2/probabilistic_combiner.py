@@ -10,6 +10,7 @@ Example:
 import logging
 import asyncio
 from typing import Dict, Optional, Callable, Any
+import numpy as np
 from nexus.agents.eligibility_v2.models import EligibilityStatus, EventTense
 
 logger = logging.getLogger("nexus.eligibility_v2.probabilistic_combiner")
@@ -163,3 +164,50 @@ class ProbabilisticCombiner:
                 logger.debug(f"Error emitting combination_complete: {e}")
         
         return final_probs
+    
+    def combine_batch(
+        self,
+        base_probs: Dict[EligibilityStatus, np.ndarray],
+        risk_probs: Dict[str, np.ndarray]
+    ) -> Dict[EligibilityStatus, np.ndarray]:
+        """
+        Vectorized combine_probabilistically over visits. Risks absent for a
+        visit are 0 in its row, which leaves that row unchanged exactly as
+        skipping the step would. Same operation order as the scalar path.
+        """
+        yes = base_probs[EligibilityStatus.YES].copy()
+        no = base_probs[EligibilityStatus.NO].copy()
+        not_established = base_probs[EligibilityStatus.NOT_ESTABLISHED].copy()
+        unknown = base_probs[EligibilityStatus.UNKNOWN].copy()
+        zeros = np.zeros_like(yes)
+        
+        # Coverage loss, then retrospective denial: ELIGIBLE -> NOT_ELIGIBLE
+        for risk_name in ("coverage_loss", "retrospective_denial"):
+            if risk_name in risk_probs:
+                risk = risk_probs[risk_name]
+                reduction = yes * risk
+                yes = yes * (1 - risk)
+                no = no + reduction
+        
+        # Payer/provider errors: proportional share of every state -> UNESTABLISHED
+        error_risks = risk_probs.get("payer_error", zeros) + risk_probs.get("provider_error", zeros)
+        total_prob = yes + no + not_established + unknown
+        apply = (error_risks > 0) & (total_prob > 0)
+        if apply.any():
+            error_prob = total_prob * error_risks
+            share = np.divide(error_prob, total_prob, out=np.zeros_like(total_prob), where=apply)
+            yes = np.where(apply, yes - yes * share, yes)
+            no = np.where(apply, no - no * share, no)
+            not_established = np.where(apply, not_established - not_established * share, not_established)
+            unknown = np.where(apply, unknown - unknown * share + error_prob, unknown)
+        
+        # Normalize to sum to 1.0
+        total = yes + no + not_established + unknown
+        positive = total > 0
+        safe_total = np.where(positive, total, 1.0)
+        return {
+            EligibilityStatus.YES: np.where(positive, yes / safe_total, yes),
+            EligibilityStatus.NO: np.where(positive, no / safe_total, no),
+            EligibilityStatus.NOT_ESTABLISHED: np.where(positive, not_established / safe_total, not_established),
+            EligibilityStatus.UNKNOWN: np.where(positive, unknown / safe_total, unknown)
+        }
@@ -9,9 +9,16 @@ Computes separate risk probabilities (not adjustments, but actual probabilities)
 """
 import logging
 import asyncio
-from typing import Dict, Optional, Callable, Any
-from nexus.agents.eligibility_v2.models import CaseState, EventTense
+from datetime import date
+from typing import Dict, Optional, Callable, Any, List, Tuple
+
+import numpy as np
+
+from nexus.agents.eligibility_v2.models import CaseState, EventTense, ProductType
 from nexus.modules.database import database
+from nexus.services.eligibility_v2.risk_rate_table import (
+    risk_rate_table, COVERAGE_LOSS_PRIOR, DENIAL_PRIOR
+)
 
 logger = logging.getLogger("nexus.eligibility_v2.risk_probability_calculator")
 
@@ -88,6 +95,80 @@ class RiskProbabilityCalculator:
         
         return risks
     
+    async def compute_risk_probabilities_batch(
+        self,
+        case_state: CaseState,
+        visits: List[Tuple[date, EventTense]]
+    ) -> List[Dict[str, float]]:
+        """
+        compute_risk_probabilities for each (dos_date, event_tense).
+        Payer/provider error rates are per case and queried once; coverage
+        loss and denial rates for all day gaps come from one vectorized
+        risk rate table lookup (or one live query per distinct gap until the
+        table is built).
+        """
+        today = date.today()
+        payer_error = None
+        provider_error = None
+        product_type = case_state.health_plan.product_type
+        
+        gaps = []
+        for dos_date, event_tense in visits:
+            if event_tense == EventTense.FUTURE:
+                gaps.append((dos_date - today).days if dos_date else 0)
+            elif event_tense == EventTense.PAST:
+                gaps.append((today - dos_date).days if dos_date else 0)
+            else:
+                gaps.append(0)
+        coverage_loss = await self._coverage_loss_rates(
+            product_type,
+            sorted({g for g, (_, t) in zip(gaps, visits) if t == EventTense.FUTURE and g > 0})
+        )
+        denial = await self._retrospective_denial_rates(
+            sorted({g for g, (_, t) in zip(gaps, visits) if t == EventTense.PAST and g > 0})
+        )
+        
+        results = []
+        for gap, (_, event_tense) in zip(gaps, visits):
+            risks = {}
+            if event_tense not in (EventTense.FUTURE, EventTense.PAST):
+                results.append(risks)
+                continue
+            
+            if event_tense == EventTense.FUTURE:
+                risks["coverage_loss"] = coverage_loss[gap] if gap > 0 else 0.0
+            else:
+                risks["retrospective_denial"] = denial[gap] if gap > 0 else 0.0
+            
+            if payer_error is None:
+                payer_error = await self._compute_payer_error_risk(case_state)
+                provider_error = await self._compute_provider_error_risk(case_state)
+            risks["payer_error"] = payer_error
+            risks["provider_error"] = provider_error
+            results.append(risks)
+        
+        return results
+    
+    async def _coverage_loss_rates(self, product_type: Optional[ProductType], days: List[int]) -> Dict[int, float]:
+        """Coverage loss rate per distinct gap: one array lookup, or one live query per gap"""
+        if not days:
+            return {}
+        if await risk_rate_table.ensure_loaded():
+            rates = risk_rate_table.coverage_loss_rates(
+                product_type.value if product_type else "UNKNOWN", np.asarray(days)
+            )
+            return dict(zip(days, rates.tolist()))
+        return {d: await self._coverage_loss_rate(product_type, d) for d in days}
+    
+    async def _retrospective_denial_rates(self, days: List[int]) -> Dict[int, float]:
+        """Denial rate per distinct gap: one array lookup, or one live query per gap"""
+        if not days:
+            return {}
+        if await risk_rate_table.ensure_loaded():
+            rates = risk_rate_table.retrospective_denial_rates(np.asarray(days))
+            return dict(zip(days, rates.tolist()))
+        return {d: await self._retrospective_denial_rate(d) for d in days}
+    
     async def _compute_coverage_loss_risk(
         self, case_state: CaseState, emit_step: Optional[Callable] = None
     ) -> float:
@@ -105,18 +186,42 @@ class RiskProbabilityCalculator:
         if days_until_dos <= 0:
             return 0.0
         
-        # Base risk by product type
         product_type = case_state.health_plan.product_type
-        base_risk = {
-            "MEDICAID": 0.15,      # Higher volatility
-            "MEDICARE": 0.08,
-            "DSNP": 0.12,
-            "COMMERCIAL": 0.05,    # Lower volatility
-            "OTHER": 0.10,
-            "UNKNOWN": 0.10
-        }.get(product_type.value if product_type else "UNKNOWN", 0.10)
-        
-        # Query historical data if available
+        base_risk = await self._coverage_loss_rate(product_type, days_until_dos)
+        
+        if emit_step:
+            try:
+                if asyncio.iscoroutinefunction(emit_step):
+                    await emit_step("coverage_loss_risk", {
+                        "risk": base_risk,
+                        "days_until_dos": days_until_dos,
+                        "product_type": product_type.value if product_type else "UNKNOWN",
+                        "explanation": f"Coverage loss risk: {base_risk:.1%} based on product type and historical patterns"
+                    })
+                else:
+                    emit_step("coverage_loss_risk", {
+                        "risk": base_risk,
+                        "days_until_dos": days_until_dos,
+                        "product_type": product_type.value if product_type else "UNKNOWN",
+                        "explanation": f"Coverage loss risk: {base_risk:.1%} based on product type and historical patterns"
+                    })
+            except Exception as e:
+                logger.debug(f"Error emitting coverage_loss_risk: {e}")
+        
+        return base_risk
+    
+    async def _coverage_loss_rate(self, product_type: Optional[ProductType], days_until_dos: int) -> float:
+        """Coverage loss rate for a product type and DOS horizon (days_until_dos > 0)"""
+        # Preferred path: materialized, smoothed rates (no DB query)
+        if await risk_rate_table.ensure_loaded():
+            return risk_rate_table.coverage_loss_rates(
+                product_type.value if product_type else "UNKNOWN", days_until_dos
+            )
+        
+        # Base risk by product type
+        base_risk = COVERAGE_LOSS_PRIOR.get(product_type.value if product_type else "UNKNOWN", 0.10)
+        
+        # Table not built yet: query historical data if available
         try:
             query = """
                 SELECT 
@@ -138,25 +243,6 @@ class RiskProbabilityCalculator:
         except Exception as e:
             logger.debug(f"Could not query historical coverage loss data: {e}")
         
-        if emit_step:
-            try:
-                if asyncio.iscoroutinefunction(emit_step):
-                    await emit_step("coverage_loss_risk", {
-                        "risk": base_risk,
-                        "days_until_dos": days_until_dos,
-                        "product_type": product_type.value if product_type else "UNKNOWN",
-                        "explanation": f"Coverage loss risk: {base_risk:.1%} based on product type and historical patterns"
-                    })
-                else:
-                    emit_step("coverage_loss_risk", {
-                        "risk": base_risk,
-                        "days_until_dos": days_until_dos,
-                        "product_type": product_type.value if product_type else "UNKNOWN",
-                        "explanation": f"Coverage loss risk: {base_risk:.1%} based on product type and historical patterns"
-                    })
-            except Exception as e:
-                logger.debug(f"Error emitting coverage_loss_risk: {e}")
-        
         return base_risk
     
     async def _compute_retrospective_denial_risk(
@@ -176,10 +262,37 @@ class RiskProbabilityCalculator:
         if days_since_visit <= 0:
             return 0.0
         
+        base_risk = await self._retrospective_denial_rate(days_since_visit)
+        
+        if emit_step:
+            try:
+                if asyncio.iscoroutinefunction(emit_step):
+                    await emit_step("retrospective_denial_risk", {
+                        "risk": base_risk,
+                        "days_since_visit": days_since_visit,
+                        "explanation": f"Retrospective denial risk: {base_risk:.1%} based on historical patterns"
+                    })
+                else:
+                    emit_step("retrospective_denial_risk", {
+                        "risk": base_risk,
+                        "days_since_visit": days_since_visit,
+                        "explanation": f"Retrospective denial risk: {base_risk:.1%} based on historical patterns"
+                    })
+            except Exception as e:
+                logger.debug(f"Error emitting retrospective_denial_risk: {e}")
+        
+        return base_risk
+    
+    async def _retrospective_denial_rate(self, days_since_visit: int) -> float:
+        """Historical denial rate around days_since_visit (days_since_visit > 0)"""
+        # Preferred path: materialized, smoothed rates (no DB query)
+        if await risk_rate_table.ensure_loaded():
+            return risk_rate_table.retrospective_denial_rates(days_since_visit)
+        
         # Base risk decreases over time (if not denied yet, less likely to be denied)
-        base_risk = 0.10  # 10% base risk
+        base_risk = DENIAL_PRIOR
         
-        # Query historical data if available
+        # Table not built yet: query historical data if available
         try:
             query = """
                 SELECT 
@@ -199,23 +312,6 @@ class RiskProbabilityCalculator:
         except Exception as e:
             logger.debug(f"Could not query historical denial data: {e}")
         
-        if emit_step:
-            try:
-                if asyncio.iscoroutinefunction(emit_step):
-                    await emit_step("retrospective_denial_risk", {
-                        "risk": base_risk,
-                        "days_since_visit": days_since_visit,
-                        "explanation": f"Retrospective denial risk: {base_risk:.1%} based on historical patterns"
-                    })
-                else:
-                    emit_step("retrospective_denial_risk", {
-                        "risk": base_risk,
-                        "days_since_visit": days_since_visit,
-                        "explanation": f"Retrospective denial risk: {base_risk:.1%} based on historical patterns"
-                    })
-            except Exception as e:
-                logger.debug(f"Error emitting retrospective_denial_risk: {e}")
-        
         return base_risk
     
     async def _compute_payer_error_risk(
@@ -6,7 +6,8 @@ Deterministic scoring logic for eligibility probability using purist approach.
 import logging
 import asyncio
 from datetime import date
-from typing import Optional, Callable, Any, Dict
+from typing import Optional, Callable, Any, Dict, List, Tuple
+import numpy as np
 from nexus.agents.eligibility_v2.models import (
     CaseState, ScoreState, EligibilityStatus, EventTense
 )
@@ -193,19 +194,99 @@ class EligibilityScorer:
         
         return score_state
     
+    async def score_batch(
+        self,
+        case_state: CaseState,
+        visits: List[Tuple[date, EventTense]]
+    ) -> List[ScoreState]:
+        """
+        Score one case at several (dos_date, event_tense) points in one pass.
+        
+        Equivalent to calling score() on a copy of case_state with timing set
+        to each visit (same numbers), but shares lookups across visits and
+        runs the time function and combiner as NumPy array operations.
+        Calculation steps are not emitted.
+        """
+        if not visits:
+            return []
+        
+        # 1. Base probabilities (deduplicated lookups)
+        base_results = await self.base_calculator.compute_base_probability_batch(case_state, visits)
+        base_arrays = {
+            status: np.array([probs.get(status, 0.0) for probs, _ in base_results], dtype=float)
+            for status in (EligibilityStatus.YES, EligibilityStatus.NO,
+                           EligibilityStatus.NOT_ESTABLISHED, EligibilityStatus.UNKNOWN)
+        }
+        
+        # 2. Risk probabilities (deduplicated lookups)
+        risk_results = await self.risk_calculator.compute_risk_probabilities_batch(case_state, visits)
+        risk_names = []
+        for risks in risk_results:
+            risk_names.extend(name for name in risks if name not in risk_names)
+        risk_arrays = {
+            name: np.array([risks.get(name, 0.0) for risks in risk_results], dtype=float)
+            for name in risk_names
+        }
+        
+        # 3. Time function over all visits
+        tenses = [event_tense for _, event_tense in visits]
+        time_gaps = np.array([self._time_gap(dos_date, event_tense) for dos_date, event_tense in visits], dtype=np.int64)
+        adjusted_arrays = self.time_function.apply_time_function_batch(risk_arrays, tenses, time_gaps)
+        
+        # 4. Combine over all visits
+        final_arrays = self.combiner.combine_batch(base_arrays, adjusted_arrays)
+        
+        # 5. Per-visit ScoreState and explanation
+        final_columns = {status: values.tolist() for status, values in final_arrays.items()}
+        adjusted_columns = {name: values.tolist() for name, values in adjusted_arrays.items()}
+        score_states = []
+        for i, (dos_date, event_tense) in enumerate(visits):
+            base_probs, base_source = base_results[i]
+            risk_probs = risk_results[i]
+            adjusted_risks = {name: adjusted_columns[name][i] for name in risk_probs}
+            final_probs = {status: final_columns[status][i] for status in final_arrays}
+            time_gap = int(time_gaps[i])
+            
+            explanation = self.explainer.generate_explanation(
+                base_probs, base_source, risk_probs, adjusted_risks,
+                time_gap, event_tense, final_probs
+            )
+            score_states.append(ScoreState(
+                base_probability=final_probs[EligibilityStatus.YES],
+                base_confidence=self._compute_confidence(case_state, base_source),
+                state_probabilities={
+                    "eligible": final_probs[EligibilityStatus.YES],
+                    "not_eligible": final_probs[EligibilityStatus.NO],
+                    "no_info": final_probs[EligibilityStatus.NOT_ESTABLISHED],
+                    "unestablished": final_probs[EligibilityStatus.UNKNOWN]
+                },
+                risk_probabilities=adjusted_risks,
+                base_probability_source=base_source,
+                calculation_explanation=explanation.model_dump(),
+                calculation_human_readable=explanation.human_readable,
+                scoring_version="v2"
+            ))
+        
+        logger.info(f"Computed batch scores for {len(visits)} visits")
+        return score_states
+    
     def _compute_time_gap(self, case_state: CaseState) -> int:
         """Compute time gap in days"""
-        if not case_state.timing.dos_date:
+        return self._time_gap(case_state.timing.dos_date, case_state.timing.event_tense)
+    
+    @staticmethod
+    def _time_gap(dos_date: Optional[date], event_tense: EventTense) -> int:
+        if not dos_date:
             return 0
         
         today = date.today()
         
-        if case_state.timing.event_tense == EventTense.FUTURE:
+        if event_tense == EventTense.FUTURE:
             # Days until DOS
-            return max(0, (case_state.timing.dos_date - today).days)
-        elif case_state.timing.event_tense == EventTense.PAST:
+            return max(0, (dos_date - today).days)
+        elif event_tense == EventTense.PAST:
             # Days since visit
-            return max(0, (today - case_state.timing.dos_date).days)
+            return max(0, (today - dos_date).days)
         else:
             return 0
     
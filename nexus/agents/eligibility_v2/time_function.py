@@ -8,7 +8,8 @@ Amplifies or deteriorates risk probabilities based on time gap and event tense.
 import logging
 import math
 import asyncio
-from typing import Dict, Optional, Callable, Any
+from typing import Dict, Optional, Callable, Any, Sequence
+import numpy as np
 from nexus.agents.eligibility_v2.models import EventTense
 
 logger = logging.getLogger("nexus.eligibility_v2.time_function")
@@ -108,6 +109,47 @@ class TimeFunction:
         
         return adjusted_risks
     
+    def apply_time_function_batch(
+        self,
+        risk_probabilities: Dict[str, np.ndarray],
+        event_tenses: Sequence[EventTense],
+        time_gaps: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized apply_time_function over visits: one array per risk,
+        indexed like event_tenses/time_gaps. Gives the same floats as the
+        scalar path (exp factors come from math.exp per distinct gap).
+        """
+        future = np.array([t == EventTense.FUTURE for t in event_tenses], dtype=bool)
+        past = np.array([t == EventTense.PAST for t in event_tenses], dtype=bool)
+        
+        adjusted_risks = {}
+        for risk_name, base in risk_probabilities.items():
+            adjusted = base.copy()
+            if future.any():
+                alpha = self._get_alpha(risk_name, is_future=True)
+                amplification = self._exp_factors(alpha, time_gaps[future])
+                adjusted[future] = np.minimum(1.0, base[future] * amplification)
+            if past.any():
+                gaps = time_gaps[past]
+                if risk_name == "retrospective_denial":
+                    linear = np.where(gaps <= 60, base[past] * (1.0 - (gaps / 60.0)), 0.0)
+                    adjusted[past] = np.maximum(0.0, linear)
+                else:
+                    alpha = self._get_alpha(risk_name, is_future=False)
+                    deterioration = self._exp_factors(-alpha, gaps)
+                    adjusted[past] = np.maximum(0.0, base[past] * deterioration)
+            adjusted_risks[risk_name] = adjusted
+        
+        return adjusted_risks
+    
+    @staticmethod
+    def _exp_factors(alpha: float, time_gaps: np.ndarray) -> np.ndarray:
+        """exp(alpha * t) per element, evaluated once per distinct gap"""
+        unique_gaps, inverse = np.unique(time_gaps, return_inverse=True)
+        factors = np.array([math.exp(alpha * int(t)) for t in unique_gaps], dtype=float)
+        return factors[inverse]
+    
     def _amplify_risk(self, risk_name: str, base_prob: float, time_gap_days: int) -> float:
         """Amplify risk for future events"""
         # Get amplification factor α based on risk type
@@ -29,6 +29,15 @@ from nexus.recipes.crm_recipes import register_crm_recipes
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_db()
+    # Cross-worker cache invalidation (LISTEN/NOTIFY)
+    from nexus.modules.cache_invalidation import invalidation_bus
+    await invalidation_bus.start()
+    # Push fan-out of memory events to SSE subscribers across workers
+    from nexus.core.event_hub import event_hub
+    await event_hub.start()
+    # Cross-worker WebSocket broadcast
+    from nexus.modules.session_manager import session_manager
+    await session_manager.start()
     # Migration Note: active migrations should be triggered via /api/system/migrate in prod
     # But for dev convenience we can keep init_db or move to migrations entirely.
     await init_db()
@@ -66,6 +75,17 @@ async def lifespan(app: FastAPI):
     
     yield
     # Shutdown
+    # Drain queued memory events while the database is still connected
+    from nexus.core.event_sink import event_sink
+    await event_sink.close()
+    from nexus.modules.tracing import tracer
+    await tracer.close()
+    from nexus.modules.session_manager import session_manager
+    await session_manager.stop()
+    from nexus.modules.llm_client_pool import client_registry
+    await client_registry.close()
+    from nexus.services.database.notify_listener import notify_listener
+    await notify_listener.stop()
     await disconnect_from_db()
 
 app = FastAPI(title="Mobius Nexus", version="0.1.0", lifespan=lifespan)
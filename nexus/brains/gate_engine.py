@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional, Literal, Tuple, List
 from datetime import datetime
 from nexus.core.gate_models import (
     GateConfig,
+    CompiledGateConfig,
     GateState,
     GateValue,
     StatusInfo,
@@ -21,6 +22,7 @@ from nexus.core.gate_models import (
     ParseError
 )
 from nexus.core.memory_logger import MemoryLogger
+from nexus.modules.tracing import tracer
 from nexus.services.gate.prompt_builder import GatePromptBuilder
 from nexus.services.gate.llm_service import GateLLMService
 from nexus.engines.gate.completion_checker import GateCompletionChecker
@@ -47,6 +49,7 @@ class GateEngine:
         self.state_merger = GateStateMerger()
         self.gate_selector = GateSelector()
     
+    @tracer.traced("gate.execute")
     async def execute_gate(
         self,
         user_text: str,
@@ -76,6 +79,9 @@ class GateEngine:
             f"Previous gates: {len(previous_state.gates) if previous_state else 0}"
         )
         
+        # Loader configs are already compiled; compile ad-hoc ones once for this turn
+        gate_config = CompiledGateConfig.of(gate_config)
+        
         # DETERMINISTIC PATH: If no user input, determine next gate without LLM call
         if not user_text or not user_text.strip():
             self.mem.log_thinking("[GATE_ENGINE] No user input - using deterministic path")
@@ -15,6 +15,7 @@ from typing import List, Dict, Any, Optional
 from nexus.core.memory_logger import MemoryLogger
 from nexus.modules.database import database
 from nexus.core.gate_models import GateState
+from nexus.core.json_parser import scan_json
 from nexus.core.button_builder import emit_action_buttons
 from nexus.core.base_agent import BaseAgent
 from nexus.core.action_button_handler import ActionButtonHandler
@@ -1377,6 +1378,7 @@ What would you like to do next?"""
                 UPDATE shaping_sessions 
                 SET planning_phase_approved = TRUE,
                     planning_phase_approved_at = CURRENT_TIMESTAMP,
+                    version = version + 1,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE id = :session_id
             """
@@ -1394,6 +1396,7 @@ What would you like to do next?"""
                     planning_phase_approved = FALSE,
                     planning_phase_approved_at = NULL,
                     status = 'GATHERING',
+                    version = version + 1,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE id = :session_id
             """
@@ -1685,64 +1688,19 @@ What would you like to do next?"""
     
     def _parse_planning_response(self, llm_response: str) -> Dict[str, Any]:
         """Parse LLM JSON response - handles markdown code blocks and extra text."""
-        import re
-        from typing import Optional
-        
         logger.info(f"[PlanningPhaseBrain._parse_planning_response] 📥 Parsing LLM response ({len(llm_response)} chars)")
         logger.debug(f"[PlanningPhaseBrain._parse_planning_response] Full response:\n{llm_response}")
         
-        # Helper function: Extract JSON using brace counting (robust for nested JSON)
-        def extract_json_with_brace_counting(text: str) -> Optional[str]:
-            """Extract JSON object from text using brace counting."""
-            start_idx = text.find('{')
-            if start_idx == -1:
-                return None
-            
-            brace_count = 0
-            for i in range(start_idx, len(text)):
-                if text[i] == '{':
-                    brace_count += 1
-                elif text[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        return text[start_idx:i+1]
-            return None
-        
-        # Step 1: Try to extract JSON from markdown code blocks first
-        code_block_pattern = r'```(?:json)?\s*\n?(.*?)\n?```'
-        code_block_match = re.search(code_block_pattern, llm_response, re.DOTALL)
-        if code_block_match:
-            code_block_content = code_block_match.group(1).strip()
-            logger.debug(f"[PlanningPhaseBrain._parse_planning_response] Found JSON in code block, trying to parse...")
-            
-            # Try direct parsing first
-            try:
-                parsed = json.loads(code_block_content)
-                logger.info(f"[PlanningPhaseBrain._parse_planning_response] ✅ Successfully parsed JSON from code block")
-                return parsed
-            except json.JSONDecodeError:
-                # If direct parsing fails, try brace counting on the code block content
-                logger.debug(f"[PlanningPhaseBrain._parse_planning_response] Direct parse failed, trying brace counting on code block content...")
-                json_candidate = extract_json_with_brace_counting(code_block_content)
-                if json_candidate:
-                    try:
-                        parsed = json.loads(json_candidate)
-                        logger.info(f"[PlanningPhaseBrain._parse_planning_response] ✅ Successfully parsed JSON from code block using brace counting")
-                        return parsed
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"[PlanningPhaseBrain._parse_planning_response] Brace counting on code block failed: {e}")
-        
-        # Step 2: Try to find JSON using brace counting (removed broken regex pattern)
-        json_candidate = extract_json_with_brace_counting(llm_response)
-        if json_candidate:
-            try:
-                parsed = json.loads(json_candidate)
-                logger.info(f"[PlanningPhaseBrain._parse_planning_response] ✅ Successfully parsed JSON using brace counting")
-                return parsed
-            except json.JSONDecodeError as e:
-                logger.warning(f"[PlanningPhaseBrain._parse_planning_response] Brace counting found candidate but parsing failed: {e}")
+        # Step 1: Locate the outermost JSON object (code fences, surrounding text,
+        # comments and trailing commas are handled by the scanner)
+        scanner = scan_json(llm_response)
+        if scanner.data is not None:
+            logger.info(f"[PlanningPhaseBrain._parse_planning_response] ✅ Successfully parsed JSON object")
+            return scanner.data
+        if scanner.text:
+            logger.warning(f"[PlanningPhaseBrain._parse_planning_response] Found a JSON object candidate but it does not parse")
         
-        # Step 3: Try parsing entire response as JSON (last resort)
+        # Step 2: Try parsing entire response as JSON (last resort)
         try:
             parsed = json.loads(llm_response.strip())
             logger.info(f"[PlanningPhaseBrain._parse_planning_response] ✅ Successfully parsed entire response as JSON")
@@ -1815,7 +1773,7 @@ What would you like to do next?"""
     async def _save_draft_plan(self, session_id: int, draft_plan: Dict[str, Any]) -> None:
         """Save updated draft plan to database."""
         await database.execute(
-            "UPDATE shaping_sessions SET draft_plan = :plan, updated_at = CURRENT_TIMESTAMP WHERE id = :id",
+            "UPDATE shaping_sessions SET draft_plan = :plan, version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = :id",
             {"plan": json.dumps(draft_plan), "id": session_id}
         )
         
@@ -484,17 +484,22 @@ class BaseOrchestrator(ABC):
     def _record_metric(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
         """
         Record metric.
+        Counted in nexus_events_total by name; tags (user/session ids) are
+        too high-cardinality for labels, so they only go to the debug log.
         """
+        from nexus.modules.metrics import EVENTS
+        EVENTS.labels(name).inc(value)
         tag_str = ", ".join([f"{k}={v}" for k, v in (tags or {}).items()])
-        self.logger.info(f"METRIC: {name}={value} {tag_str}")
-        # In production, this would send to metrics system (Prometheus, etc.)
+        self.logger.debug(f"METRIC: {name}={value} {tag_str}")
     
     def _start_trace(self, operation_name: str, context: Dict[str, Any]) -> str:
         """
         Start tracing - returns trace_id.
+        Inside a traced turn this is the turn's trace id (see modules/tracing).
         """
         import uuid
-        trace_id = str(uuid.uuid4())
+        from nexus.modules.tracing import tracer
+        trace_id = tracer.current_trace_id() or str(uuid.uuid4())
         self.logger.debug(f"TRACE_START: {trace_id} [{operation_name}] {context}")
         return trace_id
     
@@ -799,45 +804,28 @@ class BaseOrchestrator(ABC):
             ]
         """
         try:
-            # Get session transcript from shaping_sessions table
-            db = self._get_database()
-            session_query = "SELECT transcript FROM shaping_sessions WHERE id = :session_id"
-            session_row = await db.fetch_one(session_query, {"session_id": session_id})
-            
-            if not session_row:
-                self.logger.debug(f"Session {session_id} not found for conversational history")
-                return []
-            
-            # Convert row to dict
-            session_dict = dict(session_row)
-            transcript = session_dict.get("transcript", [])
+            # Read from append-only session_messages; with a limit only the
+            # tail rows are fetched instead of the whole transcript
+            from nexus.services.shaping.message_repository import SessionMessageRepository
+            messages = SessionMessageRepository()
             
-            # Parse transcript if it's a string
-            if isinstance(transcript, str):
-                import json
-                try:
-                    transcript = json.loads(transcript)
-                except (json.JSONDecodeError, TypeError):
-                    self.logger.warning(f"Failed to parse transcript for session {session_id}")
+            # Only include user and system messages (system = OUTPUT events shown to user)
+            if max_messages:
+                transcript = await messages.get_tail(
+                    session_id, max_messages, roles=("user", "system"), non_empty=True
+                )
+            else:
+                transcript = await messages.get_messages(session_id)
+                if transcript is None:
+                    self.logger.debug(f"Session {session_id} not found for conversational history")
                     return []
             
-            if not isinstance(transcript, list):
-                self.logger.warning(f"Transcript for session {session_id} is not a list: {type(transcript)}")
-                return []
-            
-            # Filter to only user-facing messages
-            # Transcript format: [{"role": "user|system", "content": "...", ...}, ...]
-            # We only want messages with role "user" or "system" (system messages are OUTPUT events)
             user_facing_messages = []
             
             for msg in transcript:
-                if not isinstance(msg, dict):
-                    continue
-                
-                role = msg.get("role", "").lower()
+                role = (msg.get("role") or "").lower()
                 content = msg.get("content", "")
                 
-                # Only include user and system messages (system = OUTPUT events shown to user)
                 if role in ("user", "system") and content:
                     # Clean message - only include role and content
                     clean_msg = {
@@ -846,14 +834,9 @@ class BaseOrchestrator(ABC):
                     }
                     user_facing_messages.append(clean_msg)
             
-            # Apply max_messages limit if specified (take most recent)
-            if max_messages and len(user_facing_messages) > max_messages:
-                user_facing_messages = user_facing_messages[-max_messages:]
-            
             self.logger.debug(
                 f"Built conversational history for session {session_id}: "
-                f"{len(user_facing_messages)} user-facing messages "
-                f"(from {len(transcript)} total transcript entries)"
+                f"{len(user_facing_messages)} user-facing messages"
             )
             
             return user_facing_messages
@@ -17,6 +17,8 @@ from nexus.conductors.base_orchestrator import BaseOrchestrator
 from nexus.modules.shaping_manager import shaping_manager
 from nexus.modules.session_manager import session_manager
 from nexus.modules.database import database
+from nexus.modules.llm_admission import LLMPriority, with_llm_priority
+from nexus.modules.tracing import tracer
 from nexus.brains.diagnosis import DiagnosisBrain, SolutionCandidate
 from nexus.brains.planner import planner_brain
 from nexus.brains.consultant import consultant_brain
@@ -71,6 +73,7 @@ class WorkflowOrchestrator(BaseOrchestrator):
     # Public API - Called by Endpoints
     # ============================================================================
     
+    @tracer.traced("shaping.start_session", root=True)
     async def start_shaping_session(self, user_id: str, query: str) -> Dict[str, Any]:
         """
         Start a new shaping session.
@@ -527,6 +530,7 @@ class WorkflowOrchestrator(BaseOrchestrator):
             await self._handle_error(e, {"operation": "get_session_state", "session_id": session_id}, session_id)
             raise
     
+    @tracer.traced("shaping.chat_turn", root=True, session_arg="session_id")
     async def handle_chat_message(self, session_id: int, message: str, user_id: str) -> Dict[str, Any]:
         """
         Handle a chat message in a shaping session.
@@ -591,10 +595,9 @@ Please let me know which option you prefer."""
                     self.logger.warning(f"Conversational agent formatting failed: {e}")
                     formatted_message = transition_message
                 
-                # Get current transcript and add user message (gates already complete, so we don't call append_message)
-                session = await self.shaping_manager.get_session(session_id)
-                transcript = session.get("transcript", []) if session else []
-                transcript.append({"role": "user", "content": message, "timestamp": "now"})
+                # Persist user message (gates already complete, so we don't call append_message)
+                messages = self.shaping_manager.session_repository.messages
+                await messages.append(session_id, "user", message, timestamp="now")
                 
                 # Emit user message
                 await agent.emit("OUTPUT", {"role": "user", "content": message})
@@ -652,20 +655,18 @@ Please let me know which option you prefer."""
                     metadata={"phase": "planning", "step": "build_reuse_decision"}
                 )
                 
-                # Add system response to transcript
-                transcript.append({"role": "system", "content": formatted_message, "timestamp": "now"})
-                
-                # Persist transcript
+                # Persist system response
+                await messages.append(session_id, "system", formatted_message, timestamp="now")
                 await database.execute(
-                    "UPDATE shaping_sessions SET transcript = :transcript, updated_at = CURRENT_TIMESTAMP WHERE id = :id",
-                    {"transcript": json.dumps(transcript), "id": session_id}
+                    "UPDATE shaping_sessions SET updated_at = CURRENT_TIMESTAMP WHERE id = :id",
+                    {"id": session_id}
                 )
                 
                 # Return planning phase response
                 logger.debug(f"[WorkflowOrchestrator.handle_chat_message] EXIT | Returning planning phase response")
                 return {
                     "reply": formatted_message,
-                    "trace_id": None
+                    "trace_id": tracer.current_trace_id()
                 }
             
             # Gates not complete - continue with normal gate flow
@@ -720,7 +721,7 @@ Please let me know which option you prefer."""
                 )
                 
                 # Trigger planner update in background (now that user confirmed)
-                asyncio.create_task(self._trigger_planner_update(session_id, transcript))
+                asyncio.create_task(with_llm_priority(LLMPriority.BACKGROUND, self._trigger_planner_update(session_id, transcript)))
                 
                 from nexus.core.base_agent import BaseAgent
                 agent = BaseAgent(session_id=session_id)
@@ -796,25 +797,21 @@ Please let me know which option you prefer."""
                     context="planning_phase_decision"
                 )
                 
-                # Get current transcript - append_message already added the user message
-                # DON'T add user message again - it's already in transcript from append_message
-                session = await self.shaping_manager.get_session(session_id)
-                transcript = session.get("transcript", []) if session else []
-                
-                # Add planning phase system message to transcript
-                transcript.append({"role": "system", "content": formatted_message, "timestamp": "now"})
-                
-                # Persist transcript
+                # append_message already added the user message
+                # DON'T add user message again - only persist the planning phase system message
+                await self.shaping_manager.session_repository.messages.append(
+                    session_id, "system", formatted_message, timestamp="now"
+                )
                 await database.execute(
-                    "UPDATE shaping_sessions SET transcript = :transcript, updated_at = CURRENT_TIMESTAMP WHERE id = :id",
-                    {"transcript": json.dumps(transcript), "id": session_id}
+                    "UPDATE shaping_sessions SET updated_at = CURRENT_TIMESTAMP WHERE id = :id",
+                    {"id": session_id}
                 )
                 
                 # Return planning phase response
                 logger.debug(f"[WorkflowOrchestrator.handle_chat_message] EXIT | Returning planning phase response")
                 return {
                     "reply": formatted_message,
-                    "trace_id": None
+                    "trace_id": tracer.current_trace_id()
                 }
             
             # 4. Check for planning phase transition (gate completion) - fire and forget
@@ -825,19 +822,18 @@ Please let me know which option you prefer."""
             asyncio.create_task(self._trigger_workflow_analysis(session_id, message))
             
             # 6. Trigger planner update (parallel) - update draft plan
-            asyncio.create_task(self._trigger_planner_update(session_id, transcript))
+            asyncio.create_task(with_llm_priority(LLMPriority.BACKGROUND, self._trigger_planner_update(session_id, transcript)))
             
             # 7. Get updated session to get the reply
-            updated_session = await self.shaping_manager.get_session(session_id)
-            transcript_list = updated_session.get("transcript", []) if updated_session else []
-            last_message = transcript_list[-1] if transcript_list else {}
+            tail = await self.shaping_manager.session_repository.messages.get_tail(session_id, 1)
+            last_message = tail[-1] if tail else {}
             
             # 8. Metrics
             self._record_metric("chat_message.processed", 1, {"session_id": session_id})
             
             result = {
                 "reply": last_message.get("content", ""),
-                "trace_id": last_message.get("trace_id")
+                "trace_id": last_message.get("trace_id") or tracer.current_trace_id()
             }
             logger.debug(f"[WorkflowOrchestrator.handle_chat_message] EXIT | Returning gate flow response")
             return result
@@ -886,6 +882,7 @@ Please let me know which option you prefer."""
             await self._handle_error(e, {"operation": "analyze_existing_workflows", "session_id": session_id}, session_id)
             raise
     
+    @tracer.traced("shaping.update_workflow_plan", root=True, session_arg="session_id")
     async def update_workflow_plan(self, session_id: int) -> Dict[str, Any]:
         """
         Update the workflow plan based on current session state.
@@ -920,6 +917,7 @@ Please let me know which option you prefer."""
             await self._handle_error(e, {"operation": "update_workflow_plan", "session_id": session_id}, session_id)
             return {"steps": [], "error": str(e)}
     
+    @tracer.traced("workflow.execute", root=True)
     async def execute_workflow(self, recipe_name: str, initial_context: Dict[str, Any], 
                               session_id: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -1360,20 +1358,16 @@ Please let me know which option you prefer."""
                 )
             return
         
-        # Format through conversational agent
-        try:
-            formatted_message = await conversational_agent.format_response(
+        # Format through conversational agent, streaming the OUTPUT as it is generated
+        await agent.emit_output_stream(
+            conversational_agent.stream_response(
                 raw_response=raw_message,
                 user_id=user_id,
                 context={"operation": "gate_response", "source": "gate_engine", "session_id": session_id}
-            )
-        except Exception as e:
-            self.logger.warning(f"Conversational agent formatting failed: {e}")
-            formatted_message = raw_message
-        
-        # Emit formatted OUTPUT
-        if formatted_message and formatted_message.strip():
-            await agent.emit("OUTPUT", {"role": "system", "content": formatted_message})
+            ),
+            {"role": "system"},
+            fallback_content=raw_message
+        )
         
         # Emit buttons if provided
         if buttons:
@@ -1385,6 +1379,7 @@ Please let me know which option you prefer."""
                 metadata=button_metadata
             )
     
+    @tracer.traced("shaping.planner_update")
     async def _trigger_planner_update(self, session_id: int, transcript: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Trigger planner update and emit draft plan.
@@ -1406,7 +1401,7 @@ Please let me know which option you prefer."""
             if gate_state_data:
                 try:
                     import json
-                    from nexus.core.gate_models import GateState, GateValue, StatusInfo, GateConfig
+                    from nexus.core.gate_models import GateState, GateValue, StatusInfo
                     from nexus.modules.prompt_manager import prompt_manager
                     
                     # Parse gate_state
@@ -1446,7 +1441,8 @@ Please let me know which option you prefer."""
                     )
                     
                     if prompt_data and "GATE_ORDER" in prompt_data.get("config", {}):
-                        gate_config = GateConfig.from_prompt_config(prompt_data["config"])
+                        from nexus.services.gate.config_loader import GateConfigLoader
+                        gate_config = GateConfigLoader().compile(strategy, prompt_data["config"], prompt_data.get("version"))
                         
                         # Use gate_state to living document mapping
                         living_doc = self.planner_brain.map_gate_state_to_living_document(
@@ -1540,7 +1536,7 @@ Please let me know which option you prefer."""
             
             # Update database
             from nexus.modules.database import database
-            update_query = "UPDATE shaping_sessions SET draft_plan = :draft, updated_at = CURRENT_TIMESTAMP WHERE id = :id"
+            update_query = "UPDATE shaping_sessions SET draft_plan = :draft, version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = :id"
             await database.execute(
                 query=update_query,
                 values={
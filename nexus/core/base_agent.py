@@ -1,18 +1,28 @@
 import asyncio
 import logging
 import json
+import os
+import time
+import uuid
 from abc import ABC
-from typing import List, Dict, Any, Optional, Literal
+from typing import AsyncIterator, List, Dict, Any, Optional, Literal
 from dataclasses import dataclass, is_dataclass, asdict
 from datetime import datetime
 
 from nexus.core.base_tool import NexusTool
 from nexus.core.memory_models import MemoryEvent, ThinkingEvent, ArtifactEvent, OutputEvent, PersistenceEvent
+from nexus.core.event_sink import event_sink
+from nexus.core.event_hub import event_hub
 from nexus.modules.session_manager import session_manager
 from nexus.modules.database import database
+from nexus.modules.tracing import tracer
 
 logger = logging.getLogger("nexus.core.agent")
 
+# Streamed output deltas arriving within this window of the last send are
+# coalesced into one OUTPUT_DELTA event (the first delta is always sent at once)
+OUTPUT_DELTA_FLUSH_MS = int(os.getenv("OUTPUT_DELTA_FLUSH_MS", "50"))
+
 # --- The Streaming Base Agent ---
 class BaseAgent(ABC):
     """
@@ -28,11 +38,19 @@ class BaseAgent(ABC):
     def set_session_id(self, session_id: int):
         self.session_id = session_id
 
-    async def emit(self, bucket: Literal["THINKING", "ARTIFACTS", "PERSISTENCE", "OUTPUT"], payload: Dict[str, Any]):
+    async def emit(self, bucket: Literal["THINKING", "ARTIFACTS", "PERSISTENCE", "OUTPUT", "OUTPUT_DELTA"], payload: Dict[str, Any]):
         """
         The unified event emitter.
         Returns memory_event_id for OUTPUT events, None otherwise.
+        OUTPUT_DELTA events (partial streamed output) are pushed live only, never persisted.
         """
+        if bucket == "OUTPUT_DELTA":
+            # Too frequent to trace individually
+            return await self._emit(bucket, payload)
+        with tracer.span("agent.emit", bucket=bucket):
+            return await self._emit(bucket, payload)
+
+    async def _emit(self, bucket: str, payload: Dict[str, Any]):
         if not self.session_id:
             self.logger.warning(f"⚠️ Emit called without session_id. Payload: {payload}")
             return None
@@ -47,15 +65,18 @@ class BaseAgent(ABC):
         }
         await session_manager.broadcast(self.session_id, event_data)
         
+        if bucket == "OUTPUT_DELTA":
+            await event_hub.publish_ephemeral(self.session_id, bucket, payload)
+            return None
+        
         # 2. Path B: Persistence
         # For OUTPUT events, await persistence to get memory_event_id for transcript linking
-        # For other events, use background task to avoid blocking
+        # For other events, queue on the batched event sink (non-blocking unless overloaded)
         if bucket == "OUTPUT":
             memory_event_id = await self._persist_event(bucket, payload)
             return memory_event_id
         else:
-            # Spawn background task for non-OUTPUT events
-            asyncio.create_task(self._persist_event(bucket, payload))
+            await self._persist_event(bucket, payload)
             return None
         
         # 3. CRITICAL: If DRAFT_PLAN artifact, also persist to shaping_sessions.draft_plan
@@ -88,7 +109,7 @@ class BaseAgent(ABC):
                 query = """
                 INSERT INTO memory_events (session_id, bucket_type, payload)
                 VALUES (:sid, :bucket, :payload)
-                RETURNING id
+                RETURNING id, created_at
                 """
                 result = await database.fetch_one(query=query, values={
                     "sid": self.session_id,
@@ -99,6 +120,9 @@ class BaseAgent(ABC):
                 # Emit feedback UI after OUTPUT event is persisted
                 if result and "id" in result:
                     memory_event_id = result["id"]
+                    await event_hub.publish_event(
+                        memory_event_id, self.session_id, bucket, serializable_payload, result["created_at"]
+                    )
                     self.logger.debug(f"📝 OUTPUT event persisted with id={memory_event_id}, emitting feedback UI")
                     asyncio.create_task(self._emit_feedback_ui(memory_event_id))
                     return memory_event_id
@@ -106,16 +130,8 @@ class BaseAgent(ABC):
                     self.logger.warning(f"⚠️ OUTPUT event persisted but no ID returned from database")
                     return None
             else:
-                # For other bucket types, use simple INSERT
-                query = """
-                INSERT INTO memory_events (session_id, bucket_type, payload)
-                VALUES (:sid, :bucket, :payload)
-                """
-                await database.execute(query=query, values={
-                    "sid": self.session_id,
-                    "bucket": bucket,
-                    "payload": json.dumps(serializable_payload)
-                })
+                # For other bucket types, batch through the event sink
+                await event_sink.submit(self.session_id, bucket, json.dumps(serializable_payload))
                 return None
         except Exception as e:
             # We log but DO NOT crash the stream
@@ -154,9 +170,17 @@ class BaseAgent(ABC):
             # Convert to JSON-serializable format
             serializable_plan = self._make_json_serializable(draft_plan_data)
             
+            # Inside a chat turn the plan is flushed with the turn's session
+            from nexus.services.shaping.session_unit_of_work import current_session
+            session = current_session(self.session_id)
+            if session is not None:
+                session.set_draft_plan(serializable_plan)
+                return
+            
+            # Bumping version makes an open turn's flush raise SessionConflictError
             query = """
             UPDATE shaping_sessions 
-            SET draft_plan = :draft, updated_at = CURRENT_TIMESTAMP 
+            SET draft_plan = :draft, version = version + 1, updated_at = CURRENT_TIMESTAMP 
             WHERE id = :sid
             """
             await database.execute(query=query, values={
@@ -277,6 +301,62 @@ class BaseAgent(ABC):
         Used for: Chat messages, execution results, final answers.
         """
         await self.emit("OUTPUT", payload)
+    
+    async def emit_output_stream(
+        self,
+        deltas: AsyncIterator[str],
+        payload: Dict[str, Any],
+        fallback_content: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Streams an OUTPUT message as it is generated.
+        Deltas go out as OUTPUT_DELTA events {stream_id, index, delta} (live only);
+        the full content is then emitted and persisted once as a regular OUTPUT
+        carrying the same stream_id, which replaces the partial message in the UI.
+        If the stream fails or comes back empty and fallback_content is given,
+        the final OUTPUT uses it.
+        Returns the OUTPUT memory_event_id.
+        """
+        stream_id = uuid.uuid4().hex
+        parts: List[str] = []
+        pending: List[str] = []
+        index = 0
+        last_sent = None
+        
+        async def send_pending():
+            nonlocal index, last_sent
+            if not pending:
+                return
+            await self.emit("OUTPUT_DELTA", {
+                "role": payload.get("role", "system"),
+                "stream_id": stream_id,
+                "index": index,
+                "delta": "".join(pending)
+            })
+            pending.clear()
+            index += 1
+            last_sent = time.monotonic()
+        
+        content = None
+        try:
+            async for delta in deltas:
+                if not delta:
+                    continue
+                parts.append(delta)
+                pending.append(delta)
+                if last_sent is None or (time.monotonic() - last_sent) * 1000 >= OUTPUT_DELTA_FLUSH_MS:
+                    await send_pending()
+            await send_pending()
+            content = "".join(parts)
+            if not content.strip() and fallback_content is not None:
+                content = fallback_content
+        except Exception as e:
+            if fallback_content is None:
+                raise
+            self.logger.warning(f"⚠️ Output stream failed after {index} deltas: {e}, using fallback content")
+            content = fallback_content
+        
+        return await self.emit("OUTPUT", {**payload, "content": content, "stream_id": stream_id})
 
 # --- The Recipe Data Structures (Unchanged) ---
 @dataclass
@@ -0,0 +1,305 @@
+"""
+Session Event Hub
+
+Push-based fan-out of memory_events rows to SSE subscribers
+(/api/spectacles/eligibility/stream).
+
+Sources:
+- In process: the batched event sink and direct OUTPUT inserts hand written
+  rows (with their ids) to `publish()`.
+- Other workers: `publish()` also sends a NOTIFY on CHANNEL, and every
+  process delivers received events to its own subscribers.
+
+Subscribers resume from an id cursor (SSE Last-Event-ID). A catch-up query
+against memory_events only runs on (re)connect or when a subscriber falls
+behind, never on a timer.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from nexus.core.event_sink import QueuedEvent, event_sink
+from nexus.modules.database import database, parse_jsonb
+
+logger = logging.getLogger("nexus.core.event_hub")
+
+CHANNEL = "nexus_memory_events"
+
+# Buckets streamed to SSE clients - everything else is not published
+STREAM_BUCKETS = ("ELIGIBILITY_PROCESS", "THINKING", "OUTPUT")
+
+# Pushed live but never written to memory_events (no id, no catch-up)
+EPHEMERAL_BUCKETS = ("OUTPUT_DELTA",)
+
+# Per-subscriber buffer; a subscriber that overflows it falls back to catch-up
+MAX_PENDING_PER_SUBSCRIBER = 1000
+
+CATCH_UP_PAGE_SIZE = 500
+
+
+@dataclass
+class StreamEvent:
+    id: Optional[int]  # None for ephemeral events
+    session_id: int
+    bucket: str
+    payload: Any
+    created_at: str  # ISO timestamp
+
+    @classmethod
+    def from_row(cls, row: Any) -> "StreamEvent":
+        row_dict = dict(row)
+        created_at = row_dict.get("created_at")
+        return cls(
+            id=row_dict["id"],
+            session_id=row_dict["session_id"],
+            bucket=row_dict["bucket_type"],
+            payload=parse_jsonb(row_dict["payload"]),
+            created_at=created_at.isoformat() if hasattr(created_at, "isoformat") else str(created_at)
+        )
+
+
+class Subscription:
+    """One SSE connection's view of a session's event stream."""
+
+    def __init__(self, session_id: int, max_pending: int = MAX_PENDING_PER_SUBSCRIBER):
+        self.session_id = session_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        # Set when events were dropped (overflow, listener reconnect): the
+        # consumer must run a catch-up query from its cursor
+        self.lagged = False
+
+    def offer(self, event: StreamEvent) -> None:
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    async def next(self, timeout: float) -> Optional[StreamEvent]:
+        """Next pushed event, or None if nothing arrived within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class SessionEventHub:
+    """
+    Process-wide registry of SSE subscribers keyed by session.
+    """
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._listener = None
+        self._stats = {"published": 0, "delivered": 0, "remote_received": 0, "catch_ups": 0, "lagged": 0}
+
+    def subscribe(self, session_id: int) -> Subscription:
+        subscription = Subscription(session_id)
+        self._subscribers.setdefault(session_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.session_id)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.session_id]
+
+    async def publish(self, events: List[StreamEvent]) -> None:
+        """
+        Delivers written events to local subscribers and to other workers.
+        """
+        events = [e for e in events if e.bucket in STREAM_BUCKETS or e.bucket in EPHEMERAL_BUCKETS]
+        if not events:
+            return
+        self._stats["published"] += len(events)
+        self._deliver(events)
+        try:
+            from nexus.services.database.notify_listener import notify_listener
+            for payload in self._encode(events):
+                await notify_listener.publish(self.channel, payload)
+        except Exception as e:
+            logger.warning(f"Failed to NOTIFY {len(events)} memory events: {e}")
+
+    async def publish_event(self, event_id: int, session_id: int, bucket: str, payload: Any, created_at: Any) -> None:
+        """Convenience wrapper for single-row writers (OUTPUT inserts)."""
+        await self.publish([StreamEvent(
+            id=event_id,
+            session_id=session_id,
+            bucket=bucket,
+            payload=parse_jsonb(payload),
+            created_at=created_at.isoformat() if hasattr(created_at, "isoformat") else str(created_at)
+        )])
+
+    async def publish_ephemeral(self, session_id: int, bucket: str, payload: Any) -> None:
+        """Pushes a live-only event (e.g. OUTPUT_DELTA) that is not in memory_events."""
+        await self.publish([StreamEvent(
+            id=None,
+            session_id=session_id,
+            bucket=bucket,
+            payload=payload,
+            created_at=datetime.now().isoformat()
+        )])
+
+    async def catch_up(self, session_id: int, after_id: int = 0, after_time: Optional[datetime] = None) -> List[StreamEvent]:
+        """
+        Loads streamed events with id > after_id in id order. Used on
+        (re)connect and when a subscriber has lagged. `after_time` supports
+        clients that still resume by timestamp.
+        """
+        self._stats["catch_ups"] += 1
+        events: List[StreamEvent] = []
+        cursor = after_id
+        time_filter = " AND created_at > :after_time" if after_time else ""
+        while True:
+            values = {
+                "session_id": session_id,
+                "buckets": list(STREAM_BUCKETS),
+                "after_id": cursor,
+                "limit": CATCH_UP_PAGE_SIZE
+            }
+            if after_time:
+                values["after_time"] = after_time
+            rows = await database.fetch_all(
+                query=f"""
+                    SELECT id, session_id, bucket_type, payload, created_at
+                    FROM memory_events
+                    WHERE session_id = :session_id
+                    AND bucket_type = ANY(:buckets)
+                    AND id > :after_id{time_filter}
+                    ORDER BY id ASC
+                    LIMIT :limit
+                """,
+                values=values
+            )
+            events.extend(StreamEvent.from_row(r) for r in rows)
+            if len(rows) < CATCH_UP_PAGE_SIZE:
+                return events
+            cursor = events[-1].id
+
+    async def start(self) -> None:
+        """
+        Attaches to the process NOTIFY listener. Called from app startup.
+        """
+        from nexus.services.database.notify_listener import notify_listener
+        if self._listener is None:
+            notify_listener.subscribe(self.channel, self._on_payload)
+            notify_listener.on_reconnect(self._on_reconnect)
+            self._listener = notify_listener
+        await notify_listener.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "sessions": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+        }
+
+    def _deliver(self, events: List[StreamEvent]) -> None:
+        for event in events:
+            for subscription in self._subscribers.get(event.session_id, ()):
+                was_lagged = subscription.lagged
+                subscription.offer(event)
+                if subscription.lagged and not was_lagged:
+                    self._stats["lagged"] += 1
+                self._stats["delivered"] += 1
+
+    def _encode(self, events: List[StreamEvent]) -> List[str]:
+        """
+        Packs events into NOTIFY payloads under the size limit. Events too
+        large to inline are sent as id references and loaded by the receiver.
+        """
+        from nexus.modules.cache_invalidation import PROCESS_ID
+        from nexus.services.database.notify_listener import MAX_PAYLOAD_BYTES
+
+        payloads: List[str] = []
+        chunk: List[Dict[str, Any]] = []
+
+        def flush_chunk():
+            if chunk:
+                payloads.append(json.dumps({"origin": PROCESS_ID, "events": chunk}, default=str))
+                chunk.clear()
+
+        budget = MAX_PAYLOAD_BYTES - 100
+        used = 0
+        for event in events:
+            item = asdict(event)
+            size = len(json.dumps(item, default=str).encode("utf-8"))
+            if size > budget:
+                if event.id is None:
+                    # Ephemeral events can't be loaded by reference; the final OUTPUT follows
+                    continue
+                item = {"id": event.id, "session_id": event.session_id, "bucket": event.bucket, "ref": True}
+                size = len(json.dumps(item).encode("utf-8"))
+            if used + size > budget:
+                flush_chunk()
+                used = 0
+            chunk.append(item)
+            used += size + 1
+        flush_chunk()
+        return payloads
+
+    async def _on_payload(self, payload: str) -> None:
+        from nexus.modules.cache_invalidation import PROCESS_ID
+        try:
+            message = json.loads(payload)
+        except ValueError as e:
+            logger.warning(f"Ignoring malformed memory event payload: {e}")
+            return
+        if message.get("origin") == PROCESS_ID:
+            return
+
+        # Only this worker's subscribed sessions matter
+        items = [i for i in message.get("events", []) if i.get("session_id") in self._subscribers]
+        self._stats["remote_received"] += len(items)
+        if not items:
+            return
+
+        inline = [StreamEvent(**i) for i in items if not i.get("ref")]
+        ref_ids = [i["id"] for i in items if i.get("ref")]
+        if ref_ids:
+            rows = await database.fetch_all(
+                query="""
+                    SELECT id, session_id, bucket_type, payload, created_at
+                    FROM memory_events WHERE id = ANY(:ids)
+                """,
+                values={"ids": ref_ids}
+            )
+            inline.extend(StreamEvent.from_row(r) for r in rows)
+        inline.sort(key=lambda e: e.id)
+        self._deliver(inline)
+
+    async def _on_reconnect(self) -> None:
+        # NOTIFYs sent while disconnected are lost: everyone catches up from their cursor
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.lagged = True
+
+
+event_hub = SessionEventHub()
+
+
+async def _publish_written(batch: List[QueuedEvent]) -> None:
+    await event_hub.publish([
+        StreamEvent(
+            id=e.id,
+            session_id=e.session_id,
+            bucket=e.bucket,
+            payload=parse_jsonb(e.payload),
+            created_at=e.created_at.isoformat()
+        )
+        for e in batch
+        if e.id is not None and e.bucket in STREAM_BUCKETS
+    ])
+
+
+event_sink.on_written(_publish_written)
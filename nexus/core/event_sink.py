@@ -0,0 +1,285 @@
+"""
+Memory Event Sink
+
+Batched writer for the memory_events table (Path B of BaseAgent streaming).
+Events are queued in a bounded in-process queue and written by a single
+background task in batches (by size or time window), so a burst of THINKING
+events costs a handful of round-trips instead of one INSERT and one task each.
+
+Overload policy:
+- THINKING events are dropped when the queue is full (they are transient).
+- All other buckets wait for space (backpressure on the emitting coroutine).
+
+OUTPUT events do not go through the sink: callers need the row id back
+immediately, so BaseAgent keeps a direct INSERT ... RETURNING for them.
+
+Written events (with their ids) are handed to `on_written` callbacks, which
+is how the SSE event hub gets pushed new rows without polling.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from nexus.modules.database import database
+from nexus.modules.metrics import metrics
+
+logger = logging.getLogger("nexus.core.event_sink")
+
+EVENT_SINK_MAX_QUEUE = int(os.getenv("EVENT_SINK_MAX_QUEUE", "5000"))
+EVENT_SINK_BATCH_SIZE = int(os.getenv("EVENT_SINK_BATCH_SIZE", "200"))
+EVENT_SINK_FLUSH_INTERVAL_MS = int(os.getenv("EVENT_SINK_FLUSH_INTERVAL_MS", "50"))
+# Batches at least this large are written with COPY instead of a multi-row INSERT
+EVENT_SINK_COPY_THRESHOLD = int(os.getenv("EVENT_SINK_COPY_THRESHOLD", "50"))
+
+DROPPABLE_BUCKETS = ("THINKING",)
+
+_COLUMNS = ("id", "session_id", "bucket_type", "payload", "created_at")
+
+
+@dataclass
+class QueuedEvent:
+    session_id: int
+    bucket: str
+    payload: str  # Serialized JSON
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    id: Optional[int] = None  # Assigned on write
+
+
+WrittenCallback = Callable[[List[QueuedEvent]], Awaitable[None]]
+
+
+class MemoryEventSink:
+    """
+    Bounded, batching writer for memory_events.
+    The writer task starts lazily on first submit, so scripts and tests that
+    never emit don't pay for it.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = EVENT_SINK_MAX_QUEUE,
+        batch_size: int = EVENT_SINK_BATCH_SIZE,
+        flush_interval_ms: int = EVENT_SINK_FLUSH_INTERVAL_MS,
+        copy_threshold: int = EVENT_SINK_COPY_THRESHOLD
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.copy_threshold = copy_threshold
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+        self._closing = False
+        self._written_callbacks: List[WrittenCallback] = []
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "copy_batches": 0,
+            "max_depth": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    async def submit(self, session_id: int, bucket: str, payload: str) -> bool:
+        """
+        Queues an event for batched persistence.
+        Returns False if the event was dropped under overload.
+        """
+        if self._closing:
+            # Shutdown in progress: write through so nothing is lost
+            await self._write_batch([QueuedEvent(session_id, bucket, payload)])
+            return True
+
+        self._ensure_started()
+        event = QueuedEvent(session_id, bucket, payload)
+        if self._queue.full() and bucket in DROPPABLE_BUCKETS:
+            self._stats["dropped"] += 1
+            if self._stats["dropped"] % 100 == 1:
+                logger.warning(
+                    f"Memory event queue full ({self.max_queue}); dropping {bucket} events "
+                    f"(dropped so far: {self._stats['dropped']})"
+                )
+            return False
+
+        await self._queue.put(event)
+        self._stats["enqueued"] += 1
+        depth = self._queue.qsize()
+        if depth > self._stats["max_depth"]:
+            self._stats["max_depth"] = depth
+        return True
+
+    def on_written(self, callback: WrittenCallback) -> None:
+        """
+        Registers a callback invoked with each successfully written batch
+        (events carry their memory_events ids).
+        """
+        self._written_callbacks.append(callback)
+
+    async def flush(self) -> None:
+        """
+        Waits until everything queued so far has been written.
+        """
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Drains the queue and stops the writer. Called from app shutdown
+        before the database disconnects.
+        """
+        self._closing = True
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Memory event sink drain timed out with {self._queue.qsize()} events pending")
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+        self._queue = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "capacity": self.max_queue,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            # New event loop (tests, reloads): the old queue is bound to a dead loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = None
+            self._loop = loop
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(), name="memory-event-sink")
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            first = await queue.get()
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write_batch(self, batch: List[QueuedEvent]) -> None:
+        started = time.monotonic()
+        try:
+            if len(batch) >= self.copy_threshold and await self._copy_batch(batch):
+                self._stats["copy_batches"] += 1
+            else:
+                await self._insert_batch(batch)
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            await self._notify_written(batch)
+        except Exception as e:
+            if len(batch) > 1 and "violates" in str(e):
+                # A bad row (e.g. session deleted mid-stream) must not sink its neighbours
+                await self._insert_individually(batch)
+            else:
+                # Log but never crash the writer - same contract as the old per-event path
+                self._stats["failed"] += len(batch)
+                logger.error(f"❌ DB Persistence Failed for batch of {len(batch)} memory events: {e}")
+        finally:
+            self._stats["last_flush_ms"] = round((time.monotonic() - started) * 1000, 2)
+
+    async def _insert_batch(self, batch: List[QueuedEvent]) -> None:
+        rows = []
+        values: Dict[str, Any] = {}
+        for i, event in enumerate(batch):
+            rows.append(f"(:sid_{i}, :bucket_{i}, CAST(:payload_{i} AS jsonb), :created_at_{i})")
+            values[f"sid_{i}"] = event.session_id
+            values[f"bucket_{i}"] = event.bucket
+            values[f"payload_{i}"] = event.payload
+            values[f"created_at_{i}"] = event.created_at
+        query = f"""
+            INSERT INTO memory_events (session_id, bucket_type, payload, created_at)
+            VALUES {", ".join(rows)}
+            RETURNING id
+        """
+        result = await database.fetch_all(query=query, values=values)
+        # Serial ids are drawn in VALUES order within one statement
+        for event, event_id in zip(batch, sorted(r["id"] for r in result)):
+            event.id = event_id
+
+    async def _insert_individually(self, batch: List[QueuedEvent]) -> None:
+        for event in batch:
+            try:
+                await self._insert_batch([event])
+                self._stats["written"] += 1
+                await self._notify_written([event])
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.error(f"❌ DB Persistence Failed for {event.bucket}: {e}")
+
+    async def _copy_batch(self, batch: List[QueuedEvent]) -> bool:
+        """
+        Writes a batch with COPY on the raw asyncpg connection.
+        Returns False when COPY isn't available so the caller falls back to INSERT.
+        """
+        try:
+            async with database.connection() as connection:
+                raw = connection.raw_connection
+                if not hasattr(raw, "copy_records_to_table"):
+                    return False
+                # COPY can't return ids, so draw them from the sequence up front
+                id_rows = await raw.fetch(
+                    "SELECT nextval(pg_get_serial_sequence('memory_events', 'id')) AS id "
+                    "FROM generate_series(1, $1)",
+                    len(batch)
+                )
+                ids = sorted(r["id"] for r in id_rows)
+                await raw.copy_records_to_table(
+                    "memory_events",
+                    records=[
+                        (event_id, e.session_id, e.bucket, e.payload, e.created_at)
+                        for event_id, e in zip(ids, batch)
+                    ],
+                    columns=list(_COLUMNS)
+                )
+            for event_id, event in zip(ids, batch):
+                event.id = event_id
+            return True
+        except Exception as e:
+            logger.warning(f"COPY into memory_events failed, falling back to INSERT: {e}")
+            return False
+
+    async def _notify_written(self, batch: List[QueuedEvent]) -> None:
+        for callback in self._written_callbacks:
+            try:
+                await callback(batch)
+            except Exception as e:
+                logger.warning(f"Memory event written-callback failed: {e}")
+
+
+event_sink = MemoryEventSink()
+
+metrics.gauge(
+    "nexus_emit_queue_depth", "Memory events waiting in the batched writer queue"
+).set_function(lambda: event_sink.get_stats()["depth"])
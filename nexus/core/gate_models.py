@@ -4,14 +4,16 @@ Gate Engine Data Models
 Domain-agnostic data structures for the Gate Engine system.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, FrozenInstanceError
 from typing import Dict, List, Optional, Literal, Any, Union
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 import json
-import re
 import logging
 
+from nexus.core.json_parser import scan_json
+
 logger = logging.getLogger("nexus.core.gate_models")
 
 
@@ -129,6 +131,155 @@ class GateConfig:
         )
 
 
+class CompiledGateConfig(GateConfig):
+    """
+    Read-only GateConfig with precomputed gate indexes.
+
+    Built once per (strategy, prompt version) by GateConfigLoader and shared by
+    every session, so it must never be mutated (assignment raises; gates and
+    gate_order are a mapping proxy and a tuple).
+
+    Each gate in gate_order that has a definition gets one bit, in order, so
+    "which gates are missing" for a GateState is an integer mask and the next
+    gate to ask is its lowest set bit.
+    """
+
+    def __init__(
+        self,
+        config: GateConfig,
+        version: Optional[int] = None,
+        static_prompt: Optional[Dict[str, str]] = None
+    ):
+        ordered = tuple(dict.fromkeys(k for k in config.gate_order if k in config.gates))
+        gate_index = {gate_key: i for i, gate_key in enumerate(ordered)}
+        required_mask = 0
+        for gate_key, i in gate_index.items():
+            if config.gates[gate_key].required:
+                required_mask |= 1 << i
+        all_mask = (1 << len(ordered)) - 1
+
+        categories = {}
+        category_lookup = {}
+        limiting_values = {}
+        limiting_lookup = {}
+        for gate_key, gate_def in config.gates.items():
+            categories[gate_key] = frozenset(c for c in gate_def.expected_categories or () if isinstance(c, str))
+            category_lookup[gate_key] = _first_wins_lookup(gate_def.expected_categories)
+            if gate_def.limiting_values:
+                limiting_values[gate_key] = frozenset(v for v in gate_def.limiting_values if isinstance(v, str))
+                limiting_lookup[gate_key] = _first_wins_lookup(gate_def.limiting_values)
+
+        values = dict(
+            path=config.path,
+            output_format=config.output_format,
+            mode=config.mode,
+            llm_role=tuple(config.llm_role),
+            gate_order=tuple(config.gate_order),
+            gates=MappingProxyType(dict(config.gates)),
+            mandatory_logic=tuple(config.mandatory_logic),
+            strict_json_schema=config.strict_json_schema,
+            system_instructions=config.system_instructions,
+            policy=config.policy,
+            confirmation_buttons=config.confirmation_buttons,
+            version=version,
+            ordered_gates=ordered,
+            gate_index=MappingProxyType(gate_index),
+            # Position of each gate_order key (first occurrence), defined or not
+            order_index=MappingProxyType({k: i for i, k in reversed(list(enumerate(config.gate_order)))}),
+            required_mask=required_mask,
+            optional_mask=all_mask & ~required_mask,
+            all_mask=all_mask,
+            questions=MappingProxyType({k: config.gates[k].question.strip() for k in ordered}),
+            categories=MappingProxyType(categories),
+            category_lookup=MappingProxyType(category_lookup),
+            limiting_values=MappingProxyType(limiting_values),
+            limiting_lookup=MappingProxyType(limiting_lookup),
+            static_prompt=MappingProxyType(dict(static_prompt or {})),
+        )
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}' of a compiled gate config")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}' of a compiled gate config")
+
+    @classmethod
+    def of(cls, config: GateConfig) -> 'CompiledGateConfig':
+        """Returns config if already compiled, otherwise compiles it (uncached)."""
+        return config if isinstance(config, cls) else cls(config)
+
+    # --- Masks over a GateState ---
+
+    def classified_mask(self, state: Optional[GateState]) -> int:
+        """Bits of gates that have a classified value."""
+        mask = 0
+        if state:
+            for gate_key, gate_value in state.gates.items():
+                i = self.gate_index.get(gate_key)
+                if i is not None and gate_value is not None and gate_value.classified is not None:
+                    mask |= 1 << i
+        return mask
+
+    def present_mask(self, state: Optional[GateState]) -> int:
+        """Bits of gates that have any value."""
+        mask = 0
+        if state:
+            for gate_key, gate_value in state.gates.items():
+                i = self.gate_index.get(gate_key)
+                if i is not None and gate_value is not None:
+                    mask |= 1 << i
+        return mask
+
+    def missing_required_mask(self, state: Optional[GateState]) -> int:
+        """Required gates without a classified value."""
+        return self.required_mask & ~self.classified_mask(state)
+
+    def missing_mask(self, state: Optional[GateState]) -> int:
+        """Required gates without a classified value plus optional gates without any value."""
+        return self.missing_required_mask(state) | (self.optional_mask & ~self.present_mask(state))
+
+    def bit(self, gate_key: Optional[str]) -> int:
+        i = self.gate_index.get(gate_key)
+        return 0 if i is None else 1 << i
+
+    def first_gate(self, mask: int) -> Optional[str]:
+        """Earliest gate (in gate_order) whose bit is set."""
+        if not mask:
+            return None
+        return self.ordered_gates[(mask & -mask).bit_length() - 1]
+
+    def gates_in(self, mask: int) -> List[str]:
+        """Gate keys whose bits are set, in gate_order."""
+        return [gate_key for i, gate_key in enumerate(self.ordered_gates) if mask >> i & 1]
+
+    # --- Category lookups ---
+
+    def match_category(self, gate_key: str, text: Optional[str]) -> Optional[str]:
+        """Expected category matching text (trimmed, case-insensitive; first listed wins)."""
+        if not text:
+            return None
+        return self.category_lookup.get(gate_key, {}).get(text.strip().lower())
+
+    def match_limiting_value(self, gate_key: str, text: Optional[str]) -> Optional[str]:
+        """Limiting value matching text exactly, else case-insensitively."""
+        if not text:
+            return None
+        if text in self.limiting_values.get(gate_key, ()):
+            return text
+        return self.limiting_lookup.get(gate_key, {}).get(text.strip().lower())
+
+
+def _first_wins_lookup(values: Optional[List[str]]) -> MappingProxyType:
+    """Lower-cased value -> first value with that spelling."""
+    lookup: Dict[str, str] = {}
+    for value in values or ():
+        if isinstance(value, str):
+            lookup.setdefault(value.lower(), value)
+    return MappingProxyType(lookup)
+
+
 @dataclass
 class ConsultantResult:
     """Result from GateEngine execution."""
@@ -224,10 +375,11 @@ class GateJsonParser:
         errors: List[ParseError] = []
         warnings: List[str] = []
         
-        # Step 1: Extract JSON if payload is string
+        # Step 1: Extract JSON if payload is string (thinking tags, code fences,
+        # surrounding text, comments and trailing commas are handled by the scanner)
         if isinstance(payload, str):
-            json_str = self._extract_json_string(payload)
-            if not json_str:
+            scanner = scan_json(payload)
+            if not scanner.text:
                 return ParseResult(
                     ok=False,
                     errors=[ParseError(
@@ -236,7 +388,7 @@ class GateJsonParser:
                     )]
                 )
             try:
-                data = json.loads(json_str)
+                data = scanner.data if scanner.data is not None else json.loads(scanner.text)
             except json.JSONDecodeError as e:
                 return ParseResult(
                     ok=False,
@@ -257,6 +409,7 @@ class GateJsonParser:
             )
         
         # Step 2: Validate structure
+        gate_config = CompiledGateConfig.of(gate_config)
         validation_errors = self._validate(data, gate_config, actor)
         errors.extend(validation_errors)
         
@@ -288,47 +441,10 @@ class GateJsonParser:
             warnings=warnings
         )
     
-    def _extract_json_string(self, text: str) -> Optional[str]:
-        """
-        Extract JSON string from text using multiple strategies.
-        
-        Handles:
-        1. Code fences: Extract JSON from ```json ... ``` or ``` ... ```
-        2. Leading/trailing text: Find JSON object embedded in text
-        3. Multiple JSON objects: Choose first valid JSON object
-        4. Thinking tags: Remove <thinking>...</thinking> tags before extraction
-        """
-        if not text:
-            return None
-        
-        # 1. Remove thinking tags
-        text = re.sub(r"<thinking>.*?</thinking>", "", text, flags=re.DOTALL).strip()
-        
-        # 2. Try markdown code blocks first
-        code_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-        if code_block_match:
-            return code_block_match.group(1).strip()
-        
-        # 3. Try to find JSON object with expected keys
-        json_match = re.search(
-            r'\{[^{}]*(?:"summary"|"gates"|"status")[^{}]*\}',
-            text,
-            re.DOTALL
-        )
-        if json_match:
-            return json_match.group(0)
-        
-        # 4. Fallback: any JSON object
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            return json_match.group(0)
-        
-        return None
-    
     def _validate(
         self,
         data: Dict[str, Any],
-        gate_config: GateConfig,
+        gate_config: CompiledGateConfig,
         actor: Literal["user", "assistant"]
     ) -> List[ParseError]:
         """
@@ -457,7 +573,7 @@ class GateJsonParser:
                             message=f"Classified value must be string or null, got {type(classified_val).__name__}"
                         ))
                     elif classified_val is not None and gate_def.expected_categories:
-                        if classified_val not in gate_def.expected_categories:
+                        if classified_val not in gate_config.categories[gate_key]:
                             if gate_config.policy.strict_classified_validation:
                                 errors.append(ParseError(
                                     code="invalid_category",
@@ -530,7 +646,7 @@ class GateJsonParser:
     def _canonicalize_state(
         self,
         data: Dict[str, Any],
-        gate_config: GateConfig,
+        gate_config: CompiledGateConfig,
         warnings: List[str]
     ) -> GateState:
         """
@@ -553,11 +669,9 @@ class GateJsonParser:
         gates_data = data.get("gates", {})
         
         # Process gates in gate_order to ensure all are present
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def:
-                # Gate key in gate_order but not in gate_config.gates - skip
-                continue
+        # (ordered_gates skips gate_order keys that have no definition)
+        for gate_key in gate_config.ordered_gates:
+            gate_def = gate_config.gates[gate_key]
             
             gate_data = gates_data.get(gate_key, {})
             
@@ -577,7 +691,7 @@ class GateJsonParser:
                 
                 # Validate against expected_categories
                 if classified and gate_def.expected_categories:
-                    if classified not in gate_def.expected_categories:
+                    if classified not in gate_config.categories[gate_key]:
                         # Invalid category - set to None (validation already handled errors if strict)
                         if not gate_config.policy.strict_classified_validation:
                             warnings.append(
@@ -611,7 +725,7 @@ class GateJsonParser:
     def _compute_decision(
         self,
         canonical_state: GateState,
-        gate_config: GateConfig
+        gate_config: CompiledGateConfig
     ) -> GateDecisionResult:
         """
         Compute deterministic PASS/NO PASS decision (system-owned).
@@ -623,21 +737,14 @@ class GateJsonParser:
         - Else → PASS + null next question
         """
         # Find first missing required gate
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def:
-                continue
-            
-            if gate_def.required:
-                gate_value = canonical_state.gates.get(gate_key)
-                if gate_value is None or gate_value.classified is None:
-                    # Found missing required gate
-                    return GateDecisionResult(
-                        pass_=False,
-                        reason="required_missing",
-                        next_gate=gate_key,
-                        next_question=gate_def.question
-                    )
+        gate_key = gate_config.first_gate(gate_config.missing_required_mask(canonical_state))
+        if gate_key:
+            return GateDecisionResult(
+                pass_=False,
+                reason="required_missing",
+                next_gate=gate_key,
+                next_question=gate_config.gates[gate_key].question
+            )
         
         # All required gates have classified values
         return GateDecisionResult(
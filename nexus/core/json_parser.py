@@ -15,12 +15,19 @@ Usage:
     
     # Or use the convenience method
     result = parser.parse_and_query(response_text, ['plan_name', 'steps'])
+    
+    # Streamed responses: feed deltas as they arrive
+    scanner = JsonScanner()
+    for delta in stream:
+        new_fields = scanner.feed(delta)  # top-level fields completed by this delta
+    scanner.finish()
 """
 
 import json
 import re
 import logging
-from typing import Dict, Any, Optional, List, Union, Tuple
+import inspect
+from typing import Dict, Any, Optional, List, Union, Tuple, AsyncIterable, Callable
 from dataclasses import dataclass
 
 logger = logging.getLogger("nexus.core.json_parser")
@@ -36,6 +43,285 @@ except ImportError as e:
     logger.warning(f"⚠️ ssm-jsonrepair not available: {e}. JSON repair will be disabled.")
 
 
+# ============================================================================
+# Tolerant JSON Scanner
+# ============================================================================
+
+_THINK_OPEN = "<thinking>"
+_THINK_CLOSE = "</thinking>"
+# Next "{" or thinking block outside the object
+_OUTSIDE = re.compile(r"\{|<thinking>")
+# Characters that change scanner state inside the object (outside strings)
+_STRUCTURAL = re.compile(r'["{}\[\]/,:]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JsonScanner:
+    """
+    Single-pass, incremental scanner for the JSON object in an LLM response.
+    
+    In one linear pass it skips prose and <thinking> blocks around the object,
+    strips // and /* */ comments, drops trailing commas before } or ], and
+    tracks strings and escapes so braces inside strings don't count. Input can
+    arrive in chunks (feed() per streamed delta); only the few characters that
+    need lookahead (a "/", a partial "<thinking>", a trailing backslash) are
+    held back between chunks. A <thinking> block that is never closed
+    (truncated output) is scanned as ordinary text when the input ends.
+    
+    Top-level fields are exposed in `fields` as soon as their value is
+    complete. The first outermost object that parses as JSON wins; if none
+    does, `text` is the first (or truncated) candidate, for repair.
+    """
+    
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.data: Optional[Dict[str, Any]] = None  # Parsed object, once complete and valid
+        self.text: Optional[str] = None  # Cleaned JSON text of the chosen object
+        self.complete = False
+        self._pending = ""
+        self._mode = "outside"  # outside | thinking | object | string | line_comment | block_comment
+        self._out: List[str] = []
+        self._depth = 0
+        self._trailing_comma: Optional[int] = None  # Index in _out of a comma not yet followed by a value
+        self._member_start = 0
+        self._value_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._first_invalid: Optional[str] = None
+        self._new_fields: Dict[str, Any] = {}
+        # Text seen inside an open <thinking>, rescanned if it is never closed
+        self._thinking: List[str] = []
+    
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """Scans the next chunk. Returns the top-level fields it completed."""
+        if self.complete or not chunk:
+            return {}
+        self._new_fields = {}
+        data = self._pending + chunk
+        self._pending = ""
+        self._scan(data, final=False)
+        return self._new_fields
+    
+    def finish(self) -> Optional[str]:
+        """Ends the input. Returns the cleaned JSON text (None if no object was found)."""
+        if not self.complete:
+            if self._pending:
+                data, self._pending = self._pending, ""
+                self._scan(data, final=True)
+            while self._mode == "thinking" and not self.complete:
+                # Truncated output: an unclosed <thinking> hides nothing, so
+                # scan what followed the tag as ordinary text
+                data, self._thinking = "".join(self._thinking), []
+                self._mode = "outside"
+                self._scan(data, final=True)
+            if not self.complete:
+                truncated = "".join(self._out) if self._mode not in ("outside", "thinking") else None
+                self.text = self._first_invalid or truncated
+        return self.text
+    
+    def _scan(self, data: str, final: bool) -> None:
+        i, n = 0, len(data)
+        out = self._out
+        while i < n and not self.complete:
+            mode = self._mode
+            if mode == "object":
+                m = _STRUCTURAL.search(data, i)
+                j = m.start() if m else n
+                if j > i:
+                    segment = data[i:j]
+                    if self._trailing_comma is not None and not segment.isspace():
+                        self._trailing_comma = None
+                    out.append(segment)
+                if not m:
+                    return
+                ch = data[j]
+                i = j + 1
+                if ch == '"':
+                    self._trailing_comma = None
+                    out.append(ch)
+                    self._mode = "string"
+                elif ch == "{" or ch == "[":
+                    self._trailing_comma = None
+                    self._depth += 1
+                    out.append(ch)
+                elif ch == "}" or ch == "]":
+                    if self._trailing_comma is not None:
+                        out[self._trailing_comma] = ""
+                        self._trailing_comma = None
+                    if self._depth == 1:
+                        self._end_member()
+                    self._depth -= 1
+                    out.append(ch)
+                    if self._depth == 0:
+                        self._close_object()
+                        out = self._out
+                elif ch == ",":
+                    if self._depth == 1:
+                        self._end_member()
+                    self._trailing_comma = len(out)
+                    out.append(ch)
+                    if self._depth == 1:
+                        self._member_start = len(out)
+                elif ch == ":":
+                    if self._depth == 1:
+                        self._key = self._decode_key("".join(out[self._member_start:]))
+                        out.append(ch)
+                        self._value_start = len(out)
+                    else:
+                        out.append(ch)
+                else:  # "/"
+                    if i >= n and not final:
+                        self._pending = "/"
+                        return
+                    nxt = data[i] if i < n else ""
+                    if nxt == "/":
+                        self._mode = "line_comment"
+                        i += 1
+                    elif nxt == "*":
+                        self._mode = "block_comment"
+                        i += 1
+                    else:
+                        self._trailing_comma = None
+                        out.append(ch)
+            elif mode == "string":
+                m = _STRING_SPECIAL.search(data, i)
+                if not m:
+                    out.append(data[i:])
+                    return
+                j = m.start()
+                if data[j] == '"':
+                    out.append(data[i:j + 1])
+                    self._mode = "object"
+                    i = j + 1
+                elif j + 1 < n:
+                    # Escape: keep the backslash and the escaped character
+                    out.append(data[i:j + 2])
+                    i = j + 2
+                else:
+                    out.append(data[i:j])
+                    if final:
+                        out.append("\\")
+                    else:
+                        self._pending = "\\"
+                    return
+            elif mode == "outside":
+                m = _OUTSIDE.search(data, i)
+                if not m:
+                    if not final:
+                        # Hold back a possible partial "<thinking>"
+                        tail = data.rfind("<", max(i, n - len(_THINK_OPEN) + 1))
+                        if tail != -1 and _THINK_OPEN.startswith(data[tail:]):
+                            self._pending = data[tail:]
+                    return
+                i = m.end()
+                if m.group() == "{":
+                    self._open_object()
+                    out = self._out
+                else:
+                    self._mode = "thinking"
+            elif mode == "thinking":
+                j = data.find(_THINK_CLOSE, i)
+                if j == -1:
+                    held = max(i, n - len(_THINK_CLOSE) + 1) if not final else n
+                    self._thinking.append(data[i:held])
+                    self._pending = data[held:]
+                    return
+                self._thinking = []
+                self._mode = "outside"
+                i = j + len(_THINK_CLOSE)
+            elif mode == "line_comment":
+                j = data.find("\n", i)
+                if j == -1:
+                    return
+                # The newline itself is kept as whitespace
+                self._mode = "object"
+                i = j
+            else:  # block_comment
+                j = data.find("*/", i)
+                if j == -1:
+                    if not final and data.endswith("*"):
+                        self._pending = "*"
+                    return
+                self._mode = "object"
+                i = j + 2
+    
+    def _open_object(self) -> None:
+        self._out = ["{"]
+        self._depth = 1
+        self._mode = "object"
+        self._trailing_comma = None
+        self._member_start = 1
+        self._value_start = None
+        self._key = None
+    
+    def _close_object(self) -> None:
+        text = "".join(self._out)
+        try:
+            data = json.loads(text)
+        except (json.JSONDecodeError, RecursionError):
+            data = None
+        if isinstance(data, dict):
+            self.data = data
+            self.text = text
+            self.complete = True
+            return
+        # Not valid JSON (prose braces, or malformed): keep it for repair and
+        # look for another object
+        if self._first_invalid is None:
+            self._first_invalid = text
+        self.fields = {}
+        self._out = []
+        self._mode = "outside"
+    
+    def _end_member(self) -> None:
+        if self._key is not None and self._value_start is not None:
+            try:
+                value = json.loads("".join(self._out[self._value_start:]))
+            except (json.JSONDecodeError, RecursionError):
+                pass
+            else:
+                self.fields[self._key] = value
+                self._new_fields[self._key] = value
+        self._key = None
+        self._value_start = None
+    
+    @staticmethod
+    def _decode_key(text: str) -> Optional[str]:
+        try:
+            key = json.loads(text)
+        except (json.JSONDecodeError, RecursionError):
+            return None
+        return key if isinstance(key, str) else None
+
+
+def scan_json(text: str) -> JsonScanner:
+    """Scans a complete response in one call."""
+    scanner = JsonScanner()
+    scanner.feed(text)
+    scanner.finish()
+    return scanner
+
+
+async def scan_json_stream(
+    deltas: AsyncIterable[str],
+    on_field: Optional[Callable[[str, Any], Any]] = None
+) -> JsonScanner:
+    """
+    Scans a streamed response (e.g. an LLMStream) as it arrives.
+    
+    on_field(key, value) is called (and awaited, if it returns an awaitable)
+    for each top-level field as soon as its value is complete.
+    """
+    scanner = JsonScanner()
+    async for delta in deltas:
+        for key, value in scanner.feed(delta).items():
+            if on_field:
+                result = on_field(key, value)
+                if inspect.isawaitable(result):
+                    await result
+    scanner.finish()
+    return scanner
+
+
 @dataclass
 class ParseResult:
     """Result of JSON parsing operation."""
@@ -84,25 +370,17 @@ class LLMResponseParser:
         if not text:
             return ParseResult(None, False, "Empty input")
         
-        # Step 1: Remove thinking tags
-        cleaned = self._remove_thinking_tags(text)
+        # Step 1: Locate the JSON object, stripping thinking tags, comments
+        # and trailing commas in the same pass
+        scanner = scan_json(text)
+        json_str_cleaned = scanner.text
         
-        # Step 2: Extract JSON
-        json_str = self._extract_json_string(cleaned)
-        
-        if not json_str:
+        if not json_str_cleaned:
             return ParseResult(None, False, "No JSON object found")
         
-        # Step 2.5: Remove JSON comments (simple fallback)
-        # This handles // style comments which are common in LLM responses
-        json_str_cleaned = self._remove_json_comments(json_str)
-        
-        # Step 2.6: Remove trailing commas (common LLM error)
-        json_str_cleaned = self._remove_trailing_commas(json_str_cleaned)
-        
-        # Step 3: Parse JSON, with repair if needed
+        # Step 2: Parse JSON, with repair if needed
         try:
-            data = json.loads(json_str_cleaned)
+            data = scanner.data if scanner.data is not None else json.loads(json_str_cleaned)
         except json.JSONDecodeError as e:
             # Try to repair malformed JSON if jsonrepair is available
             if JSONREPAIR_AVAILABLE:
@@ -129,7 +407,7 @@ class LLMResponseParser:
         except Exception as e:
             return ParseResult(None, False, f"Parse error: {str(e)}")
         
-        # Step 4: Normalize if requested
+        # Step 3: Normalize if requested
         try:
             original_format = self._detect_format(data)
             if normalize and format_hint:
@@ -221,138 +499,6 @@ class LLMResponseParser:
     # Private Helper Methods
     # ============================================================================
     
-    def _remove_thinking_tags(self, text: str) -> str:
-        """Remove <thinking>...</thinking> tags."""
-        return re.sub(r"<thinking>.*?</thinking>", "", text, flags=re.DOTALL).strip()
-    
-    def _remove_json_comments(self, json_str: str) -> str:
-        """
-        Remove // style comments from JSON string.
-        This is a simple fallback for when jsonrepair isn't available or fails.
-        """
-        lines = []
-        in_string = False
-        escape_next = False
-        
-        for line in json_str.split('\n'):
-            cleaned_line = []
-            i = 0
-            while i < len(line):
-                char = line[i]
-                
-                if escape_next:
-                    cleaned_line.append(char)
-                    escape_next = False
-                elif char == '\\':
-                    cleaned_line.append(char)
-                    escape_next = True
-                elif char == '"' and not escape_next:
-                    in_string = not in_string
-                    cleaned_line.append(char)
-                elif char == '/' and i + 1 < len(line) and line[i+1] == '/' and not in_string:
-                    # Found // comment outside string, skip rest of line
-                    break
-                else:
-                    cleaned_line.append(char)
-                i += 1
-            
-            lines.append(''.join(cleaned_line))
-        
-        return '\n'.join(lines)
-    
-    def _remove_trailing_commas(self, json_str: str) -> str:
-        """
-        Remove trailing commas from JSON string.
-        Handles trailing commas in objects and arrays.
-        This is a common LLM error that breaks JSON parsing.
-        """
-        lines = []
-        in_string = False
-        escape_next = False
-        
-        for line in json_str.split('\n'):
-            cleaned_line = []
-            i = 0
-            while i < len(line):
-                char = line[i]
-                
-                if escape_next:
-                    cleaned_line.append(char)
-                    escape_next = False
-                elif char == '\\':
-                    cleaned_line.append(char)
-                    escape_next = True
-                elif char == '"' and not escape_next:
-                    in_string = not in_string
-                    cleaned_line.append(char)
-                elif not in_string:
-                    # Outside string - check for trailing comma patterns
-                    if char == ',':
-                        # Look ahead to see if next non-whitespace is } or ]
-                        j = i + 1
-                        while j < len(line) and line[j] in ' \t':
-                            j += 1
-                        if j < len(line) and line[j] in '}]':
-                            # This is a trailing comma, skip it
-                            i += 1
-                            continue
-                    cleaned_line.append(char)
-                else:
-                    cleaned_line.append(char)
-                i += 1
-            
-            lines.append(''.join(cleaned_line))
-        
-        return '\n'.join(lines)
-    
-    def _extract_json_string(self, text: str) -> Optional[str]:
-        """Extract JSON string from text using multiple strategies."""
-        # Strategy 1: Markdown code blocks
-        code_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-        if code_block_match:
-            json_str = code_block_match.group(1)
-            # Clean up markdown remnants
-            json_str = re.sub(r'^```json\s*', '', json_str)
-            json_str = re.sub(r'^```\s*', '', json_str)
-            json_str = re.sub(r'```\s*$', '', json_str)
-            return json_str.strip()
-        
-        # Strategy 2: Find the outermost JSON object by counting braces
-        # This handles nested objects correctly
-        brace_count = 0
-        start_idx = None
-        
-        for i, char in enumerate(text):
-            if char == '{':
-                if brace_count == 0:
-                    start_idx = i
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0 and start_idx is not None:
-                    # Found complete outermost object
-                    json_str = text[start_idx:i+1]
-                    # Try to validate it's at least structurally sound
-                    try:
-                        # Quick validation - check if it can be parsed
-                        json.loads(json_str)
-                        return json_str
-                    except json.JSONDecodeError:
-                        # If jsonrepair is available, we'll try to repair it later
-                        # For now, return it and let the repair step handle it
-                        if JSONREPAIR_AVAILABLE:
-                            return json_str
-                        # Otherwise, continue searching for a valid JSON object
-                        start_idx = None
-                        continue
-        
-        # Strategy 3: Fallback - try to find any JSON object (less reliable)
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            return json_match.group(0)
-        
-        return None
-    
     def _detect_format(self, data: Dict[str, Any]) -> str:
         """Detect the format of the JSON structure."""
         if "status" in data or "collected" in data:
@@ -8,7 +8,7 @@ Extracted from GateEngine to separate completion validation logic.
 import logging
 from typing import Tuple, List
 
-from nexus.core.gate_models import GateConfig, GateState, GateDecision
+from nexus.core.gate_models import GateConfig, GateState, GateDecision, CompiledGateConfig
 
 logger = logging.getLogger("nexus.engines.gate.completion_checker")
 
@@ -42,20 +42,11 @@ class GateCompletionChecker:
             logger.debug("Completion check: User override detected")
             return (True, GateDecision.PASS_OVERRIDE)
         
-        # Check required gates
-        missing_gates = []
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def or not gate_def.required:
-                continue
-            
-            gate_value = current_state.gates.get(gate_key)
-            # Gate is missing if classified is None
-            if gate_value is None or gate_value.classified is None:
-                missing_gates.append(gate_key)
-        
-        if missing_gates:
-            logger.debug(f"Completion check: Missing required gates: {missing_gates}")
+        # Check required gates (missing if classified is None)
+        compiled = CompiledGateConfig.of(gate_config)
+        missing = compiled.missing_required_mask(current_state)
+        if missing:
+            logger.debug(f"Completion check: Missing required gates: {compiled.gates_in(missing)}")
             return (False, GateDecision.FAIL_REQUIRED_MISSING)
         
         # All required gates have classified values
@@ -77,17 +68,8 @@ class GateCompletionChecker:
         Returns:
             List of gate keys that are missing
         """
-        missing = []
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def or not gate_def.required:
-                continue
-            
-            gate_value = current_state.gates.get(gate_key)
-            if gate_value is None or gate_value.classified is None:
-                missing.append(gate_key)
-        
-        return missing
+        compiled = CompiledGateConfig.of(gate_config)
+        return compiled.gates_in(compiled.missing_required_mask(current_state))
     
     def detect_user_override(self, user_text: str) -> bool:
         """
@@ -8,7 +8,7 @@ Extracted from GateEngine to separate gate selection logic.
 import logging
 from typing import Optional
 
-from nexus.core.gate_models import GateConfig, GateState
+from nexus.core.gate_models import GateConfig, GateState, CompiledGateConfig
 
 logger = logging.getLogger("nexus.engines.gate.gate_selector")
 
@@ -38,44 +38,27 @@ class GateSelector:
         Returns:
             Next gate key to ask, or None if all gates complete
         """
-        # Helper to check if gate is missing
-        def is_gate_missing(gate_key: str) -> bool:
-            gate_value = current_state.gates.get(gate_key)
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def:
-                return False
-            # Gate is missing if required and classified is None
-            if gate_def.required:
-                return gate_value is None or gate_value.classified is None
-            # For optional gates, missing if no value at all
-            return gate_value is None
+        compiled = CompiledGateConfig.of(gate_config)
+        # Required gates missing a classified value, optional gates missing any value
+        missing = compiled.missing_mask(current_state)
         
         # 1. Check LLM recommendation (if provided and valid)
-        if llm_recommendation:
-            if llm_recommendation in gate_config.gate_order:
-                gate_def = gate_config.gates.get(llm_recommendation)
-                if gate_def and is_gate_missing(llm_recommendation):
-                    # LLM recommended a valid missing gate - use it
-                    logger.debug(f"Gate selection: Using LLM recommendation: {llm_recommendation}")
-                    return llm_recommendation
+        if llm_recommendation and missing & compiled.bit(llm_recommendation):
+            # LLM recommended a valid missing gate - use it
+            logger.debug(f"Gate selection: Using LLM recommendation: {llm_recommendation}")
+            return llm_recommendation
         
         # 2. Deterministic: find FIRST missing REQUIRED gate in gate_order
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def:
-                continue
-            if gate_def.required and is_gate_missing(gate_key):
-                logger.debug(f"Gate selection: Found missing required gate: {gate_key}")
-                return gate_key
+        gate_key = compiled.first_gate(missing & compiled.required_mask)
+        if gate_key:
+            logger.debug(f"Gate selection: Found missing required gate: {gate_key}")
+            return gate_key
         
         # 3. If no required gates missing, check optional gates
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def:
-                continue
-            if not gate_def.required and is_gate_missing(gate_key):
-                logger.debug(f"Gate selection: Found missing optional gate: {gate_key}")
-                return gate_key
+        gate_key = compiled.first_gate(missing & compiled.optional_mask)
+        if gate_key:
+            logger.debug(f"Gate selection: Found missing optional gate: {gate_key}")
+            return gate_key
         
         # All gates complete
         logger.debug("Gate selection: All gates complete")
@@ -98,6 +81,8 @@ class GateSelector:
         """
         if not gate_key:
             return None
+        if isinstance(gate_config, CompiledGateConfig):
+            return gate_config.questions.get(gate_key)
         gate_def = gate_config.gates.get(gate_key)
         if not gate_def:
             return None
@@ -9,7 +9,7 @@ import logging
 from typing import Optional
 from datetime import datetime
 
-from nexus.core.gate_models import GateConfig, GateState, GateValue, StatusInfo
+from nexus.core.gate_models import GateConfig, GateState, GateValue, StatusInfo, CompiledGateConfig
 
 logger = logging.getLogger("nexus.engines.gate.state_merger")
 
@@ -67,7 +67,9 @@ class GateStateMerger:
         
         # Update gates that were explicitly answered (have raw values in parsed_state)
         updated_gates = []
-        for gate_key in gate_config.gate_order:
+        order_index = CompiledGateConfig.of(gate_config).order_index
+        answered = sorted((k for k in parsed_state.gates if k in order_index), key=order_index.__getitem__)
+        for gate_key in answered:
             parsed_gate_value = parsed_state.gates.get(gate_key)
             if not parsed_gate_value:
                 continue
@@ -0,0 +1,51 @@
+-- Migration 034: Append-only Session Messages
+-- Purpose: Store shaping session transcripts one row per message so that appending
+-- a turn is a single INSERT instead of rewriting shaping_sessions.transcript.
+-- The legacy transcript column is kept (read-only) for rollback and old readers.
+
+-- 1. Session Messages
+CREATE TABLE IF NOT EXISTS session_messages (
+    id BIGSERIAL PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES shaping_sessions(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT '',
+    extra JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT session_messages_session_seq_key UNIQUE (session_id, seq)
+);
+
+-- Indexes for session_messages
+-- (session_id, seq) is covered by the unique constraint and serves ordered/tail reads
+CREATE INDEX IF NOT EXISTS idx_session_messages_user_created_at
+ON session_messages(created_at DESC) WHERE role = 'user';
+
+-- 2. Backfill existing transcripts (idempotent)
+INSERT INTO session_messages (session_id, seq, role, content, extra, created_at)
+SELECT
+    s.id,
+    m.ord,
+    COALESCE(m.msg->>'role', ''),
+    COALESCE(m.msg->>'content', ''),
+    m.msg - 'role' - 'content',
+    COALESCE(s.created_at, CURRENT_TIMESTAMP)
+FROM shaping_sessions s
+CROSS JOIN LATERAL jsonb_array_elements(s.transcript) WITH ORDINALITY AS m(msg, ord)
+WHERE jsonb_typeof(s.transcript) = 'array'
+  AND jsonb_typeof(m.msg) = 'object'
+ON CONFLICT (session_id, seq) DO NOTHING;
+
+-- 3. Compatibility view with the legacy transcript shape
+CREATE OR REPLACE VIEW shaping_session_transcripts AS
+SELECT
+    s.id AS session_id,
+    COALESCE(
+        (
+            SELECT jsonb_agg(jsonb_build_object('role', sm.role, 'content', sm.content) || sm.extra ORDER BY sm.seq)
+            FROM session_messages sm
+            WHERE sm.session_id = s.id
+        ),
+        s.transcript,
+        '[]'::jsonb
+    ) AS transcript
+FROM shaping_sessions s;
@@ -0,0 +1,5 @@
+-- Migration 035: Memory Events Stream Index
+-- Purpose: Serve SSE catch-up queries (session_id = X AND id > cursor ORDER BY id)
+-- from an index instead of filtering the (session_id, bucket_type) index by created_at.
+
+CREATE INDEX IF NOT EXISTS idx_memory_events_session_id_id ON memory_events(session_id, id);
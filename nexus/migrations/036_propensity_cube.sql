@@ -0,0 +1,39 @@
+-- Migration 036: Eligibility Propensity Cube
+-- Purpose: Materialized propensity counts for every subset of
+-- (payer_id, product_type, contract_status, event_tense, sex, age_bucket),
+-- refreshed incrementally from eligibility_transactions and loaded into memory
+-- by the eligibility scorer (services/eligibility_v2/propensity_cube.py).
+
+-- 1. Cube cells
+-- dims_mask: bit per included dimension (payer_id = 32 ... age_bucket = 1), 0 = global
+-- cell_key: '|'-joined dimension values, unique together with dims_mask
+CREATE TABLE IF NOT EXISTS eligibility_propensity_cube (
+    id BIGSERIAL PRIMARY KEY,
+    dims_mask SMALLINT NOT NULL,
+    cell_key TEXT NOT NULL,
+    payer_id TEXT,
+    product_type TEXT,
+    contract_status TEXT,
+    event_tense TEXT,
+    sex TEXT,
+    age_bucket TEXT,
+    n BIGINT NOT NULL DEFAULT 0,
+    successes BIGINT NOT NULL DEFAULT 0,
+    no_count BIGINT NOT NULL DEFAULT 0,
+    not_established_count BIGINT NOT NULL DEFAULT 0,
+    unknown_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT eligibility_propensity_cube_cell_key UNIQUE (dims_mask, cell_key)
+);
+
+-- 2. Refresh watermark (single row)
+CREATE TABLE IF NOT EXISTS eligibility_propensity_cube_state (
+    id INTEGER PRIMARY KEY DEFAULT 1,
+    last_transaction_id BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP,
+    CONSTRAINT eligibility_propensity_cube_state_single_row CHECK (id = 1)
+);
+
+INSERT INTO eligibility_propensity_cube_state (id, last_transaction_id)
+VALUES (1, 0)
+ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,31 @@
+-- Migration 037: Eligibility batch scoring jobs
+-- Purpose: Track overnight bulk scoring jobs (one row per job) and tag the
+-- score runs they write so an interrupted job can resume where it stopped
+
+CREATE TABLE IF NOT EXISTS eligibility_batch_jobs (
+    id SERIAL PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'PENDING',
+    patient_ids JSONB NOT NULL DEFAULT '[]'::jsonb,
+    total INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    concurrency INTEGER,
+    patients_per_second DOUBLE PRECISION,
+    error TEXT,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_eligibility_batch_jobs_status ON eligibility_batch_jobs(status);
+
+-- Score runs written by a batch job (NULL for interactive turns)
+ALTER TABLE eligibility_score_runs ADD COLUMN IF NOT EXISTS batch_job_id TEXT;
+ALTER TABLE eligibility_score_runs ADD COLUMN IF NOT EXISTS patient_id TEXT;
+
+-- Resume lookup: which patients of a job already have a stored run
+CREATE INDEX IF NOT EXISTS idx_eligibility_score_runs_batch_job
+    ON eligibility_score_runs(batch_job_id, patient_id)
+    WHERE batch_job_id IS NOT NULL;
@@ -0,0 +1,17 @@
+-- Migration 038: Eligibility response cache
+-- Purpose: Persist 270 eligibility responses per (payer, member, DOS window)
+-- so repeat checks within the TTL skip the clearinghouse call across
+-- sessions, workers and restarts (services/eligibility_v2/eligibility_response_cache.py)
+
+CREATE TABLE IF NOT EXISTS eligibility_response_cache (
+    payer TEXT NOT NULL,
+    member_id TEXT NOT NULL,
+    dos_window TEXT NOT NULL,
+    response JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (payer, member_id, dos_window)
+);
+
+-- Expired-row cleanup
+CREATE INDEX IF NOT EXISTS idx_eligibility_response_cache_expires_at ON eligibility_response_cache(expires_at);
@@ -0,0 +1,65 @@
+-- Migration 039: Eligibility Transactions and Risk Rates
+-- Purpose: Create eligibility_transactions (historical 270 outcomes read by the
+-- propensity cube and the risk calculator, which until now fell back to
+-- defaults because the table did not exist) and eligibility_risk_rates, the
+-- per-day risk counts rebuilt by nexus/scripts/refresh_risk_rates.py and
+-- loaded into memory by services/eligibility_v2/risk_rate_table.py.
+
+-- 1. Historical eligibility transactions
+CREATE TABLE IF NOT EXISTS eligibility_transactions (
+    id BIGSERIAL PRIMARY KEY,
+    member_id TEXT,
+    payer_id TEXT,
+    provider_id TEXT,
+    product_type TEXT,
+    contract_status TEXT,
+    event_tense TEXT,
+    sex TEXT,
+    age_bucket TEXT,
+    dos_date DATE,
+    eligibility_status TEXT NOT NULL,
+    days_until_dos INTEGER,
+    days_since_visit INTEGER,
+    lost_coverage_before_dos BOOLEAN,
+    days_to_loss INTEGER,
+    payment_status TEXT,
+    error_type TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Payer / provider error rates
+CREATE INDEX IF NOT EXISTS idx_eligibility_transactions_payer
+ON eligibility_transactions (payer_id);
+
+CREATE INDEX IF NOT EXISTS idx_eligibility_transactions_provider
+ON eligibility_transactions (provider_id)
+WHERE provider_id IS NOT NULL;
+
+-- Coverage loss windows (live fallback and risk rate rebuild)
+CREATE INDEX IF NOT EXISTS idx_eligibility_transactions_future_gap
+ON eligibility_transactions (product_type, days_until_dos)
+WHERE eligibility_status = 'YES' AND event_tense = 'FUTURE';
+
+-- Retrospective denial windows
+CREATE INDEX IF NOT EXISTS idx_eligibility_transactions_past_gap
+ON eligibility_transactions (days_since_visit)
+WHERE eligibility_status = 'YES' AND event_tense = 'PAST';
+
+-- Live propensity fallback filters on these before the cube is built
+CREATE INDEX IF NOT EXISTS idx_eligibility_transactions_dims
+ON eligibility_transactions (payer_id, product_type, event_tense);
+
+-- 2. Risk rate counts
+-- One row per (product_type, event_tense, days_bucket). days_bucket is the
+-- DOS gap in days (days_until_dos for FUTURE, days_since_visit for PAST),
+-- with longer gaps folded into the last bucket. events counts coverage
+-- losses (FUTURE) or denials (PAST). Smoothing is applied at load time.
+CREATE TABLE IF NOT EXISTS eligibility_risk_rates (
+    product_type TEXT NOT NULL,
+    event_tense TEXT NOT NULL,
+    days_bucket INTEGER NOT NULL,
+    n BIGINT NOT NULL DEFAULT 0,
+    events BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (product_type, event_tense, days_bucket)
+);
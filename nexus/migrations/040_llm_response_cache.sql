@@ -0,0 +1,20 @@
+-- Migration 040: LLM Response Cache
+-- Purpose: Persistent level of the exact-match LLM response cache
+-- (modules/llm_response_cache.py), keyed by the canonical prompt hash of
+-- (model, messages, generation_config). Shared by workers, survives restarts.
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    prompt_hash TEXT PRIMARY KEY,
+    module_id TEXT,
+    response JSONB NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Expired-row cleanup and per-module invalidation
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires
+ON llm_response_cache (expires_at);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_module
+ON llm_response_cache (module_id);
@@ -0,0 +1,19 @@
+-- Migration 041: LLM Routing Policies
+-- Purpose: Optional per-module list of equivalent models used by
+-- modules/llm_router.py for hedged requests and failover. The model resolved
+-- by governance stays primary; the policy models follow in position order.
+
+CREATE TABLE IF NOT EXISTS llm_routing_policies (
+    module_id VARCHAR(50) PRIMARY KEY,
+    hedge_enabled BOOLEAN NOT NULL DEFAULT true,
+    -- Lower bound for the hedge delay (the primary's live p95 is used above it)
+    hedge_min_ms INTEGER NOT NULL DEFAULT 2000,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS llm_routing_policy_models (
+    module_id VARCHAR(50) NOT NULL REFERENCES llm_routing_policies(module_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    model_id INT NOT NULL REFERENCES llm_models(id) ON DELETE CASCADE,
+    PRIMARY KEY (module_id, position)
+);
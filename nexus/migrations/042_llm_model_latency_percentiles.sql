@@ -0,0 +1,9 @@
+-- Migration 042: LLM model latency percentiles
+-- Purpose: Catalog sync (LLMService.sync_models) probes each model several
+-- times. Keep p50 / p95 of those samples next to last_latency_ms, which now
+-- holds the p50.
+
+ALTER TABLE llm_models
+ADD COLUMN IF NOT EXISTS latency_p50_ms INTEGER,
+ADD COLUMN IF NOT EXISTS latency_p95_ms INTEGER,
+ADD COLUMN IF NOT EXISTS latency_samples INTEGER;
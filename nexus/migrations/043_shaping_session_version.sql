@@ -0,0 +1,7 @@
+-- Migration 043: Shaping session version
+-- Purpose: Optimistic concurrency for the per-turn session unit of work
+-- (services/shaping/session_unit_of_work.py). Every flush bumps version and
+-- only applies if the version still matches the one loaded at turn start.
+
+ALTER TABLE shaping_sessions
+ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,23 @@
+-- Migration 044: Trace spans
+-- Purpose: Optional persistent store for span tracing (modules/tracing.py).
+-- Written in batches when TRACE_PERSIST=true. The in-process ring buffer is
+-- the primary store, so this table only backs waterfalls for evicted traces.
+
+CREATE TABLE IF NOT EXISTS trace_spans (
+    span_id TEXT PRIMARY KEY,
+    trace_id TEXT NOT NULL,
+    parent_id TEXT,
+    name TEXT NOT NULL,
+    session_key TEXT,
+    started_at TIMESTAMPTZ NOT NULL,
+    duration_ms DOUBLE PRECISION,
+    status TEXT NOT NULL DEFAULT 'ok',
+    attributes JSONB NOT NULL DEFAULT '{}'::jsonb
+);
+
+CREATE INDEX IF NOT EXISTS idx_trace_spans_trace ON trace_spans (trace_id);
+
+-- Recent turns per session (root spans only)
+CREATE INDEX IF NOT EXISTS idx_trace_spans_session_roots
+ON trace_spans (session_key, started_at DESC)
+WHERE parent_id IS NULL;
@@ -0,0 +1,20 @@
+-- Migration 045: Propensity cube lookback
+-- Purpose: Let the incremental cube refresh (services/eligibility_v2/propensity_cube.py)
+-- re-scan a window below its watermark. A transaction whose id was allocated
+-- before a refresh but committed after it is below the new watermark; the
+-- lookback picks it up, and the ids recorded here keep already counted rows
+-- from being counted twice.
+
+-- 1. Transaction ids already counted within the lookback window (pruned each refresh)
+CREATE TABLE IF NOT EXISTS eligibility_propensity_cube_seen (
+    transaction_id BIGINT PRIMARY KEY
+);
+
+-- 2. Lowest id the seen set is complete above. Ids counted before this
+-- migration were never recorded, so the lookback must not reach below it.
+ALTER TABLE eligibility_propensity_cube_state
+ADD COLUMN IF NOT EXISTS tracked_from_id BIGINT NOT NULL DEFAULT 0;
+
+UPDATE eligibility_propensity_cube_state
+SET tracked_from_id = last_transaction_id
+WHERE id = 1;
@@ -0,0 +1,23 @@
+-- Migration 046: LLM catalog sync jobs
+-- Purpose: Shared state for background catalog syncs (modules/llm_service.py),
+-- so any worker can report a job's progress and only one sync runs at a time
+-- across all workers.
+
+CREATE TABLE IF NOT EXISTS llm_sync_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'RUNNING',
+    -- providers, models_synced and probe counts, as reported by sync_models
+    progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+    error TEXT,
+    duration_ms INTEGER,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- At most one RUNNING row: starting a sync is an INSERT that loses on conflict
+CREATE UNIQUE INDEX IF NOT EXISTS idx_llm_sync_jobs_one_running
+    ON llm_sync_jobs ((true))
+    WHERE status = 'RUNNING';
+
+CREATE INDEX IF NOT EXISTS idx_llm_sync_jobs_started ON llm_sync_jobs (started_at DESC);
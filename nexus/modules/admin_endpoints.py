@@ -104,6 +104,104 @@ async def update_secret(
     await config_manager.update_secret(req.provider_id, req.key, req.value, context, req.is_secret)
     return {"status": "updated", "key": req.key}
 
+@router.get("/clients/stats")
+async def get_client_pool_stats():
+    """
+    Returns pooled LLM client stats (cache hits, rebuilds, connections per pool).
+    """
+    from nexus.modules.llm_client_pool import client_registry
+    return client_registry.get_stats()
+
+@router.get("/events/stats")
+async def get_event_sink_stats():
+    """
+    Returns memory event sink stats (queue depth, batches, drops, failures).
+    """
+    from nexus.core.event_sink import event_sink
+    return event_sink.get_stats()
+
+@router.get("/events/stream/stats")
+async def get_event_stream_stats():
+    """
+    Returns SSE event hub stats (subscribers, pushed/delivered events, catch-ups).
+    """
+    from nexus.core.event_hub import event_hub
+    return event_hub.get_stats()
+
+@router.get("/ws/stats")
+async def get_ws_broadcast_stats():
+    """
+    Returns WebSocket broadcast stats (backend, connections, queue depth, slow disconnects).
+    """
+    from nexus.modules.session_manager import session_manager
+    return session_manager.get_stats()
+
+@router.get("/eligibility/cache/stats")
+async def get_eligibility_cache_stats():
+    """
+    Returns 270 eligibility response cache stats (hits, persistent hits, misses, coalesced calls).
+    """
+    from nexus.services.eligibility_v2.eligibility_response_cache import eligibility_response_cache
+    return eligibility_response_cache.get_stats()
+
+@router.delete("/eligibility/cache")
+async def invalidate_eligibility_cache(payer: Optional[str] = None, member_id: Optional[str] = None):
+    """
+    Drops cached 270 responses for a member, a payer, or everything.
+    """
+    from nexus.services.eligibility_v2.eligibility_response_cache import eligibility_response_cache
+    removed = await eligibility_response_cache.invalidate(payer=payer, member_id=member_id)
+    return {"status": "ok", "memory_entries_removed": removed}
+
+@router.get("/patients/cache/stats")
+async def get_patient_record_cache_stats():
+    """
+    Returns patient record cache stats (hits, store hits, generated records, coalesced loads).
+    """
+    from nexus.tools.eligibility.patient_record_cache import patient_record_cache
+    return patient_record_cache.get_stats()
+
+@router.get("/llm/cache/stats")
+async def get_llm_response_cache_stats():
+    """
+    Returns LLM response cache stats (hit rate, tokens saved, coalesced calls, opted-in modules).
+    """
+    from nexus.modules.llm_response_cache import llm_response_cache
+    return llm_response_cache.get_stats()
+
+@router.delete("/llm/cache")
+async def invalidate_llm_response_cache(module_id: Optional[str] = None):
+    """
+    Drops cached LLM responses for a module, or everything.
+    """
+    from nexus.modules.llm_response_cache import llm_response_cache
+    removed = await llm_response_cache.invalidate(module_id=module_id)
+    return {"status": "ok", "memory_entries_removed": removed}
+
+@router.get("/llm/stream/stats")
+async def get_llm_stream_stats():
+    """
+    Returns LLM streaming stats (time to first token and total stream time percentiles, errors).
+    """
+    from nexus.modules.llm_streaming import stream_metrics
+    return stream_metrics.get_stats()
+
+@router.get("/llm/admission/stats")
+async def get_llm_admission_stats():
+    """
+    Returns LLM admission stats per provider/model (in flight, queue depth, queue wait percentiles, retries).
+    """
+    from nexus.modules.llm_admission import llm_admission
+    return llm_admission.get_stats()
+
+@router.get("/llm/router/stats")
+async def get_llm_router_stats():
+    """
+    Returns LLM routing stats (hedges, hedge wins, failovers, circuit breaker states, live latency percentiles).
+    """
+    from nexus.modules.llm_router import llm_router
+    return llm_router.get_stats()
+
 # --- Governance & Catalog ---
 
 @router.get("/catalog")
@@ -117,11 +215,23 @@ async def get_model_catalog():
 @router.post("/catalog/sync")
 async def sync_model_catalog():
     """
-    Forces a sync of available models (seeds defaults).
+    Starts a background sync of available models (seeds defaults, probes latency).
+    Poll /catalog/sync/{job_id} for progress. A sync already running is returned instead.
+    """
+    from nexus.modules.llm_service import llm_service
+    job = await llm_service.start_sync_job()
+    return {"status": "started", "job": job}
+
+@router.get("/catalog/sync/{job_id}")
+async def get_model_sync_job(job_id: str):
+    """
+    Returns a catalog sync job's status (per-provider progress, probe counts, duration).
     """
     from nexus.modules.llm_service import llm_service
-    await llm_service.sync_models()
-    return {"status": "synced"}
+    job = await llm_service.get_sync_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
 
 class SetRuleRequest(BaseModel):
     rule_type: str # 'GLOBAL', 'MODULE', 'USER'
@@ -162,6 +272,42 @@ async def resolve_model(module: str, user_id: str = "user_default"):
     from nexus.modules.llm_governance import llm_governance
     return await llm_governance.resolve_model(module_id=module, user_id=user_id)
 
+class RoutingPolicyRequest(BaseModel):
+    models: List[int] # llm_models.id, in failover order
+    hedge_enabled: bool = True
+    hedge_min_ms: int = 2000
+
+@router.get("/routing/{module_id}")
+async def get_routing_policy(module_id: str):
+    """
+    Returns a module's routing policy (equivalent models for hedging and failover).
+    """
+    from nexus.modules.llm_governance import llm_governance
+    route = await llm_governance.resolve_route(module_id)
+    if not route:
+        raise HTTPException(status_code=404, detail="No routing policy for module")
+    return route
+
+@router.put("/routing/{module_id}")
+async def set_routing_policy(module_id: str, req: RoutingPolicyRequest):
+    """
+    Replaces a module's routing policy.
+    """
+    from nexus.modules.llm_governance import llm_governance
+    if req.hedge_min_ms < 0:
+        raise HTTPException(400, "hedge_min_ms must be >= 0")
+    await llm_governance.set_routing_policy(module_id, req.models, req.hedge_enabled, req.hedge_min_ms)
+    return {"status": "success", "module_id": module_id, "policy": req.model_dump()}
+
+@router.delete("/routing/{module_id}")
+async def delete_routing_policy(module_id: str):
+    """
+    Removes a module's routing policy (back to the single governed model).
+    """
+    from nexus.modules.llm_governance import llm_governance
+    await llm_governance.set_routing_policy(module_id, [])
+    return {"status": "deleted", "module_id": module_id}
+
 # --- Granular Model Control ---
 
 class ToggleModelRequest(BaseModel):
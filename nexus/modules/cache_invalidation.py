@@ -0,0 +1,142 @@
+"""
+Cache Invalidation Bus
+
+Keeps in-memory caches consistent across uvicorn workers and Cloud Run
+instances. Writers publish typed invalidation events on a PostgreSQL NOTIFY
+channel; every process listens and evicts the matching local cache entries.
+
+Usage:
+    # Cache owner (at import time)
+    invalidation_bus.subscribe(InvalidationKind.PROMPT, prompt_cache.evict)
+
+    # Writer (after the DB write succeeds)
+    await invalidation_bus.publish(InvalidationKind.PROMPT, prompt_key)
+"""
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger("nexus.cache_invalidation")
+
+CHANNEL = "nexus_cache_invalidation"
+
+# Unique per process so a worker can skip its own echoes
+PROCESS_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class InvalidationKind:
+    """Event types understood by the bus. `key` semantics per kind:"""
+    PROMPT = "prompt"            # prompt_key
+    PROVIDER = "provider"        # llm_providers.id
+    MODULE_RULE = "module_rule"  # module_id ('all' for global rules)
+    PROPENSITY_CUBE = "propensity_cube"  # key ignored; cube was refreshed
+    RISK_RATES = "risk_rates"    # key ignored; risk rate table was rebuilt
+    ALL = "all"                  # key ignored; flush everything
+
+    KNOWN = (PROMPT, PROVIDER, MODULE_RULE, PROPENSITY_CUBE, RISK_RATES, ALL)
+
+
+@dataclass
+class InvalidationEvent:
+    kind: str
+    key: Optional[str] = None
+    origin: str = PROCESS_ID
+
+    def to_payload(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "InvalidationEvent":
+        data = json.loads(payload)
+        return cls(kind=data["kind"], key=data.get("key"), origin=data.get("origin", ""))
+
+
+# Handlers receive the event key (None means "evict everything of this kind")
+InvalidationHandler = Callable[[Optional[str]], Union[None, Awaitable[None]]]
+
+
+class CacheInvalidationBus:
+    """
+    Typed pub/sub for cache invalidation over LISTEN/NOTIFY.
+    Local handlers always run synchronously with publish() so the writing
+    worker never serves stale data, even if NOTIFY delivery is delayed.
+    """
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._handlers: Dict[str, List[InvalidationHandler]] = {}
+        self._listener = None
+        self._stats = {"published": 0, "received": 0, "applied": 0}
+
+    def subscribe(self, kind: str, handler: InvalidationHandler) -> None:
+        """
+        Registers a local eviction handler for an event kind.
+        """
+        if kind not in InvalidationKind.KNOWN:
+            raise ValueError(f"Unknown invalidation kind: {kind}")
+        self._handlers.setdefault(kind, []).append(handler)
+
+    async def publish(self, kind: str, key: Optional[Union[str, int]] = None) -> None:
+        """
+        Evicts locally, then notifies every other worker.
+        A failed NOTIFY is logged but never fails the caller's write.
+        """
+        event = InvalidationEvent(kind=kind, key=None if key is None else str(key))
+        await self._apply(event)
+        self._stats["published"] += 1
+        try:
+            from nexus.services.database.notify_listener import notify_listener
+            await notify_listener.publish(self.channel, event.to_payload())
+        except Exception as e:
+            logger.warning(f"Failed to publish invalidation {kind}:{key}: {e}")
+
+    async def start(self) -> None:
+        """
+        Attaches to the process NOTIFY listener. Called from app startup.
+        """
+        from nexus.services.database.notify_listener import notify_listener
+        if self._listener is None:
+            notify_listener.subscribe(self.channel, self._on_payload)
+            # Events sent while our LISTEN connection was down are lost
+            notify_listener.on_reconnect(self._on_reconnect)
+            self._listener = notify_listener
+        await notify_listener.start()
+
+    async def _on_payload(self, payload: str) -> None:
+        try:
+            event = InvalidationEvent.from_payload(payload)
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed invalidation payload: {e}")
+            return
+        self._stats["received"] += 1
+        if event.origin == PROCESS_ID:
+            return
+        await self._apply(event)
+
+    async def _on_reconnect(self) -> None:
+        logger.info("Invalidation listener reconnected; flushing local caches")
+        await self._apply(InvalidationEvent(kind=InvalidationKind.ALL))
+
+    async def _apply(self, event: InvalidationEvent) -> None:
+        if event.kind == InvalidationKind.ALL:
+            targets = [(h, None) for handlers in self._handlers.values() for h in handlers]
+        else:
+            targets = [(h, event.key) for h in self._handlers.get(event.kind, [])]
+
+        for handler, key in targets:
+            try:
+                result = handler(key)
+                if result is not None and hasattr(result, "__await__"):
+                    await result
+                self._stats["applied"] += 1
+            except Exception as e:
+                logger.error(f"Invalidation handler failed for {event.kind}:{key}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "listening": bool(self._listener and self._listener.is_listening)}
+
+
+invalidation_bus = CacheInvalidationBus()
@@ -1,16 +1,65 @@
 import logging
-from typing import List, Dict, Any
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from nexus.modules.database import database
 from nexus.modules.crypto import encrypt
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
 
 logger = logging.getLogger("nexus.config")
 
+CONFIG_CACHE_TTL_SECONDS = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", "300"))
+
 class ConfigManager:
     """
     Manages System Configuration, specifically AI Providers.
     Handles encryption of secrets before writing to DB.
+    
+    Resolved app contexts and decrypted provider configs are cached in-process
+    with a TTL, and dropped whenever a provider, secret or governance rule changes.
     """
     
+    def __init__(self, cache_ttl: float = CONFIG_CACHE_TTL_SECONDS):
+        self.cache_ttl = cache_ttl
+        # (module_id, user_id, override_model) -> (expires_at, context)
+        self._context_cache: Dict[Tuple[str, str, Optional[str]], Tuple[float, Dict]] = {}
+        # provider_name -> (expires_at, provider config incl. decrypted secrets)
+        self._provider_cache: Dict[str, Tuple[float, Optional[Dict]]] = {}
+        # Bumped on every invalidation so in-flight loads don't re-cache stale data
+        self._generation = 0
+    
+    # --- Cache ---
+    
+    def invalidate_cache(self, reason: str = "") -> None:
+        """
+        Drops every cached context and provider config.
+        """
+        self._generation += 1
+        self._context_cache.clear()
+        self._provider_cache.clear()
+        logger.debug(f"Config cache invalidated ({reason or 'manual'})")
+    
+    def _cache_get(self, cache: Dict, key: Any) -> Tuple[bool, Any]:
+        entry = cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            cache.pop(key, None)
+            return False, None
+        return True, value
+    
+    def _cache_set(self, cache: Dict, key: Any, value: Any, generation: int) -> None:
+        if generation != self._generation or self.cache_ttl <= 0:
+            return
+        cache[key] = (time.monotonic() + self.cache_ttl, value)
+    
+    @staticmethod
+    def _copy_config(config: Optional[Dict]) -> Optional[Dict]:
+        if config is None:
+            return None
+        return {**config, "secrets": dict(config.get("secrets") or {})}
+    
     async def list_providers(self) -> List[Dict[str, Any]]:
         query = """
         SELECT id, name, provider_type, base_url, is_active, created_at 
@@ -45,6 +94,7 @@ class ConfigManager:
                 resource_id=str(pid),
                 details={"name": name, "type": provider_type}
             )
+            await invalidation_bus.publish(InvalidationKind.PROVIDER, pid)
             return pid
             
         except Exception as e:
@@ -77,6 +127,8 @@ class ConfigManager:
             VALUES (:pid, :key, :val, :sec)
             """
             await database.execute(query, {"pid": provider_id, "key": key, "val": final_val, "sec": is_secret})
+        
+        await invalidation_bus.publish(InvalidationKind.PROVIDER, provider_id)
             
         await audit_manager.log_event(
             user_id=user_context.get("user_id", "unknown"),
@@ -107,6 +159,7 @@ class ConfigManager:
             "pid": provider_id, 
             "uid": user_context.get("user_id", "unknown")
         })
+        await invalidation_bus.publish(InvalidationKind.PROVIDER, provider_id)
         
         await audit_manager.log_event(
             user_id=user_context.get("user_id", "unknown"),
@@ -116,46 +169,110 @@ class ConfigManager:
             resource_id=str(provider_id)
         )
 
+    async def get_provider_config(self, provider_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetches provider details + decrypted secrets by provider name.
+        Cached in-process; returns a copy so callers can't mutate the cache.
+        """
+        hit, config = self._cache_get(self._provider_cache, provider_name)
+        if hit:
+            return self._copy_config(config)
+        
+        generation = self._generation
+        from nexus.modules.crypto import decrypt
+        
+        query = "SELECT id, name, provider_type, base_url, is_active FROM llm_providers WHERE name = :name"
+        provider_row = await database.fetch_one(query, {"name": provider_name})
+        
+        config = None
+        if provider_row:
+            provider = dict(provider_row)
+            
+            # Fetch & decrypt configs
+            config_query = "SELECT config_key, encrypted_value, is_secret FROM llm_config WHERE provider_id = :pid"
+            rows = await database.fetch_all(config_query, {"pid": provider["id"]})
+            
+            secrets = {}
+            for row in rows:
+                val = row["encrypted_value"]
+                if row["is_secret"]:
+                    val = decrypt(val)
+                secrets[row["config_key"]] = val
+            
+            config = {
+                "id": provider["id"],
+                "name": provider["name"],
+                "provider_type": provider["provider_type"],
+                "base_url": provider["base_url"],
+                "is_active": provider["is_active"],
+                "secrets": secrets
+            }
+        
+        self._cache_set(self._provider_cache, provider_name, config, generation)
+        return self._copy_config(config)
+
+    async def _enrich_with_provider(self, model_context: Dict) -> None:
+        provider_name = model_context.get("provider_name")
+        if not provider_name:
+            return
+        provider = await self.get_provider_config(provider_name)
+        
+        if provider and provider["is_active"]:
+            secrets = provider["secrets"]
+            
+            model_context.update({
+                "api_key": secrets.get("api_key"),
+                "project_id": secrets.get("project_id"),
+                "location": secrets.get("location", "us-central1"),
+                "base_url": provider.get("base_url"),
+                "provider_type": provider.get("provider_type")
+            })
+
     async def resolve_app_context(self, module_id: str, user_id: str, override_model: str = None) -> Dict:
         """
         Centralizes the logic for "Which model should be used?".
         Delegates to LLMGovernance but acts as the single point of contact for the App.
         Automatically enriches the context with provider secrets (api_key, project_id, location, base_url).
+        Warm (module, user, override) lookups are served from memory without touching the DB.
         """
+        cache_key = (module_id, user_id, override_model)
+        hit, cached = self._cache_get(self._context_cache, cache_key)
+        if hit:
+            return dict(cached)
+        
+        generation = self._generation
         from nexus.modules.llm_governance import llm_governance
         model_context = await llm_governance.resolve_model(module_id, user_id, override_model)
         
         # Automatically enrich with provider secrets
-        provider_name = model_context.get("provider_name")
-        if provider_name:
-            from nexus.modules.crypto import decrypt
-            
-            query = "SELECT id, provider_type, base_url FROM llm_providers WHERE name = :name AND is_active = true"
-            provider_row = await database.fetch_one(query, {"name": provider_name})
-            
-            if provider_row:
-                provider = dict(provider_row)  # Convert row to dict for .get() method
-                
-                # Fetch & decrypt configs
-                config_query = "SELECT config_key, encrypted_value, is_secret FROM llm_config WHERE provider_id = :pid"
-                rows = await database.fetch_all(config_query, {"pid": provider["id"]})
-                
-                secrets = {}
-                for row in rows:
-                    val = row["encrypted_value"]
-                    if row["is_secret"]:
-                        val = decrypt(val)
-                    secrets[row["config_key"]] = val
-                
-                # Enrich model_context
-                model_context.update({
-                    "api_key": secrets.get("api_key"),
-                    "project_id": secrets.get("project_id"),
-                    "location": secrets.get("location", "us-central1"),
-                    "base_url": provider.get("base_url"),
-                    "provider_type": provider.get("provider_type")
-                })
+        await self._enrich_with_provider(model_context)
+        
+        # Optional routing policy: equivalent models for hedging and failover.
+        # Runtime overrides pin the model, so they never fail over.
+        if not override_model:
+            route = await llm_governance.resolve_route(module_id)
+            if route:
+                primary = (model_context.get("provider_name"), model_context.get("model_id"))
+                fallbacks = []
+                for candidate in route["models"]:
+                    if (candidate["provider_name"], candidate["model_id"]) == primary:
+                        model_context["last_latency_ms"] = candidate["last_latency_ms"]
+                        continue
+                    candidate = dict(candidate, module_id=module_id)
+                    await self._enrich_with_provider(candidate)
+                    fallbacks.append(candidate)
+                model_context["fallbacks"] = fallbacks
+                model_context["hedge"] = route["hedge"]
         
+        # Lets LLMService.generate_text apply per-module policy (response cache)
+        model_context["module_id"] = module_id
+        
+        self._cache_set(self._context_cache, cache_key, dict(model_context), generation)
         return model_context
         
 config_manager = ConfigManager()
+
+# Contexts embed provider secrets and governance choices, so any provider or
+# rule change (from this worker or another) flushes the whole cache.
+invalidation_bus.subscribe(InvalidationKind.PROVIDER, lambda key: config_manager.invalidate_cache(f"provider:{key}"))
+invalidation_bus.subscribe(InvalidationKind.MODULE_RULE, lambda key: config_manager.invalidate_cache(f"module_rule:{key}"))
@@ -17,7 +17,7 @@ from nexus.modules.database import database
 from nexus.core.gate_models import GateState, GateValue, StatusInfo, GateConfig
 from nexus.core.gate_models import GateJsonParser
 from nexus.brains.gate_engine import GateEngine
-from nexus.modules.prompt_manager import prompt_manager
+from nexus.services.gate.config_loader import GateConfigLoader
 
 logger = logging.getLogger("nexus.gates")
 
@@ -125,6 +125,7 @@ async def _save_gate_state(session_id: int, gate_state: GateState) -> None:
     query = """
         UPDATE shaping_sessions
         SET gate_state = :gate_state::jsonb,
+            version = version + 1,
             updated_at = CURRENT_TIMESTAMP
         WHERE id = :session_id
     """
@@ -157,26 +158,8 @@ async def _load_gate_config(session_id: int) -> Optional[GateConfig]:
     
     strategy = row.get("consultant_strategy") or "TABULA_RASA"
     
-    # Load prompt config
-    # Uses new prompt key structure: workflow:eligibility:{strategy}:gate
-    prompt_data = await prompt_manager.get_prompt(
-        module_name="workflow",
-        domain="eligibility",  # Hardcoded for now
-        mode=strategy,          # Strategy becomes mode
-        step="gate"            # From gate agent
-    )
-    
-    if not prompt_data:
-        return None
-    
-    config = prompt_data.get("config", {})
-    
-    # Check if this is a gate-based prompt (has GATE_ORDER)
-    if "GATE_ORDER" not in config:
-        return None
-    
-    # Convert to GateConfig
-    return GateConfig.from_prompt_config(config)
+    # Compiled config for workflow:eligibility:{strategy}:gate (cached per prompt version)
+    return await GateConfigLoader().load(strategy)
 
 
 # --- API Endpoints ---
@@ -223,7 +206,7 @@ async def get_gate_state(session_id: int):
         gate_config_dict = None
         if gate_config:
             gate_config_dict = {
-                "gate_order": gate_config.gate_order,
+                "gate_order": list(gate_config.gate_order),
                 "gates": {
                     gate_key: {
                         "question": gate_def.question,
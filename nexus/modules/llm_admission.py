@@ -0,0 +1,412 @@
+"""
+LLM Admission Control
+
+Every provider call made by LLMGateway and LLMService is admitted through
+llm_admission, keyed by (provider, model):
+
+- At most max_in_flight concurrent requests per key.
+- Request-per-minute and token-per-minute token buckets. Token reservations
+  are estimates (prompt chars / 4). After the call the bucket is charged the
+  actual total_tokens, so an overrun delays later requests instead of being
+  lost.
+- A priority queue: interactive work (chat, gate extraction) is admitted
+  before default work, and background work (planner updates, diary) last.
+  Within a priority, requests are FIFO.
+- Retry with exponential backoff and full jitter on retryable errors (429,
+  5xx, timeouts, connection resets). The slot is released while backing off.
+
+Limits come from LLM_MAX_IN_FLIGHT / LLM_RPM / LLM_TPM (0 = unlimited). They
+can be overridden per provider or per provider/model with LLM_ADMISSION_LIMITS,
+e.g. {"vertex-prod": {"max_in_flight": 4, "rpm": 60}, "vertex-prod/gemini-2.5-pro": {"tpm": 200000}}
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from nexus.modules.metrics import LLM_CALL_SECONDS, LLM_TOKENS
+from nexus.modules.metrics_utils import percentile
+
+logger = logging.getLogger("nexus.llm_admission")
+
+T = TypeVar("T")
+
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+LLM_RETRY_ATTEMPTS = int(os.getenv("LLM_RETRY_ATTEMPTS", "3"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+
+# Recent queue-wait samples kept per key for percentiles
+QUEUE_WAIT_SAMPLES = 500
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {
+    # google.api_core
+    "ResourceExhausted", "ServiceUnavailable", "TooManyRequests", "InternalServerError",
+    "DeadlineExceeded", "Aborted", "GatewayTimeout",
+    # openai
+    "RateLimitError", "APITimeoutError", "APIConnectionError",
+}
+
+
+class LLMPriority(IntEnum):
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+def _module_set(env_name: str, default: str) -> set:
+    return {m.strip() for m in os.getenv(env_name, default).split(",") if m.strip()}
+
+
+LLM_INTERACTIVE_MODULES = _module_set("LLM_INTERACTIVE_MODULES", "chat,conversational,eligibility_v2,workflow")
+LLM_BACKGROUND_MODULES = _module_set("LLM_BACKGROUND_MODULES", "diary")
+
+_current_priority: ContextVar[Optional[LLMPriority]] = ContextVar("llm_priority", default=None)
+
+
+def priority_for(module_id: Optional[str]) -> LLMPriority:
+    """Priority set with with_llm_priority, else by module, else NORMAL."""
+    priority = _current_priority.get()
+    if priority is not None:
+        return priority
+    if module_id in LLM_BACKGROUND_MODULES:
+        return LLMPriority.BACKGROUND
+    if module_id in LLM_INTERACTIVE_MODULES:
+        return LLMPriority.INTERACTIVE
+    return LLMPriority.NORMAL
+
+
+async def with_llm_priority(priority: LLMPriority, awaitable: Awaitable[T]) -> T:
+    """
+    Runs awaitable with every LLM call it makes admitted at priority, e.g.
+    asyncio.create_task(with_llm_priority(LLMPriority.BACKGROUND, update()))
+    """
+    token = _current_priority.set(priority)
+    try:
+        return await awaitable
+    finally:
+        _current_priority.reset(token)
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__):
+        return True
+    response = getattr(error, "response", None)
+    for status in (getattr(error, "status_code", None), getattr(error, "code", None), getattr(response, "status_code", None)):
+        if isinstance(status, int) and status in RETRYABLE_STATUS:
+            return True
+    return False
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+    cap = min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * (2 ** (attempt - 1)))
+    delay = random.uniform(0, cap)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, LLM_RETRY_MAX_SECONDS))
+    return delay
+
+
+@dataclass
+class AdmissionLimits:
+    max_in_flight: int = LLM_MAX_IN_FLIGHT
+    rpm: float = LLM_RPM
+    tpm: float = LLM_TPM
+
+
+class TokenBucket:
+    """
+    Refills at per_minute / 60 per second up to one minute of budget. The
+    level may go negative when actual usage exceeds the reservation.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (requests larger than capacity wait for a full bucket)."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: float = 0
+    enqueued_at: float = 0.0
+    future: Optional[asyncio.Future] = None
+
+
+class AdmissionQueue:
+    """Admission state for one (provider, model)."""
+
+    def __init__(self, key: str, limits: AdmissionLimits, clock: Callable[[], float] = time.monotonic):
+        self.key = key
+        self.limits = limits
+        self._clock = clock
+        self.in_flight = 0
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._requests = TokenBucket(limits.rpm, clock) if limits.rpm > 0 else None
+        self._tokens = TokenBucket(limits.tpm, clock) if limits.tpm > 0 else None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._wait_ms: Deque[float] = deque(maxlen=QUEUE_WAIT_SAMPLES)
+        self._stats = {"admitted": 0, "queued": 0, "retries": 0, "retries_exhausted": 0, "failures": 0}
+
+    def _admission_delay(self, tokens: float) -> float:
+        if 0 < self.limits.max_in_flight <= self.in_flight:
+            return math.inf
+        delay = 0.0
+        if self._requests:
+            delay = max(delay, self._requests.wait_time(1))
+        if self._tokens and tokens:
+            delay = max(delay, self._tokens.wait_time(tokens))
+        return delay
+
+    def _admit(self, tokens: float) -> None:
+        self.in_flight += 1
+        self._stats["admitted"] += 1
+        if self._requests:
+            self._requests.take(1)
+        if self._tokens and tokens:
+            self._tokens.take(tokens)
+
+    async def acquire(self, priority: LLMPriority, tokens: float = 0) -> float:
+        """Waits for a slot. Returns the queue wait in ms."""
+        if not self._heap and self._admission_delay(tokens) == 0:
+            self._admit(tokens)
+            self._wait_ms.append(0.0)
+            return 0.0
+
+        waiter = _Waiter(
+            int(priority), next(self._seq), tokens, self._clock(),
+            asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._heap, waiter)
+        self._stats["queued"] += 1
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller was cancelled: hand the slot back
+                self.release(tokens)
+            else:
+                self._dispatch()
+            raise
+        wait_ms = (self._clock() - waiter.enqueued_at) * 1000
+        self._wait_ms.append(wait_ms)
+        return wait_ms
+
+    def release(self, reserved_tokens: float = 0, actual_tokens: Optional[float] = None) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        if self._tokens and actual_tokens is not None:
+            self._tokens.take(actual_tokens - reserved_tokens)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._heap:
+            waiter = self._heap[0]
+            if waiter.future.done():
+                # Cancelled while queued
+                heapq.heappop(self._heap)
+                continue
+            delay = self._admission_delay(waiter.tokens)
+            if delay > 0:
+                if delay != math.inf:
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._heap)
+            self._admit(waiter.tokens)
+            waiter.future.set_result(None)
+
+    def record(self, stat: str) -> None:
+        self._stats[stat] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "in_flight": self.in_flight,
+            "queue_depth": sum(1 for w in self._heap if not w.future.done()),
+            "limits": asdict(self.limits),
+            "queue_wait_ms": {
+                "p50": percentile(self._wait_ms, 0.5),
+                "p95": percentile(self._wait_ms, 0.95),
+                "max": round(max(self._wait_ms), 1) if self._wait_ms else None
+            }
+        }
+
+
+class LLMAdmissionController:
+    """Per (provider, model) admission queues plus retry policy."""
+
+    def __init__(
+        self,
+        default_limits: Optional[AdmissionLimits] = None,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_attempts: int = LLM_RETRY_ATTEMPTS
+    ):
+        self.default_limits = default_limits or AdmissionLimits()
+        self.overrides = overrides if overrides is not None else self._overrides_from_env()
+        self.max_attempts = max(1, max_attempts)
+        self._queues: Dict[str, AdmissionQueue] = {}
+
+    @staticmethod
+    def _overrides_from_env() -> Dict[str, Dict[str, Any]]:
+        raw = os.getenv("LLM_ADMISSION_LIMITS")
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid LLM_ADMISSION_LIMITS: {e}")
+            return {}
+
+    def limits_for(self, provider: Optional[str], model: Optional[str]) -> AdmissionLimits:
+        limits = asdict(self.default_limits)
+        limits.update(self.overrides.get(provider or "", {}))
+        limits.update(self.overrides.get(f"{provider}/{model}", {}))
+        return AdmissionLimits(**limits)
+
+    def queue(self, provider: Optional[str], model: Optional[str]) -> AdmissionQueue:
+        key = f"{provider or 'default'}/{model or 'default'}"
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = AdmissionQueue(key, self.limits_for(provider, model))
+            self._queues[key] = queue
+        return queue
+
+    async def run(
+        self,
+        provider: Optional[str],
+        model: Optional[str],
+        call: Callable[[], Awaitable[T]],
+        module_id: Optional[str] = None,
+        tokens_estimate: int = 0,
+        usage: Optional[Callable[[T], Optional[int]]] = None
+    ) -> T:
+        """
+        Admits and runs call(), retrying retryable failures with backoff.
+        usage(result) returns the actual total tokens to charge, if known.
+        """
+        queue = self.queue(provider, model)
+        priority = priority_for(module_id)
+        for attempt in range(1, self.max_attempts + 1):
+            await queue.acquire(priority, tokens_estimate)
+            actual = None
+            outcome = "error"
+            started = time.perf_counter()
+            try:
+                result = await call()
+                outcome = "ok"
+                actual = usage(result) if usage else None
+                return result
+            except Exception as e:
+                if not is_retryable(e):
+                    queue.record("failures")
+                    raise
+                if attempt >= self.max_attempts:
+                    queue.record("retries_exhausted")
+                    raise
+                delay = backoff_delay(attempt, _retry_after_seconds(e))
+                queue.record("retries")
+                logger.warning(
+                    f"LLM call to {queue.key} failed ({type(e).__name__}: {e}), "
+                    f"retry {attempt}/{self.max_attempts - 1} in {delay:.2f}s"
+                )
+            finally:
+                queue.release(tokens_estimate, actual)
+                _record_call(provider, model, outcome, started, actual)
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: Optional[str],
+        model: Optional[str],
+        module_id: Optional[str] = None,
+        tokens_estimate: int = 0
+    ):
+        """
+        Holds one admission slot for the body (streams, which can't be retried
+        once deltas were sent). Set usage["total_tokens"] to charge actual usage.
+        """
+        queue = self.queue(provider, model)
+        await queue.acquire(priority_for(module_id), tokens_estimate)
+        usage: Dict[str, Any] = {}
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            yield usage
+            outcome = "ok"
+        except Exception:
+            queue.record("failures")
+            raise
+        finally:
+            queue.release(tokens_estimate, usage.get("total_tokens"))
+            _record_call(provider, model, outcome, started, usage.get("total_tokens"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {key: queue.get_stats() for key, queue in self._queues.items()}
+
+
+def _record_call(provider: Optional[str], model: Optional[str], outcome: str,
+                 started: float, total_tokens: Optional[float]) -> None:
+    provider, model = provider or "default", model or "default"
+    LLM_CALL_SECONDS.labels(provider, model, outcome).observe(time.perf_counter() - started)
+    if total_tokens:
+        LLM_TOKENS.labels(provider, model).inc(total_tokens)
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough reservation (1 token ≈ 4 chars)."""
+    return sum(len(t) for t in texts if t) // 4
+
+
+llm_admission = LLMAdmissionController()
@@ -0,0 +1,324 @@
+"""
+LLM Client Pool
+
+Keeps long-lived provider clients so LLM calls reuse connections instead of
+building a new client (and a new TLS handshake) per request.
+
+- OpenAI-compatible providers share one httpx connection pool per
+  (provider, base_url, credential fingerprint).
+- Vertex AI models are cached per (project, location, model) and
+  vertexai.init() only runs when the target project/location changes.
+
+Clients are rebuilt only when the credentials stored in llm_config change.
+A replaced pool is closed LLM_POOL_RETIRE_GRACE_SECONDS later (default: the
+request timeout), once any request still using it has finished or timed out.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger("nexus.llm_client_pool")
+
+ClientKey = Tuple[str, str, str, str]  # (provider, base_url, fingerprint, model)
+PoolKey = Tuple[str, str, str]         # (provider, base_url, fingerprint)
+
+
+def credential_fingerprint(*parts: Optional[str]) -> str:
+    """
+    Returns a short, non-reversible fingerprint of the given credential parts.
+    Used as a cache key so raw secrets never end up in keys, logs or stats.
+    """
+    digest = hashlib.sha256("\x1f".join(p or "" for p in parts).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ProviderClientRegistry:
+    """
+    Registry of pooled provider clients keyed by
+    (provider, base_url, credential fingerprint, model).
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+        retire_grace: Optional[float] = None
+    ):
+        self.max_connections = max_connections or int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = max_keepalive_connections or int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+        self.timeout = timeout or float(os.getenv("LLM_POOL_TIMEOUT", "120"))
+        self.retire_grace = retire_grace if retire_grace is not None else float(
+            os.getenv("LLM_POOL_RETIRE_GRACE_SECONDS", str(self.timeout))
+        )
+
+        self._http_pools: Dict[PoolKey, httpx.AsyncClient] = {}
+        self._pool_loops: Dict[PoolKey, Any] = {}
+        self._pool_requests: Dict[PoolKey, int] = {}
+        self._clients: Dict[ClientKey, Any] = {}
+        # (provider, base_url) -> fingerprint of the credentials currently in use
+        self._active_fingerprints: Dict[Tuple[str, str], str] = {}
+        # Pools replaced after a credential or loop change, waiting to be closed
+        self._retired_pools: list = []
+        self._close_tasks: set = set()
+
+        self._vertex_initialized: Optional[Tuple[str, str]] = None
+
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "rebuilds": 0,
+            "vertex_inits": 0
+        }
+
+    # ------------------------------------------------------------------
+    # OpenAI-compatible providers
+    # ------------------------------------------------------------------
+
+    def get_openai_client(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        model_id: Optional[str] = None
+    ):
+        """
+        Returns a cached AsyncOpenAI client backed by a shared httpx pool.
+        """
+        from openai import AsyncOpenAI
+
+        base = base_url or ""
+        fingerprint = credential_fingerprint(api_key)
+        self._check_credentials(provider, base, fingerprint)
+
+        pool_key = (provider, base, fingerprint)
+        key = (provider, base, fingerprint, model_id or "")
+
+        loop = self._current_loop()
+        if pool_key in self._http_pools and self._pool_loops.get(pool_key) is not loop:
+            # httpx connections are bound to the event loop that opened them
+            self._evict_pool(pool_key)
+
+        client = self._clients.get(key)
+        if client is not None:
+            self._stats["hits"] += 1
+            return client
+
+        self._stats["misses"] += 1
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._get_http_pool(pool_key, loop)
+        )
+        self._clients[key] = client
+        return client
+
+    def _get_http_pool(self, pool_key: PoolKey, loop: Any) -> httpx.AsyncClient:
+        pool = self._http_pools.get(pool_key)
+        if pool is not None:
+            return pool
+
+        async def _count_request(request: httpx.Request) -> None:
+            self._pool_requests[pool_key] = self._pool_requests.get(pool_key, 0) + 1
+
+        pool = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=10.0),
+            event_hooks={"request": [_count_request]}
+        )
+        self._http_pools[pool_key] = pool
+        self._pool_loops[pool_key] = loop
+        logger.debug(f"Created HTTP pool for provider={pool_key[0]} base_url={pool_key[1] or 'default'}")
+        return pool
+
+    # ------------------------------------------------------------------
+    # Vertex AI
+    # ------------------------------------------------------------------
+
+    def get_vertex_model(
+        self,
+        provider: str,
+        project_id: str,
+        location: str,
+        model_id: str
+    ):
+        """
+        Returns a cached Vertex GenerativeModel. The model keeps its own
+        prediction client, so reusing it reuses the underlying gRPC channel.
+        """
+        import vertexai
+        from vertexai.generative_models import GenerativeModel
+
+        fingerprint = credential_fingerprint(project_id, location)
+        self._check_credentials(provider, location, fingerprint)
+
+        key = (provider, location, fingerprint, model_id)
+        model = self._clients.get(key)
+        if model is not None:
+            self._stats["hits"] += 1
+            return model
+
+        self._stats["misses"] += 1
+        if self._vertex_initialized != (project_id, location):
+            vertexai.init(project=project_id, location=location)
+            self._vertex_initialized = (project_id, location)
+            self._stats["vertex_inits"] += 1
+
+        model = GenerativeModel(model_id)
+        self._clients[key] = model
+        return model
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def _check_credentials(self, provider: str, base: str, fingerprint: str) -> None:
+        """
+        Drops every client for (provider, base) when its credentials change.
+        """
+        scope = (provider, base)
+        current = self._active_fingerprints.get(scope)
+        if current == fingerprint:
+            return
+        if current is not None:
+            logger.info(f"Credentials changed for provider={provider}; rebuilding clients")
+            self._stats["rebuilds"] += 1
+            self._drop_scope(provider, base)
+        self._active_fingerprints[scope] = fingerprint
+
+    def _drop_scope(self, provider: str, base: str) -> None:
+        for key in [k for k in self._clients if k[0] == provider and k[1] == base]:
+            del self._clients[key]
+        for pool_key in [k for k in self._http_pools if k[0] == provider and k[1] == base]:
+            self._retire_pool(pool_key)
+
+    def _evict_pool(self, pool_key: PoolKey) -> None:
+        for key in [k for k in self._clients if k[:3] == pool_key]:
+            del self._clients[key]
+        self._retire_pool(pool_key)
+
+    def _retire_pool(self, pool_key: PoolKey) -> None:
+        pool = self._http_pools.pop(pool_key, None)
+        loop = self._pool_loops.pop(pool_key, None)
+        self._pool_requests.pop(pool_key, None)
+        if pool is None:
+            return
+        if loop is None or loop is not self._current_loop():
+            # Its connections belong to a loop that is gone (or not ours to
+            # schedule on); nothing can use them again, so just let it go
+            logger.debug(f"Dropped HTTP pool for provider={pool_key[0]} from another event loop")
+            return
+        # In-flight requests may still hold the old pool; close it after the grace period
+        self._retired_pools.append(pool)
+        task = loop.create_task(self._close_retired(pool))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+
+    async def _close_retired(self, pool: httpx.AsyncClient) -> None:
+        await asyncio.sleep(self.retire_grace)
+        if pool in self._retired_pools:
+            self._retired_pools.remove(pool)
+        try:
+            await pool.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing retired HTTP pool: {e}")
+
+    def invalidate(self, provider: Optional[str] = None) -> None:
+        """
+        Drops cached clients for one provider (or all providers).
+        """
+        scopes = [s for s in self._active_fingerprints if provider is None or s[0] == provider]
+        for scope in scopes:
+            self._drop_scope(*scope)
+            del self._active_fingerprints[scope]
+        if provider is None:
+            self._vertex_initialized = None
+
+    async def close(self) -> None:
+        """
+        Closes every HTTP pool. Called on application shutdown.
+        """
+        pools = list(self._http_pools.values()) + self._retired_pools
+        self._http_pools.clear()
+        self._pool_loops.clear()
+        self._pool_requests.clear()
+        self._clients.clear()
+        self._active_fingerprints.clear()
+        self._retired_pools = []
+        self._vertex_initialized = None
+        for task in list(self._close_tasks):
+            task.cancel()
+        self._close_tasks.clear()
+        for pool in pools:
+            try:
+                await pool.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing HTTP pool: {e}")
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns registry counters and per-pool connection usage.
+        A pool whose request count grows while its connection count stays
+        flat is reusing connections.
+        """
+        pools = []
+        for pool_key, pool in self._http_pools.items():
+            connections = self._pool_connections(pool)
+            pools.append({
+                "provider": pool_key[0],
+                "base_url": pool_key[1] or None,
+                "fingerprint": pool_key[2],
+                "requests": self._pool_requests.get(pool_key, 0),
+                "connections": len(connections),
+                "idle_connections": sum(1 for c in connections if self._is_idle(c))
+            })
+
+        return {
+            **self._stats,
+            "clients": len(self._clients),
+            "retired_pools": len(self._retired_pools),
+            "limits": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry
+            },
+            "pools": pools
+        }
+
+    @staticmethod
+    def _pool_connections(pool: httpx.AsyncClient) -> list:
+        # httpcore internals; degrade to an empty list if the layout changes
+        transport = getattr(pool, "_transport", None)
+        connection_pool = getattr(transport, "_pool", None)
+        return list(getattr(connection_pool, "connections", []) or [])
+
+    @staticmethod
+    def _is_idle(connection: Any) -> bool:
+        try:
+            return connection.is_idle()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _current_loop():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+
+client_registry = ProviderClientRegistry()
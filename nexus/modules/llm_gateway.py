@@ -3,11 +3,17 @@ import json
 from typing import Dict, Any, Optional
 from nexus.modules.database import database
 from nexus.modules.crypto import decrypt
+from nexus.modules.llm_client_pool import client_registry
+from nexus.modules.llm_admission import llm_admission, estimate_tokens
+from nexus.modules.llm_response_cache import llm_response_cache, prompt_hash
+from nexus.modules.llm_router import llm_router
+from nexus.modules.llm_streaming import LLMStream, estimate_usage
+from nexus.modules.tracing import tracer
 # Providers
 from openai import AsyncOpenAI
 # Vertex AI
 import vertexai
-from vertexai.preview.generative_models import GenerativeModel, Part
+from vertexai.preview.generative_models import Part
 
 logger = logging.getLogger("nexus.gateway")
 
@@ -52,34 +58,194 @@ class LLMGateway:
         # Override if legacy provider_name was passed (e.g. testing)
         if provider_name:
             target_provider = provider_name
+        
+        # Equivalent models from the module's routing policy (explicit provider pins the call)
+        candidates = [{**resolution, "provider_name": target_provider}]
+        if not provider_name:
+            candidates += resolution.get("fallbacks") or []
             
-        # 2. Get Config
-        config = await self._get_provider_config(target_provider)
+        # 2. Exact-match response cache (opt-in per module), keyed by the primary model
+        key = prompt_hash(f"{target_provider}/{target_model}", messages)
+        
+        async def call_provider() -> Dict[str, Any]:
+            # 3. Hedged / failed over across candidates when a policy exists
+            response, _ = await llm_router.run(
+                candidates,
+                lambda candidate: self._complete_on(
+                    candidate["provider_name"], candidate["model_id"], messages, module_id
+                ),
+                hedge=resolution.get("hedge")
+            )
+            return response
+        
+        with tracer.span("llm.chat_completion", module_id=module_id, model=target_model) as span:
+            response, cached = await llm_response_cache.get_or_compute(
+                module_id, key, call_provider, tokens=self._total_tokens
+            )
+            if span:
+                span.set(cached=cached, provider=response.get("provider"), model=response.get("model") or target_model)
+        response["prompt_hash"] = key
+        response["cached"] = cached
+        return response
+
+    async def _complete_on(self, provider_name: str, model_id: str, messages: list, module_id: str) -> Dict[str, Any]:
+        config = await self._get_provider_config(provider_name)
         if not config:
-            raise ValueError(f"Provider '{target_provider}' not configured or active.")
+            raise ValueError(f"Provider '{provider_name}' not configured or active.")
         
-        # 3. Route
+        # Route (admitted per provider/model, retried on 429/5xx)
         provider_type = config["provider_type"]
         
         if provider_type == "vertex":
-            return await self._call_vertex(config, target_model, messages)
+            call = lambda: self._call_vertex(config, model_id, messages)
         elif provider_type == "openai_compatible":
-            return await self._call_openai_compatible(config, target_model, messages)
+            call = lambda: self._call_openai_compatible(config, model_id, messages)
         else:
             raise ValueError(f"Unsupported provider type: {provider_type}")
+        
+        with tracer.span("llm.call", provider=provider_name, model=model_id) as span:
+            response = await llm_admission.run(
+                provider_name,
+                model_id,
+                call,
+                module_id=module_id,
+                tokens_estimate=estimate_tokens(json.dumps(messages)),
+                usage=self._total_tokens
+            )
+            if span:
+                span.set(total_tokens=self._total_tokens(response))
+            return response
+
+    @staticmethod
+    def _total_tokens(response: Dict[str, Any]) -> int:
+        raw = response.get("raw")
+        if isinstance(raw, dict):
+            return (raw.get("usage") or {}).get("total_tokens") or 0
+        return 0
+
+    async def stream_chat_completion(
+        self,
+        messages: list,
+        provider_name: str = None,
+        model_id: str = None,
+        module_id: str = "chat",
+        user_id: str = "user_default"
+    ) -> LLMStream:
+        """
+        Streaming variant of chat_completion: iterate the returned LLMStream for
+        text deltas; stream.text holds the full reply afterwards. Model
+        resolution, response caching and prompt_hash match chat_completion.
+        """
+        from nexus.modules.config_manager import config_manager
+        
+        resolution = await config_manager.resolve_app_context(
+            module_id=module_id,
+            user_id=user_id,
+            override_model=model_id
+        )
+        target_model = resolution["model_id"]
+        target_provider = provider_name or resolution["provider_name"]
+        key = prompt_hash(f"{target_provider}/{target_model}", messages)
+        candidates = [{**resolution, "provider_name": target_provider}]
+        if not provider_name:
+            candidates += resolution.get("fallbacks") or []
+        
+        async def deltas(stream: LLMStream):
+            cached = await llm_response_cache.lookup(module_id, key)
+            if cached is not None:
+                stream.cached = True
+                yield cached.get("content") or ""
+                return
+            
+            # Streams can't be hedged: pick one candidate by breaker state
+            candidate = llm_router.pick(candidates)
+            stream.provider = candidate["provider_name"]
+            stream.model = candidate["model_id"]
+            parts = []
+            # Not made current: the consumer's code runs between our yields
+            span = tracer.start("llm.stream", module_id=module_id, provider=stream.provider, model=stream.model)
+            try:
+                config = await self._get_provider_config(stream.provider)
+                if not config:
+                    raise ValueError(f"Provider '{stream.provider}' not configured or active.")
+                
+                provider_type = config["provider_type"]
+                if provider_type == "vertex":
+                    source = self._stream_vertex(config, stream.model, messages)
+                elif provider_type == "openai_compatible":
+                    source = self._stream_openai_compatible(config, stream.model, messages)
+                else:
+                    raise ValueError(f"Unsupported provider type: {provider_type}")
+                
+                async with llm_admission.slot(
+                    stream.provider, stream.model, module_id, estimate_tokens(json.dumps(messages))
+                ) as admitted:
+                    async for delta in source:
+                        parts.append(delta)
+                        yield delta
+                    
+                    content = "".join(parts)
+                    usage = estimate_usage(json.dumps(messages), content)
+                    admitted["total_tokens"] = usage["total_tokens"]
+            except Exception as e:
+                llm_router.record(candidate, e)
+                tracer.end(span, e)
+                raise
+            except BaseException as e:
+                # Consumer went away mid-stream: no verdict on the provider
+                llm_router.breaker(candidate["provider_name"]).release()
+                tracer.end(span, e)
+                raise
+            llm_router.record(candidate)
+            if span:
+                span.set(total_tokens=usage["total_tokens"])
+            tracer.end(span)
+            stream.metadata.update(usage)
+            await llm_response_cache.store(
+                module_id,
+                key,
+                {"content": content, "raw": None, "provider": stream.provider, "model": stream.model},
+                usage["total_tokens"]
+            )
+        
+        return LLMStream(deltas, provider=target_provider, model=target_model, prompt_hash=key)
+
+    async def _stream_vertex(self, config: Dict, model_id: str, messages: list):
+        model, full_prompt, _ = self._prepare_vertex(config, model_id, messages)
+        response = await model.generate_content_async(full_prompt, stream=True)
+        async for chunk in response:
+            try:
+                yield chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. final safety/usage chunk)
+                continue
+
+    async def _stream_openai_compatible(self, config: Dict, model_id: str, messages: list):
+        api_key = config["secrets"].get("api_key", "missing-key")
+        target_model = model_id or "gpt-3.5-turbo"
+        client = client_registry.get_openai_client(config["name"], api_key, config.get("base_url"), target_model)
+        
+        response = await client.chat.completions.create(
+            model=target_model,
+            messages=messages,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
     async def _get_provider_config(self, provider_name: Optional[str]) -> Dict[str, Any]:
         """
         Fetches provider details + decrypted secrets.
         """
-        # 1. Select Provider
+        # 1. Select Provider (named lookups are served from the ConfigManager cache)
         if provider_name:
-            query = "SELECT id, name, provider_type, base_url FROM llm_providers WHERE name = :name"
-            provider = await database.fetch_one(query, {"name": provider_name})
-        else:
-            # Default: Pick the first active one (Logic can be improved)
-            query = "SELECT id, name, provider_type, base_url FROM llm_providers WHERE is_active = true LIMIT 1"
-            provider = await database.fetch_one(query)
+            from nexus.modules.config_manager import config_manager
+            return await config_manager.get_provider_config(provider_name)
+        
+        # Default: Pick the first active one (Logic can be improved)
+        query = "SELECT id, name, provider_type, base_url FROM llm_providers WHERE is_active = true LIMIT 1"
+        provider = await database.fetch_one(query)
             
         if not provider:
             return None
@@ -103,9 +269,9 @@ class LLMGateway:
             "secrets": secrets
         }
 
-    async def _call_vertex(self, config: Dict, model_id: str, messages: list) -> Dict:
+    def _prepare_vertex(self, config: Dict, model_id: str, messages: list):
         """
-        Native Vertex AI Implementation.
+        Native Vertex AI request setup: pooled model and the flattened prompt.
         Requires 'project_id' and 'location' in config.
         """
         secrets = config["secrets"]
@@ -115,10 +281,6 @@ class LLMGateway:
         if not project_id:
             raise ValueError("Vertex AI requires 'project_id' in configuration.")
 
-        # Initialize Vertex AI SDK
-        # Note: In a real high-throughput app, we might cache this init
-        vertexai.init(project=project_id, location=location)
-        
         # Default Model
         target_model = model_id or "gemini-2.5-flash"
         
@@ -140,8 +302,8 @@ class LLMGateway:
         if not user_content:
             raise ValueError("No user message found in messages")
         
-        # Create model
-        model = GenerativeModel(target_model)
+        # Reuse pooled model (vertexai.init only runs when project/location change)
+        model = client_registry.get_vertex_model(config["name"], project_id, location, target_model)
         
         # For Vertex AI, prepend system_instruction to prompt if provided
         # (This matches the approach used in llm_service.py for consistency)
@@ -149,6 +311,14 @@ class LLMGateway:
         if system_instruction:
             full_prompt = f"{system_instruction}\n\n{user_content}"
         
+        return model, full_prompt, target_model
+
+    async def _call_vertex(self, config: Dict, model_id: str, messages: list) -> Dict:
+        """
+        Native Vertex AI Implementation.
+        """
+        model, full_prompt, target_model = self._prepare_vertex(config, model_id, messages)
+        
         # Generate
         response = await model.generate_content_async(full_prompt)
         
@@ -166,10 +336,10 @@ class LLMGateway:
         api_key = config["secrets"].get("api_key", "missing-key")
         base_url = config.get("base_url") # Optional override
         
-        client = AsyncOpenAI(api_key=api_key, base_url=base_url)
-        
         target_model = model_id or "gpt-3.5-turbo"
         
+        client = client_registry.get_openai_client(config["name"], api_key, base_url, target_model)
+        
         response = await client.chat.completions.create(
             model=target_model,
             messages=messages
@@ -1,5 +1,6 @@
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 from nexus.modules.database import database
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
 import logging
 
 logger = logging.getLogger("nexus.governance")
@@ -115,6 +116,8 @@ class LLMGovernance:
         else:
             query = "INSERT INTO llm_system_rules (rule_type, module_id, model_id) VALUES (:rt, :mid, :pid)"
             await database.execute(query, {"rt": rule_type, "mid": module_id, "pid": model_pk})
+        
+        await invalidation_bus.publish(InvalidationKind.MODULE_RULE, module_id)
 
     async def set_user_preference(self, user_id: str, module_id: str, model_pk: int):
         """
@@ -128,6 +131,65 @@ class LLMGovernance:
             await database.execute(query, {"pid": model_pk, "id": existing["id"]})
         else:
             await database.execute(query, {"uid": user_id, "mid": module_id, "pid": model_pk})
+        
+        await invalidation_bus.publish(InvalidationKind.MODULE_RULE, module_id)
+
+    async def resolve_route(self, module_id: str) -> Optional[Dict]:
+        """
+        Returns the module's routing policy (equivalent models for hedging and
+        failover), or None if the module has none:
+        { "models": [{model_id, provider_name, last_latency_ms}, ...], "hedge": {enabled, min_ms} }
+        """
+        query = """
+            SELECT m.model_id, p.name as provider_name, m.last_latency_ms,
+                   pol.hedge_enabled, pol.hedge_min_ms
+            FROM llm_routing_policies pol
+            JOIN llm_routing_policy_models pm ON pm.module_id = pol.module_id
+            JOIN llm_models m ON pm.model_id = m.id
+            JOIN llm_providers p ON m.provider_id = p.id
+            WHERE pol.module_id = :mid AND m.is_active = true AND p.is_active = true
+            ORDER BY pm.position
+        """
+        try:
+            rows = await database.fetch_all(query, {"mid": module_id})
+        except Exception as e:
+            logger.debug(f"No routing policy for {module_id}: {e}")
+            return None
+        if not rows:
+            return None
+        return {
+            "models": [
+                {"model_id": r["model_id"], "provider_name": r["provider_name"], "last_latency_ms": r["last_latency_ms"]}
+                for r in rows
+            ],
+            "hedge": {"enabled": rows[0]["hedge_enabled"], "min_ms": rows[0]["hedge_min_ms"]}
+        }
+
+    async def set_routing_policy(self, module_id: str, model_pks: List[int], hedge_enabled: bool = True, hedge_min_ms: int = 2000):
+        """
+        Replaces a module's routing policy. An empty model list removes it.
+        """
+        async with database.transaction():
+            await database.execute(
+                "DELETE FROM llm_routing_policies WHERE module_id = :mid", {"mid": module_id}
+            )
+            if model_pks:
+                await database.execute(
+                    """
+                    INSERT INTO llm_routing_policies (module_id, hedge_enabled, hedge_min_ms)
+                    VALUES (:mid, :hedge, :min_ms)
+                    """,
+                    {"mid": module_id, "hedge": hedge_enabled, "min_ms": hedge_min_ms}
+                )
+                await database.execute_many(
+                    """
+                    INSERT INTO llm_routing_policy_models (module_id, position, model_id)
+                    VALUES (:mid, :pos, :pid)
+                    """,
+                    [{"mid": module_id, "pos": i, "pid": pk} for i, pk in enumerate(model_pks)]
+                )
+        
+        await invalidation_bus.publish(InvalidationKind.MODULE_RULE, module_id)
 
     async def get_all_rules(self) -> Dict[str, Dict]:
         """
@@ -0,0 +1,240 @@
+"""
+LLM Response Cache
+
+Exact-match cache for LLM completions, in front of LLMGateway.chat_completion
+and LLMService.generate_text. Retries, replayed UI events and recomputed plans
+send byte-identical prompts; those are answered without a provider call.
+
+- Key: prompt_hash(model, messages, generation_config), a SHA-256 over
+  canonical JSON (sorted keys), so dict ordering never changes the key. The
+  same hash is what eligibility_llm_calls.prompt_hash records.
+- Opt-in per module_id (LLM_RESPONSE_CACHE_MODULES, comma-separated, '*' for
+  all). Modules not listed call the provider as before.
+- Memory (TTL + LRU) first, then Postgres (llm_response_cache, migration 040)
+  so entries survive restarts and are shared by workers.
+- Single-flight: identical concurrent requests share one provider call.
+- Only successful responses are cached.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.ttl_cache import TTLCache, hit_rate
+
+logger = logging.getLogger("nexus.llm_response_cache")
+
+LLM_RESPONSE_CACHE_MODULES = {
+    m.strip() for m in os.getenv("LLM_RESPONSE_CACHE_MODULES", "").split(",") if m.strip()
+}
+LLM_RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+LLM_RESPONSE_CACHE_PERSIST = os.getenv("LLM_RESPONSE_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")
+
+
+def prompt_hash(model: Optional[str], messages: List[Dict[str, Any]], generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """Canonical SHA-256 of everything that determines a completion."""
+    canonical = json.dumps(
+        {"model": model or "", "messages": messages, "generation_config": generation_config or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """TTL + LRU cache of LLM responses keyed by prompt hash, with optional Postgres backing."""
+
+    def __init__(
+        self,
+        modules: Optional[set] = None,
+        ttl_seconds: int = LLM_RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_RESPONSE_CACHE_MAX_ENTRIES,
+        persist: bool = LLM_RESPONSE_CACHE_PERSIST
+    ):
+        self.modules = set(LLM_RESPONSE_CACHE_MODULES if modules is None else modules)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist = persist
+        # hash -> (response, tokens)
+        self._memory = TTLCache(ttl_seconds, max_entries)
+        self._stats = {
+            "hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "tokens_saved": 0,
+            "uncacheable": 0,
+            "persist_errors": 0
+        }
+
+    def enabled_for(self, module_id: Optional[str]) -> bool:
+        return "*" in self.modules or (module_id is not None and module_id in self.modules)
+
+    async def get_or_compute(
+        self,
+        module_id: Optional[str],
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        tokens: Callable[[Any], int] = lambda response: 0,
+        cacheable: Callable[[Any], bool] = lambda response: True
+    ) -> Tuple[Any, bool]:
+        """
+        Returns (response, from_cache). For modules that did not opt in this is
+        just compute(). tokens(response) is counted as saved on every hit;
+        responses failing cacheable(response) are returned but not stored.
+        """
+        if not self.enabled_for(module_id):
+            return await compute(), False
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            response, token_count = cached
+            self._stats["hits"] += 1
+            self._stats["tokens_saved"] += token_count
+            return response, True
+
+        (response, token_count, from_cache), coalesced = await self._memory.load_once(
+            key, lambda: self._load(module_id, key, compute, tokens, cacheable)
+        )
+        if coalesced:
+            self._stats["tokens_saved"] += token_count
+            return response, True
+        return response, from_cache
+
+    async def lookup(self, module_id: Optional[str], key: str) -> Optional[Any]:
+        """
+        Cached response or None, without computing. For streaming callers,
+        which produce the response incrementally and store() it at the end.
+        """
+        if not self.enabled_for(module_id):
+            return None
+        cached = self._memory.get(key)
+        if cached is None and self.persist:
+            stored = await self._get_persistent(key)
+            if stored is not None:
+                self._stats["persistent_hits"] += 1
+                self._stats["tokens_saved"] += stored[1]
+                return stored[0]
+        if cached is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        self._stats["tokens_saved"] += cached[1]
+        return cached[0]
+
+    async def store(self, module_id: Optional[str], key: str, response: Any, token_count: int = 0) -> None:
+        """Caches a response computed outside get_or_compute (no-op unless the module opted in)."""
+        if not self.enabled_for(module_id):
+            return
+        expires_at = time.time() + self.ttl_seconds
+        self._memory.put(key, (response, token_count), expires_at)
+        if self.persist:
+            await self._put_persistent(module_id, key, expires_at, response, token_count)
+
+    async def _load(self, module_id, key, compute, tokens, cacheable) -> Tuple[Any, int, bool]:
+        if self.persist:
+            stored = await self._get_persistent(key)
+            if stored is not None:
+                response, token_count = stored
+                self._stats["persistent_hits"] += 1
+                self._stats["tokens_saved"] += token_count
+                return response, token_count, True
+
+        self._stats["misses"] += 1
+        response = await compute()
+        if not cacheable(response):
+            self._stats["uncacheable"] += 1
+            return response, 0, False
+
+        token_count = int(tokens(response) or 0)
+        await self.store(module_id, key, response, token_count)
+        return response, token_count, False
+
+    async def _get_persistent(self, key: str) -> Optional[Tuple[Any, int]]:
+        try:
+            row = await database.fetch_one(
+                query="""
+                    SELECT response, tokens, expires_at FROM llm_response_cache
+                    WHERE prompt_hash = :prompt_hash AND expires_at > CURRENT_TIMESTAMP
+                """,
+                values={"prompt_hash": key}
+            )
+        except Exception as e:
+            self._stats["persist_errors"] += 1
+            logger.debug(f"LLM response cache lookup failed, calling provider: {e}")
+            return None
+        if not row:
+            return None
+        response = parse_jsonb(row["response"])
+        token_count = row["tokens"] or 0
+        expires_at = row["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        self._memory.put(key, (response, token_count), expires_at.timestamp())
+        return response, token_count
+
+    async def _put_persistent(self, module_id: Optional[str], key: str, expires_at: float, response: Any, token_count: int) -> None:
+        try:
+            await database.execute(
+                query="""
+                    INSERT INTO llm_response_cache (prompt_hash, module_id, response, tokens, created_at, expires_at)
+                    VALUES (:prompt_hash, :module_id, CAST(:response AS jsonb), :tokens, CURRENT_TIMESTAMP,
+                            to_timestamp(:expires_at))
+                    ON CONFLICT (prompt_hash) DO UPDATE SET
+                        response = EXCLUDED.response,
+                        tokens = EXCLUDED.tokens,
+                        created_at = EXCLUDED.created_at,
+                        expires_at = EXCLUDED.expires_at
+                """,
+                values={
+                    "prompt_hash": key,
+                    "module_id": module_id,
+                    "response": json.dumps(response, default=str),
+                    "tokens": token_count,
+                    "expires_at": expires_at
+                }
+            )
+        except Exception as e:
+            self._stats["persist_errors"] += 1
+            logger.warning(f"Failed to persist LLM response {key[:12]}: {e}")
+
+    async def invalidate(self, module_id: Optional[str] = None) -> int:
+        """
+        Drops everything (module_id None) or the persisted entries of one module.
+        Memory entries are not tagged by module, so they are always cleared.
+        Returns the number of memory entries removed.
+        """
+        removed = self._memory.invalidate()
+        if self.persist:
+            try:
+                if module_id is None:
+                    await database.execute(query="DELETE FROM llm_response_cache")
+                else:
+                    await database.execute(
+                        query="DELETE FROM llm_response_cache WHERE module_id = :module_id",
+                        values={"module_id": module_id}
+                    )
+            except Exception as e:
+                self._stats["persist_errors"] += 1
+                logger.warning(f"Failed to invalidate persisted LLM responses: {e}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["persistent_hits"] + self._stats["misses"]
+        hits = self._stats["hits"] + self._stats["persistent_hits"]
+        return {
+            **self._stats,
+            **self._memory.get_stats(),
+            "hit_rate": hit_rate(hits, lookups),
+            "modules": sorted(self.modules),
+            "persist": self.persist
+        }
+
+
+llm_response_cache = LLMResponseCache()
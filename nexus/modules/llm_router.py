@@ -0,0 +1,323 @@
+"""
+LLM Router
+
+Hedged requests and failover across equivalent models. A module opts in with a
+routing policy (llm_routing_policies, see LLMGovernance.resolve_route), which
+config_manager.resolve_app_context surfaces as model_context["fallbacks"] and
+model_context["hedge"]. Without a policy there is a single candidate and the
+router just runs it.
+
+For each request:
+- The primary (the model governance resolved) is called first.
+- If it hasn't answered within the hedge delay, the next candidate is called
+  as well. The delay is the primary's live p95 latency, floored at the
+  policy's hedge_min_ms. The first success wins and the loser is cancelled.
+- If a call fails, the next candidate is called immediately (failover).
+- Each provider has a circuit breaker: after LLM_BREAKER_FAILURES consecutive
+  failures it is skipped for LLM_BREAKER_COOLDOWN_SECONDS, then a single trial
+  request is let through (half-open). If every candidate's breaker is open the
+  primary is still tried, so a module without fallbacks never fails fast.
+
+Latencies of successful calls are kept per provider/model, seeded from
+llm_models.last_latency_ms, and their p50 is written back to that column at
+most every LLM_LATENCY_FLUSH_SECONDS, so the catalog reflects live traffic
+instead of the last sync benchmark.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, TypeVar
+
+from nexus.modules.metrics_utils import percentile
+
+logger = logging.getLogger("nexus.llm_router")
+
+T = TypeVar("T")
+
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+LLM_LATENCY_FLUSH_SECONDS = float(os.getenv("LLM_LATENCY_FLUSH_SECONDS", "60"))
+# Extra requests a single call may hedge with (failovers are not limited)
+LLM_MAX_HEDGES = int(os.getenv("LLM_MAX_HEDGES", "1"))
+
+# Recent latency samples kept per provider/model for percentiles
+LATENCY_SAMPLES = 200
+
+
+def candidate_key(candidate: Dict[str, Any]) -> str:
+    return f"{candidate.get('provider_name') or 'default'}/{candidate.get('model_id') or 'default'}"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one provider."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        cooldown_seconds: float = LLM_BREAKER_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now. Claims the half-open trial."""
+        if self.state == self.OPEN and self._clock() - self._opened_at >= self.cooldown_seconds:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """The request ended without an outcome (cancelled): free the trial."""
+        self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Recent successful-call latencies per provider/model."""
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLES):
+        self.sample_size = sample_size
+        self._samples: Dict[str, Deque[float]] = {}
+        self._dirty: Set[Tuple[str, str]] = set()
+
+    def seed(self, candidate: Dict[str, Any]) -> None:
+        """Uses the catalog latency until live samples exist."""
+        key = candidate_key(candidate)
+        latency = candidate.get("last_latency_ms")
+        if key not in self._samples and latency and latency > 0:
+            self._samples[key] = deque([float(latency)], maxlen=self.sample_size)
+
+    def record(self, candidate: Dict[str, Any], latency_ms: float) -> None:
+        key = candidate_key(candidate)
+        self._samples.setdefault(key, deque(maxlen=self.sample_size)).append(latency_ms)
+        if candidate.get("provider_name") and candidate.get("model_id"):
+            self._dirty.add((candidate["provider_name"], candidate["model_id"]))
+
+    def percentile(self, candidate: Dict[str, Any], q: float) -> Optional[float]:
+        return percentile(self._samples.get(candidate_key(candidate)), q)
+
+    async def flush(self) -> int:
+        """Writes the live p50 of recently used models to llm_models.last_latency_ms."""
+        from nexus.modules.database import database
+
+        dirty, self._dirty = self._dirty, set()
+        values = []
+        for provider, model in dirty:
+            p50 = percentile(self._samples.get(f"{provider}/{model}"), 0.5)
+            if p50 is not None:
+                values.append({"ms": int(p50), "model": model, "provider": provider})
+        if not values:
+            return 0
+        try:
+            await database.execute_many(
+                """
+                UPDATE llm_models SET last_latency_ms = :ms
+                WHERE model_id = :model
+                  AND provider_id = (SELECT id FROM llm_providers WHERE name = :provider)
+                """,
+                values
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist live LLM latencies: {e}")
+            self._dirty |= dirty
+            return 0
+        return len(values)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            key: {"p50": percentile(s, 0.5), "p95": percentile(s, 0.95), "samples": len(s)}
+            for key, s in self._samples.items()
+        }
+
+
+class LLMRouter:
+    """Runs a call against ordered candidates with hedging, failover and breakers."""
+
+    def __init__(
+        self,
+        breaker_failures: int = LLM_BREAKER_FAILURES,
+        breaker_cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS,
+        flush_seconds: float = LLM_LATENCY_FLUSH_SECONDS,
+        persist: bool = True,
+        max_hedges: int = LLM_MAX_HEDGES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.flush_seconds = flush_seconds
+        self.persist = persist
+        self.max_hedges = max_hedges
+        self._clock = clock
+        self.latency = LatencyTracker()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._last_flush = clock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "failover_wins": 0, "failures": 0, "breaker_skips": 0}
+
+    def breaker(self, provider: Optional[str]) -> CircuitBreaker:
+        key = provider or "default"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self.breaker_failures, self.breaker_cooldown, self._clock)
+            self._breakers[key] = breaker
+        return breaker
+
+    def hedge_delay(self, candidate: Dict[str, Any], hedge: Optional[Dict[str, Any]]) -> Optional[float]:
+        """Seconds to wait on candidate before hedging, or None if hedging is off."""
+        if not hedge or not hedge.get("enabled", True) or self.max_hedges <= 0:
+            return None
+        p95 = self.latency.percentile(candidate, 0.95) or 0
+        return max(float(hedge.get("min_ms") or 0), p95) / 1000
+
+    def pick(self, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        First candidate whose breaker allows a request (for streams, which
+        can't be hedged once deltas were sent). Report the outcome with record().
+        """
+        for candidate in candidates:
+            if self.breaker(candidate.get("provider_name")).allow():
+                return candidate
+            self._stats["breaker_skips"] += 1
+        return candidates[0]
+
+    def record(self, candidate: Dict[str, Any], error: Optional[BaseException] = None) -> None:
+        breaker = self.breaker(candidate.get("provider_name"))
+        if error is None:
+            breaker.record_success()
+        else:
+            self._stats["failures"] += 1
+            breaker.record_failure()
+
+    async def run(
+        self,
+        candidates: List[Dict[str, Any]],
+        call: Callable[[Dict[str, Any]], Awaitable[T]],
+        hedge: Optional[Dict[str, Any]] = None
+    ) -> Tuple[T, Dict[str, Any]]:
+        """
+        Runs call(candidate) on the primary, hedging/failing over to the rest
+        in order. Returns (result, winning candidate); raises the last error
+        if every candidate failed.
+        """
+        self._stats["requests"] += 1
+        for candidate in candidates:
+            self.latency.seed(candidate)
+
+        pending = list(candidates)
+        tasks: Dict[asyncio.Task, Tuple[Dict[str, Any], float, str]] = {}
+        hedges = 0
+        hedge_at: Optional[float] = None
+        last_error: Optional[BaseException] = None
+
+        def launch(how: str) -> bool:
+            nonlocal hedge_at
+            while pending:
+                candidate = pending.pop(0)
+                if not self.breaker(candidate.get("provider_name")).allow():
+                    self._stats["breaker_skips"] += 1
+                    continue
+                tasks[asyncio.ensure_future(call(candidate))] = (candidate, self._clock(), how)
+                delay = self.hedge_delay(candidate, hedge)
+                hedge_at = self._clock() + delay if delay is not None else None
+                return True
+            return False
+
+        if not launch("primary"):
+            # Every breaker is open: still try the primary rather than fail fast
+            tasks[asyncio.ensure_future(call(candidates[0]))] = (candidates[0], self._clock(), "primary")
+
+        try:
+            while tasks:
+                timeout = None
+                if hedge_at is not None and pending and hedges < self.max_hedges:
+                    timeout = max(0.0, hedge_at - self._clock())
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    hedge_at = None
+                    if launch("hedge"):
+                        hedges += 1
+                        self._stats["hedges"] += 1
+                    continue
+
+                # Prefer a success over failures finishing in the same tick
+                for task in sorted(done, key=lambda t: t.exception() is not None):
+                    candidate, started, how = tasks.pop(task)
+                    error = task.exception()
+                    self.record(candidate, error)
+                    if error is None:
+                        self.latency.record(candidate, (self._clock() - started) * 1000)
+                        self._maybe_flush()
+                        if how == "hedge":
+                            self._stats["hedge_wins"] += 1
+                        elif how == "failover":
+                            self._stats["failover_wins"] += 1
+                        return task.result(), candidate
+                    last_error = error
+                    logger.warning(
+                        f"LLM call to {candidate_key(candidate)} failed ({type(error).__name__}: {error})"
+                    )
+
+                if not tasks and launch("failover"):
+                    self._stats["failovers"] += 1
+            raise last_error
+        finally:
+            # Losers (and everything, if the caller was cancelled)
+            for task, (candidate, _, _) in tasks.items():
+                task.cancel()
+                self.breaker(candidate.get("provider_name")).release()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _maybe_flush(self) -> None:
+        if not self.persist or self.flush_seconds <= 0:
+            return
+        if self._clock() - self._last_flush < self.flush_seconds:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._last_flush = self._clock()
+        self._flush_task = asyncio.create_task(self.latency.flush())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "breakers": {
+                provider: {"state": b.state, "consecutive_failures": b.failures}
+                for provider, b in self._breakers.items()
+            },
+            "latency_ms": self.latency.get_stats()
+        }
+
+
+llm_router = LLMRouter()
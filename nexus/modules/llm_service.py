@@ -1,12 +1,32 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Awaitable, Callable, Optional
 from nexus.modules.database import database
 from nexus.modules.config_manager import config_manager
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
+from nexus.modules.llm_admission import llm_admission, estimate_tokens
+from nexus.modules.llm_router import llm_router
+from nexus.modules.llm_response_cache import llm_response_cache, prompt_hash
+from nexus.modules.llm_streaming import LLMStream, estimate_usage
+from nexus.modules.metrics_utils import percentile
+from nexus.modules.llm_sync_job_repository import LLMSyncJobRepository
+from nexus.modules.tracing import tracer
+import asyncio
 import logging
 import os
 import json
+import time
+import uuid
 
 logger = logging.getLogger("nexus.llm_service")
 
+# Catalog sync: parallel probes per provider, per-probe timeout, latency samples per model
+SYNC_PROBE_CONCURRENCY = int(os.getenv("LLM_SYNC_PROBE_CONCURRENCY", "8"))
+SYNC_PROBE_TIMEOUT_SECONDS = float(os.getenv("LLM_SYNC_PROBE_TIMEOUT_SECONDS", "15"))
+SYNC_PROBE_SAMPLES = int(os.getenv("LLM_SYNC_PROBE_SAMPLES", "3"))
+SYNC_JOB_HISTORY = 10
+# Running jobs write progress this often; a job silent for SYNC_JOB_STALE_SECONDS lost its worker
+SYNC_JOB_PROGRESS_SECONDS = float(os.getenv("LLM_SYNC_JOB_PROGRESS_SECONDS", "2"))
+SYNC_JOB_STALE_SECONDS = float(os.getenv("LLM_SYNC_JOB_STALE_SECONDS", "300"))
+
 class LLMService:
     """
     Manages the Catalog of Available Models.
@@ -15,6 +35,9 @@ class LLMService:
     """
 
     def __init__(self):
+        # Catalog sync job state is shared across workers in llm_sync_jobs
+        self.sync_jobs = LLMSyncJobRepository()
+        self._sync_tasks: set = set()
         self.known_models = {
             "google_vertex": [
                 {
@@ -96,47 +119,186 @@ class LLMService:
             ]
         }
 
-    async def sync_models(self):
+    # --- Catalog Sync ---
+
+    async def start_sync_job(self) -> Dict[str, Any]:
+        """
+        Starts sync_models in the background and returns the job status.
+        Only one sync runs at a time across all workers: while one is running
+        its status is returned.
+        """
+        await self.sync_jobs.expire_stale(SYNC_JOB_STALE_SECONDS)
+        progress = {
+            "providers": {},
+            "models_synced": 0,
+            "probes": {"total": 0, "succeeded": 0, "failed": 0, "timed_out": 0}
+        }
+        # A running job may finish between the claim and the lookup; try again once
+        for _ in range(2):
+            claimed = await self.sync_jobs.claim(f"sync-{uuid.uuid4().hex[:12]}", progress)
+            if claimed:
+                break
+            running = await self.sync_jobs.get_running()
+            if running:
+                return running
+        else:
+            raise RuntimeError("Could not start a model sync")
+
+        await self.sync_jobs.prune(SYNC_JOB_HISTORY)
+        job = {"job_id": claimed["job_id"], **progress}
+        task = asyncio.create_task(self._run_sync_job(job))
+        self._sync_tasks.add(task)
+        task.add_done_callback(self._sync_tasks.discard)
+        return claimed
+
+    async def get_sync_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.sync_jobs.get(job_id)
+
+    @staticmethod
+    def _sync_progress(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: job[k] for k in ("providers", "models_synced", "probes")}
+
+    async def _report_sync_progress(self, job: Dict[str, Any]):
+        while True:
+            await asyncio.sleep(SYNC_JOB_PROGRESS_SECONDS)
+            try:
+                await self.sync_jobs.save_progress(job["job_id"], self._sync_progress(job))
+            except Exception as e:
+                logger.debug(f"Could not save progress of model sync {job['job_id']}: {e}")
+
+    async def _run_sync_job(self, job: Dict[str, Any]):
+        started = time.perf_counter()
+        reporter = asyncio.create_task(self._report_sync_progress(job))
+        status, error = "COMPLETE", None
+        try:
+            await self.sync_models(job)
+        except Exception as e:
+            logger.error(f"Model sync {job['job_id']} failed: {e}", exc_info=True)
+            status, error = "FAILED", str(e)
+        finally:
+            reporter.cancel()
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            await self.sync_jobs.finish(job["job_id"], status, self._sync_progress(job), duration_ms, error)
+            logger.info(
+                f"Model sync {job['job_id']} {status}: {job['models_synced']} models, "
+                f"{job['probes']['succeeded']}/{job['probes']['total']} probes ok in {duration_ms}ms"
+            )
+
+    async def sync_models(self, job: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Ensures the database has the latest known models for active providers.
-        For now, we seed 'known good' models. In future, we can query provider APIs.
+        Seeds 'known good' models, then discovers and benchmarks models per
+        provider type. Providers sync concurrently; within a provider, probes
+        run with bounded concurrency and a per-probe timeout, and the catalog
+        is written with one batched upsert.
+
+        job (see start_sync_job) receives per-provider progress and probe counts.
         """
+        job = job if job is not None else {"providers": {}, "models_synced": 0, "probes": {"total": 0, "succeeded": 0, "failed": 0, "timed_out": 0}}
         providers = await config_manager.list_providers()
+        await asyncio.gather(*(self._sync_provider(p, job) for p in providers))
+        return job
 
-        for p in providers:
-            p_name = p['name']
-            
-            # 1. Seed Known Models (Static)
-            if p_name in self.known_models:
-                for m in self.known_models[p_name]:
-                    await self._upsert_model(p['id'], m)
-                    
-            # 2. Dynamic Discovery (Vertex)
+    async def _sync_provider(self, p: Dict, job: Dict[str, Any]):
+        p_name = p['name']
+        status = {"status": "RUNNING", "models": 0, "error": None}
+        job["providers"][p_name] = status
+        probes = job["probes"]
+
+        # 1. Seed Known Models (Static)
+        models = {m["model_id"]: m for m in self.known_models.get(p_name, [])}
+
+        # 2. Dynamic Discovery (Vertex / OpenAI-compatible); benchmarked entries replace seeds
+        try:
             if p['provider_type'] == 'vertex':
-                try:
-                    dynamic_models = await self._fetch_vertex_models(p['id'], p_name)
-                    for m in dynamic_models:
-                        await self._upsert_model(p['id'], m)
-                except Exception as e:
-                    logger.warning(f"Could not auto-sync Vertex models: {e}")
-            
-            # 3. Dynamic Discovery (OpenAI-compatible)
-            if p['provider_type'] == 'openai_compatible':
-                try:
-                    dynamic_models = await self._fetch_dynamic_models(p['id'], p_name)
-                    for m in dynamic_models:
-                        await self._upsert_model(p['id'], m)
-                except Exception as e:
-                    logger.warning(f"Could not auto-sync OpenAI-compatible models for {p_name}: {e}")
+                dynamic_models = await self._fetch_vertex_models(p['id'], p_name, probes)
+            elif p['provider_type'] == 'openai_compatible':
+                dynamic_models = await self._fetch_dynamic_models(p['id'], p_name, probes)
+            else:
+                dynamic_models = []
+            models.update({m["model_id"]: m for m in dynamic_models})
+        except Exception as e:
+            logger.warning(f"Could not auto-sync models for {p_name}: {e}")
+            status["error"] = str(e)
+
+        # 3. Batched upsert
+        try:
+            status["models"] = await self._upsert_models(p['id'], list(models.values()))
+            job["models_synced"] += status["models"]
+            status["status"] = "COMPLETE"
+        except Exception as e:
+            logger.error(f"Failed to upsert models for {p_name}: {e}")
+            status["status"] = "FAILED"
+            status["error"] = str(e)
 
-    async def _fetch_vertex_models(self, provider_id: int, provider_name: str):
+    async def _probe_model(self, call: Callable[[], Awaitable[Any]], probes: Dict[str, int]) -> Optional[Dict[str, int]]:
+        """
+        Sends up to SYNC_PROBE_SAMPLES sequential probes, each bounded by
+        SYNC_PROBE_TIMEOUT_SECONDS. Returns latency p50/p95 in ms, or None
+        if the first probe failed.
+        """
+        probes["total"] += 1
+        samples = []
+        for _ in range(SYNC_PROBE_SAMPLES):
+            start_t = time.perf_counter()
+            try:
+                await asyncio.wait_for(call(), SYNC_PROBE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                if not samples:
+                    probes["timed_out"] += 1
+                break
+            except Exception as e:
+                logger.debug(f"Probe failed: {e}")
+                if not samples:
+                    probes["failed"] += 1
+                break
+            samples.append((time.perf_counter() - start_t) * 1000)
+
+        if not samples:
+            return None
+        probes["succeeded"] += 1
+        return {
+            "p50": int(percentile(samples, 0.5, ndigits=None)),
+            "p95": int(percentile(samples, 0.95, ndigits=None)),
+            "samples": len(samples)
+        }
+
+    async def _probe_models(
+        self,
+        model_ids: List[str],
+        call_for: Callable[[str], Awaitable[Any]],
+        probes: Dict[str, int]
+    ) -> Dict[str, Optional[Dict[str, int]]]:
+        """Probes models in parallel (at most SYNC_PROBE_CONCURRENCY at once)."""
+        semaphore = asyncio.Semaphore(SYNC_PROBE_CONCURRENCY)
+
+        async def probe(model_id: str):
+            async with semaphore:
+                latency = await self._probe_model(lambda: call_for(model_id), probes)
+                if latency:
+                    logger.debug(f"Probe {model_id}: p50={latency['p50']}ms p95={latency['p95']}ms")
+                return model_id, latency
+
+        return dict(await asyncio.gather(*(probe(m) for m in model_ids)))
+
+    @staticmethod
+    def _latency_fields(latency: Optional[Dict[str, int]]) -> Dict[str, Any]:
+        if not latency:
+            return {}
+        return {
+            "last_latency_ms": latency["p50"],
+            "latency_p50_ms": latency["p50"],
+            "latency_p95_ms": latency["p95"],
+            "latency_samples": latency["samples"]
+        }
+
+    async def _fetch_vertex_models(self, provider_id: int, provider_name: str, probes: Dict[str, int]):
         """
         Dynamically probes Gemini models using a Fallback Strategy:
         1. Try AI Studio (API Key) if key exists.
         2. If that fails or no key, Try Vertex AI (GCP Project).
         """
         from nexus.modules.crypto import decrypt
-        import time
 
         # Fetch Secrets
         s_query = "SELECT config_key, encrypted_value, is_secret FROM llm_config WHERE provider_id = :pid"
@@ -153,7 +315,6 @@ class LLMService:
         api_key = secrets.get("api_key")
 
         results = []
-        studio_success = False
 
         # --- STRATEGY 1: AI STUDIO (API KEY) ---
         if api_key and len(api_key.strip()) > 10:
@@ -165,56 +326,45 @@ class LLMService:
                 genai.configure(api_key=api_key)
                 
                 # Discovery (List)
-                print("DEBUG: Studio -> Listing Models...")
                 found_models = []
                 try:
                     for m in genai.list_models():
                         if "generateContent" in m.supported_generation_methods:
                             found_models.append(m.name.replace("models/", ""))
-                    print(f"DEBUG: Found models: {found_models}")
+                    logger.debug(f"Studio models found: {found_models}")
                 except Exception as e:
-                    print(f"DEBUG: List Failed (Expected if key invalid/restricted): {e}")
+                    logger.debug(f"Studio model listing failed (expected if key invalid/restricted): {e}")
                     # Don't abort yet, try fallback list
                 
                 candidates = set(found_models)
                 manual_list = ["gemini-2.0-flash-exp", "gemini-1.5-pro", "gemini-1.5-flash", "gemini-1.5-pro-001"]
                 for m in manual_list: candidates.add(m)
                 
-                # Probing
-                for model_id in candidates:
-                    print(f"DEBUG: Probing {model_id} (Studio)...")
-                    start_t = time.time()
-                    try:
-                        model = genai.GenerativeModel(model_id)
-                        await model.generate_content_async("hi")
-                        
-                        # Check success
-                        duration = time.time() - start_t
-                        latency_ms = int(duration * 1000)
-                        print(f"DEBUG:   -> Success ({latency_ms}ms)")
-                        
-                        tier = "balanced"
-                        if latency_ms < 500: tier = "fast"
-                        
-                        results.append({
-                            "model_id": model_id,
-                            "display_name": model_id.replace("-", " ").title().replace("Exp", "(Exp)"),
-                            "description": f"Latency: {latency_ms}ms (Studio)",
-                            "latency_tier": tier, 
-                            "input_cost": 0.0, "output_cost": 0.0,
-                            "capabilities": ["vision"],
-                            "last_latency_ms": latency_ms,
-                            "is_recommended": True
-                        })
-                        studio_success = True  # At least one worked
-                    except Exception as e:
-                        print(f"DEBUG:   -> Failed {model_id}: {e}")
+                # Probing (parallel, bounded)
+                latencies = await self._probe_models(
+                    sorted(candidates),
+                    lambda model_id: genai.GenerativeModel(model_id).generate_content_async("hi"),
+                    probes
+                )
+                for model_id, latency in latencies.items():
+                    if not latency:
+                        continue
+                    results.append({
+                        "model_id": model_id,
+                        "display_name": model_id.replace("-", " ").title().replace("Exp", "(Exp)"),
+                        "description": f"Latency: {latency['p50']}ms p50 / {latency['p95']}ms p95 (Studio)",
+                        "latency_tier": "fast" if latency["p50"] < 500 else "balanced",
+                        "input_cost": 0.0, "output_cost": 0.0,
+                        "capabilities": ["vision"],
+                        **self._latency_fields(latency),
+                        "is_recommended": True
+                    })
             
             except Exception as e:
                 logger.warning(f"AI Studio Auth Crashed: {e}")
         
         # Return if Studio worked well
-        if studio_success and len(results) > 0:
+        if results:
             logger.info("Sync completed via AI Studio.")
             return results
             
@@ -253,41 +403,35 @@ class LLMService:
                     "gemini-1.0-pro-001"
                 ]
                 
+                latencies = await self._probe_models(
+                    candidates,
+                    lambda model_id: GenerativeModel(model_id).generate_content_async("hi"),
+                    probes
+                )
                 for model_id in candidates:
-                    print(f"DEBUG: Probing {model_id} (Vertex)...")
-                    start_t = time.time()
-                    try:
-                        model = GenerativeModel(model_id)
-                        await model.generate_content_async("hi")
-                        
-                        duration = time.time() - start_t
-                        latency_ms = int(duration * 1000)
-                        print(f"DEBUG:   -> Success ({latency_ms}ms)")
-                        
-                        tier = "balanced"
-                        if latency_ms < 500: tier = "fast"
-                        
-                        is_rec = any(k['model_id'] == model_id for k in self.known_models.get('google_vertex', []))
-                        if "2.0" in model_id: is_rec = True # Recommend the new one
-
-                        results.append({
-                            "model_id": model_id,
-                            "display_name": model_id.replace("-", " ").title(),
-                            "description": f"Latency: {latency_ms}ms (Vertex)",
-                            "latency_tier": tier, 
-                            "input_cost": 0.0, "output_cost": 0.0,
-                            "capabilities": ["vision"],
-                            "last_latency_ms": latency_ms,
-                            "is_recommended": is_rec
-                        })
-                    except Exception as e:
-                        print(f"DEBUG:   -> Failed {model_id}: {e}")
+                    latency = latencies.get(model_id)
+                    if not latency:
+                        continue
+                    
+                    is_rec = any(k['model_id'] == model_id for k in self.known_models.get('google_vertex', []))
+                    if "2.0" in model_id: is_rec = True # Recommend the new one
+
+                    results.append({
+                        "model_id": model_id,
+                        "display_name": model_id.replace("-", " ").title(),
+                        "description": f"Latency: {latency['p50']}ms p50 / {latency['p95']}ms p95 (Vertex)",
+                        "latency_tier": "fast" if latency["p50"] < 500 else "balanced",
+                        "input_cost": 0.0, "output_cost": 0.0,
+                        "capabilities": ["vision"],
+                        **self._latency_fields(latency),
+                        "is_recommended": is_rec
+                    })
             except Exception as e:
                 logger.error(f"Vertex Auth Failed: {e}")
 
         return results
 
-    async def _fetch_dynamic_models(self, provider_id: int, provider_name: str) -> List[Dict]:
+    async def _fetch_dynamic_models(self, provider_id: int, provider_name: str, probes: Dict[str, int]) -> List[Dict]:
         """
         Connects to the provider and lists available models.
         Uses OpenAI API: GET https://api.openai.com/v1/models
@@ -319,7 +463,6 @@ class LLMService:
         resp = await client.models.list()
         
         results = []
-        import time
         
         # Filter for chat models only (exclude TTS, audio, image-only, etc.)
         # Common non-chat model patterns
@@ -347,31 +490,27 @@ class LLMService:
         # Process chat models (limit benchmarking for performance)
         recommended_model_ids = ["gpt-4", "gpt-3.5-turbo", "gpt-4-turbo", "gpt-4o", "o1"]
         
+        # Only benchmark a subset for performance (prioritize recommended models)
+        to_benchmark = [
+            model.id for model in chat_models
+            if any(rec in model.id.lower() for rec in recommended_model_ids) or len(chat_models) <= 20  # Benchmark all if small list
+        ]
+        # Simple ping: "hi" usually triggers a short response
+        latencies = await self._probe_models(
+            to_benchmark,
+            lambda model_id: client.chat.completions.create(
+                model=model_id,
+                messages=[{"role": "user", "content": "hi"}],
+                max_tokens=1
+            ),
+            probes
+        )
+        
         for model in chat_models:
             model_id = model.id
             model_id_lower = model_id.lower()
-            
-            # Only benchmark a subset for performance (prioritize recommended models)
-            should_benchmark = (
-                any(rec in model_id_lower for rec in recommended_model_ids) or
-                len(chat_models) <= 20  # Benchmark all if small list
-            )
-            
-            latency_ms = None
-            if should_benchmark:
-                start_t = time.time()
-                try:
-                    # Simple ping: "hi" usually triggers a short response
-                    await client.chat.completions.create(
-                        model=model_id,
-                        messages=[{"role": "user", "content": "hi"}],
-                        max_tokens=1
-                    )
-                    duration = time.time() - start_t
-                    latency_ms = int(duration * 1000)
-                except Exception as e:
-                    # Silent skip for non-chat models or errors
-                    logger.debug(f"Benchmark skipped for {model_id}: {e}")
+            latency = latencies.get(model_id)
+            latency_ms = latency["p50"] if latency else None
             
             # Determine Tier (default to balanced if not benchmarked)
             if latency_ms is None:
@@ -407,78 +546,84 @@ class LLMService:
             model_data = {
                 "model_id": model_id,
                 "display_name": display_name,
-                "description": f"OpenAI model (latency: {latency_ms}ms)" if latency_ms else "OpenAI model",
+                "description": f"OpenAI model (latency: {latency_ms}ms p50 / {latency['p95']}ms p95)" if latency else "OpenAI model",
                 "latency_tier": tier,
                 "input_cost": 0.0,  # Costs can be updated separately
                 "output_cost": 0.0,
                 "capabilities": capabilities,
                 "is_recommended": is_recommended
             }
-            
-            if latency_ms is not None:
-                model_data["last_latency_ms"] = latency_ms
+            model_data.update(self._latency_fields(latency))
             
             results.append(model_data)
         
         return results
 
-    async def _upsert_model(self, provider_id: int, model_data: Dict):
-        logger.info(f"Upserting Model: {model_data['model_id']} (Provider: {provider_id})")
-        check_query = "SELECT id FROM llm_models WHERE provider_id = :pid AND model_id = :mid"
-        existing = await database.fetch_one(check_query, {"pid": provider_id, "mid": model_data["model_id"]})
-        
-        latency_val = model_data.get("last_latency_ms", None)
-        is_rec = model_data.get("is_recommended", False)
+    async def _upsert_models(self, provider_id: int, models: List[Dict]) -> int:
+        """
+        Writes a provider's synced models in one transaction: one SELECT for
+        the existing rows, then one batched UPDATE and one batched INSERT.
+        """
+        if not models:
+            return 0
+        existing_rows = await database.fetch_all(
+            "SELECT id, model_id FROM llm_models WHERE provider_id = :pid", {"pid": provider_id}
+        )
+        existing = {r["model_id"]: r["id"] for r in existing_rows}
         
-        if existing:
-            # Update
-            query = """
-                UPDATE llm_models 
-                SET display_name = :dname, 
-                    description = :desc,
-                    latency_tier = :latency,
-                    input_cost_per_1k = :icost,
-                    output_cost_per_1k = :ocost,
-                    capabilities = :caps,
-                    last_latency_ms = COALESCE(:lat, last_latency_ms),
-                    is_recommended = :rec,
-                    last_verified_at = CURRENT_TIMESTAMP
-                WHERE id = :id
-            """
-            values = {
-                "id": existing["id"],
-                "dname": model_data["display_name"],
-                "desc": model_data["description"],
-                "latency": model_data["latency_tier"],
-                "icost": model_data["input_cost"],
-                "ocost": model_data["output_cost"],
-                "caps": str(model_data["capabilities"]).replace("'", '"'),
-                "lat": latency_val,
-                "rec": is_rec
-            }
-        else:
-            # Insert - Set Active Default (Active if Recommended, otherwise Inactive)
-            is_active_default = is_rec 
-            
-            query = """
-                INSERT INTO llm_models (provider_id, model_id, display_name, description, latency_tier, input_cost_per_1k, output_cost_per_1k, capabilities, last_latency_ms, is_recommended, is_active, last_verified_at)
-                VALUES (:pid, :mid, :dname, :desc, :latency, :icost, :ocost, :caps, :lat, :rec, :act, CURRENT_TIMESTAMP)
-            """
+        updates, inserts = [], []
+        for model_data in models:
             values = {
-                "pid": provider_id,
-                "mid": model_data["model_id"],
                 "dname": model_data["display_name"],
                 "desc": model_data["description"],
                 "latency": model_data["latency_tier"],
                 "icost": model_data["input_cost"],
                 "ocost": model_data["output_cost"],
-                "caps": str(model_data["capabilities"]).replace("'", '"'),
-                "lat": latency_val,
-                "rec": is_rec,
-                "act": is_active_default
+                "caps": json.dumps(model_data["capabilities"]),
+                "lat": model_data.get("last_latency_ms"),
+                "p50": model_data.get("latency_p50_ms"),
+                "p95": model_data.get("latency_p95_ms"),
+                "samples": model_data.get("latency_samples"),
+                "rec": model_data.get("is_recommended", False)
             }
+            if model_data["model_id"] in existing:
+                updates.append({**values, "id": existing[model_data["model_id"]]})
+            else:
+                # Insert - Set Active Default (Active if Recommended, otherwise Inactive)
+                inserts.append({**values, "pid": provider_id, "mid": model_data["model_id"], "act": values["rec"]})
         
-        await database.execute(query, values)
+        async with database.transaction():
+            if updates:
+                await database.execute_many(
+                    """
+                    UPDATE llm_models 
+                    SET display_name = :dname, 
+                        description = :desc,
+                        latency_tier = :latency,
+                        input_cost_per_1k = :icost,
+                        output_cost_per_1k = :ocost,
+                        capabilities = :caps,
+                        last_latency_ms = COALESCE(:lat, last_latency_ms),
+                        latency_p50_ms = COALESCE(:p50, latency_p50_ms),
+                        latency_p95_ms = COALESCE(:p95, latency_p95_ms),
+                        latency_samples = COALESCE(:samples, latency_samples),
+                        is_recommended = :rec,
+                        last_verified_at = CURRENT_TIMESTAMP
+                    WHERE id = :id
+                    """,
+                    updates
+                )
+            if inserts:
+                await database.execute_many(
+                    """
+                    INSERT INTO llm_models (provider_id, model_id, display_name, description, latency_tier, input_cost_per_1k, output_cost_per_1k, capabilities, last_latency_ms, latency_p50_ms, latency_p95_ms, latency_samples, is_recommended, is_active, last_verified_at)
+                    VALUES (:pid, :mid, :dname, :desc, :latency, :icost, :ocost, :caps, :lat, :p50, :p95, :samples, :rec, :act, CURRENT_TIMESTAMP)
+                    """,
+                    inserts
+                )
+        
+        logger.info(f"Upserted {len(models)} models for provider {provider_id} ({len(inserts)} new)")
+        return len(models)
 
     async def get_catalog(self) -> List[Dict]:
         """
@@ -504,8 +649,11 @@ class LLMService:
         return catalog
 
     async def toggle_model_active(self, model_id: int, is_active: bool):
-        query = "UPDATE llm_models SET is_active = :act WHERE id = :id"
-        await database.execute(query, {"act": is_active, "id": model_id})
+        query = "UPDATE llm_models SET is_active = :act WHERE id = :id RETURNING provider_id"
+        provider_id = await database.fetch_val(query, {"act": is_active, "id": model_id})
+        # Governance only resolves active models; drop cached contexts on every worker
+        if provider_id is not None:
+            await invalidation_bus.publish(InvalidationKind.PROVIDER, provider_id)
 
     async def benchmark_single_model(self, model_id: int) -> int:
         """
@@ -636,7 +784,8 @@ class LLMService:
         system_instruction: str = None, 
         model_context: Dict = None,
         generation_config: Dict = None,
-        return_metadata: bool = False
+        return_metadata: bool = False,
+        module_id: str = None
     ) -> str | tuple[str, Dict[str, Any]]:
         """
         Unified generation method.
@@ -649,355 +798,570 @@ class LLMService:
             generation_config: Optional dict with temperature, max_output_tokens, top_p, top_k, etc.
                               If None, uses defaults or prompt-specific config.
             return_metadata: If True, returns tuple (text, metadata). If False, returns just text.
+            module_id: Module the call belongs to, for the opt-in response cache.
+                       Defaults to the module the model_context was resolved for.
         
         Returns:
             If return_metadata=False: str (text response)
             If return_metadata=True: tuple[str, Dict] (text, metadata dict with tokens, finish_reason, etc.)
+            metadata also carries prompt_hash and whether the response was cached.
         """
         if not model_context:
             # Fallback for legacy calls (should be avoided)
             logger.warning("generate_text called without model_context! Using fallback.")
             model_context = {"model_id": "gemini-2.5-flash", "source": "legacy_fallback"}
 
+        generation_config = generation_config or self._default_generation_config(system_instruction)
+        module_id = module_id or model_context.get("module_id")
+        key = self._prompt_key(prompt, system_instruction, model_context, generation_config)
+
+        async def call_model():
+            return await self._generate_text(prompt, system_instruction, model_context, generation_config)
+
+        with tracer.span("llm.generate_text", module_id=module_id, model=model_context.get("model_id")) as span:
+            (text, metadata), cached = await llm_response_cache.get_or_compute(
+                module_id,
+                key,
+                call_model,
+                tokens=lambda result: result[1].get("total_tokens", 0),
+                cacheable=lambda result: "error" not in result[1]
+            )
+            if span:
+                span.set(cached=cached, total_tokens=metadata.get("total_tokens"))
+                if "error" in metadata:
+                    span.status = "error"
+                    span.set(error=metadata["error"])
+        metadata["prompt_hash"] = key
+        metadata["cached"] = cached
+
+        if return_metadata:
+            return text, metadata
+        return text
+
+    async def stream_text(
+        self,
+        prompt: str,
+        system_instruction: str = None,
+        model_context: Dict = None,
+        generation_config: Dict = None,
+        module_id: str = None
+    ) -> LLMStream:
+        """
+        Streaming variant of generate_text for Vertex, AI Studio and
+        OpenAI-compatible providers. Iterate the returned LLMStream for text
+        deltas; stream.text and stream.metadata hold the full result afterwards.
+        Failures raise instead of returning "Error: ..." text, since deltas may
+        already have reached the user.
+        """
+        if not model_context:
+            logger.warning("stream_text called without model_context! Using fallback.")
+            model_context = {"model_id": "gemini-2.5-flash", "source": "legacy_fallback"}
+
+        generation_config = generation_config or self._default_generation_config(system_instruction)
+        module_id = module_id or model_context.get("module_id")
+        key = self._prompt_key(prompt, system_instruction, model_context, generation_config)
+
+        async def deltas(stream: LLMStream):
+            cached = await llm_response_cache.lookup(module_id, key)
+            if cached is not None:
+                text, metadata = cached
+                stream.cached = True
+                stream.metadata.update(metadata)
+                yield text
+                return
+
+            # Streams can't be hedged: pick one candidate by breaker state
+            candidate = llm_router.pick([model_context] + (model_context.get("fallbacks") or []))
+            stream.provider = candidate.get("provider_name")
+            stream.model = candidate.get("model_id", "gemini-2.5-flash")
+            parts = []
+            try:
+                async with llm_admission.slot(
+                    stream.provider,
+                    stream.model,
+                    module_id,
+                    estimate_tokens(system_instruction, prompt)
+                ) as admitted:
+                    async for delta in self._stream_provider(prompt, system_instruction, candidate, generation_config):
+                        parts.append(delta)
+                        yield delta
+
+                    text = "".join(parts)
+                    metadata = estimate_usage(f"{system_instruction or ''}{prompt}", text)
+                    admitted["total_tokens"] = metadata["total_tokens"]
+            except Exception as e:
+                llm_router.record(candidate, e)
+                raise
+            except BaseException:
+                # Consumer went away mid-stream: no verdict on the provider
+                llm_router.breaker(candidate.get("provider_name")).release()
+                raise
+            llm_router.record(candidate)
+            stream.metadata.update(metadata)
+            await llm_response_cache.store(module_id, key, [text, metadata], metadata["total_tokens"])
+
+        return LLMStream(
+            deltas,
+            provider=model_context.get("provider_name"),
+            model=model_context.get("model_id", "gemini-2.5-flash"),
+            prompt_hash=key
+        )
+
+    async def _stream_provider(
+        self,
+        prompt: str,
+        system_instruction: str,
+        model_context: Dict,
+        generation_config: Dict
+    ):
+        """Yields text deltas from the provider selected the same way as _generate_text."""
+        model_id = model_context.get("model_id", "gemini-2.5-flash")
+        api_key = model_context.get("api_key")
+        provider_name = (model_context.get("provider_name") or "").lower()
+        base_url = model_context.get("base_url")
+        max_output_tokens = generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192)
+
+        from nexus.modules.llm_client_pool import client_registry
+
+        if "google" in provider_name or "vertex" in provider_name:
+            if model_context.get("provider_type") == "vertex":
+                if not model_context.get("project_id"):
+                    raise ValueError("Vertex AI requires 'project_id' in configuration. API keys are not supported for Vertex AI.")
+                model = client_registry.get_vertex_model(
+                    provider_name, model_context.get("project_id"), model_context.get("location", "us-central1"), model_id
+                )
+                full_prompt = f"{system_instruction}\n\n{prompt}" if system_instruction else prompt
+                response = await model.generate_content_async(
+                    full_prompt,
+                    generation_config={"temperature": generation_config.get("temperature", 0.4), "max_output_tokens": max_output_tokens},
+                    stream=True
+                )
+            elif api_key and len(api_key) > 10:
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                model = genai.GenerativeModel(
+                    model_name=model_id,
+                    system_instruction=system_instruction,
+                    generation_config={
+                        "temperature": generation_config.get("temperature", 0.7),
+                        "top_p": generation_config.get("top_p", 0.95),
+                        "top_k": generation_config.get("top_k", 40),
+                        "max_output_tokens": max_output_tokens,
+                    }
+                )
+                response = await model.generate_content_async(prompt, stream=True)
+            else:
+                raise ValueError(f"Google provider '{provider_name}' has neither Vertex project_id nor API key")
+
+            async for chunk in response:
+                try:
+                    yield chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. final safety/usage chunk)
+                    continue
+            return
+
+        if not base_url and "ollama" in provider_name:
+            base_url = "http://localhost:11434/v1"
+        client = client_registry.get_openai_client(provider_name, api_key or "ollama", base_url, model_id)
+
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+        openai_config = {
+            "model": model_id,
+            "messages": messages,
+            "temperature": generation_config.get("temperature", 0.7),
+            "max_tokens": max_output_tokens,
+            "stream": True
+        }
+        if generation_config.get("top_p"):
+            openai_config["top_p"] = generation_config["top_p"]
+
+        response = await client.chat.completions.create(**openai_config)
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    @staticmethod
+    def _prompt_key(prompt: str, system_instruction: str, model_context: Dict, generation_config: Dict) -> str:
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+        model = f"{model_context.get('provider_name') or ''}/{model_context.get('model_id', 'gemini-2.5-flash')}"
+        return prompt_hash(model, messages, generation_config)
+
+    @staticmethod
+    def _default_generation_config(system_instruction: str = None) -> Dict[str, Any]:
+        return {
+            "temperature": 0.4 if "plan" in str(system_instruction).lower() else 0.7,
+            "max_output_tokens": 8192,
+            "top_p": 0.95,
+            "top_k": 40,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0
+        }
+
+    async def _generate_text(
+        self,
+        prompt: str,
+        system_instruction: str,
+        model_context: Dict,
+        generation_config: Dict
+    ) -> tuple[str, Dict[str, Any]]:
+        """
+        Admitted provider call behind generate_text (queued per provider/model,
+        retried on 429/5xx), hedged / failed over across the module's routing
+        policy fallbacks. Failures return ("Error: ...", {"error": ...}).
+        """
+        candidates = [model_context] + (model_context.get("fallbacks") or [])
+
+        def call(candidate: Dict) -> Awaitable[tuple[str, Dict[str, Any]]]:
+            return llm_admission.run(
+                candidate.get("provider_name"),
+                candidate.get("model_id", "gemini-2.5-flash"),
+                lambda: self._call_provider(prompt, system_instruction, candidate, generation_config),
+                module_id=model_context.get("module_id"),
+                tokens_estimate=estimate_tokens(system_instruction, prompt),
+                usage=lambda result: result[1].get("total_tokens")
+            )
+
+        try:
+            (text, metadata), winner = await llm_router.run(candidates, call, hedge=model_context.get("hedge"))
+            if winner is not model_context:
+                metadata["served_by"] = f"{winner.get('provider_name')}/{winner.get('model_id')}"
+            return text, metadata
+        except Exception as e:
+            logger.error(f"❌ LLM Execution Failed: {e}")
+            return f"Error: {str(e)}", {"error": str(e)}
+
+    async def _call_provider(
+        self,
+        prompt: str,
+        system_instruction: str,
+        model_context: Dict,
+        generation_config: Dict
+    ) -> tuple[str, Dict[str, Any]]:
+        """Single provider call. Raises on failure."""
         model_id = model_context.get("model_id", "gemini-2.5-flash")
         source = model_context.get("source", "unknown")
         
-        # Use provided generation_config, or fallback to defaults
-        if not generation_config:
-            generation_config = {
-                "temperature": 0.4 if "plan" in str(system_instruction).lower() else 0.7,
-                "max_output_tokens": 8192,
-                "top_p": 0.95,
-                "top_k": 40,
-                "frequency_penalty": 0.0,
-                "presence_penalty": 0.0
-            }
-        
         logger.debug(f"🤖 [LLM_SERVICE] Execution | Model: {model_id} | Source: {source}")
         logger.debug(f"   📥 Prompt Length: {len(prompt)} chars")
         logger.debug(f"   ⚙️  Generation Config: temp={generation_config.get('temperature')}, max_tokens={generation_config.get('max_output_tokens')}")
 
-        try:
-            # --- PATH A: AI STUDIO (API KEY) ---
-            api_key = model_context.get("api_key")
-            provider_name = model_context.get("provider_name", "").lower()
-            base_url = model_context.get("base_url")
-
-            # 1. GOOGLE (Vertex or Studio)
-            if "google" in provider_name or "vertex" in provider_name:
-                provider_type = model_context.get("provider_type")
+        # --- PATH A: AI STUDIO (API KEY) ---
+        api_key = model_context.get("api_key")
+        provider_name = model_context.get("provider_name", "").lower()
+        base_url = model_context.get("base_url")
+
+        # 1. GOOGLE (Vertex or Studio)
+        if "google" in provider_name or "vertex" in provider_name:
+            provider_type = model_context.get("provider_type")
+            
+            # VERTEX AI: Use service account credentials (ADC) - no API keys
+            if provider_type == "vertex":
+                if not model_context.get("project_id"):
+                    raise ValueError("Vertex AI requires 'project_id' in configuration. API keys are not supported for Vertex AI.")
                 
-                # VERTEX AI: Use service account credentials (ADC) - no API keys
-                if provider_type == "vertex":
-                    if not model_context.get("project_id"):
-                        raise ValueError("Vertex AI requires 'project_id' in configuration. API keys are not supported for Vertex AI.")
-                    
-                    import vertexai
-                    from vertexai.generative_models import GenerativeModel
-                    
-                    location = model_context.get("location", "us-central1")
-                    vertexai.init(project=model_context.get("project_id"), location=location)
-                    
-                    model = GenerativeModel(model_id)
-                    
-                    # For Vertex AI, prepend system_instruction to prompt if provided
-                    full_prompt = prompt
-                    if system_instruction:
-                        full_prompt = f"{system_instruction}\n\n{prompt}"
+                from nexus.modules.llm_client_pool import client_registry
+                
+                location = model_context.get("location", "us-central1")
+                model = client_registry.get_vertex_model(
+                    provider_name, model_context.get("project_id"), location, model_id
+                )
+                
+                # For Vertex AI, prepend system_instruction to prompt if provided
+                full_prompt = prompt
+                if system_instruction:
+                    full_prompt = f"{system_instruction}\n\n{prompt}"
+                
+                vertex_config = {
+                    "temperature": generation_config.get("temperature", 0.4),
+                    "max_output_tokens": generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192)
+                }
+                response = await model.generate_content_async(full_prompt, generation_config=vertex_config)
+                text = response.text
+                
+                # Log the actual prompt and response for debugging
+                logger.debug(f"   📤 [LLM_SERVICE] Full prompt sent ({len(full_prompt)} chars)")
+                if len(full_prompt) > 1000:
+                    logger.debug(f"   📤 [LLM_SERVICE] Prompt preview (first 1000 chars):\n{full_prompt[:1000]}...")
+                else:
+                    logger.debug(f"   📤 [LLM_SERVICE] Full prompt:\n{full_prompt}")
+                
+                logger.debug(f"   📥 [LLM_SERVICE] Response received ({len(text)} chars)")
+                if len(text) > 1000:
+                    logger.debug(f"   📥 [LLM_SERVICE] Response preview (first 1000 chars):\n{text[:1000]}...")
+                else:
+                    logger.debug(f"   📥 [LLM_SERVICE] Full response:\n{text}")
+                
+                # Extract metadata
+                metadata = {}
+                max_output_tokens = vertex_config.get("max_output_tokens", 8192)
+                
+                # Try multiple ways to get usage metadata from Vertex AI
+                usage_metadata = None
+                if hasattr(response, 'usage_metadata'):
+                    usage_metadata = response.usage_metadata
+                elif hasattr(response, 'candidates') and len(response.candidates) > 0:
+                    # Sometimes usage_metadata is on the candidate
+                    candidate = response.candidates[0]
+                    if hasattr(candidate, 'usage_metadata'):
+                        usage_metadata = candidate.usage_metadata
+                
+                if usage_metadata:
+                    # Try different attribute names for token counts
+                    prompt_tokens = (
+                        getattr(usage_metadata, 'prompt_token_count', None) or
+                        getattr(usage_metadata, 'prompt_tokens', None) or
+                        0
+                    )
+                    completion_tokens = (
+                        getattr(usage_metadata, 'candidates_token_count', None) or
+                        getattr(usage_metadata, 'completion_tokens', None) or
+                        0
+                    )
+                    total_tokens = (
+                        getattr(usage_metadata, 'total_token_count', None) or
+                        getattr(usage_metadata, 'total_tokens', None) or
+                        (prompt_tokens + completion_tokens if prompt_tokens and completion_tokens else 0)
+                    )
                     
-                    vertex_config = {
-                        "temperature": generation_config.get("temperature", 0.4),
-                        "max_output_tokens": generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192)
+                    metadata = {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": total_tokens if total_tokens else (prompt_tokens + completion_tokens),
+                        "completion_percent": round((completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 and completion_tokens > 0 else 0
                     }
-                    response = await model.generate_content_async(full_prompt, generation_config=vertex_config)
-                    text = response.text
-                    
-                    # Log the actual prompt and response for debugging
-                    logger.debug(f"   📤 [LLM_SERVICE] Full prompt sent ({len(full_prompt)} chars)")
-                    if len(full_prompt) > 1000:
-                        logger.debug(f"   📤 [LLM_SERVICE] Prompt preview (first 1000 chars):\n{full_prompt[:1000]}...")
-                    else:
-                        logger.debug(f"   📤 [LLM_SERVICE] Full prompt:\n{full_prompt}")
-                    
-                    logger.debug(f"   📥 [LLM_SERVICE] Response received ({len(text)} chars)")
-                    if len(text) > 1000:
-                        logger.debug(f"   📥 [LLM_SERVICE] Response preview (first 1000 chars):\n{text[:1000]}...")
-                    else:
-                        logger.debug(f"   📥 [LLM_SERVICE] Full response:\n{text}")
-                    
-                    # Extract metadata
-                    metadata = {}
-                    max_output_tokens = vertex_config.get("max_output_tokens", 8192)
-                    
-                    # Try multiple ways to get usage metadata from Vertex AI
-                    usage_metadata = None
-                    if hasattr(response, 'usage_metadata'):
-                        usage_metadata = response.usage_metadata
-                    elif hasattr(response, 'candidates') and len(response.candidates) > 0:
-                        # Sometimes usage_metadata is on the candidate
-                        candidate = response.candidates[0]
-                        if hasattr(candidate, 'usage_metadata'):
-                            usage_metadata = candidate.usage_metadata
-                    
-                    if usage_metadata:
-                        # Try different attribute names for token counts
-                        prompt_tokens = (
-                            getattr(usage_metadata, 'prompt_token_count', None) or
-                            getattr(usage_metadata, 'prompt_tokens', None) or
-                            0
-                        )
-                        completion_tokens = (
-                            getattr(usage_metadata, 'candidates_token_count', None) or
-                            getattr(usage_metadata, 'completion_tokens', None) or
-                            0
-                        )
-                        total_tokens = (
-                            getattr(usage_metadata, 'total_token_count', None) or
-                            getattr(usage_metadata, 'total_tokens', None) or
-                            (prompt_tokens + completion_tokens if prompt_tokens and completion_tokens else 0)
-                        )
-                        
-                        metadata = {
-                            "prompt_tokens": prompt_tokens,
-                            "completion_tokens": completion_tokens,
-                            "total_tokens": total_tokens if total_tokens else (prompt_tokens + completion_tokens),
-                            "completion_percent": round((completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 and completion_tokens > 0 else 0
-                        }
-                    else:
-                        # Fallback: estimate tokens (rough approximation: 1 token ≈ 4 characters)
-                        estimated_prompt_tokens = len(full_prompt) // 4
-                        estimated_completion_tokens = len(text) // 4
-                        metadata = {
-                            "prompt_tokens": estimated_prompt_tokens,
-                            "completion_tokens": estimated_completion_tokens,
-                            "total_tokens": estimated_prompt_tokens + estimated_completion_tokens,
-                            "completion_percent": round((estimated_completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 else 0,
-                            "estimated": True  # Flag to indicate this is an estimate
-                        }
+                else:
+                    # Fallback: estimate tokens (rough approximation: 1 token ≈ 4 characters)
+                    estimated_prompt_tokens = len(full_prompt) // 4
+                    estimated_completion_tokens = len(text) // 4
+                    metadata = {
+                        "prompt_tokens": estimated_prompt_tokens,
+                        "completion_tokens": estimated_completion_tokens,
+                        "total_tokens": estimated_prompt_tokens + estimated_completion_tokens,
+                        "completion_percent": round((estimated_completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 else 0,
+                        "estimated": True  # Flag to indicate this is an estimate
+                    }
+                
+                if hasattr(response, 'candidates') and len(response.candidates) > 0:
+                    candidate = response.candidates[0]
+                    finish_reason_raw = getattr(candidate, 'finish_reason', None)
                     
-                    if hasattr(response, 'candidates') and len(response.candidates) > 0:
-                        candidate = response.candidates[0]
-                        finish_reason_raw = getattr(candidate, 'finish_reason', None)
-                        
-                        # Convert enum to readable string
-                        if finish_reason_raw is not None:
-                            if hasattr(finish_reason_raw, 'name'):
-                                # It's an enum with .name attribute
-                                metadata["finish_reason"] = finish_reason_raw.name
-                            elif isinstance(finish_reason_raw, int):
-                                # Map enum integer values to names
-                                finish_reason_map = {
-                                    0: "FINISH_REASON_UNSPECIFIED",
-                                    1: "STOP",
-                                    2: "MAX_TOKENS",
-                                    3: "SAFETY",
-                                    4: "RECITATION",
-                                    5: "OTHER"
-                                }
-                                metadata["finish_reason"] = finish_reason_map.get(finish_reason_raw, f"UNKNOWN({finish_reason_raw})")
-                            else:
-                                metadata["finish_reason"] = str(finish_reason_raw)
+                    # Convert enum to readable string
+                    if finish_reason_raw is not None:
+                        if hasattr(finish_reason_raw, 'name'):
+                            # It's an enum with .name attribute
+                            metadata["finish_reason"] = finish_reason_raw.name
+                        elif isinstance(finish_reason_raw, int):
+                            # Map enum integer values to names
+                            finish_reason_map = {
+                                0: "FINISH_REASON_UNSPECIFIED",
+                                1: "STOP",
+                                2: "MAX_TOKENS",
+                                3: "SAFETY",
+                                4: "RECITATION",
+                                5: "OTHER"
+                            }
+                            metadata["finish_reason"] = finish_reason_map.get(finish_reason_raw, f"UNKNOWN({finish_reason_raw})")
                         else:
-                            metadata["finish_reason"] = "UNKNOWN"
-                        
-                        if hasattr(candidate, 'safety_ratings'):
-                            metadata["safety_ratings"] = [r.rating.name if hasattr(r.rating, 'name') else str(r.rating) for r in candidate.safety_ratings]
+                            metadata["finish_reason"] = str(finish_reason_raw)
+                    else:
+                        metadata["finish_reason"] = "UNKNOWN"
                     
-                    if return_metadata:
-                        return text, metadata
-                    return text
+                    if hasattr(candidate, 'safety_ratings'):
+                        metadata["safety_ratings"] = [r.rating.name if hasattr(r.rating, 'name') else str(r.rating) for r in candidate.safety_ratings]
                 
-                # AI STUDIO: Use API key (google.generativeai SDK)
-                elif api_key and len(api_key) > 10:
-                    import google.generativeai as genai
-                    genai.configure(api_key=api_key)
-                    
-                    # Use generation_config from parameter (already set above)
-                    google_config = {
-                        "temperature": generation_config.get("temperature", 0.7),
-                        "top_p": generation_config.get("top_p", 0.95),
-                        "top_k": generation_config.get("top_k", 40),
-                        "max_output_tokens": generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192),
-                    }
-                    
-                    model = genai.GenerativeModel(
-                        model_name=model_id,
-                        system_instruction=system_instruction,
-                        generation_config=google_config
+                return text, metadata
+            
+            # AI STUDIO: Use API key (google.generativeai SDK)
+            elif api_key and len(api_key) > 10:
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                
+                # Use generation_config from parameter (already set above)
+                google_config = {
+                    "temperature": generation_config.get("temperature", 0.7),
+                    "top_p": generation_config.get("top_p", 0.95),
+                    "top_k": generation_config.get("top_k", 40),
+                    "max_output_tokens": generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192),
+                }
+                
+                model = genai.GenerativeModel(
+                    model_name=model_id,
+                    system_instruction=system_instruction,
+                    generation_config=google_config
+                )
+                
+                # system_instruction is set on the model, so only the prompt is sent
+                full_prompt = prompt
+                response = await model.generate_content_async(full_prompt)
+                text = response.text
+                # Response will be printed in gate_engine instead
+                # logger.debug(f"   ⚡️ Studio Response: {text[:100]}...")
+                
+                # Extract metadata (same logic as Vertex AI)
+                metadata = {}
+                max_output_tokens = google_config.get("max_output_tokens", 8192)
+                
+                # Try multiple ways to get usage metadata
+                usage_metadata = None
+                if hasattr(response, 'usage_metadata'):
+                    usage_metadata = response.usage_metadata
+                elif hasattr(response, 'candidates') and len(response.candidates) > 0:
+                    candidate = response.candidates[0]
+                    if hasattr(candidate, 'usage_metadata'):
+                        usage_metadata = candidate.usage_metadata
+                
+                if usage_metadata:
+                    prompt_tokens = (
+                        getattr(usage_metadata, 'prompt_token_count', None) or
+                        getattr(usage_metadata, 'prompt_tokens', None) or
+                        0
+                    )
+                    completion_tokens = (
+                        getattr(usage_metadata, 'candidates_token_count', None) or
+                        getattr(usage_metadata, 'completion_tokens', None) or
+                        0
+                    )
+                    total_tokens = (
+                        getattr(usage_metadata, 'total_token_count', None) or
+                        getattr(usage_metadata, 'total_tokens', None) or
+                        (prompt_tokens + completion_tokens if prompt_tokens and completion_tokens else 0)
                     )
                     
-                    response = await model.generate_content_async(full_prompt)
-                    text = response.text
-                    # Response will be printed in gate_engine instead
-                    # logger.debug(f"   ⚡️ Studio Response: {text[:100]}...")
-                    
-                    # Extract metadata (same logic as Vertex AI)
-                    metadata = {}
-                    max_output_tokens = google_config.get("max_output_tokens", 8192)
-                    
-                    # Try multiple ways to get usage metadata
-                    usage_metadata = None
-                    if hasattr(response, 'usage_metadata'):
-                        usage_metadata = response.usage_metadata
-                    elif hasattr(response, 'candidates') and len(response.candidates) > 0:
-                        candidate = response.candidates[0]
-                        if hasattr(candidate, 'usage_metadata'):
-                            usage_metadata = candidate.usage_metadata
-                    
-                    if usage_metadata:
-                        prompt_tokens = (
-                            getattr(usage_metadata, 'prompt_token_count', None) or
-                            getattr(usage_metadata, 'prompt_tokens', None) or
-                            0
-                        )
-                        completion_tokens = (
-                            getattr(usage_metadata, 'candidates_token_count', None) or
-                            getattr(usage_metadata, 'completion_tokens', None) or
-                            0
-                        )
-                        total_tokens = (
-                            getattr(usage_metadata, 'total_token_count', None) or
-                            getattr(usage_metadata, 'total_tokens', None) or
-                            (prompt_tokens + completion_tokens if prompt_tokens and completion_tokens else 0)
-                        )
-                        
-                        metadata = {
-                            "prompt_tokens": prompt_tokens,
-                            "completion_tokens": completion_tokens,
-                            "total_tokens": total_tokens if total_tokens else (prompt_tokens + completion_tokens),
-                            "completion_percent": round((completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 and completion_tokens > 0 else 0
-                        }
-                    else:
-                        # Fallback: estimate tokens
-                        estimated_prompt_tokens = len(full_prompt) // 4
-                        estimated_completion_tokens = len(text) // 4
-                        metadata = {
-                            "prompt_tokens": estimated_prompt_tokens,
-                            "completion_tokens": estimated_completion_tokens,
-                            "total_tokens": estimated_prompt_tokens + estimated_completion_tokens,
-                            "completion_percent": round((estimated_completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 else 0,
-                            "estimated": True
-                        }
+                    metadata = {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": total_tokens if total_tokens else (prompt_tokens + completion_tokens),
+                        "completion_percent": round((completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 and completion_tokens > 0 else 0
+                    }
+                else:
+                    # Fallback: estimate tokens
+                    estimated_prompt_tokens = len(full_prompt) // 4
+                    estimated_completion_tokens = len(text) // 4
+                    metadata = {
+                        "prompt_tokens": estimated_prompt_tokens,
+                        "completion_tokens": estimated_completion_tokens,
+                        "total_tokens": estimated_prompt_tokens + estimated_completion_tokens,
+                        "completion_percent": round((estimated_completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 else 0,
+                        "estimated": True
+                    }
+                
+                if hasattr(response, 'candidates') and len(response.candidates) > 0:
+                    candidate = response.candidates[0]
+                    finish_reason_raw = getattr(candidate, 'finish_reason', None)
                     
-                    if hasattr(response, 'candidates') and len(response.candidates) > 0:
-                        candidate = response.candidates[0]
-                        finish_reason_raw = getattr(candidate, 'finish_reason', None)
-                        
-                        # Convert enum to readable string
-                        if finish_reason_raw is not None:
-                            if hasattr(finish_reason_raw, 'name'):
-                                metadata["finish_reason"] = finish_reason_raw.name
-                            elif isinstance(finish_reason_raw, int):
-                                finish_reason_map = {
-                                    0: "FINISH_REASON_UNSPECIFIED",
-                                    1: "STOP",
-                                    2: "MAX_TOKENS",
-                                    3: "SAFETY",
-                                    4: "RECITATION",
-                                    5: "OTHER"
-                                }
-                                metadata["finish_reason"] = finish_reason_map.get(finish_reason_raw, f"UNKNOWN({finish_reason_raw})")
-                            else:
-                                metadata["finish_reason"] = str(finish_reason_raw)
+                    # Convert enum to readable string
+                    if finish_reason_raw is not None:
+                        if hasattr(finish_reason_raw, 'name'):
+                            metadata["finish_reason"] = finish_reason_raw.name
+                        elif isinstance(finish_reason_raw, int):
+                            finish_reason_map = {
+                                0: "FINISH_REASON_UNSPECIFIED",
+                                1: "STOP",
+                                2: "MAX_TOKENS",
+                                3: "SAFETY",
+                                4: "RECITATION",
+                                5: "OTHER"
+                            }
+                            metadata["finish_reason"] = finish_reason_map.get(finish_reason_raw, f"UNKNOWN({finish_reason_raw})")
                         else:
-                            metadata["finish_reason"] = "UNKNOWN"
-                        
-                        if hasattr(candidate, 'safety_ratings'):
-                            metadata["safety_ratings"] = [r.rating.name if hasattr(r.rating, 'name') else str(r.rating) for r in candidate.safety_ratings]
+                            metadata["finish_reason"] = str(finish_reason_raw)
+                    else:
+                        metadata["finish_reason"] = "UNKNOWN"
                     
-                    if return_metadata:
-                        return text, metadata
-                    return text
+                    if hasattr(candidate, 'safety_ratings'):
+                        metadata["safety_ratings"] = [r.rating.name if hasattr(r.rating, 'name') else str(r.rating) for r in candidate.safety_ratings]
+                
+                return text, metadata
 
-            # 2. OPENAI COMPATIBLE (Ollama, OpenAI, DeepSeek, etc.)
-            # This covers the local llama3.1 case
-            from openai import AsyncOpenAI
-            
-            # Default to local ollama if no URL provided but provider is generic
-            if not base_url and "ollama" in provider_name:
-                base_url = "http://localhost:11434/v1"
-            
-            client = AsyncOpenAI(
-                api_key=api_key or "ollama", # Ollama doesn't care, but SDK needs non-empty
-                base_url=base_url
-            )
-            
-            messages = []
+        # 2. OPENAI COMPATIBLE (Ollama, OpenAI, DeepSeek, etc.)
+        # This covers the local llama3.1 case
+        from nexus.modules.llm_client_pool import client_registry
+        
+        # Default to local ollama if no URL provided but provider is generic
+        if not base_url and "ollama" in provider_name:
+            base_url = "http://localhost:11434/v1"
+        
+        client = client_registry.get_openai_client(
+            provider_name,
+            api_key or "ollama", # Ollama doesn't care, but SDK needs non-empty
+            base_url,
+            model_id
+        )
+        
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+        
+        openai_config = {
+            "model": model_id,
+            "messages": messages,
+            "temperature": generation_config.get("temperature", 0.7),
+        }
+        # Add optional parameters if provided
+        if generation_config.get("max_output_tokens") or generation_config.get("max_tokens"):
+            openai_config["max_tokens"] = generation_config.get("max_output_tokens") or generation_config.get("max_tokens")
+        if generation_config.get("top_p"):
+            openai_config["top_p"] = generation_config["top_p"]
+        if generation_config.get("frequency_penalty") is not None:
+            openai_config["frequency_penalty"] = generation_config["frequency_penalty"]
+        if generation_config.get("presence_penalty") is not None:
+            openai_config["presence_penalty"] = generation_config["presence_penalty"]
+        
+        response = await client.chat.completions.create(**openai_config)
+        
+        text = response.choices[0].message.content
+        # Response will be printed in gate_engine instead
+        # logger.debug(f"   ⚡️ Generic/Ollama Response: {text[:100]}...")
+        
+        # Extract metadata
+        metadata = {}
+        max_output_tokens = generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192)
+        if hasattr(response, 'usage'):
+            usage = response.usage
+            prompt_tokens = getattr(usage, 'prompt_tokens', 0)
+            completion_tokens = getattr(usage, 'completion_tokens', 0)
+            total_tokens = getattr(usage, 'total_tokens', 0)
+            metadata = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": total_tokens,
+                "completion_percent": round((completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 and completion_tokens > 0 else 0
+            }
+        else:
+            # Fallback: estimate tokens
+            estimated_prompt_tokens = len(prompt) // 4
             if system_instruction:
-                messages.append({"role": "system", "content": system_instruction})
-            messages.append({"role": "user", "content": prompt})
-            
-            openai_config = {
-                "model": model_id,
-                "messages": messages,
-                "temperature": generation_config.get("temperature", 0.7),
+                estimated_prompt_tokens += len(system_instruction) // 4
+            estimated_completion_tokens = len(text) // 4
+            metadata = {
+                "prompt_tokens": estimated_prompt_tokens,
+                "completion_tokens": estimated_completion_tokens,
+                "total_tokens": estimated_prompt_tokens + estimated_completion_tokens,
+                "completion_percent": round((estimated_completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 else 0,
+                "estimated": True
             }
-            # Add optional parameters if provided
-            if generation_config.get("max_output_tokens") or generation_config.get("max_tokens"):
-                openai_config["max_tokens"] = generation_config.get("max_output_tokens") or generation_config.get("max_tokens")
-            if generation_config.get("top_p"):
-                openai_config["top_p"] = generation_config["top_p"]
-            if generation_config.get("frequency_penalty") is not None:
-                openai_config["frequency_penalty"] = generation_config["frequency_penalty"]
-            if generation_config.get("presence_penalty") is not None:
-                openai_config["presence_penalty"] = generation_config["presence_penalty"]
-            
-            response = await client.chat.completions.create(**openai_config)
-            
-            text = response.choices[0].message.content
-            # Response will be printed in gate_engine instead
-            # logger.debug(f"   ⚡️ Generic/Ollama Response: {text[:100]}...")
-            
-            # Extract metadata
-            metadata = {}
-            max_output_tokens = generation_config.get("max_output_tokens") or generation_config.get("max_tokens", 8192)
-            if hasattr(response, 'usage'):
-                usage = response.usage
-                prompt_tokens = getattr(usage, 'prompt_tokens', 0)
-                completion_tokens = getattr(usage, 'completion_tokens', 0)
-                total_tokens = getattr(usage, 'total_tokens', 0)
-                metadata = {
-                    "prompt_tokens": prompt_tokens,
-                    "completion_tokens": completion_tokens,
-                    "total_tokens": total_tokens,
-                    "completion_percent": round((completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 and completion_tokens > 0 else 0
-                }
-            else:
-                # Fallback: estimate tokens
-                estimated_prompt_tokens = len(prompt) // 4
-                if system_instruction:
-                    estimated_prompt_tokens += len(system_instruction) // 4
-                estimated_completion_tokens = len(text) // 4
-                metadata = {
-                    "prompt_tokens": estimated_prompt_tokens,
-                    "completion_tokens": estimated_completion_tokens,
-                    "total_tokens": estimated_prompt_tokens + estimated_completion_tokens,
-                    "completion_percent": round((estimated_completion_tokens / max_output_tokens) * 100, 1) if max_output_tokens > 0 else 0,
-                    "estimated": True
-                }
-            
-            if hasattr(response, 'choices') and len(response.choices) > 0:
-                finish_reason = getattr(response.choices[0], 'finish_reason', None)
-                # OpenAI finish_reason is usually already a string, but handle enum case
-                if finish_reason:
-                    if hasattr(finish_reason, 'value'):
-                        metadata["finish_reason"] = finish_reason.value
-                    elif isinstance(finish_reason, str):
-                        metadata["finish_reason"] = finish_reason
-                    else:
-                        metadata["finish_reason"] = str(finish_reason)
+        
+        if hasattr(response, 'choices') and len(response.choices) > 0:
+            finish_reason = getattr(response.choices[0], 'finish_reason', None)
+            # OpenAI finish_reason is usually already a string, but handle enum case
+            if finish_reason:
+                if hasattr(finish_reason, 'value'):
+                    metadata["finish_reason"] = finish_reason.value
+                elif isinstance(finish_reason, str):
+                    metadata["finish_reason"] = finish_reason
                 else:
-                    metadata["finish_reason"] = "UNKNOWN"
-            
-            if return_metadata:
-                return text, metadata
-            return text
-
-        except Exception as e:
-            logger.error(f"❌ LLM Execution Failed: {e}")
-            error_text = f"Error: {str(e)}"
-            if return_metadata:
-                return error_text, {"error": str(e)}
-            return error_text
+                    metadata["finish_reason"] = str(finish_reason)
+            else:
+                metadata["finish_reason"] = "UNKNOWN"
+        
+        return text, metadata
 
 llm_service = LLMService()
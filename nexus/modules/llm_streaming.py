@@ -0,0 +1,152 @@
+"""
+LLM Streaming
+
+Token-delta streaming shared by LLMGateway.stream_chat_completion and
+LLMService.stream_text. Both return an LLMStream: iterate it for text deltas
+as the provider produces them. Once iteration finishes, text and metadata
+hold the full completion.
+
+The provider request is issued when iteration starts. Time to first token
+(TTFT) is measured from then to the first non-empty delta and recorded in
+stream_metrics next to the total stream time.
+"""
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+from nexus.modules.metrics_utils import percentile
+
+logger = logging.getLogger("nexus.llm_streaming")
+
+# Recent samples kept for percentiles
+TTFT_SAMPLE_SIZE = 500
+
+
+class StreamMetrics:
+    """Process-wide streaming counters with recent TTFT / total-time samples."""
+
+    def __init__(self, sample_size: int = TTFT_SAMPLE_SIZE):
+        self._ttft_ms: Deque[float] = deque(maxlen=sample_size)
+        self._total_ms: Deque[float] = deque(maxlen=sample_size)
+        self._last_ttft_by_provider: Dict[str, float] = {}
+        self._stats = {"streams": 0, "completed": 0, "errors": 0, "cached": 0, "empty": 0}
+
+    def record_start(self) -> None:
+        self._stats["streams"] += 1
+
+    def record_first_token(self, provider: Optional[str], ttft_ms: float, cached: bool) -> None:
+        if cached:
+            # Cache hits would skew provider latency
+            self._stats["cached"] += 1
+            return
+        self._ttft_ms.append(ttft_ms)
+        self._last_ttft_by_provider[provider or "unknown"] = round(ttft_ms, 1)
+
+    def record_complete(self, total_ms: float, empty: bool) -> None:
+        self._stats["completed"] += 1
+        if empty:
+            self._stats["empty"] += 1
+        self._total_ms.append(total_ms)
+
+    def record_error(self) -> None:
+        self._stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "ttft_ms": {
+                "p50": percentile(self._ttft_ms, 0.5),
+                "p95": percentile(self._ttft_ms, 0.95),
+                "samples": len(self._ttft_ms),
+                "last_by_provider": dict(self._last_ttft_by_provider)
+            },
+            "total_ms": {
+                "p50": percentile(self._total_ms, 0.5),
+                "p95": percentile(self._total_ms, 0.95)
+            }
+        }
+
+
+class LLMStream:
+    """
+    Async iterator of text deltas for one completion.
+
+    source(stream) must return the provider's delta iterator. It receives the
+    stream so it can set `cached` and add to `metadata`.
+    """
+
+    def __init__(
+        self,
+        source: Callable[["LLMStream"], AsyncIterator[str]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        prompt_hash: str = "",
+        metrics: Optional[StreamMetrics] = None
+    ):
+        self._source = source
+        self._metrics = metrics or stream_metrics
+        self._consumed = False
+        self.provider = provider
+        self.model = model
+        self.prompt_hash = prompt_hash
+        self.cached = False
+        self.text = ""
+        self.metadata: Dict[str, Any] = {}
+        self.ttft_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        if self._consumed:
+            raise RuntimeError("LLMStream can only be iterated once")
+        self._consumed = True
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        self._metrics.record_start()
+        started = time.perf_counter()
+        parts = []
+        try:
+            async for delta in self._source(self):
+                if not delta:
+                    continue
+                if self.ttft_ms is None:
+                    self.ttft_ms = (time.perf_counter() - started) * 1000
+                    self._metrics.record_first_token(self.provider, self.ttft_ms, self.cached)
+                    logger.debug(f"First token from {self.provider}/{self.model} after {self.ttft_ms:.0f}ms")
+                parts.append(delta)
+                yield delta
+        except Exception:
+            self._metrics.record_error()
+            self.text = "".join(parts)
+            raise
+        self.text = "".join(parts)
+        self.total_ms = (time.perf_counter() - started) * 1000
+        self._metrics.record_complete(self.total_ms, empty=not parts)
+        self.metadata.update({
+            "prompt_hash": self.prompt_hash,
+            "cached": self.cached,
+            "ttft_ms": round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            "total_ms": round(self.total_ms, 1)
+        })
+
+    async def collect(self) -> str:
+        """Consumes the stream and returns the full text."""
+        async for _ in self:
+            pass
+        return self.text
+
+
+def estimate_usage(prompt_text: str, completion_text: str) -> Dict[str, Any]:
+    """Token estimate (1 token ≈ 4 chars) for streams whose provider sends no usage."""
+    prompt_tokens = len(prompt_text) // 4
+    completion_tokens = len(completion_text) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "estimated": True
+    }
+
+
+stream_metrics = StreamMetrics()
@@ -0,0 +1,130 @@
+"""
+LLM Sync Job Repository - Manages llm_sync_jobs (background catalog syncs)
+
+Job state lives in Postgres so every worker reports the same status and the
+"one sync at a time" rule holds across workers: a job is started by an INSERT
+that loses on the partial unique index over RUNNING rows (migration 046).
+"""
+import json
+import logging
+from typing import Any, Dict, Optional
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.metrics import instrument_repository
+
+logger = logging.getLogger("nexus.llm_sync_job_repository")
+
+
+def _row_to_job(row: Any) -> Dict[str, Any]:
+    row = dict(row)
+    started_at, finished_at = row.get("started_at"), row.get("finished_at")
+    return {
+        "job_id": row["job_id"],
+        "status": row["status"],
+        "started_at": started_at.isoformat() if started_at else None,
+        "finished_at": finished_at.isoformat() if finished_at else None,
+        "duration_ms": row.get("duration_ms"),
+        **(parse_jsonb(row.get("progress")) or {}),
+        "error": row.get("error")
+    }
+
+
+@instrument_repository
+class LLMSyncJobRepository:
+    """Repository for llm_sync_jobs operations"""
+
+    async def claim(self, job_id: str, progress: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Inserts a RUNNING job. Returns it, or None if another sync is already
+        running on any worker.
+        """
+        row = await database.fetch_one(
+            query="""
+                INSERT INTO llm_sync_jobs (job_id, status, progress)
+                VALUES (:job_id, 'RUNNING', CAST(:progress AS jsonb))
+                ON CONFLICT DO NOTHING
+                RETURNING *
+            """,
+            values={"job_id": job_id, "progress": json.dumps(progress)}
+        )
+        return _row_to_job(row) if row else None
+
+    async def expire_stale(self, stale_seconds: float) -> int:
+        """Fails RUNNING jobs whose worker stopped reporting progress."""
+        rows = await database.fetch_all(
+            query="""
+                UPDATE llm_sync_jobs
+                SET status = 'FAILED',
+                    error = 'Abandoned: no progress reported',
+                    finished_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'RUNNING'
+                  AND updated_at < CURRENT_TIMESTAMP - make_interval(secs => :stale_seconds)
+                RETURNING job_id
+            """,
+            values={"stale_seconds": stale_seconds}
+        )
+        for row in rows:
+            logger.warning(f"Model sync {row['job_id']} abandoned by its worker; marked FAILED")
+        return len(rows)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = await database.fetch_one(
+            query="SELECT * FROM llm_sync_jobs WHERE job_id = :job_id",
+            values={"job_id": job_id}
+        )
+        return _row_to_job(row) if row else None
+
+    async def get_running(self) -> Optional[Dict[str, Any]]:
+        row = await database.fetch_one(query="SELECT * FROM llm_sync_jobs WHERE status = 'RUNNING' LIMIT 1")
+        return _row_to_job(row) if row else None
+
+    async def save_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        await database.execute(
+            query="""
+                UPDATE llm_sync_jobs
+                SET progress = CAST(:progress AS jsonb), updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = :job_id AND status = 'RUNNING'
+            """,
+            values={"job_id": job_id, "progress": json.dumps(progress, default=str)}
+        )
+
+    async def finish(
+        self,
+        job_id: str,
+        status: str,
+        progress: Dict[str, Any],
+        duration_ms: int,
+        error: Optional[str] = None
+    ) -> None:
+        await database.execute(
+            query="""
+                UPDATE llm_sync_jobs
+                SET status = :status,
+                    progress = CAST(:progress AS jsonb),
+                    duration_ms = :duration_ms,
+                    error = :error,
+                    finished_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = :job_id
+            """,
+            values={
+                "job_id": job_id,
+                "status": status,
+                "progress": json.dumps(progress, default=str),
+                "duration_ms": duration_ms,
+                "error": error
+            }
+        )
+
+    async def prune(self, keep: int) -> None:
+        """Deletes finished jobs beyond the most recent `keep`."""
+        await database.execute(
+            query="""
+                DELETE FROM llm_sync_jobs
+                WHERE status <> 'RUNNING'
+                  AND job_id NOT IN (
+                      SELECT job_id FROM llm_sync_jobs ORDER BY started_at DESC LIMIT :keep
+                  )
+            """,
+            values={"keep": keep}
+        )
@@ -0,0 +1,312 @@
+"""
+In-process Metrics
+
+Counters, gauges and fixed-bucket histograms kept in plain dicts, exported in
+Prometheus text format (0.0.4) at GET /api/system/metrics.
+
+Everything runs on the event loop thread, so updates are plain dict/list
+operations with no locks: a labelled series is looked up once per call by its
+label-value tuple and incremented in place. Histograms keep per-bucket counts
+(not cumulative) and bisect into sorted bounds; cumulative counts are only
+built at scrape time.
+
+Gauges can be backed by a callback (set_function) evaluated at scrape time,
+which is how queue depths and connection counts are exposed without touching
+the hot path at all.
+
+Usage:
+    from nexus.modules.metrics import metrics
+
+    LLM_LATENCY = metrics.histogram("nexus_llm_call_seconds", "LLM call latency", ("provider", "model"))
+    LLM_LATENCY.labels("vertex-prod", "gemini-2.5-flash").observe(0.42)
+
+    with metrics.timer(DB_LATENCY, "CaseRepository", "get_case_state"):
+        ...
+"""
+import functools
+import inspect
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from nexus.modules.tracing import tracer
+
+logger = logging.getLogger("nexus.metrics")
+
+# Seconds; covers fast DB lookups through slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple, Any] = {}
+
+    def labels(self, *values: Any):
+        """Returns the child series for these label values (created on first use)."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple("" if v is None else str(v) for v in values)
+        child = self._series.get(key)
+        if child is None:
+            child = self._series[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        pass
+
+    @abstractmethod
+    def _samples(self) -> Iterable[Tuple[str, str, float]]:
+        pass
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in self._series.items():
+            yield self.name, _label_str(self.labelnames, key), child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Evaluate function() at scrape time instead of storing a value."""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is None:
+            return self.value
+        try:
+            return float(self.function())
+        except Exception as e:
+            logger.debug(f"Gauge callback failed: {e}")
+            return math.nan
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+    def _samples(self):
+        for key, child in list(self._series.items()):
+            yield self.name, _label_str(self.labelnames, key), child.get()
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self):
+        for key, child in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket", _label_str(self.labelnames, key, le), cumulative
+            labels = _label_str(self.labelnames, key)
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, child.count
+
+
+class MetricsRegistry:
+    """Named metrics for this process. Registering an existing name returns it."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} already registered as a different type or label set")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    @contextmanager
+    def timer(self, histogram: Histogram, *label_values: Any):
+        """Observes the body's wall time in seconds, including when it raises."""
+        child = histogram.labels(*label_values)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            child.observe(time.perf_counter() - start)
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Drops all recorded series (tests)."""
+        for metric in self._metrics.values():
+            metric._series.clear()
+
+
+metrics = MetricsRegistry()
+
+# --- Core series ---
+
+LLM_CALL_SECONDS = metrics.histogram(
+    "nexus_llm_call_seconds", "Provider call latency per attempt, excluding admission queue wait",
+    ("provider", "model", "outcome")
+)
+LLM_TOKENS = metrics.counter(
+    "nexus_llm_tokens_total", "Total tokens reported by providers", ("provider", "model")
+)
+DB_QUERY_SECONDS = metrics.histogram(
+    "nexus_db_query_seconds", "Repository method latency", ("repository", "method"), buckets=DB_BUCKETS
+)
+EVENTS = metrics.counter(
+    "nexus_events_total", "Application events recorded by orchestrators", ("event",)
+)
+
+
+def instrument_repository(cls):
+    """
+    Class decorator: times every public async method defined on the class in
+    DB_QUERY_SECONDS, labelled by class and method name, and records it as a
+    db.<Class>.<method> span when inside a trace.
+    """
+    repository = cls.__name__
+    for attr, fn in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.iscoroutinefunction(fn):
+            continue
+        setattr(cls, attr, _timed_method(fn, DB_QUERY_SECONDS.labels(repository, attr), f"db.{repository}.{attr}"))
+    return cls
+
+
+def _timed_method(fn, child: _HistogramChild, span_name: str):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with tracer.span(span_name):
+                return await fn(*args, **kwargs)
+        finally:
+            child.observe(time.perf_counter() - start)
+    return wrapper
@@ -0,0 +1,19 @@
+"""
+Metrics Utilities
+
+Small helpers shared by the modules that keep recent latency samples in
+memory (streaming, admission, routing, catalog sync probes).
+"""
+from typing import Iterable, Optional
+
+
+def percentile(samples: Optional[Iterable[float]], q: float, ndigits: Optional[int] = 1) -> Optional[float]:
+    """
+    Nearest-rank percentile (q in [0, 1]) of the samples, or None if there
+    are none. Rounded to ndigits (None keeps the raw sample).
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    value = ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return value if ndigits is None else round(value, ndigits)
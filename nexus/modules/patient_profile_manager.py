@@ -7,6 +7,7 @@ import logging
 from typing import Dict, Any, Optional
 from nexus.modules.database import database
 from nexus.tools.eligibility.patient_simulator import PatientSimulator
+from nexus.tools.eligibility.patient_record_cache import patient_record_cache
 
 logger = logging.getLogger("nexus.patient_profile_manager")
 
@@ -20,10 +21,14 @@ class PatientProfileManager:
     async def generate_synthetic_patient(self, patient_id: str, seed_data: Optional[Dict] = None) -> Dict[str, Any]:
         """Generate synthetic patient data"""
         try:
-            patient_data = self.patient_simulator.generate_synthetic_patient(
-                patient_id=patient_id,
-                seed_data=seed_data
-            )
+            if seed_data is None:
+                # Same record the EMR tools see for this patient
+                patient_data = await patient_record_cache.get(patient_id)
+            else:
+                patient_data = self.patient_simulator.generate_synthetic_patient(
+                    patient_id=patient_id,
+                    seed_data=seed_data
+                )
             
             # Store in database
             import json
@@ -1,11 +1,31 @@
 import logging
+import os
+import time
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 from nexus.modules.database import database
 from nexus.modules.audit_manager import audit_manager
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
 import json
 
 logger = logging.getLogger("nexus.prompt_manager")
 
+PROMPT_CACHE_REVALIDATE_SECONDS = float(os.getenv("PROMPT_CACHE_REVALIDATE_SECONDS", "30"))
+
+
+@dataclass
+class CachedPrompt:
+    """Parsed active prompt version held in the process-wide prompt cache."""
+    key: str
+    config: Dict[str, Any]
+    generation_config: Dict[str, Any]
+    version: Optional[int]
+    updated_at: Any
+    description: Optional[str]
+    estimated_length: int
+    checked_at: float
+
+
 class PromptManager:
     """
     Manages prompt templates stored in PostgreSQL.
@@ -13,8 +33,12 @@ class PromptManager:
     New structure: MODULE:DOMAIN:MODE:STEP (e.g., workflow:eligibility:TABULA_RASA:gate)
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, revalidate_seconds: float = PROMPT_CACHE_REVALIDATE_SECONDS):
+        # prompt_key -> CachedPrompt (active version only)
+        self._cache: Dict[str, CachedPrompt] = {}
+        self.revalidate_seconds = revalidate_seconds
+        # Bumped on invalidation so in-flight loads don't re-cache stale rows
+        self._generation = 0
     
     def _build_prompt_key(self, module_name: str, domain: str, mode: str, step: str) -> str:
         """
@@ -43,6 +67,10 @@ class PromptManager:
         Retrieves active prompt by unique identifier.
         Exact match only - no fallback logic.
         
+        The parsed config is served from a process-wide cache (see _load_cached_prompt);
+        per-session data such as conversation history is assembled on top of it.
+        The returned "config" is shared across callers and must be treated as read-only.
+        
         Args:
             module_name: e.g., 'workflow', 'chat'
             domain: e.g., 'eligibility', 'crm'
@@ -59,16 +87,95 @@ class PromptManager:
             } or None if not found
         """
         prompt_key = self._build_prompt_key(module_name, domain, mode, step)
-        logger.info(f"[PROMPT_MANAGER] get_prompt | Looking for key: '{prompt_key}' | module={module_name}, domain={domain}, mode={mode}, step={step}")
+        logger.debug(f"[PROMPT_MANAGER] get_prompt | Looking for key: '{prompt_key}' | module={module_name}, domain={domain}, mode={mode}, step={step}")
+        
+        cached = await self._load_cached_prompt(prompt_key)
+        if not cached:
+            return None
+        
+        config = cached.config
+        
+        # Emit thinking message about prompt usage
+        if session_id:
+            from nexus.core.thinking_emitter import emit_prompt_usage
+            try:
+                await emit_prompt_usage(
+                    session_id=session_id,
+                    prompt_key=prompt_key,
+                    prompt_length=cached.estimated_length,
+                    strategy=mode,  # Use mode instead of strategy
+                    module_name=module_name
+                )
+            except Exception as e:
+                logger.warning(f"[PROMPT_MANAGER] Failed to emit thinking message: {e}")
+        
+        # Get conversational history from orchestrator if session_id provided and prompt needs it
+        conversation_history = None
+        if session_id and "CONVERSATION_HISTORY" in config:
+            try:
+                # Import orchestrator to get conversation history
+                # Try to get the workflow orchestrator (most common case)
+                from nexus.conductors.workflows.orchestrator import orchestrator
+                conversation_history = await orchestrator.build_conversational_history(
+                    session_id=session_id,
+                    max_messages=config.get("CONVERSATION_HISTORY", {}).get("use_last_n", 5)
+                )
+                logger.debug(f"[PROMPT_MANAGER] Retrieved {len(conversation_history)} messages from conversation history")
+            except Exception as e:
+                logger.warning(f"[PROMPT_MANAGER] Failed to get conversation history: {e}")
+                conversation_history = []
+        
+        return {
+            "config": config,
+            "generation_config": cached.generation_config,
+            "version": cached.version,
+            "description": cached.description,
+            "key": prompt_key,
+            "conversation_history": conversation_history  # Add conversation history for use in context
+        }
+    
+    async def _load_cached_prompt(self, prompt_key: str) -> Optional[CachedPrompt]:
+        """
+        Returns the active prompt for a key from the cache.
+        
+        Fresh entries are returned without touching the DB. Entries older than
+        PROMPT_CACHE_REVALIDATE_SECONDS are revalidated with a version-only query
+        and the config is only re-fetched and re-parsed when the version (or
+        updated_at, for in-place edits by seed scripts) changed.
+        Writes through create_prompt/update_prompt evict entries immediately on
+        every worker via the invalidation bus.
+        """
+        entry = self._cache.get(prompt_key)
+        now = time.monotonic()
+        if entry and now - entry.checked_at < self.revalidate_seconds:
+            return entry
+        
+        if entry:
+            version_query = """
+                SELECT version, updated_at FROM prompt_templates 
+                WHERE prompt_key = :key AND is_active = true
+                ORDER BY version DESC
+                LIMIT 1
+            """
+            try:
+                current = await database.fetch_one(version_query, {"key": prompt_key})
+            except Exception as e:
+                logger.warning(f"[PROMPT_MANAGER] Version check failed for '{prompt_key}', serving cached v{entry.version}: {e}")
+                return entry
+            if current and (current["version"], current["updated_at"]) == (entry.version, entry.updated_at):
+                entry.checked_at = now
+                return entry
+            self._cache.pop(prompt_key, None)
         
         # Try exact match first
         query = """
-            SELECT prompt_config, version, description 
+            SELECT prompt_config, version, description, updated_at 
             FROM prompt_templates 
             WHERE prompt_key = :key AND is_active = true
             ORDER BY version DESC
             LIMIT 1
         """
+        generation = self._generation
         try:
             logger.debug(f"[PROMPT_MANAGER] Executing query for key: '{prompt_key}'")
             row = await database.fetch_one(query, {"key": prompt_key})
@@ -82,75 +189,57 @@ class PromptManager:
             logger.error(f"[PROMPT_MANAGER] Traceback: {traceback.format_exc()}")
             return None
         
-        if row:
-            row_dict = dict(row)
-            logger.info(f"[PROMPT_MANAGER] Found prompt for key '{prompt_key}' | Version: {row_dict.get('version')}")
-            try:
-                from nexus.modules.database import parse_jsonb
-                config = parse_jsonb(row["prompt_config"])
-                
-                # Ensure config is a dict
-                if not isinstance(config, dict):
-                    logger.error(f"[PROMPT_MANAGER] ERROR - prompt_config for {prompt_key} is not a valid dict: {type(config)}")
-                    logger.error(f"[PROMPT_MANAGER] Config value: {config}")
-                    return None
-                    
-                generation_config = config.get("GENERATION_CONFIG", {})
-                
-                # Estimate prompt length from config (will be more accurate after building, but this gives an idea)
-                # We can estimate by serializing the config
-                import json
-                estimated_length = len(json.dumps(config))
-                
-                # Emit thinking message about prompt usage
-                if session_id:
-                    from nexus.core.thinking_emitter import emit_prompt_usage
-                    try:
-                        await emit_prompt_usage(
-                            session_id=session_id,
-                            prompt_key=prompt_key,
-                            prompt_length=estimated_length,
-                            strategy=mode,  # Use mode instead of strategy
-                            module_name=module_name
-                        )
-                    except Exception as e:
-                        logger.warning(f"[PROMPT_MANAGER] Failed to emit thinking message: {e}")
-                
-                logger.info(f"[PROMPT_MANAGER] Successfully loaded prompt '{prompt_key}' | Version: {row_dict.get('version')}")
-                
-                # Get conversational history from orchestrator if session_id provided and prompt needs it
-                conversation_history = None
-                if session_id and "CONVERSATION_HISTORY" in config:
-                    try:
-                        # Import orchestrator to get conversation history
-                        # Try to get the workflow orchestrator (most common case)
-                        from nexus.conductors.workflows.orchestrator import orchestrator
-                        conversation_history = await orchestrator.build_conversational_history(
-                            session_id=session_id,
-                            max_messages=config.get("CONVERSATION_HISTORY", {}).get("use_last_n", 5)
-                        )
-                        logger.debug(f"[PROMPT_MANAGER] Retrieved {len(conversation_history)} messages from conversation history")
-                    except Exception as e:
-                        logger.warning(f"[PROMPT_MANAGER] Failed to get conversation history: {e}")
-                        conversation_history = []
-                
-                return {
-                    "config": config,
-                    "generation_config": generation_config,
-                    "version": row_dict.get("version"),
-                    "description": row_dict.get("description"),
-                    "key": prompt_key,
-                    "conversation_history": conversation_history  # Add conversation history for use in context
-                }
-            except Exception as e:
-                logger.error(f"[PROMPT_MANAGER] ERROR - Failed to parse prompt_config for '{prompt_key}': {e}")
-                import traceback
-                logger.error(f"[PROMPT_MANAGER] Traceback: {traceback.format_exc()}")
+        if not row:
+            # No exact match found - exact match only, no fallback (misses are not cached)
+            logger.warning(f"[PROMPT_MANAGER] No prompt found for key '{prompt_key}' (exact match only, no fallback)")
+            return None
+        
+        row_dict = dict(row)
+        try:
+            from nexus.modules.database import parse_jsonb
+            config = parse_jsonb(row_dict["prompt_config"])
+            
+            # Ensure config is a dict
+            if not isinstance(config, dict):
+                logger.error(f"[PROMPT_MANAGER] ERROR - prompt_config for {prompt_key} is not a valid dict: {type(config)}")
+                logger.error(f"[PROMPT_MANAGER] Config value: {config}")
                 return None
+            
+            # Estimate prompt length from config once per version
+            # (will be more accurate after building, but this gives an idea)
+            raw_config = row_dict["prompt_config"]
+            estimated_length = len(raw_config) if isinstance(raw_config, str) else len(json.dumps(config))
+        except Exception as e:
+            logger.error(f"[PROMPT_MANAGER] ERROR - Failed to parse prompt_config for '{prompt_key}': {e}")
+            import traceback
+            logger.error(f"[PROMPT_MANAGER] Traceback: {traceback.format_exc()}")
+            return None
         
-        # No exact match found - exact match only, no fallback
-        logger.warning(f"[PROMPT_MANAGER] No prompt found for key '{prompt_key}' (exact match only, no fallback)")
-        return None
+        entry = CachedPrompt(
+            key=prompt_key,
+            config=config,
+            generation_config=config.get("GENERATION_CONFIG", {}),
+            version=row_dict.get("version"),
+            updated_at=row_dict.get("updated_at"),
+            description=row_dict.get("description"),
+            estimated_length=estimated_length,
+            checked_at=time.monotonic()
+        )
+        # Skip caching if the key was invalidated while we were loading
+        if generation == self._generation:
+            self._cache[prompt_key] = entry
+        logger.info(f"[PROMPT_MANAGER] Loaded prompt '{prompt_key}' | Version: {entry.version}")
+        return entry
+    
+    def invalidate(self, prompt_key: Optional[str] = None) -> None:
+        """
+        Evicts one prompt (or all prompts) from the cache.
+        """
+        self._generation += 1
+        if prompt_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(prompt_key, None)
     
     async def create_prompt(
         self,
@@ -212,6 +301,8 @@ class PromptManager:
             details={"prompt_key": prompt_key, "module": module_name}
         )
         
+        await invalidation_bus.publish(InvalidationKind.PROMPT, prompt_key)
+        
         return prompt_id
     
     async def update_prompt(
@@ -285,8 +376,11 @@ class PromptManager:
             except Exception as e:
                 # Log but don't fail the update if audit fails
                 logger.warning(f"Failed to log audit event for prompt update: {e}")
-            
-            return new_id
+        
+        # Evict cached copies on every worker once the new version is committed
+        await invalidation_bus.publish(InvalidationKind.PROMPT, prompt_key)
+        
+        return new_id
     
     async def list_prompts(
         self,
@@ -414,3 +508,5 @@ class PromptManager:
 
 prompt_manager = PromptManager()
 
+invalidation_bus.subscribe(InvalidationKind.PROMPT, prompt_manager.invalidate)
+
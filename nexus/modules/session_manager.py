@@ -1,18 +1,94 @@
 from fastapi import WebSocket
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 import asyncio
+import os
+
+from nexus.modules.metrics import metrics
+from nexus.modules.ws_broadcast import BroadcastBackend, create_backend
 
 logger = logging.getLogger("nexus.session_manager")
 
+# Per-connection outbound buffer; a client that falls this far behind is disconnected
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+# A single send taking longer than this marks the client as stalled
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+
+# Close code for slow consumers (1013 = Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+WS_CONNECTION_EVENTS = metrics.counter(
+    "nexus_ws_connection_events_total", "WebSocket connects, disconnects and slow-consumer drops", ("event",)
+)
+
+
+class ConnectionWriter:
+    """
+    Owns one WebSocket's outbound path: a bounded queue drained by a
+    dedicated writer task, so broadcasters never await a socket.
+    """
+    def __init__(self, manager: "SessionManager", session_id: int, websocket: WebSocket):
+        self.manager = manager
+        self.session_id = session_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.task = asyncio.create_task(self._run(), name=f"ws-writer-{self.session_id}")
+
+    def offer(self, data: Dict[str, Any]) -> bool:
+        """Queues a message without blocking. Returns False if the queue is full."""
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_json(data), timeout=WS_SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"WS send timed out for Session {self.session_id}; disconnecting slow client")
+            await self.manager._close_slow(self)
+        except Exception as e:
+            logger.warning(f"Failed to send to WS: {e}")
+            self.manager.disconnect(self.session_id, self.websocket)
+
+    def stop(self):
+        if self.task and not self.task.done() and self.task is not asyncio.current_task():
+            self.task.cancel()
+
+
 class SessionManager:
     """
     Manages active WebSocket connections for sessions.
     Path A of the Dual-Path Streaming Architecture.
+
+    broadcast() goes through a pluggable backend (see ws_broadcast) so events
+    reach sockets connected to any worker.
     """
-    def __init__(self):
+    def __init__(self, backend: Optional[BroadcastBackend] = None):
         # session_id -> List[WebSocket]
         self.active_connections: Dict[int, List[WebSocket]] = {}
+        self._writers: Dict[int, ConnectionWriter] = {}  # id(websocket) -> writer
+        self.backend = backend or create_backend()
+        self.backend.bind(self._deliver_local)
+        self._stats = {"broadcasts": 0, "delivered": 0, "slow_disconnects": 0}
+
+    async def start(self):
+        """Starts the broadcast backend. Called from app startup."""
+        await self.backend.start()
+
+    async def stop(self):
+        for writer in list(self._writers.values()):
+            writer.stop()
+        self._writers.clear()
+        await self.backend.stop()
 
     async def connect(self, session_id: int, websocket: WebSocket):
         """Accepts and stores a new WS connection."""
@@ -20,6 +96,10 @@ class SessionManager:
         if session_id not in self.active_connections:
             self.active_connections[session_id] = []
         self.active_connections[session_id].append(websocket)
+        writer = ConnectionWriter(self, session_id, websocket)
+        self._writers[id(websocket)] = writer
+        writer.start()
+        WS_CONNECTION_EVENTS.labels("connect").inc()
         logger.info(f"WS Connected to Session {session_id}. Total: {len(self.active_connections[session_id])}")
 
     def disconnect(self, session_id: int, websocket: WebSocket):
@@ -29,28 +109,66 @@ class SessionManager:
                 self.active_connections[session_id].remove(websocket)
                 if not self.active_connections[session_id]:
                     del self.active_connections[session_id]
+        writer = self._writers.pop(id(websocket), None)
+        if writer:
+            writer.stop()
+            WS_CONNECTION_EVENTS.labels("disconnect").inc()
         logger.info(f"WS Disconnected from Session {session_id}")
 
     async def broadcast(self, session_id: int, data: Dict[str, Any]):
         """
-        Push data to all connected clients for this session.
+        Push data to all connected clients for this session, on every worker.
         (Path A: Immediate UI Update)
+        Never blocks on a client socket.
         """
-        if session_id in self.active_connections:
-            logger.debug(f"Broadcasting to {len(self.active_connections[session_id])} clients in Session {session_id}")
-            # Broadcast to all connected sockets
-            # Use asyncio.gather to broadcast in parallel? Or simple loop.
-            # Simple loop is safer for connection handling usually.
-            to_remove = []
-            for connection in self.active_connections[session_id]:
-                try:
-                    await connection.send_json(data)
-                except Exception as e:
-                    logger.warning(f"Failed to send to WS: {e}")
-                    to_remove.append(connection)
-            
-            # Cleanup dead connections
-            for dead in to_remove:
-                self.disconnect(session_id, dead)
+        self._stats["broadcasts"] += 1
+        await self.backend.publish(session_id, data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            **self._stats,
+            "backend": type(self.backend).__name__,
+            "sessions": len(self.active_connections),
+            "connections": sum(len(c) for c in self.active_connections.values()),
+            "max_queue_depth": max((w.queue.qsize() for w in self._writers.values()), default=0),
+        }
+        if hasattr(self.backend, "get_stats"):
+            stats["backend_stats"] = self.backend.get_stats()
+        return stats
+
+    def _deliver_local(self, session_id: int, data: Dict[str, Any]):
+        """Queues a message on every local connection for the session."""
+        connections = self.active_connections.get(session_id)
+        if not connections:
+            return
+        logger.debug(f"Broadcasting to {len(connections)} clients in Session {session_id}")
+        for connection in list(connections):
+            writer = self._writers.get(id(connection))
+            if writer is None:
+                continue
+            if writer.offer(data):
+                self._stats["delivered"] += 1
+            else:
+                logger.warning(f"WS send queue full for Session {session_id}; disconnecting slow client")
+                asyncio.ensure_future(self._close_slow(writer))
+
+    async def _close_slow(self, writer: ConnectionWriter):
+        """Slow-consumer policy: drop the connection, the client reconnects and resyncs."""
+        if id(writer.websocket) not in self._writers:
+            return
+        self._stats["slow_disconnects"] += 1
+        WS_CONNECTION_EVENTS.labels("slow_disconnect").inc()
+        self.disconnect(writer.session_id, writer.websocket)
+        try:
+            await writer.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
 
 session_manager = SessionManager()
+
+metrics.gauge(
+    "nexus_ws_connections", "Open WebSocket connections on this worker"
+).set_function(lambda: len(session_manager._writers))
+metrics.gauge(
+    "nexus_ws_send_queue_depth_max", "Deepest per-connection WebSocket send queue on this worker"
+).set_function(lambda: max((w.queue.qsize() for w in list(session_manager._writers.values())), default=0))
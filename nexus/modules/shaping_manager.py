@@ -1,5 +1,6 @@
 import logging
 import asyncio
+import copy
 from typing import List, Optional, Dict, Any
 import json
 from dataclasses import asdict
@@ -8,11 +9,12 @@ from nexus.brains.gate_engine import GateEngine
 from nexus.brains.planner import planner_brain
 from nexus.core.base_agent import BaseAgent # New Streaming Core
 from nexus.core.json_parser import json_parser
-from nexus.core.gate_models import GateConfig, GateDef, GateState, GateValue, StatusInfo
+from nexus.core.gate_models import GateConfig, CompiledGateConfig, GateDef, GateState, GateValue, StatusInfo
 from nexus.modules.prompt_manager import prompt_manager
 from nexus.services.gate.state_repository import GateStateRepository
 from nexus.services.gate.config_loader import GateConfigLoader
 from nexus.services.shaping.session_repository import ShapingSessionRepository
+from nexus.services.shaping.session_unit_of_work import ShapingSessionAggregate, current_session
 
 class ShapingManager:
     """
@@ -31,13 +33,36 @@ class ShapingManager:
         self.session_repository = ShapingSessionRepository()
     
     async def _load_gate_state(self, session_id: int) -> Optional[GateState]:
-        """Load gate state from database. Delegates to GateStateRepository."""
+        """Load gate state from the open turn's session, else from database (GateStateRepository)."""
+        session = current_session(session_id)
+        if session is not None:
+            return copy.deepcopy(session.gate_state)
         return await self.state_repository.load(session_id)
     
     async def _save_gate_state(self, session_id: int, gate_state: GateState) -> None:
-        """Save gate state to database. Delegates to GateStateRepository."""
+        """Save gate state to the open turn's session (flushed at turn end), else to database."""
+        session = current_session(session_id)
+        if session is not None:
+            session.set_gate_state(gate_state)
+            return
         await self.state_repository.save(session_id, gate_state)
     
+    async def _save_draft_plan(self, session_id: int, draft_plan: Dict[str, Any]) -> None:
+        """Save the draft plan to the open turn's session, else to database."""
+        session = current_session(session_id)
+        if session is not None:
+            session.set_draft_plan(draft_plan)
+            return
+        await self.session_repository.update_draft_plan(session_id, draft_plan)
+    
+    async def _save_transcript(self, session_id: int, transcript: List[Dict[str, Any]]) -> None:
+        """Persist new transcript messages via the open turn's session, else directly."""
+        session = current_session(session_id)
+        if session is not None:
+            session.set_transcript(transcript)
+            return
+        await self.session_repository.update_transcript(session_id, transcript)
+    
     async def _load_gate_config(self, strategy: str, session_id: Optional[int] = None) -> Optional[GateConfig]:
         """Load gate config from prompt. Delegates to GateConfigLoader."""
         return await self.config_loader.load(strategy, session_id)
@@ -365,20 +390,17 @@ class ShapingManager:
                 **(context or {})
             }
             
-            # Format through conversational agent
-            formatted_content = await conversational_agent.format_response(
-                raw_response=raw_content,
-                user_id=user_id,
-                context=formatting_context
+            # Stream the formatted response as OUTPUT_DELTA events; the full
+            # OUTPUT is persisted once and returns memory_event_id
+            memory_event_id = await agent.emit_output_stream(
+                conversational_agent.stream_response(
+                    raw_response=raw_content,
+                    user_id=user_id,
+                    context=formatting_context
+                ),
+                {"role": "system"},
+                fallback_content=raw_content
             )
-            
-            # Emit thinking after formatting
-            await agent.emit("THINKING", {
-                "message": f"Response formatted and ready (length: {len(formatted_content)} chars)"
-            })
-            
-            # Emit formatted OUTPUT and return memory_event_id
-            memory_event_id = await agent.emit("OUTPUT", {"role": "system", "content": formatted_content})
             return memory_event_id
             
         except Exception as e:
@@ -557,7 +579,7 @@ class ShapingManager:
             
             # Also explicitly persist here for immediate availability (BaseAgent does this too, but this ensures it)
             try:
-                await self.session_repository.update_draft_plan(session_id, initial_draft)
+                await self._save_draft_plan(session_id, initial_draft)
                 logging.debug(f"[SHAPING_MANAGER] Persisted initial draft plan to database")
             except Exception as e:
                 logging.error(f"[SHAPING_MANAGER] Failed to persist initial draft plan: {e}", exc_info=True)
@@ -604,7 +626,7 @@ class ShapingManager:
             })
             
             # Persist
-            await self.session_repository.update_draft_plan(session_id, new_draft)
+            await self._save_draft_plan(session_id, new_draft)
             await agent.emit("PERSISTENCE", {"action": "UPDATE_SESSION", "id": session_id})
             
         except Exception as e:
@@ -760,7 +782,7 @@ class ShapingManager:
                     "completion_status": completion_status
                 })
                 
-                await self.session_repository.update_transcript(session_id, transcript)
+                await self._save_transcript(session_id, transcript)
                 
                 # Emit HANDOFF artifact
                 gate_state = await self._load_gate_state(session_id)
@@ -779,7 +801,7 @@ class ShapingManager:
                     )
                     # Save draft plan to database after handoff/confirmation
                     try:
-                        await self.session_repository.update_draft_plan(session_id, draft_plan)
+                        await self._save_draft_plan(session_id, draft_plan)
                         logging.debug(f"[SHAPING_MANAGER] Saved draft plan to database after handoff | gates_count={len(draft_plan.get('gates', []))}")
                     except Exception as e:
                         logging.error(f"[SHAPING_MANAGER] Failed to save draft plan to database: {e}", exc_info=True)
@@ -894,6 +916,7 @@ class ShapingManager:
         if not current_gate:
             return (None, False, None, False)
         
+        gate_config = CompiledGateConfig.of(gate_config)
         gate_def = gate_config.gates.get(current_gate)
         if not gate_def:
             return (None, False, None, False)
@@ -908,18 +931,15 @@ class ShapingManager:
         # Also check if content itself matches an expected category (fallback for button clicks not detected)
         # This handles cases where conversational agent didn't set original_value
         if not is_button_click and gate_def.expected_categories:
-            user_input_normalized = user_text.strip()
-            user_input_lower = user_input_normalized.lower()
-            for category in gate_def.expected_categories:
-                if user_input_normalized == category or user_input_lower == category.lower():
-                    # Content matches expected category - treat as button click
-                    is_button_click = True
-                    user_text_for_gate = category  # Use exact category value
-                    logging.debug(f"[SHAPING_MANAGER] Step 2: Detected button click pattern - content '{user_text}' matches category '{category}'")
-                    # Update transcript to set original_value for future reference
-                    if transcript and last_user_msg.get("role") == "user":
-                        last_user_msg["original_value"] = category
-                    break
+            category = gate_config.match_category(current_gate, user_text)
+            if category:
+                # Content matches expected category - treat as button click
+                is_button_click = True
+                user_text_for_gate = category  # Use exact category value
+                logging.debug(f"[SHAPING_MANAGER] Step 2: Detected button click pattern - content '{user_text}' matches category '{category}'")
+                # Update transcript to set original_value for future reference
+                if transcript and last_user_msg.get("role") == "user":
+                    last_user_msg["original_value"] = category
         
         gate_result = None
         state_already_saved = False
@@ -941,17 +961,7 @@ class ShapingManager:
                 
                 # Check for direct category match
                 if gate_def.expected_categories:
-                    user_input_normalized = user_text_for_gate.strip()
-                    user_input_lower = user_input_normalized.lower()
-                    
-                    matched_category = None
-                    for category in gate_def.expected_categories:
-                        if user_input_normalized == category:
-                            matched_category = category
-                            break
-                        elif user_input_lower == category.lower():
-                            matched_category = category
-                            break
+                    matched_category = gate_config.match_category(current_gate, user_text_for_gate)
                     
                     if matched_category:
                         # Direct match - set gate value
@@ -1062,14 +1072,11 @@ class ShapingManager:
         if is_button_click:
             # Button click - check if value matches limiting_values
             if gate_def.limiting_values:
-                user_input_normalized = user_text_for_gate.strip()
-                user_input_lower = user_input_normalized.lower()
-                limiting_values_lower = [v.lower() for v in gate_def.limiting_values]
+                matched_value = gate_config.match_limiting_value(current_gate, user_text_for_gate)
                 
-                if user_text_for_gate in gate_def.limiting_values or user_input_lower in limiting_values_lower:
+                if matched_value:
                     # Gate failed - stop workflow
                     from datetime import datetime
-                    matched_value = user_text_for_gate if user_text_for_gate in gate_def.limiting_values else next((v for v in gate_def.limiting_values if v.lower() == user_input_lower), user_text_for_gate)
                     
                     stop_gates = previous_state.gates.copy() if previous_state else {}
                     stop_gates[current_gate] = GateValue(
@@ -1105,17 +1112,7 @@ class ShapingManager:
             
             # Button click but not limiting - use direct matching
             if gate_def.expected_categories:
-                user_input_normalized = user_text_for_gate.strip()
-                user_input_lower = user_input_normalized.lower()
-                
-                matched_category = None
-                for category in gate_def.expected_categories:
-                    if user_input_normalized == category:
-                        matched_category = category
-                        break
-                    elif user_input_lower == category.lower():
-                        matched_category = category
-                        break
+                matched_category = gate_config.match_category(current_gate, user_text_for_gate)
                 
                 if matched_category:
                     # Direct match - set gate value
@@ -1213,16 +1210,13 @@ class ShapingManager:
         stop_classification = None
         stop_message = None
         
-        for gate_key, g_def in gate_config.gates.items():
-            if not g_def.limiting_values:
-                continue
-            
+        for gate_key, limiting_values in gate_config.limiting_values.items():
             gate_value = gate_result.proposed_state.gates.get(gate_key)
-            if gate_value and gate_value.classified in g_def.limiting_values:
+            if gate_value and gate_value.classified in limiting_values:
                 should_stop = True
                 stop_gate_key = gate_key
                 stop_classification = gate_value.classified
-                stop_message = g_def.stop_message
+                stop_message = gate_config.gates[gate_key].stop_message
                 break
         
         if should_stop:
@@ -1354,7 +1348,7 @@ class ShapingManager:
                 )
                 # Save draft plan to database after problem statement update
                 try:
-                    await self.session_repository.update_draft_plan(session_id, updated_draft)
+                    await self._save_draft_plan(session_id, updated_draft)
                     logging.debug(f"[SHAPING_MANAGER] Saved draft plan to database after problem statement update | gates_count={len(updated_draft.get('gates', []))}")
                 except Exception as e:
                     logging.error(f"[SHAPING_MANAGER] Failed to save draft plan to database: {e}", exc_info=True)
@@ -1459,14 +1453,24 @@ class ShapingManager:
 
     async def append_message(self, session_id: int, role: str, content: str) -> Dict[str, Any]:
         """
-        Appends a message to the session transcript.
+        Appends a message to the session transcript and runs one gate turn.
+        
+        The session (transcript, citations, iteration count, strategy, gate
+        state, draft plan) is loaded once and its changes are flushed in one
+        transaction when the turn ends. Raises SessionConflictError if another
+        turn for the same session flushed first.
         """
+        async with self.session_repository.unit_of_work(session_id) as session:
+            if session is None:
+                return
+            return await self._run_turn(session, role, content)
+    
+    async def _run_turn(self, session: ShapingSessionAggregate, role: str, content: str) -> Dict[str, Any]:
+        session_id = session.session_id
         agent = BaseAgent(session_id=session_id)
         
-        # 2. Fetch current state using repository
-        transcript = await self.session_repository.get_transcript(session_id)
-        if transcript is None:
-            return
+        # 2. Current state comes from the turn's session aggregate
+        transcript = list(session.transcript)
         
         # Check if this is a button click that was already saved by conversational agent
         # If the last message is a user message with original_value matching this content, skip duplicate
@@ -1481,8 +1485,10 @@ class ShapingManager:
                 # Ensure original_value is set correctly (in case it wasn't set by conversational agent)
                 if not last_msg.get("original_value"):
                     last_msg["original_value"] = content
-                    # Update transcript in database to persist the fix
-                    await self.session_repository.update_transcript(session_id, transcript)
+                    # Persist the fix on the stored message
+                    await self.session_repository.messages.update_last_message(
+                        session_id, "user", {"original_value": content}
+                    )
                 # Don't add duplicate - the button label is already in transcript
                 # But we need to process the category value, so continue with gate engine
             else:
@@ -1496,12 +1502,11 @@ class ShapingManager:
             await agent.emit("OUTPUT", {"role": role, "content": content})
             transcript.append({"role": role, "content": content, "timestamp": "now"})
         
-        rag_data = await self.session_repository.get_rag_citations(session_id)
+        rag_data = session.rag_citations
         
         # Get iteration tracking
-        iteration_info = await self.session_repository.get_iteration_info(session_id)
-        iteration_count = iteration_info.get("iteration_count", 0)
-        max_iterations = iteration_info.get("max_iterations", 15)
+        iteration_count = session.iteration_count
+        max_iterations = session.max_iterations
         
         # --- 3. CHECK ITERATION LIMIT ---
         
@@ -1510,7 +1515,7 @@ class ShapingManager:
                 "message": f"Iteration limit reached ({max_iterations}). Stopping Consultant loop and using best available plan."
             })
             # Extract best plan from current state and hand off
-            current_plan = await self.session_repository.get_draft_plan(session_id) or {}
+            current_plan = session.draft_plan or {}
             await agent.emit("ARTIFACTS", {
                 "type": "DRAFT_PLAN",
                 "data": current_plan,
@@ -1519,19 +1524,15 @@ class ShapingManager:
             logging.warning(f"Session {session_id} hit iteration limit ({max_iterations})")
             return
         
-        # Increment iteration count (repository handles missing column gracefully)
-        await self.session_repository.increment_iteration_count(session_id)
+        # Increment iteration count
+        session.increment_iteration()
         
         # --- 4. GATE ENGINE EXECUTION ---
         await agent.emit("THINKING", {"message": "Processing your input..."})
 
         # A. Resolve Strategy and Load GateConfig
-        user_and_strategy = await self.session_repository.get_user_and_strategy(session_id)
-        if not user_and_strategy:
-            logging.error(f"Session {session_id} not found")
-            return
-        user_id = user_and_strategy.get("user_id")
-        strategy = user_and_strategy.get("consultant_strategy", "TABULA_RASA")
+        user_id = session.user_id
+        strategy = session.strategy or "TABULA_RASA"
         
         # Load gate config
         gate_config = await self._load_gate_config(strategy, session_id=session_id)
@@ -1598,7 +1599,7 @@ class ShapingManager:
             await self._save_gate_state(session_id, gate_result.proposed_state)
         
         # Get RAG data from session for planner context
-        rag_data = await self.session_repository.get_rag_citations(session_id)
+        rag_data = session.rag_citations
         
         # --- EMIT ARTIFACTS FOR LIVE BUILDER (After Each Gate Execution) ---
         # Every time user reacts, gate agent emits for live builder to capture and update
@@ -1622,7 +1623,7 @@ class ShapingManager:
                 
                 # Save draft plan to database after each gate interaction
                 try:
-                    await self.session_repository.update_draft_plan(session_id, updated_draft)
+                    await self._save_draft_plan(session_id, updated_draft)
                     logging.debug(f"[SHAPING_MANAGER] Saved draft plan to database after gate execution | gates_count={len(updated_draft.get('gates', []))}")
                 except Exception as e:
                     logging.error(f"[SHAPING_MANAGER] Failed to save draft plan to database: {e}", exc_info=True)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Header
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -256,88 +256,114 @@ async def check_eligibility(request: EligibilityCheckRequest, background_tasks:
         logger.error(f"Error checking eligibility: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
+# Max seconds between SSE keepalive comments when no events are pushed
+SSE_KEEPALIVE_SECONDS = 15
+
+_SSE_EVENT_TYPES = {
+    "ELIGIBILITY_PROCESS": "status",
+    "THINKING": "thinking",
+    "OUTPUT": "chat",
+    "OUTPUT_DELTA": "chat_delta",
+}
+
+
+def _format_sse_event(event) -> Optional[str]:
+    """Formats a hub StreamEvent as an SSE frame (with id for Last-Event-ID resume)."""
+    event_type = _SSE_EVENT_TYPES.get(event.bucket)
+    if not event_type:
+        return None
+    event_data = {
+        "type": event_type,
+        "payload": event.payload,
+        "timestamp": event.created_at,
+        "event_id": event.id
+    }
+    # For OUTPUT events, include memory_event_id for feedback
+    if event_type == "chat":
+        event_data["memory_event_id"] = event.id
+    if event.id is None:
+        # Ephemeral (not resumable): no id line, so Last-Event-ID keeps the last persisted event
+        return f"data: {json.dumps(event_data, default=str)}\n\n"
+    return f"id: {event.id}\ndata: {json.dumps(event_data, default=str)}\n\n"
+
+
 @router.get("/eligibility/stream")
 async def stream_eligibility_events(
     session_id: int = Query(..., description="Session ID to stream events for"),
-    last_event_time: Optional[str] = Query(None, description="ISO timestamp of last received event")
+    last_event_id: Optional[int] = Query(None, description="Resume after this memory_events id"),
+    last_event_time: Optional[str] = Query(None, description="ISO timestamp of last received event (legacy resume)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
 ):
     """
     Stream eligibility events via Server-Sent Events (SSE).
-    Streams ELIGIBILITY_PROCESS, THINKING, and OUTPUT events from memory_events table.
+    Streams ELIGIBILITY_PROCESS, THINKING, and OUTPUT events pushed by the
+    session event hub. History (or everything after Last-Event-ID on
+    reconnect) is loaded once with a catch-up query, then events are pushed.
     """
-    from nexus.modules.database import parse_jsonb
+    from nexus.core.event_hub import event_hub
+    
+    cursor = last_event_id
+    if cursor is None and last_event_id_header and last_event_id_header.isdigit():
+        cursor = int(last_event_id_header)
+    after_time = None
+    if cursor is None and last_event_time:
+        try:
+            after_time = datetime.fromisoformat(last_event_time.replace('Z', '+00:00'))
+        except ValueError:
+            pass
     
     async def event_generator():
+        # Subscribe before catching up so nothing written in between is missed
+        subscription = event_hub.subscribe(session_id)
+        last_id = cursor or 0
+        # Push order can differ slightly from id order (batched vs direct writes)
+        seen_ids: set = set()
+        
+        def emit(event) -> Optional[str]:
+            nonlocal last_id
+            if event.id is None:
+                return _format_sse_event(event)
+            if event.id in seen_ids or (event.id <= (cursor or 0)):
+                return None
+            seen_ids.add(event.id)
+            if len(seen_ids) > 5000:
+                seen_ids.difference_update(sorted(seen_ids)[:2500])
+            last_id = max(last_id, event.id)
+            return _format_sse_event(event)
+        
         try:
-            last_timestamp = None
-            if last_event_time:
-                try:
-                    last_timestamp = datetime.fromisoformat(last_event_time.replace('Z', '+00:00'))
-                except:
-                    pass
-            
             # Initial connection message
             yield f"data: {json.dumps({'type': 'connected', 'session_id': session_id, 'timestamp': datetime.now(timezone.utc).isoformat()})}\n\n"
             
+            for event in await event_hub.catch_up(session_id, last_id, after_time):
+                frame = emit(event)
+                if frame:
+                    yield frame
+            
             while True:
                 try:
-                    # Query for new events
-                    query = """
-                        SELECT id, bucket_type, payload, created_at
-                        FROM memory_events
-                        WHERE session_id = :session_id
-                        AND bucket_type IN ('ELIGIBILITY_PROCESS', 'THINKING', 'OUTPUT')
-                    """
-                    params = {"session_id": session_id}
-                    
-                    if last_timestamp:
-                        query += " AND created_at > :last_timestamp"
-                        params["last_timestamp"] = last_timestamp
-                    
-                    query += " ORDER BY created_at ASC LIMIT 100"
-                    
-                    rows = await database.fetch_all(query=query, values=params)
-                    
-                    if rows:
-                        for row in rows:
-                            event_type = None
-                            # Parse JSONB payload properly
-                            payload_data = parse_jsonb(row["payload"])
-                            
-                            # Map bucket_type to event type
-                            if row["bucket_type"] == "ELIGIBILITY_PROCESS":
-                                event_type = "status"
-                            elif row["bucket_type"] == "THINKING":
-                                event_type = "thinking"
-                            elif row["bucket_type"] == "OUTPUT":
-                                event_type = "chat"
-                            
-                            if event_type:
-                                # Format timestamp
-                                timestamp = row["created_at"]
-                                if hasattr(timestamp, "isoformat"):
-                                    timestamp_str = timestamp.isoformat()
-                                else:
-                                    timestamp_str = str(timestamp)
-                                
-                                # For OUTPUT events, include memory_event_id for feedback
-                                memory_event_id = row["id"] if event_type == "chat" else None
-                                
-                                event_data = {
-                                    "type": event_type,
-                                    "payload": payload_data,
-                                    "timestamp": timestamp_str,
-                                    "event_id": row["id"]
-                                }
-                                if memory_event_id:
-                                    event_data["memory_event_id"] = memory_event_id
-                                
-                                yield f"data: {json.dumps(event_data)}\n\n"
-                                last_timestamp = row["created_at"]
+                    if subscription.lagged:
+                        # Buffer overflowed or listener reconnected: reload from cursor
+                        subscription.drain()
+                        subscription.lagged = False
+                        try:
+                            missed = await event_hub.catch_up(session_id, last_id)
+                        except Exception:
+                            subscription.lagged = True
+                            raise
+                        for event in missed:
+                            frame = emit(event)
+                            if frame:
+                                yield frame
+                        continue
                     
-                    # Poll every 500ms
-                    await asyncio.sleep(0.5)
-                    yield f": keepalive\n\n"
+                    event = await subscription.next(timeout=SSE_KEEPALIVE_SECONDS)
+                    if event is None:
+                        yield f": keepalive\n\n"
+                        continue
+                    frame = emit(event)
+                    if frame:
+                        yield frame
                     
                 except asyncio.CancelledError:
                     logger.info(f"SSE stream cancelled for session {session_id}")
@@ -360,6 +386,8 @@ async def stream_eligibility_events(
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             yield f"data: {json.dumps(error_data)}\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
     
     return StreamingResponse(
         event_generator(),
@@ -1,6 +1,10 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
 from nexus.modules.database import database
+from nexus.modules.metrics import metrics
 from nexus.modules.migration_runner import run_migrations
+from nexus.modules.tracing import tracer
 
 router = APIRouter(prefix="/api/system", tags=["System"])
 
@@ -30,3 +34,38 @@ async def dump_debug_tables():
         "traces": [dict(r) for r in traces],
         "activity": [dict(r) for r in activity]
     }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    In-process metrics (LLM, DB, queues, WebSockets, eligibility stages) in Prometheus text format.
+    Per worker: scrape each instance.
+    """
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/traces")
+async def list_traces(session: Optional[str] = None, limit: int = 20):
+    """
+    Recent traced turns (root spans), newest first. session is the shaping
+    session id or eligibility case id.
+    """
+    roots = await tracer.list_traces(session, min(max(limit, 1), 200))
+    return {
+        "traces": [
+            {"trace_id": r["trace_id"], "name": r["name"], "session": r["session"],
+             "duration_ms": r["duration_ms"], "status": r["status"]}
+            for r in roots
+        ],
+        "stats": tracer.get_stats()
+    }
+
+@router.get("/traces/{trace_id}")
+async def trace_waterfall(trace_id: str):
+    """
+    Waterfall for one turn: spans ordered by start, with offset from the turn
+    start, duration and nesting depth.
+    """
+    waterfall = tracer.waterfall(await tracer.load_trace(trace_id))
+    if waterfall is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return waterfall
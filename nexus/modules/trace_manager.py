@@ -2,11 +2,14 @@ import json
 from uuid import uuid4
 from typing import Dict, Any, Optional
 from nexus.modules.database import database
+from nexus.modules.tracing import tracer
 
 class TraceManager:
     """
     Manages the 'Black Box' logging of LLM interactions.
     Stores raw prompts and completions for auditing and debugging.
+    Inside a traced turn, rows are tagged with the turn's trace and span ids
+    so a waterfall (GET /api/system/traces/{trace_id}) links to the raw payloads.
     """
 
     async def log_trace(
@@ -22,6 +25,10 @@ class TraceManager:
         Returns the generated Trace UUID.
         """
         trace_id = str(uuid4())
+        span = tracer.current()
+        if span is not None:
+            model_metadata = {**model_metadata, "trace_id": span.trace_id, "span_id": span.span_id}
+            span.set(llm_trace_log_id=trace_id, step_name=step_name)
         
         query = """
         INSERT INTO llm_trace_logs 
@@ -0,0 +1,381 @@
+"""
+Span Tracing
+
+Lightweight nested spans for request turns (shaping chat, eligibility turns),
+tracked with a ContextVar so child spans pick up their parent across awaits
+and into tasks created inside the turn (asyncio copies the context).
+
+- tracer.trace(name, session=...) starts a trace, or a child span when one is
+  already active. Orchestrator entry points use it.
+- tracer.span(name, **attributes) records a child span only inside a trace;
+  outside one (startup, background jobs) it is a ContextVar lookup and
+  nothing else. LLM calls, repository methods and emits use it.
+- tracer.start()/end() record a span without making it current, for work
+  that is interleaved with its caller (async generators / streams).
+
+Finished spans go to an in-process ring buffer and, when TRACE_PERSIST is on,
+are written to trace_spans in batches by a background flush (same pattern as
+the LLM latency flush). GET /api/system/traces/{trace_id} returns the
+waterfall for one turn.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("nexus.tracing")
+
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+# Finished spans kept in memory (across all traces)
+TRACE_RING_SIZE = int(os.getenv("TRACE_RING_SIZE", "20000"))
+# Also write spans to the trace_spans table
+TRACE_PERSIST = os.getenv("TRACE_PERSIST", "false").lower() == "true"
+TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "200"))
+TRACE_FLUSH_SECONDS = float(os.getenv("TRACE_FLUSH_SECONDS", "2"))
+
+# Attribute values are truncated to this many characters
+MAX_ATTRIBUTE_CHARS = 300
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("nexus_current_span", default=None)
+
+
+def _new_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def _attribute(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value if isinstance(value, str) else str(value)
+    return text if len(text) <= MAX_ATTRIBUTE_CHARS else text[:MAX_ATTRIBUTE_CHARS] + "..."
+
+
+class Span:
+    """One timed unit of work inside a trace."""
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "session", "attributes",
+                 "start", "_perf", "duration_ms", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], session: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.session = session
+        self.attributes = {k: _attribute(v) for k, v in attributes.items()}
+        self.start = time.time()
+        self._perf = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+
+    def set(self, **attributes: Any) -> None:
+        for key, value in attributes.items():
+            self.attributes[key] = _attribute(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "session": self.session,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Creates spans, keeps finished ones in a ring buffer and batches them to trace_spans."""
+
+    def __init__(
+        self,
+        enabled: bool = TRACE_ENABLED,
+        ring_size: int = TRACE_RING_SIZE,
+        persist: bool = TRACE_PERSIST,
+        batch_size: int = TRACE_BATCH_SIZE,
+        flush_seconds: float = TRACE_FLUSH_SECONDS
+    ):
+        self.enabled = enabled
+        self.persist = persist
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=ring_size)
+        self._pending: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stats = {"traces": 0, "spans": 0, "written": 0, "write_failures": 0, "dropped": 0}
+
+    # --- Creating spans ---
+
+    def current(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def current_trace_id(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.trace_id if span else None
+
+    def start(self, name: str, root: bool = False, session: Any = None, **attributes: Any) -> Optional[Span]:
+        """
+        Starts a span under the current one without making it current.
+        Returns None when there is no active trace and root is False.
+        """
+        if not self.enabled:
+            return None
+        parent = _current_span.get()
+        if parent is None:
+            if not root:
+                return None
+            self._stats["traces"] += 1
+            return Span(name, _new_id() + _new_id(), None, None if session is None else str(session), attributes)
+        if session is not None:
+            attributes["session"] = session
+        return Span(name, parent.trace_id, parent.span_id, parent.session, attributes)
+
+    def end(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if span is None or span.duration_ms is not None:
+            return
+        span.duration_ms = round((time.perf_counter() - span._perf) * 1000, 2)
+        if error is not None:
+            span.status = "cancelled" if isinstance(error, asyncio.CancelledError) else "error"
+            span.attributes["error"] = _attribute(f"{type(error).__name__}: {error}")
+        record = span.to_dict()
+        self._ring.append(record)
+        self._stats["spans"] += 1
+        if self.persist:
+            if len(self._pending) >= self._ring.maxlen:
+                self._stats["dropped"] += 1
+            else:
+                self._pending.append(record)
+            self._maybe_flush()
+
+    @contextmanager
+    def _activate(self, span: Optional[Span]):
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end(span, e)
+            raise
+        finally:
+            self.end(span)
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Exited in a different context than it was entered in
+                pass
+
+    def trace(self, name: str, session: Any = None, **attributes: Any):
+        """Starts a trace (or a child span if one is active) and makes it current."""
+        return self._activate(self.start(name, root=True, session=session, **attributes))
+
+    def span(self, name: str, **attributes: Any):
+        """Child span of the current trace; a no-op outside one."""
+        if _current_span.get() is None:
+            return self._activate(None)
+        return self._activate(self.start(name, **attributes))
+
+    def traced(self, name: Optional[str] = None, root: bool = False, session_arg: Optional[str] = None):
+        """
+        Decorator for coroutine functions. root=True starts a trace when none is
+        active; session_arg names the argument that identifies the session.
+        """
+        def decorator(fn: Callable):
+            span_name = name or fn.__qualname__
+            signature = inspect.signature(fn) if session_arg else None
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return await fn(*args, **kwargs)
+                session = None
+                if signature is not None:
+                    try:
+                        session = signature.bind_partial(*args, **kwargs).arguments.get(session_arg)
+                    except TypeError:
+                        pass
+                context = self.trace(span_name, session=session) if root else self.span(span_name)
+                with context:
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- Reading traces ---
+
+    def recent_traces(self, session: Any = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent root spans in the ring buffer, optionally for one session."""
+        key = None if session is None else str(session)
+        roots = []
+        for record in reversed(self._ring):
+            if record["parent_id"] is None and (key is None or record["session"] == key):
+                roots.append(record)
+                if len(roots) >= limit:
+                    break
+        return roots
+
+    def get_spans(self, trace_id: str) -> List[Dict[str, Any]]:
+        return [record for record in self._ring if record["trace_id"] == trace_id]
+
+    async def list_traces(self, session: Any = None, limit: int = 20) -> List[Dict[str, Any]]:
+        roots = self.recent_traces(session, limit)
+        if roots or not self.persist:
+            return roots
+        from nexus.modules.database import database
+        rows = await database.fetch_all(
+            """
+            SELECT * FROM trace_spans
+            WHERE parent_id IS NULL AND (CAST(:session AS TEXT) IS NULL OR session_key = :session)
+            ORDER BY started_at DESC
+            LIMIT :limit
+            """,
+            {"session": None if session is None else str(session), "limit": limit}
+        )
+        return [self._from_row(row) for row in rows]
+
+    async def load_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans of one trace from the ring buffer, or from trace_spans once evicted."""
+        spans = self.get_spans(trace_id)
+        if spans or not self.persist:
+            return spans
+        from nexus.modules.database import database
+        rows = await database.fetch_all(
+            "SELECT * FROM trace_spans WHERE trace_id = :trace_id",
+            {"trace_id": trace_id}
+        )
+        return [self._from_row(row) for row in rows]
+
+    @staticmethod
+    def _from_row(row) -> Dict[str, Any]:
+        from nexus.modules.database import parse_jsonb
+        return {
+            "trace_id": row["trace_id"],
+            "span_id": row["span_id"],
+            "parent_id": row["parent_id"],
+            "name": row["name"],
+            "session": row["session_key"],
+            "start": row["started_at"].timestamp(),
+            "duration_ms": row["duration_ms"],
+            "status": row["status"],
+            "attributes": parse_jsonb(row["attributes"]) or {},
+        }
+
+    @staticmethod
+    def waterfall(spans: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Orders a trace's spans by start with offsets from the root and nesting depth."""
+        if not spans:
+            return None
+        spans = sorted(spans, key=lambda s: s["start"])
+        root = next((s for s in spans if s["parent_id"] is None), spans[0])
+        parents = {s["span_id"]: s["parent_id"] for s in spans}
+
+        def depth(span_id: Optional[str]) -> int:
+            level = 0
+            while parents.get(span_id) is not None and level < 64:
+                span_id = parents[span_id]
+                level += 1
+            return level
+
+        origin = root["start"]
+        return {
+            "trace_id": root["trace_id"],
+            "name": root["name"],
+            "session": root["session"],
+            "started_at": datetime.fromtimestamp(origin, timezone.utc).isoformat(),
+            "duration_ms": root["duration_ms"],
+            "spans": [
+                {
+                    "span_id": s["span_id"],
+                    "parent_id": s["parent_id"],
+                    "name": s["name"],
+                    "depth": depth(s["span_id"]),
+                    "offset_ms": round((s["start"] - origin) * 1000, 2),
+                    "duration_ms": s["duration_ms"],
+                    "status": s["status"],
+                    "attributes": s["attributes"],
+                }
+                for s in spans
+            ],
+        }
+
+    # --- Persistence ---
+
+    def _maybe_flush(self) -> None:
+        if len(self._pending) < self.batch_size and time.monotonic() - self._last_flush < self.flush_seconds:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_flush = time.monotonic()
+        self._flush_task = loop.create_task(self.flush(), name="trace-span-flush")
+
+    async def flush(self) -> int:
+        """Writes pending spans to trace_spans. Failed batches are dropped, not retried."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        from nexus.modules.database import database
+        try:
+            await database.execute_many(
+                """
+                INSERT INTO trace_spans
+                (span_id, trace_id, parent_id, name, session_key, started_at, duration_ms, status, attributes)
+                VALUES (:span_id, :trace_id, :parent_id, :name, :session_key, :started_at, :duration_ms, :status,
+                        CAST(:attributes AS jsonb))
+                ON CONFLICT (span_id) DO NOTHING
+                """,
+                [
+                    {
+                        "span_id": s["span_id"],
+                        "trace_id": s["trace_id"],
+                        "parent_id": s["parent_id"],
+                        "name": s["name"],
+                        "session_key": s["session"],
+                        "started_at": datetime.fromtimestamp(s["start"], timezone.utc),
+                        "duration_ms": s["duration_ms"],
+                        "status": s["status"],
+                        "attributes": json.dumps(s["attributes"], default=str),
+                    }
+                    for s in batch
+                ]
+            )
+        except Exception as e:
+            self._stats["write_failures"] += len(batch)
+            logger.warning(f"Failed to write {len(batch)} trace spans: {e}")
+            return 0
+        self._stats["written"] += len(batch)
+        return len(batch)
+
+    async def close(self) -> None:
+        """Writes what is left. Called from app shutdown before the database disconnects."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self.persist:
+            await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "persist": self.persist,
+            "buffered": len(self._ring),
+            "pending": len(self._pending),
+        }
+
+
+tracer = Tracer()
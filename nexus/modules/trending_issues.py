@@ -1,8 +1,6 @@
 import logging
-import json
 from typing import List, Dict, Set
 from collections import defaultdict
-from nexus.modules.database import database, parse_jsonb
 
 logger = logging.getLogger("nexus.trending_issues")
 
@@ -17,7 +15,7 @@ DEFAULT_TRENDING_ISSUES = [
 
 async def get_recent_searches(days: int = 7) -> List[str]:
     """
-    Extracts user queries from shaping_sessions transcripts within the last N days.
+    Extracts user queries from session messages within the last N days.
     
     Args:
         days: Number of days to look back (default: 7)
@@ -26,44 +24,16 @@ async def get_recent_searches(days: int = 7) -> List[str]:
         List of unique user query strings (normalized)
     """
     try:
-        # Use string formatting for INTERVAL since PostgreSQL doesn't support parameter binding in INTERVAL literals
-        query = f"""
-            SELECT transcript, created_at
-            FROM shaping_sessions
-            WHERE created_at >= NOW() - INTERVAL '{days} days'
-            ORDER BY created_at DESC
-        """
-        
-        rows = await database.fetch_all(query)
+        from nexus.services.shaping.message_repository import SessionMessageRepository
+        contents = await SessionMessageRepository().get_recent_by_role("user", days)
         
         user_queries: Set[str] = set()
         
-        for row in rows:
-            row_dict = dict(row)
-            transcript = row_dict.get("transcript")
-            
-            # Parse transcript if it's a string
-            if isinstance(transcript, str):
-                try:
-                    transcript = json.loads(transcript)
-                except (json.JSONDecodeError, TypeError):
-                    logger.warning(f"Failed to parse transcript: {transcript}")
-                    continue
-            
-            # Extract user messages from transcript
-            if isinstance(transcript, list):
-                for msg in transcript:
-                    if not isinstance(msg, dict):
-                        continue
-                    
-                    role = msg.get("role", "").lower()
-                    content = msg.get("content", "")
-                    
-                    if role == "user" and content:
-                        # Normalize: lowercase, strip whitespace
-                        normalized = content.strip().lower()
-                        if normalized and len(normalized) > 3:  # Filter out very short queries
-                            user_queries.add(normalized)
+        for content in contents:
+            # Normalize: lowercase, strip whitespace
+            normalized = content.strip().lower()
+            if normalized and len(normalized) > 3:  # Filter out very short queries
+                user_queries.add(normalized)
         
         result = list(user_queries)
         logger.debug(f"Extracted {len(result)} unique user queries from last {days} days")
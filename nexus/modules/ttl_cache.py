@@ -0,0 +1,102 @@
+"""
+TTL Cache
+
+In-memory TTL + LRU cache with single-flight loading, shared by the response
+caches that sit in front of slow or billable calls (270 eligibility checks,
+patient records, LLM completions). Each of those keeps its own second level
+(Postgres, a record store) and its own hit/miss accounting on top of this.
+
+- Entries expire after ttl_seconds (or an explicit expires_at) and the least
+  recently used entry is evicted beyond max_entries.
+- Values are deep-copied in and out; cached values are never handed out for
+  mutation.
+- load_once(): concurrent misses for the same key share one in-flight load.
+"""
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def hit_rate(hits: int, lookups: int) -> Optional[float]:
+    """Fraction of lookups served from cache, or None before the first lookup."""
+    return round(hits / lookups, 4) if lookups else None
+
+
+class TTLCache:
+    """TTL + LRU memory cache with single-flight loads."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (expires_at epoch seconds, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats = {"coalesced": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Copy of the live value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Stores a copy of value until expires_at (default: now + ttl_seconds)."""
+        if expires_at is None:
+            expires_at = time.time() + self.ttl_seconds
+        self._entries[key] = (expires_at, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def load_once(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Returns (copy of load()'s result, coalesced). load() runs at most once
+        per key at a time; callers arriving meanwhile wait for it and get
+        coalesced=True. Its exceptions propagate to every waiter. load() is
+        responsible for put()-ing whatever should be cached.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            return copy.deepcopy(await asyncio.shield(inflight)), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await load()
+            future.set_result(result)
+            return copy.deepcopy(result), False
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, match: Optional[Callable[[Any], bool]] = None) -> int:
+        """Drops entries whose key satisfies match (all when None). Returns the count removed."""
+        doomed = [k for k in self._entries if match is None or match(k)]
+        for k in doomed:
+            del self._entries[k]
+        return len(doomed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "ttl_seconds": self.ttl_seconds
+        }
@@ -7,10 +7,12 @@ import logging
 import json
 from typing import Optional, Dict, Any, List
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.users.profile_repository")
 
 
+@instrument_repository
 class ProfileRepository:
     """Repository for profile data access."""
     
@@ -8,10 +8,12 @@ import json
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.users.repository")
 
 
+@instrument_repository
 class UserRepository:
     """Repository for user data access."""
     
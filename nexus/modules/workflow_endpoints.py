@@ -9,6 +9,7 @@ from nexus.tools.crm.risk_calculator import RiskCalculatorTool
 from nexus.modules.session_manager import session_manager
 from nexus.modules.database import database
 from nexus.modules.user_profile_events import track_workflow_interaction
+from nexus.services.shaping import SessionConflictError
 
 # Setup Logger
 logger = logging.getLogger("nexus.workflows")
@@ -153,7 +154,12 @@ async def start_shaping(req: StartShapingRequest, background_tasks: BackgroundTa
         if session_id:
             try:
                 # Get session details for tracking
-                session_query = "SELECT consultant_strategy, transcript FROM shaping_sessions WHERE id = :session_id"
+                session_query = """
+                    SELECT s.consultant_strategy, t.transcript
+                    FROM shaping_sessions s
+                    JOIN shaping_session_transcripts t ON t.session_id = s.id
+                    WHERE s.id = :session_id
+                """
                 session_row = await database.fetch_one(session_query, {"session_id": session_id})
                 
                 if session_row:
@@ -306,6 +312,10 @@ async def shaping_chat(session_id: int, req: ChatRequest, background_tasks: Back
             logger.warning(f"Failed to track workflow interaction: {e}", exc_info=True)
         
         return result
+    except SessionConflictError as e:
+        # Another message for this session was processed concurrently
+        logger.warning(f"Chat message conflict: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to handle chat message: {e}")
         raise HTTPException(status_code=500, detail=str(e))
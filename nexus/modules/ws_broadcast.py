@@ -0,0 +1,204 @@
+"""
+WebSocket Broadcast Backends
+
+Pluggable transport behind SessionManager.broadcast so an event emitted on one
+worker reaches WebSockets connected to any worker.
+
+Backends (WS_BROADCAST_BACKEND):
+- "postgres" (default): deliver locally, then NOTIFY every other worker
+  through the shared PgNotifyListener. Payloads above the NOTIFY limit are
+  split into chunks and reassembled by the receiver.
+- "memory": in-process only (single worker / dev).
+- "local_broker": several managers in one process share an in-memory
+  broker - a stand-in for a real broker when exercising multi-worker paths.
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("nexus.ws_broadcast")
+
+WS_BROADCAST_BACKEND = os.getenv("WS_BROADCAST_BACKEND", "postgres")
+CHANNEL = "nexus_ws_broadcast"
+
+# Incomplete chunked messages are discarded after this many seconds
+CHUNK_TTL_SECONDS = 30
+
+# Called with (session_id, data) to hand a message to local connections
+DeliverCallback = Callable[[int, Dict[str, Any]], None]
+
+
+class BroadcastBackend(ABC):
+    """Transport for session broadcasts."""
+
+    def __init__(self):
+        self._deliver: Optional[DeliverCallback] = None
+
+    def bind(self, deliver: DeliverCallback) -> None:
+        self._deliver = deliver
+
+    @abstractmethod
+    async def publish(self, session_id: int, data: Dict[str, Any]) -> None:
+        ...
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def _deliver_local(self, session_id: int, data: Dict[str, Any]) -> None:
+        if self._deliver is not None:
+            self._deliver(session_id, data)
+
+
+class InProcessBackend(BroadcastBackend):
+    """Single-process delivery."""
+
+    async def publish(self, session_id: int, data: Dict[str, Any]) -> None:
+        self._deliver_local(session_id, data)
+
+
+class LocalBroker:
+    """In-memory stand-in for an external broker shared by several backends."""
+
+    def __init__(self):
+        self.backends: List["LocalBrokerBackend"] = []
+
+    def route(self, sender: "LocalBrokerBackend", session_id: int, data: Dict[str, Any]) -> None:
+        for backend in self.backends:
+            if backend is not sender:
+                backend._deliver_local(session_id, data)
+
+
+_default_broker = LocalBroker()
+
+
+class LocalBrokerBackend(BroadcastBackend):
+    def __init__(self, broker: Optional[LocalBroker] = None):
+        super().__init__()
+        self.broker = broker or _default_broker
+        self.broker.backends.append(self)
+
+    async def publish(self, session_id: int, data: Dict[str, Any]) -> None:
+        self._deliver_local(session_id, data)
+        self.broker.route(self, session_id, data)
+
+    async def stop(self) -> None:
+        if self in self.broker.backends:
+            self.broker.backends.remove(self)
+
+
+class PgNotifyBackend(BroadcastBackend):
+    """
+    LISTEN/NOTIFY transport. Until start() runs (scripts, tests) it behaves
+    like the in-process backend.
+    """
+
+    def __init__(self, channel: str = CHANNEL):
+        super().__init__()
+        self.channel = channel
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._listener = None
+        # (origin, message_id) -> (first_seen, session_id, total, {index: chunk})
+        self._partial: Dict[Tuple[str, str], Tuple[float, int, int, Dict[int, str]]] = {}
+        self._stats = {"published": 0, "received": 0, "chunked": 0, "publish_errors": 0}
+
+    async def publish(self, session_id: int, data: Dict[str, Any]) -> None:
+        self._deliver_local(session_id, data)
+        if self._listener is None:
+            return
+        try:
+            for payload in self._encode(session_id, data):
+                await self._listener.publish(self.channel, payload)
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["publish_errors"] += 1
+            logger.warning(f"Failed to NOTIFY broadcast for session {session_id}: {e}")
+
+    async def start(self) -> None:
+        from nexus.services.database.notify_listener import notify_listener
+        if self._listener is None:
+            notify_listener.subscribe(self.channel, self._on_payload)
+            self._listener = notify_listener
+        await notify_listener.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending_chunked": len(self._partial)}
+
+    def _encode(self, session_id: int, data: Dict[str, Any]) -> List[str]:
+        from nexus.services.database.notify_listener import MAX_PAYLOAD_BYTES
+
+        body = json.dumps(data, default=str)
+        single = json.dumps({"o": self.origin, "s": session_id, "d": body}, separators=(",", ":"))
+        if len(single.encode("utf-8")) <= MAX_PAYLOAD_BYTES:
+            return [single]
+
+        # body is ASCII (json.dumps escapes the rest); re-escaping a chunk at
+        # most doubles it. Leave room for the envelope.
+        chunk_chars = (MAX_PAYLOAD_BYTES - 200) // 2
+        chunks = [body[i:i + chunk_chars] for i in range(0, len(body), chunk_chars)]
+        message_id = uuid.uuid4().hex[:12]
+        self._stats["chunked"] += 1
+        return [
+            json.dumps(
+                {"o": self.origin, "s": session_id, "m": message_id, "i": i, "n": len(chunks), "d": chunk},
+                separators=(",", ":")
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+
+    async def _on_payload(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError as e:
+            logger.warning(f"Ignoring malformed broadcast payload: {e}")
+            return
+        if message.get("o") == self.origin:
+            return
+
+        session_id = message["s"]
+        if "m" not in message:
+            body = message["d"]
+        else:
+            body = self._reassemble(message)
+            if body is None:
+                return
+
+        self._stats["received"] += 1
+        try:
+            self._deliver_local(session_id, json.loads(body))
+        except ValueError as e:
+            logger.warning(f"Ignoring undecodable broadcast for session {session_id}: {e}")
+
+    def _reassemble(self, message: Dict[str, Any]) -> Optional[str]:
+        now = time.monotonic()
+        for key in [k for k, v in self._partial.items() if now - v[0] > CHUNK_TTL_SECONDS]:
+            del self._partial[key]
+
+        key = (message["o"], message["m"])
+        first_seen, session_id, total, chunks = self._partial.setdefault(
+            key, (now, message["s"], message["n"], {})
+        )
+        chunks[message["i"]] = message["d"]
+        if len(chunks) < total:
+            return None
+        del self._partial[key]
+        return "".join(chunks[i] for i in range(total))
+
+
+def create_backend(name: str = WS_BROADCAST_BACKEND) -> BroadcastBackend:
+    """
+    Builds the configured backend.
+    """
+    if name == "memory":
+        return InProcessBackend()
+    if name == "local_broker":
+        return LocalBrokerBackend()
+    if name == "postgres":
+        return PgNotifyBackend()
+    raise ValueError(f"Unknown WS_BROADCAST_BACKEND: {name}")
@@ -3,15 +3,19 @@ Eligibility Agent V2 - Router
 
 FastAPI endpoints for the Eligibility Agent V2.
 """
+import asyncio
 import logging
 import re
 import json
-from typing import Optional
+import uuid
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from nexus.agents.eligibility_v2.orchestrator import EligibilityOrchestrator
+from nexus.agents.eligibility_v2.orchestrator import EligibilityOrchestrator, BATCH_JOB_CONCURRENCY
+from nexus.services.eligibility_v2.batch_job_repository import TERMINAL_STATUSES
 from nexus.agents.eligibility_v2.models import UIEvent
 from nexus.brains.conversational_agent import conversational_agent
 from nexus.services.shaping.session_repository import ShapingSessionRepository
@@ -23,11 +27,25 @@ orchestrator = EligibilityOrchestrator()
 session_repo = ShapingSessionRepository()
 
 
+# Batch jobs running in this worker, by job_id
+_batch_tasks: Dict[str, asyncio.Task] = {}
+
+# How often the progress stream re-reads the job row
+BATCH_PROGRESS_POLL_SECONDS = 1.0
+
+
 class SessionStartRequest(BaseModel):
     """Request model for starting a session"""
     user_id: str
 
 
+class BatchJobRequest(BaseModel):
+    """Request model for a bulk scoring job"""
+    patient_ids: List[str]
+    job_id: Optional[str] = None
+    concurrency: Optional[int] = None
+
+
 async def _load_conversation_history(session_id: int) -> list:
     """Load conversation history from session transcript"""
     try:
@@ -46,6 +64,25 @@ async def _emit_process_event(session_id: Optional[int], phase: str, status: str
         await orchestrator._emit_process_event(session_id, phase, status, message, data)
 
 
+async def _store_output_event(session_id: int, payload: dict) -> None:
+    """Store an OUTPUT event and push it to SSE subscribers"""
+    from nexus.modules.database import database
+    from nexus.core.event_hub import event_hub
+    row = await database.fetch_one(
+        query="""
+        INSERT INTO memory_events (session_id, bucket_type, payload)
+        VALUES (:sid, 'OUTPUT', :payload)
+        RETURNING id, created_at
+        """,
+        values={
+            "sid": session_id,
+            "payload": json.dumps(payload)
+        }
+    )
+    if row:
+        await event_hub.publish_event(row["id"], session_id, "OUTPUT", payload, row["created_at"])
+
+
 @router.post("/session/start")
 async def start_session(request: SessionStartRequest):
     """Create a new eligibility session"""
@@ -84,22 +121,11 @@ async def submit_user_message(
     # Store user message in OUTPUT bucket for process event filtering
     if session_id and ui_event.event_type == "user_message":
         try:
-            from nexus.modules.database import database
-            import json
-            await database.execute(
-                query="""
-                INSERT INTO memory_events (session_id, bucket_type, payload)
-                VALUES (:sid, 'OUTPUT', :payload)
-                """,
-                values={
-                    "sid": session_id,
-                    "payload": json.dumps({
-                        "role": "user",
-                        "content": ui_event.data.get("message", ""),
-                        "timestamp": ui_event.timestamp
-                    })
-                }
-            )
+            await _store_output_event(session_id, {
+                "role": "user",
+                "content": ui_event.data.get("message", ""),
+                "timestamp": ui_event.timestamp
+            })
             logger.debug(f"Stored user message in OUTPUT bucket for session {session_id}")
         except Exception as e:
             logger.warning(f"Failed to store user message: {e}")
@@ -231,8 +257,6 @@ async def submit_user_message(
     # Store formatted response in OUTPUT bucket for SSE streaming
     if session_id:
         try:
-            from nexus.modules.database import database
-            import json
             from datetime import datetime, timezone
             output_payload = {
                 "role": "assistant",
@@ -241,16 +265,7 @@ async def submit_user_message(
                 "next_questions": result.get("next_questions", []),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
-            await database.execute(
-                query="""
-                INSERT INTO memory_events (session_id, bucket_type, payload)
-                VALUES (:sid, 'OUTPUT', :payload)
-                """,
-                values={
-                    "sid": session_id,
-                    "payload": json.dumps(output_payload)
-                }
-            )
+            await _store_output_event(session_id, output_payload)
             logger.debug(f"Stored assistant response in OUTPUT bucket for session {session_id}")
         except Exception as e:
             logger.warning(f"Failed to store assistant response: {e}")
@@ -405,6 +420,102 @@ async def get_process_events(
         return {"events": []}
 
 
+def _start_batch_task(job_id: str, concurrency: Optional[int]) -> None:
+    task = asyncio.create_task(orchestrator.run_batch_job(job_id, concurrency=concurrency))
+    _batch_tasks[job_id] = task
+    
+    def _done(t: asyncio.Task):
+        _batch_tasks.pop(job_id, None)
+        if not t.cancelled() and t.exception():
+            logger.error(f"Batch job {job_id} stopped: {t.exception()}")
+    task.add_done_callback(_done)
+
+
+@router.post("/batch-jobs")
+async def create_batch_job(request: BatchJobRequest):
+    """
+    Score a list of patients (e.g. tomorrow's schedule) deterministically,
+    without the interpreter. Runs in the background; poll or stream progress.
+    """
+    if not request.patient_ids:
+        raise HTTPException(status_code=400, detail="patient_ids is required")
+    job_id = request.job_id or f"job-{uuid.uuid4().hex[:12]}"
+    concurrency = request.concurrency or BATCH_JOB_CONCURRENCY
+    job = await orchestrator.batch_job_repo.create_job(job_id, request.patient_ids, concurrency)
+    if job["patient_ids"] != list(dict.fromkeys(request.patient_ids)):
+        raise HTTPException(status_code=409, detail="Batch job already exists with a different patient list")
+    if job["status"] in TERMINAL_STATUSES:
+        return {"job": _job_summary(job)}
+    # The claim is atomic across workers; losing it means the job runs elsewhere
+    if await orchestrator.batch_job_repo.claim_job(job_id):
+        _start_batch_task(job_id, concurrency)
+    return {"job": _job_summary(job)}
+
+
+@router.post("/batch-jobs/{job_id}/resume")
+async def resume_batch_job(job_id: str):
+    """Resume an interrupted job; patients already scored are skipped."""
+    job = await orchestrator.batch_job_repo.get_job(job_id, include_patients=False)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    if not await orchestrator.batch_job_repo.claim_job(job_id):
+        raise HTTPException(status_code=409, detail="Batch job is already running")
+    _start_batch_task(job_id, job.get("concurrency"))
+    return {"job": _job_summary(job)}
+
+
+@router.get("/batch-jobs/{job_id}")
+async def get_batch_job(job_id: str):
+    job = await orchestrator.batch_job_repo.get_job(job_id, include_patients=False)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return {"job": _job_summary(job)}
+
+
+@router.get("/batch-jobs/{job_id}/stream")
+async def stream_batch_job(job_id: str):
+    """Server-Sent Events with job progress until it completes or fails."""
+    if not await orchestrator.batch_job_repo.get_job(job_id, include_patients=False):
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    
+    async def event_generator():
+        last = None
+        while True:
+            job = await orchestrator.batch_job_repo.get_job(job_id, include_patients=False)
+            summary = _job_summary(job) if job else {"job_id": job_id, "status": "FAILED", "error": "Batch job not found"}
+            if summary != last:
+                yield f"data: {json.dumps(summary, default=str)}\n\n"
+                last = summary
+            if summary["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(BATCH_PROGRESS_POLL_SECONDS)
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+def _job_summary(job: dict) -> dict:
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "total": job["total"],
+        "completed": job["completed"],
+        "failed": job["failed"],
+        "patients_per_second": job.get("patients_per_second"),
+        "error": job.get("error"),
+        "running_here": job["job_id"] in _batch_tasks,
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at")
+    }
+
+
 def _parse_metadata(metadata):
     """Parse metadata if it's a JSON string"""
     if metadata is None:
@@ -0,0 +1,83 @@
+"""
+Benchmark bulk eligibility scoring throughput (patients per second).
+
+Patients come from PatientSimulator (the EMR and 270 tools are backed by it),
+so any MRN works. By default only the deterministic scoring path is timed
+(EligibilityOrchestrator.score_patient, bounded worker pool, no writes).
+With --persist a real batch job runs against the configured database,
+including the bulk writes to eligibility_score_runs.
+
+Usage:
+    python nexus/scripts/benchmark_batch_scoring.py [--patients 1000] [--concurrency 1,8,32] [--persist]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import os
+import time
+import uuid
+
+# Add parent directory to path (nexus/scripts -> nexus -> project root)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+nexus_dir = os.path.dirname(script_dir)
+project_root = os.path.dirname(nexus_dir)
+sys.path.insert(0, project_root)
+
+from nexus.modules.database import connect_to_db, disconnect_from_db
+from nexus.agents.eligibility_v2.orchestrator import EligibilityOrchestrator
+
+
+async def score_only(orchestrator: EligibilityOrchestrator, patient_ids, concurrency: int) -> float:
+    queue: asyncio.Queue = asyncio.Queue()
+    for patient_id in patient_ids:
+        queue.put_nowait(patient_id)
+
+    async def worker():
+        while not queue.empty():
+            await orchestrator.score_patient(queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(patient_ids) / (time.perf_counter() - start)
+
+
+async def main(count: int, concurrency_levels, persist: bool):
+    # Per-patient INFO logging would dominate the measurement
+    logging.getLogger("nexus").setLevel(logging.ERROR)
+
+    orchestrator = EligibilityOrchestrator()
+    patient_ids = [f"MRN{900000 + i}" for i in range(count)]
+
+    if not persist:
+        for concurrency in concurrency_levels:
+            rate = await score_only(orchestrator, patient_ids, concurrency)
+            print(f"concurrency={concurrency:>3}: {rate:8.1f} patients/s ({count} patients, scoring only)")
+        return
+
+    await connect_to_db()
+    try:
+        for concurrency in concurrency_levels:
+            job_id = f"bench-{uuid.uuid4().hex[:8]}"
+            start = time.perf_counter()
+            result = await orchestrator.run_batch_job(
+                job_id, patient_ids, concurrency=concurrency,
+                on_progress=lambda p: print(f"  {p['completed']}/{p['total']} ({p['patients_per_second']} patients/s)")
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"concurrency={concurrency:>3}: {result['completed'] / elapsed:8.1f} patients/s end-to-end "
+                f"({result['completed']} stored, {result['failed']} failed, job {job_id})"
+            )
+    finally:
+        await disconnect_from_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--patients", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated worker pool sizes")
+    parser.add_argument("--persist", action="store_true", help="Run real batch jobs against the database")
+    args = parser.parse_args()
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    asyncio.run(main(args.patients, levels, args.persist))
@@ -0,0 +1,199 @@
+"""
+Benchmark the single-pass JSON scanner against the previous multi-pass extractor.
+
+The corpus is real captured LLM output: llm_trace_logs.llm_response (most
+recent first) when the configured database is reachable, or a file given with
+--corpus (one response per line as JSONL {"text": ...}, or a JSON list of
+strings). Without either, a small built-in set of representative responses is
+used. Checks both extractors agree on every response that yields an object and
+prints the time per response, whole-text and fed in streaming-size chunks.
+
+Usage:
+    python nexus/scripts/benchmark_json_parser.py [--limit 500] [--iterations 20] [--chunk 16] [--corpus file]
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import os
+import time
+
+# Add parent directory to path (nexus/scripts -> nexus -> project root)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+nexus_dir = os.path.dirname(script_dir)
+project_root = os.path.dirname(nexus_dir)
+sys.path.insert(0, project_root)
+
+from nexus.modules.database import database, connect_to_db, disconnect_from_db
+from nexus.core.json_parser import JsonScanner, scan_json
+
+SAMPLE_RESPONSES = [
+    '```json\n{\n  "summary": "User needs eligibility for clinical programming within 48 hours.",\n'
+    '  "gates": {\n    "1_patient_info_availability": {"raw": "I have name, DOB and insurance", "classified": "Yes", "confidence": 0.95},\n'
+    '    "2_use_case": {"raw": "clinical", "classified": "Clinical", "confidence": 0.9},\n  },\n'
+    '  "status": {"pass": false, "next_gate": "3_ineligibility_handling", "next_query": "What should happen if the patient is ineligible?"}\n}\n```',
+    '<thinking>The user answered gates 1 and 2. Gate {3} is next.</thinking>\n{"summary": "Partial", "gates": {}, '
+    '"status": {"pass": false, "next_gate": "1_patient_info_availability", "next_query": null}}',
+    'Here is the plan update:\n{\n  // steps the user confirmed\n  "conversation_state": "clarification",\n'
+    '  "next_question": "Which tool should run step_1?",\n  "plan_updates": {"steps": [{"step_id": "step_1", "owner": "tool", '
+    '"tool_name": "schedule_scanner", "execution_mode": "agent", "required_data": ["days_out",],}]},\n'
+    '  "missing_information": ["Tool parameters"],\n  "reasoning": "Step needs tool assignment"\n}\nLet me know!',
+]
+
+
+# --- Previous extractor (thinking-tag regex, brace counting, per-line comment and comma passes) ---
+
+def legacy_extract(text: str):
+    text = re.sub(r"<thinking>.*?</thinking>", "", text, flags=re.DOTALL).strip()
+    json_str = None
+    match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+    if match:
+        json_str = match.group(1).strip()
+    else:
+        depth, start = 0, None
+        for i, char in enumerate(text):
+            if char == '{':
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0 and start is not None:
+                    json_str = text[start:i + 1]
+                    break
+        if json_str is None:
+            match = re.search(r'\{.*\}', text, re.DOTALL)
+            json_str = match.group(0) if match else None
+    if json_str is None:
+        return None
+    json_str = _legacy_line_pass(json_str, drop_comments=True)
+    json_str = _legacy_line_pass(json_str, drop_comments=False)
+    try:
+        data = json.loads(json_str)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _legacy_line_pass(json_str: str, drop_comments: bool) -> str:
+    lines = []
+    in_string = False
+    escape_next = False
+    for line in json_str.split('\n'):
+        cleaned = []
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if escape_next:
+                escape_next = False
+            elif char == '\\':
+                escape_next = True
+            elif char == '"':
+                in_string = not in_string
+            elif not in_string and drop_comments and char == '/' and line[i + 1:i + 2] == '/':
+                break
+            elif not in_string and not drop_comments and char == ',':
+                j = i + 1
+                while j < len(line) and line[j] in ' \t':
+                    j += 1
+                if j < len(line) and line[j] in '}]':
+                    i += 1
+                    continue
+            cleaned.append(char)
+            i += 1
+        lines.append(''.join(cleaned))
+    return '\n'.join(lines)
+
+
+def scanner_extract(text: str):
+    return scan_json(text).data
+
+
+def scanner_extract_chunked(text: str, chunk: int):
+    scanner = JsonScanner()
+    for i in range(0, len(text), chunk):
+        scanner.feed(text[i:i + chunk])
+        if scanner.complete:
+            break
+    scanner.finish()
+    return scanner.data
+
+
+async def load_corpus(path, limit: int):
+    if path:
+        with open(path) as f:
+            raw = f.read()
+        try:
+            items = json.loads(raw)
+        except json.JSONDecodeError:
+            items = [json.loads(line) for line in raw.splitlines() if line.strip()]
+        texts = [item["text"] if isinstance(item, dict) else item for item in items]
+        return [t for t in texts if t][:limit], f"file {path}"
+
+    try:
+        await connect_to_db()
+    except Exception as e:
+        print(f"Database unavailable ({e}); using built-in sample responses")
+        return SAMPLE_RESPONSES, "built-in samples"
+    try:
+        rows = await database.fetch_all(
+            """
+            SELECT llm_response FROM llm_trace_logs
+            WHERE llm_response IS NOT NULL AND llm_response LIKE '%{%'
+            ORDER BY id DESC
+            LIMIT :limit
+            """,
+            {"limit": limit}
+        )
+    finally:
+        await disconnect_from_db()
+    texts = [row["llm_response"] for row in rows]
+    if not texts:
+        print("llm_trace_logs has no captured responses; using built-in sample responses")
+        return SAMPLE_RESPONSES, "built-in samples"
+    return texts, "llm_trace_logs"
+
+
+def timed(fn, corpus, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in corpus:
+            fn(text)
+    return (time.perf_counter() - started) / (iterations * len(corpus)) * 1e6
+
+
+async def main(limit: int, iterations: int, chunk: int, corpus_path):
+    corpus, source = await load_corpus(corpus_path, limit)
+    total_chars = sum(len(t) for t in corpus)
+    print(f"Corpus: {len(corpus)} responses from {source}, {total_chars / max(1, len(corpus)):.0f} chars on average")
+
+    legacy_ok = scanner_ok = disagreements = 0
+    for text in corpus:
+        old, new = legacy_extract(text), scanner_extract(text)
+        legacy_ok += old is not None
+        scanner_ok += new is not None
+        if old is not None and new is not None and old != new:
+            disagreements += 1
+        if scanner_extract_chunked(text, chunk) != new:
+            raise AssertionError("Chunked scan differs from whole-text scan")
+    print(f"Parsed without repair: legacy {legacy_ok}/{len(corpus)}, scanner {scanner_ok}/{len(corpus)}")
+    if disagreements:
+        print(f"  {disagreements} responses parsed to different objects (legacy took the first code fence)")
+
+    legacy_us = timed(legacy_extract, corpus, iterations)
+    scanner_us = timed(scanner_extract, corpus, iterations)
+    chunked_us = timed(lambda t: scanner_extract_chunked(t, chunk), corpus, iterations)
+    print(f"Legacy extractor:        {legacy_us:9.1f} us/response")
+    print(f"Scanner (whole text):    {scanner_us:9.1f} us/response ({legacy_us / scanner_us:.1f}x)")
+    print(f"Scanner ({chunk}-char chunks): {chunked_us:9.1f} us/response")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=500, help="Captured responses to load")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--chunk", type=int, default=16, help="Chunk size for the streaming run")
+    parser.add_argument("--corpus", default=None, help="JSONL / JSON file of responses instead of the database")
+    args = parser.parse_args()
+    asyncio.run(main(args.limit, args.iterations, args.chunk, args.corpus))
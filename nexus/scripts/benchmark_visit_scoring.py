@@ -0,0 +1,107 @@
+"""
+Benchmark per-visit vs batch visit scoring (EligibilityScorer.score_batch).
+
+Scores a synthetic patient with N visits both ways, checks the numbers are
+identical and prints the time per patient. Uses the configured database for
+the propensity/risk lookups when it is reachable; otherwise the lookups fall
+back to their defaults and only CPU cost is compared.
+
+Usage:
+    python nexus/scripts/benchmark_visit_scoring.py [--visits 10] [--iterations 50] [--checked]
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+from copy import deepcopy
+from datetime import date, timedelta
+
+# Add parent directory to path (nexus/scripts -> nexus -> project root)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+nexus_dir = os.path.dirname(script_dir)
+project_root = os.path.dirname(nexus_dir)
+sys.path.insert(0, project_root)
+
+from nexus.modules.database import connect_to_db, disconnect_from_db
+from nexus.agents.eligibility_v2.models import (
+    CaseState, EligibilityStatus, EvidenceStrength, EventTense, ProductType, Sex
+)
+from nexus.agents.eligibility_v2.scorer import EligibilityScorer
+
+
+def build_case(checked: bool) -> CaseState:
+    case_state = CaseState()
+    case_state.health_plan.payer_id = "BENCH_PAYER"
+    case_state.health_plan.product_type = ProductType.MEDICAID
+    case_state.patient.date_of_birth = date(1975, 3, 14)
+    case_state.patient.sex = Sex.FEMALE
+    if checked:
+        case_state.eligibility_check.checked = True
+        case_state.eligibility_truth.status = EligibilityStatus.YES
+        case_state.eligibility_truth.evidence_strength = EvidenceStrength.HIGH
+    return case_state
+
+
+def build_visits(count: int):
+    today = date.today()
+    step = 360 // max(1, count)
+    visits = []
+    for i in range(count):
+        dos_date = today + timedelta(days=-180 + i * step)
+        visits.append((dos_date, EventTense.FUTURE if dos_date > today else EventTense.PAST))
+    return visits
+
+
+async def per_visit(scorer: EligibilityScorer, case_state: CaseState, visits):
+    results = []
+    for dos_date, event_tense in visits:
+        temp_case_state = deepcopy(case_state)
+        temp_case_state.timing.dos_date = dos_date
+        temp_case_state.timing.event_tense = event_tense
+        results.append(await scorer.score(temp_case_state))
+    return results
+
+
+async def main(visit_count: int, iterations: int, checked: bool):
+    connected = False
+    try:
+        await connect_to_db()
+        connected = True
+    except Exception as e:
+        print(f"Database unavailable ({e}); lookups use built-in defaults")
+
+    try:
+        scorer = EligibilityScorer()
+        case_state = build_case(checked)
+        visits = build_visits(visit_count)
+
+        expected = await per_visit(scorer, case_state, visits)
+        actual = await scorer.score_batch(case_state, visits)
+        identical = all(
+            a.state_probabilities == e.state_probabilities and a.risk_probabilities == e.risk_probabilities
+            for a, e in zip(actual, expected)
+        )
+        print(f"Identical results: {identical}")
+
+        timings = {}
+        for name, run in (("per-visit", lambda: per_visit(scorer, case_state, visits)),
+                          ("batch", lambda: scorer.score_batch(case_state, visits))):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await run()
+            timings[name] = (time.perf_counter() - start) * 1000 / iterations
+            print(f"{name:>10}: {timings[name]:.2f} ms/patient ({visit_count} visits)")
+        print(f"   speedup: {timings['per-visit'] / timings['batch']:.1f}x")
+    finally:
+        if connected:
+            await disconnect_from_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--visits", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--checked", action="store_true", help="Case with a direct 270 result")
+    args = parser.parse_args()
+    asyncio.run(main(args.visits, args.iterations, args.checked))
@@ -0,0 +1,39 @@
+"""
+Refresh the eligibility propensity cube (migration 036).
+
+Incremental by default: aggregates only eligibility_transactions rows added
+since the last run. Schedule it (cron / Cloud Scheduler) every few minutes;
+run with --full occasionally or after historical rows were corrected.
+
+Usage:
+    python nexus/scripts/refresh_propensity_cube.py [--full]
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path (nexus/scripts -> nexus -> project root)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+nexus_dir = os.path.dirname(script_dir)
+project_root = os.path.dirname(nexus_dir)
+sys.path.insert(0, project_root)
+
+from nexus.modules.database import connect_to_db, disconnect_from_db
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
+from nexus.services.eligibility_v2.propensity_cube import refresh_propensity_cube
+
+
+async def main(full: bool = False):
+    await connect_to_db()
+    try:
+        result = await refresh_propensity_cube(full=full)
+        print(f"Propensity cube: {result}")
+        if result.get("status") == "refreshed":
+            # Running workers reload the cube on next use
+            await invalidation_bus.publish(InvalidationKind.PROPENSITY_CUBE)
+    finally:
+        await disconnect_from_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(full="--full" in sys.argv))
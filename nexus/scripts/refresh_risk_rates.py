@@ -0,0 +1,39 @@
+"""
+Rebuild the eligibility risk rate table (migration 039).
+
+Re-aggregates coverage-loss and retrospective-denial counts by
+(product_type, event_tense, days bucket) from eligibility_transactions.
+Schedule it (cron / Cloud Scheduler) alongside refresh_propensity_cube.py;
+running workers reload the rates on next use.
+
+Usage:
+    python nexus/scripts/refresh_risk_rates.py
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path (nexus/scripts -> nexus -> project root)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+nexus_dir = os.path.dirname(script_dir)
+project_root = os.path.dirname(nexus_dir)
+sys.path.insert(0, project_root)
+
+from nexus.modules.database import connect_to_db, disconnect_from_db
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
+from nexus.services.eligibility_v2.risk_rate_table import refresh_risk_rates
+
+
+async def main():
+    await connect_to_db()
+    try:
+        result = await refresh_risk_rates()
+        print(f"Risk rates: {result}")
+        if result.get("status") == "refreshed":
+            await invalidation_bus.publish(InvalidationKind.RISK_RATES)
+    finally:
+        await disconnect_from_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -67,6 +67,9 @@ async def seed_gate_prompt():
             })
             
             if prompt_id:
+                # In-place update bypasses update_prompt(), so evict cached copies explicitly
+                from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
+                await invalidation_bus.publish(InvalidationKind.PROMPT, prompt_key)
                 print(f"✅ Successfully updated GATE prompt (ID: {prompt_id})")
                 print(f"   Key: {prompt_key}")
             else:
@@ -0,0 +1,152 @@
+"""
+PostgreSQL NOTIFY Listener
+
+Holds one dedicated asyncpg connection per process for LISTEN, dispatches
+notifications to registered callbacks, and reconnects with backoff if the
+connection drops. Publishing goes through the shared `databases` pool.
+"""
+import asyncio
+import logging
+import os
+import re
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger("nexus.database.notify")
+
+NotifyCallback = Callable[[str], Awaitable[None]]
+ReconnectCallback = Callable[[], Awaitable[None]]
+
+# pg_notify payloads are capped at 8000 bytes by PostgreSQL
+MAX_PAYLOAD_BYTES = 7900
+
+_CHANNEL_RE = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """Strips SQLAlchemy-style driver suffixes (postgresql+asyncpg://) for asyncpg."""
+    return re.sub(r"^postgres(ql)?\+\w+://", "postgresql://", database_url)
+
+
+class PgNotifyListener:
+    """
+    Process-wide LISTEN/NOTIFY hub.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.database_url = database_url or os.getenv("DATABASE_URL")
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._callbacks: Dict[str, List[NotifyCallback]] = {}
+        self._reconnect_callbacks: List[ReconnectCallback] = []
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def subscribe(self, channel: str, callback: NotifyCallback) -> None:
+        """
+        Registers a callback for a channel. Safe to call before or after start().
+        """
+        if not _CHANNEL_RE.match(channel):
+            raise ValueError(f"Invalid NOTIFY channel name: {channel}")
+        first = channel not in self._callbacks
+        self._callbacks.setdefault(channel, []).append(callback)
+        if first and self._connection is not None and not self._connection.is_closed():
+            asyncio.ensure_future(self._listen(self._connection, channel))
+
+    def on_reconnect(self, callback: ReconnectCallback) -> None:
+        """
+        Registers a callback run after the listener re-establishes a dropped
+        connection. Notifications sent while disconnected are lost, so
+        subscribers use this to resynchronise.
+        """
+        self._reconnect_callbacks.append(callback)
+
+    async def publish(self, channel: str, payload: str) -> None:
+        """
+        Sends a NOTIFY through the shared database pool.
+        """
+        if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+            raise ValueError(f"NOTIFY payload too large for channel {channel}")
+        from nexus.modules.database import database
+        await database.execute("SELECT pg_notify(:channel, :payload)", {"channel": channel, "payload": payload})
+
+    async def start(self) -> None:
+        """
+        Starts the background listener task (idempotent).
+        """
+        if not self.database_url:
+            logger.warning("DATABASE_URL not set, NOTIFY listener disabled")
+            return
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="pg-notify-listener")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self._close_connection()
+
+    @property
+    def is_listening(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        connected_before = False
+        while not self._stopping:
+            try:
+                self._connection = await asyncpg.connect(_asyncpg_dsn(self.database_url))
+                lost = asyncio.Event()
+                self._connection.add_termination_listener(lambda _conn: lost.set())
+                for channel in list(self._callbacks):
+                    await self._listen(self._connection, channel)
+                logger.info(f"NOTIFY listener connected ({len(self._callbacks)} channels)")
+                delay = self.reconnect_delay
+                if connected_before:
+                    for callback in self._reconnect_callbacks:
+                        await self._dispatch(lambda _payload, cb=callback: cb(), "reconnect", "")
+                connected_before = True
+                await lost.wait()
+                logger.warning("NOTIFY listener connection lost; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"NOTIFY listener error: {e}; retrying in {delay:.0f}s")
+            finally:
+                await self._close_connection()
+            if self._stopping:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _listen(self, connection: asyncpg.Connection, channel: str) -> None:
+        await connection.add_listener(channel, self._on_notify)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, []):
+            asyncio.ensure_future(self._dispatch(callback, channel, payload))
+
+    async def _dispatch(self, callback: NotifyCallback, channel: str, payload: str) -> None:
+        try:
+            await callback(payload)
+        except Exception as e:
+            logger.error(f"NOTIFY callback failed on {channel}: {e}")
+
+    async def _close_connection(self) -> None:
+        conn, self._connection = self._connection, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=5)
+            except Exception:
+                conn.terminate()
+
+
+notify_listener = PgNotifyListener()
@@ -0,0 +1,177 @@
+"""
+Batch Job Repository - Manages eligibility_batch_jobs and the score runs they write
+"""
+import logging
+import json
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+from nexus.agents.eligibility_v2.models import CaseState, ScoreState
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.metrics import instrument_repository
+
+logger = logging.getLogger("nexus.eligibility_v2.batch_job_repository")
+
+TERMINAL_STATUSES = ("COMPLETE", "FAILED")
+
+# A RUNNING job whose row hasn't been touched for this long lost its worker
+# (progress is written after every flush) and may be claimed again
+BATCH_JOB_STALE_SECONDS = int(os.getenv("BATCH_JOB_STALE_SECONDS", "900"))
+
+
+def batch_case_id(job_id: str, patient_id: str) -> str:
+    """case_id of the eligibility_cases row a batch job writes for a patient"""
+    return f"batch:{job_id}:{patient_id}"
+
+
+@instrument_repository
+class BatchJobRepository:
+    """Repository for eligibility_batch_jobs operations"""
+
+    async def create_job(self, job_id: str, patient_ids: List[str], concurrency: int) -> Dict[str, Any]:
+        """Create a job (no-op if job_id already exists) and return it"""
+        # Keep the first occurrence of each MRN, in schedule order
+        unique_ids = list(dict.fromkeys(patient_ids))
+        await database.execute(
+            query="""
+                INSERT INTO eligibility_batch_jobs (job_id, status, patient_ids, total, concurrency)
+                VALUES (:job_id, 'PENDING', CAST(:patient_ids AS jsonb), :total, :concurrency)
+                ON CONFLICT (job_id) DO NOTHING
+            """,
+            values={
+                "job_id": job_id,
+                "patient_ids": json.dumps(unique_ids),
+                "total": len(unique_ids),
+                "concurrency": concurrency
+            }
+        )
+        return await self.get_job(job_id)
+
+    async def claim_job(self, job_id: str, stale_seconds: int = BATCH_JOB_STALE_SECONDS) -> bool:
+        """
+        Marks the job RUNNING unless another worker is already running it.
+        Returns whether this caller got the job; only the claimant may start it.
+        """
+        row = await database.fetch_one(
+            query="""
+                UPDATE eligibility_batch_jobs
+                SET status = 'RUNNING',
+                    error = NULL,
+                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP),
+                    finished_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = :job_id
+                  AND (status <> 'RUNNING' OR updated_at < CURRENT_TIMESTAMP - make_interval(secs => :stale_seconds))
+                RETURNING job_id
+            """,
+            values={"job_id": job_id, "stale_seconds": stale_seconds}
+        )
+        return row is not None
+
+    async def get_job(self, job_id: str, include_patients: bool = True) -> Optional[Dict[str, Any]]:
+        columns = "*" if include_patients else """
+            id, job_id, status, total, completed, failed, concurrency, patients_per_second,
+            error, started_at, finished_at, created_at, updated_at
+        """
+        row = await database.fetch_one(
+            query=f"SELECT {columns} FROM eligibility_batch_jobs WHERE job_id = :job_id",
+            values={"job_id": job_id}
+        )
+        if not row:
+            return None
+        job = dict(row)
+        if include_patients:
+            job["patient_ids"] = parse_jsonb(job.get("patient_ids")) or []
+        return job
+
+    async def get_completed_patient_ids(self, job_id: str) -> Set[str]:
+        """Patients of the job that already have a stored score run"""
+        rows = await database.fetch_all(
+            query="SELECT patient_id FROM eligibility_score_runs WHERE batch_job_id = :job_id",
+            values={"job_id": job_id}
+        )
+        return {row["patient_id"] for row in rows}
+
+    async def update_status(
+        self,
+        job_id: str,
+        status: str,
+        completed: Optional[int] = None,
+        failed: Optional[int] = None,
+        patients_per_second: Optional[float] = None,
+        error: Optional[str] = None
+    ) -> None:
+        await database.execute(
+            query="""
+                UPDATE eligibility_batch_jobs
+                SET status = :status,
+                    completed = COALESCE(:completed, completed),
+                    failed = COALESCE(:failed, failed),
+                    patients_per_second = COALESCE(:pps, patients_per_second),
+                    error = :error,
+                    started_at = CASE WHEN :status = 'RUNNING' THEN COALESCE(started_at, CURRENT_TIMESTAMP) ELSE started_at END,
+                    finished_at = CASE WHEN :status IN ('COMPLETE', 'FAILED') THEN CURRENT_TIMESTAMP ELSE NULL END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = :job_id
+            """,
+            values={
+                "job_id": job_id,
+                "status": status,
+                "completed": completed,
+                "failed": failed,
+                "pps": patients_per_second,
+                "error": error
+            }
+        )
+
+    async def save_results(
+        self,
+        job_id: str,
+        results: List[Tuple[str, CaseState, ScoreState]],
+        scoring_version: str = "v2"
+    ) -> None:
+        """
+        Writes (patient_id, case_state, score_state) results with one multi-row
+        INSERT into eligibility_cases and one into eligibility_score_runs,
+        in a single transaction so a patient is either fully stored or not.
+        """
+        if not results:
+            return
+
+        case_rows = []
+        case_values: Dict[str, Any] = {}
+        for i, (patient_id, case_state, _) in enumerate(results):
+            case_rows.append(f"(:uuid_{i}, :case_id_{i}, 'SCORED', CAST(:state_{i} AS jsonb))")
+            case_values[f"uuid_{i}"] = str(uuid.uuid4())
+            case_values[f"case_id_{i}"] = batch_case_id(job_id, patient_id)
+            case_values[f"state_{i}"] = json.dumps(case_state.model_dump(), default=str)
+
+        async with database.transaction():
+            case_result = await database.fetch_all(
+                query=f"""
+                    INSERT INTO eligibility_cases (case_uuid, case_id, status, case_state)
+                    VALUES {", ".join(case_rows)}
+                    RETURNING id, case_id
+                """,
+                values=case_values
+            )
+            case_pks = {row["case_id"]: row["id"] for row in case_result}
+
+            run_rows = []
+            run_values: Dict[str, Any] = {"job_id": job_id, "version": scoring_version}
+            for i, (patient_id, _, score_state) in enumerate(results):
+                run_rows.append(
+                    f"(:case_pk_{i}, :version, CAST(:score_{i} AS jsonb), CAST(:inputs_{i} AS jsonb), :job_id, :patient_{i})"
+                )
+                run_values[f"case_pk_{i}"] = case_pks[batch_case_id(job_id, patient_id)]
+                run_values[f"score_{i}"] = json.dumps(score_state.model_dump(), default=str)
+                run_values[f"inputs_{i}"] = json.dumps({"source": "batch", "patient_id": patient_id})
+                run_values[f"patient_{i}"] = patient_id
+            await database.execute(
+                query=f"""
+                    INSERT INTO eligibility_score_runs
+                        (case_pk, scoring_version, score_state, inputs_used, batch_job_id, patient_id)
+                    VALUES {", ".join(run_rows)}
+                """,
+                values=run_values
+            )
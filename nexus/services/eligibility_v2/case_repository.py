@@ -6,10 +6,12 @@ import uuid
 from typing import Optional
 from nexus.agents.eligibility_v2.models import CaseState
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.eligibility_v2.case_repository")
 
 
+@instrument_repository
 class CaseRepository:
     """Repository for eligibility_case operations"""
     
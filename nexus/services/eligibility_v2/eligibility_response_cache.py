@@ -0,0 +1,199 @@
+"""
+Eligibility Response Cache
+
+Member-level cache for 270 eligibility transaction results, shared across
+cases, sessions and batch jobs. A 270 is a billable, slow clearinghouse call;
+the same member checked again within the TTL reuses the stored response.
+
+- Key: (payer, member_id, DOS window). DOS dates are bucketed into
+  ELIGIBILITY_CACHE_DOS_WINDOW_DAYS windows; no DOS uses today's window.
+- Single-flight: concurrent lookups for the same key share one in-flight call.
+- Persistence (ELIGIBILITY_CACHE_PERSIST): entries are also written to
+  eligibility_response_cache (migration 038) so they survive restarts and are
+  shared by workers. Memory is checked first, then Postgres, then the payer.
+- Only non-empty responses are cached; failures are never cached.
+"""
+import json
+import logging
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.ttl_cache import TTLCache, hit_rate
+
+logger = logging.getLogger("nexus.eligibility_v2.response_cache")
+
+ELIGIBILITY_CACHE_TTL_SECONDS = int(os.getenv("ELIGIBILITY_CACHE_TTL_SECONDS", str(12 * 3600)))
+ELIGIBILITY_CACHE_DOS_WINDOW_DAYS = int(os.getenv("ELIGIBILITY_CACHE_DOS_WINDOW_DAYS", "30"))
+ELIGIBILITY_CACHE_MAX_ENTRIES = int(os.getenv("ELIGIBILITY_CACHE_MAX_ENTRIES", "10000"))
+ELIGIBILITY_CACHE_PERSIST = os.getenv("ELIGIBILITY_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")
+
+CacheKey = Tuple[str, str, str]
+
+
+def dos_window(dos_date: Optional[date], window_days: int = ELIGIBILITY_CACHE_DOS_WINDOW_DAYS) -> str:
+    """Start date (ISO) of the fixed-size window containing dos_date (or today)."""
+    day = dos_date or date.today()
+    if isinstance(day, datetime):
+        day = day.date()
+    start = date.fromordinal(day.toordinal() - day.toordinal() % max(1, window_days))
+    return start.isoformat()
+
+
+class EligibilityResponseCache:
+    """TTL + LRU cache of 270 responses with single-flight and optional Postgres backing."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = ELIGIBILITY_CACHE_TTL_SECONDS,
+        max_entries: int = ELIGIBILITY_CACHE_MAX_ENTRIES,
+        persist: bool = ELIGIBILITY_CACHE_PERSIST
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist = persist
+        self._memory = TTLCache(ttl_seconds, max_entries)
+        self._stats = {
+            "hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "fetch_errors": 0,
+            "persist_errors": 0
+        }
+
+    @staticmethod
+    def make_key(payer: Optional[str], member_id: str, dos_date: Optional[date] = None) -> CacheKey:
+        return ((payer or "").strip().upper(), member_id.strip(), dos_window(dos_date))
+
+    async def get_or_fetch(
+        self,
+        payer: Optional[str],
+        member_id: str,
+        dos_date: Optional[date],
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Returns (response, from_cache). fetch() runs at most once per key at a
+        time; its exceptions propagate to every waiter and nothing is cached.
+        """
+        key = self.make_key(payer, member_id, dos_date)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._stats["hits"] += 1
+            return cached, True
+
+        (response, from_cache), _ = await self._memory.load_once(key, lambda: self._load(key, fetch))
+        return response, from_cache
+
+    async def _load(self, key: CacheKey, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], bool]:
+        if self.persist:
+            stored = await self._get_persistent(key)
+            if stored is not None:
+                self._stats["persistent_hits"] += 1
+                return stored, True
+
+        self._stats["misses"] += 1
+        try:
+            response = await fetch()
+        except Exception:
+            self._stats["fetch_errors"] += 1
+            raise
+
+        if response:
+            expires_at = time.time() + self.ttl_seconds
+            self._memory.put(key, response, expires_at)
+            if self.persist:
+                await self._put_persistent(key, expires_at, response)
+        return response, False
+
+    async def _get_persistent(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        try:
+            row = await database.fetch_one(
+                query="""
+                    SELECT response, expires_at FROM eligibility_response_cache
+                    WHERE payer = :payer AND member_id = :member_id AND dos_window = :dos_window
+                        AND expires_at > CURRENT_TIMESTAMP
+                """,
+                values={"payer": key[0], "member_id": key[1], "dos_window": key[2]}
+            )
+        except Exception as e:
+            self._stats["persist_errors"] += 1
+            logger.debug(f"Eligibility cache lookup failed, calling payer: {e}")
+            return None
+        if not row:
+            return None
+        response = parse_jsonb(row["response"])
+        expires_at = row["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        self._memory.put(key, response, expires_at.timestamp())
+        return response
+
+    async def _put_persistent(self, key: CacheKey, expires_at: float, response: Dict[str, Any]) -> None:
+        try:
+            await database.execute(
+                query="""
+                    INSERT INTO eligibility_response_cache (payer, member_id, dos_window, response, fetched_at, expires_at)
+                    VALUES (:payer, :member_id, :dos_window, CAST(:response AS jsonb), CURRENT_TIMESTAMP,
+                            to_timestamp(:expires_at))
+                    ON CONFLICT (payer, member_id, dos_window) DO UPDATE SET
+                        response = EXCLUDED.response,
+                        fetched_at = EXCLUDED.fetched_at,
+                        expires_at = EXCLUDED.expires_at
+                """,
+                values={
+                    "payer": key[0],
+                    "member_id": key[1],
+                    "dos_window": key[2],
+                    "response": json.dumps(response, default=str),
+                    "expires_at": expires_at
+                }
+            )
+        except Exception as e:
+            self._stats["persist_errors"] += 1
+            logger.warning(f"Failed to persist eligibility response for member {key[1]}: {e}")
+
+    async def invalidate(self, payer: Optional[str] = None, member_id: Optional[str] = None) -> int:
+        """
+        Drops cached responses for a member (any DOS window), a whole payer, or
+        everything when both are None. Returns the number of memory entries removed.
+        """
+        payer_key = (payer or "").strip().upper() if payer is not None else None
+        member_key = member_id.strip() if member_id is not None else None
+        removed = self._memory.invalidate(
+            lambda k: (payer_key is None or k[0] == payer_key) and (member_key is None or k[1] == member_key)
+        )
+
+        if self.persist:
+            conditions = []
+            values: Dict[str, Any] = {}
+            if payer_key is not None:
+                conditions.append("payer = :payer")
+                values["payer"] = payer_key
+            if member_key is not None:
+                conditions.append("member_id = :member_id")
+                values["member_id"] = member_key
+            where = " AND ".join(conditions) if conditions else "TRUE"
+            try:
+                await database.execute(query=f"DELETE FROM eligibility_response_cache WHERE {where}", values=values)
+            except Exception as e:
+                self._stats["persist_errors"] += 1
+                logger.warning(f"Failed to invalidate persisted eligibility responses: {e}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["persistent_hits"] + self._stats["misses"]
+        hits = self._stats["hits"] + self._stats["persistent_hits"]
+        return {
+            **self._stats,
+            **self._memory.get_stats(),
+            "hit_rate": hit_rate(hits, lookups),
+            "dos_window_days": ELIGIBILITY_CACHE_DOS_WINDOW_DAYS,
+            "persist": self.persist
+        }
+
+
+eligibility_response_cache = EligibilityResponseCache()
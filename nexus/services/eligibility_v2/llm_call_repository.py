@@ -4,10 +4,12 @@ LLM Call Repository - Manages eligibility_llm_calls
 import logging
 from typing import Optional, Dict, Any
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.eligibility_v2.llm_call_repository")
 
 
+@instrument_repository
 class LLMCallRepository:
     """Repository for eligibility_llm_calls operations"""
     
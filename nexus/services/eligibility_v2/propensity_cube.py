@@ -0,0 +1,355 @@
+"""
+Propensity Cube
+
+Materialized eligibility propensity counts for every subset of the scoring
+dimensions (a GROUP BY CUBE over eligibility_transactions), loaded into memory
+so the full waterfall/backoff walk is 2^k dict lookups with no DB queries.
+
+- Storage: eligibility_propensity_cube (migration 036), one row per cell,
+  keyed by (dims_mask, cell_key).
+- Refresh: incremental - transactions past the stored watermark are
+  aggregated and added to existing cells. Ids are allocated before commit, so
+  each run also re-scans PROPENSITY_CUBE_LOOKBACK_IDS ids below the watermark
+  for rows that committed late; counted ids in that window are kept in
+  eligibility_propensity_cube_seen (migration 045) so nothing is counted
+  twice. Run by nexus/scripts/refresh_propensity_cube.py on a schedule.
+- Lookup: PropensityCube.waterfall(known_dims) walks from the most specific
+  subset down to the global cell and returns the first level with enough data,
+  with Wilson intervals and the real backoff path.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from nexus.agents.eligibility_v2.models import BackoffPathStep, ProbabilityInterval, VolatilityMetrics
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
+from nexus.modules.database import database
+
+logger = logging.getLogger("nexus.eligibility_v2.propensity_cube")
+
+# Order matters: it fixes the dims_mask bit layout (first dim = highest bit)
+DIMENSIONS = ("payer_id", "product_type", "contract_status", "event_tense", "sex", "age_bucket")
+ALL_DIMS_MASK = (1 << len(DIMENSIONS)) - 1
+
+PROPENSITY_CUBE_RELOAD_SECONDS = int(os.getenv("PROPENSITY_CUBE_RELOAD_SECONDS", "300"))
+PROPENSITY_CUBE_LOOKBACK_IDS = int(os.getenv("PROPENSITY_CUBE_LOOKBACK_IDS", "10000"))
+
+# 95% two-sided
+WILSON_Z = 1.96
+WILSON_CONFIDENCE = 0.95
+
+# Arbitrary constant for pg_try_advisory_xact_lock so only one refresh runs at a time
+_REFRESH_LOCK_KEY = 70914
+
+_STATUS_COLUMNS = {
+    "successes": "YES",
+    "no_count": "NO",
+    "not_established_count": "NOT_ESTABLISHED",
+    "unknown_count": "UNKNOWN",
+}
+
+
+def dims_mask(dims: List[str]) -> int:
+    """Bitmask of the given dimension names (matches the SQL GROUPING() layout)."""
+    mask = 0
+    for dim in dims:
+        mask |= 1 << (len(DIMENSIONS) - 1 - DIMENSIONS.index(dim))
+    return mask
+
+
+def wilson_interval(successes: int, n: int, z: float = WILSON_Z) -> Tuple[float, float]:
+    if n <= 0:
+        return (0.0, 1.0)
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return (max(0.0, center - margin), min(1.0, center + margin))
+
+
+@dataclass
+class CubeCell:
+    n: int
+    successes: int
+    no_count: int = 0
+    not_established_count: int = 0
+    unknown_count: int = 0
+
+    @property
+    def probability(self) -> float:
+        return self.successes / self.n if self.n else 0.5
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        return wilson_interval(self.successes, self.n)
+
+    @property
+    def sample_confidence(self) -> float:
+        return min(0.95, self.n / 100.0)
+
+    def volatility(self) -> VolatilityMetrics:
+        p = self.probability
+        standard_deviation = math.sqrt(p * (1 - p))
+        low, high = self.interval
+        return VolatilityMetrics(
+            standard_error=standard_deviation / math.sqrt(self.n) if self.n else 0.0,
+            standard_deviation=standard_deviation,
+            coefficient_of_variation=standard_deviation / p if p else 0.0,
+            # Wilson width is already 0-1: ~0.2 at n=100, ~0.6 at n=5
+            volatility_score=high - low
+        )
+
+    def state_counts(self) -> Dict[str, int]:
+        return {status: getattr(self, column) for column, status in _STATUS_COLUMNS.items()}
+
+
+class PropensityCube:
+    """In-memory cube: (dims_mask, values) -> CubeCell."""
+
+    def __init__(self):
+        self.cells: Dict[Tuple[int, Tuple[Optional[str], ...]], CubeCell] = {}
+        self.loaded_at: Optional[float] = None
+        self.watermark = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        """True once a load succeeded and the cube has a global cell."""
+        return self.loaded_at is not None and (0, (None,) * len(DIMENSIONS)) in self.cells
+
+    def lookup(self, dims: Dict[str, str]) -> Optional[CubeCell]:
+        """Exact cell for a dimension subset (values must be non-empty)."""
+        key = tuple(dims.get(d) if d in dims else None for d in DIMENSIONS)
+        return self.cells.get((dims_mask(list(dims)), key))
+
+    def waterfall(self, known_dims: Dict[str, str], min_n: int = 20) -> Dict[str, Any]:
+        """
+        Walks the backoff lattice from all known dims down to the global cell.
+        At each level the subset with the narrowest Wilson interval among
+        cells with n >= min_n wins; the first level with a winner is used.
+        """
+        known = [d for d in DIMENSIONS if known_dims.get(d)]
+        path: List[Dict[str, Any]] = []
+        fallback = None
+
+        for level in range(len(known), -1, -1):
+            best = None
+            for subset in itertools.combinations(known, level):
+                cell = self.lookup({d: known_dims[d] for d in subset})
+                n = cell.n if cell else 0
+                path.append(self._step(level, list(subset), cell, min_n))
+                if not cell or n == 0:
+                    continue
+                width = cell.interval[1] - cell.interval[0]
+                if fallback is None or n > fallback[1].n:
+                    fallback = (list(subset), cell)
+                if n >= min_n and (best is None or width < best[2]):
+                    best = (list(subset), cell, width)
+            if best:
+                return self._result(level, best[0], best[1], path)
+
+        if fallback:
+            # Nothing reached min_n: use the largest sample seen
+            return self._result(len(fallback[0]), fallback[0], fallback[1], path)
+        return {
+            "probability": 0.5,
+            "combined_confidence": 0.5,
+            "sample_size": 0,
+            "backoff_level": 0,
+            "backoff_dims": [],
+            "backoff_path": path
+        }
+
+    @staticmethod
+    def _step(level: int, dims: List[str], cell: Optional[CubeCell], min_n: int) -> Dict[str, Any]:
+        """One backoff_path entry, shaped as BackoffPathStep."""
+        step = BackoffPathStep(
+            level=level,
+            dimensions=dims,
+            dimensions_str=", ".join(dims),
+            sample_size=cell.n if cell else 0,
+            status="no_data"
+        )
+        if cell and cell.n:
+            low, high = cell.interval
+            step.probability = cell.probability
+            step.ci_width = high - low
+            step.combined_confidence = cell.sample_confidence
+            step.status = "found" if cell.n >= min_n else "insufficient"
+        return step.model_dump()
+
+    @staticmethod
+    def _result(level: int, dims: List[str], cell: CubeCell, path: List[Dict[str, Any]]) -> Dict[str, Any]:
+        low, high = cell.interval
+        return {
+            "level": level,
+            "dims": dims,
+            "probability": cell.probability,
+            "sample_size": cell.n,
+            "successes": cell.successes,
+            "ci_width": high - low,
+            "probability_interval": ProbabilityInterval(
+                lower_bound=low,
+                upper_bound=high,
+                confidence_level=WILSON_CONFIDENCE,
+                width=high - low
+            ).model_dump(),
+            "volatility": cell.volatility().model_dump(),
+            "sample_confidence": cell.sample_confidence,
+            "combined_confidence": cell.sample_confidence,
+            "state_counts": cell.state_counts(),
+            "backoff_level": level,
+            "backoff_dims": dims,
+            "backoff_path": path
+        }
+
+    async def ensure_loaded(self) -> bool:
+        """
+        Loads the cube if it was never loaded or the reload interval passed.
+        Returns whether a usable cube is in memory.
+        """
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < PROPENSITY_CUBE_RELOAD_SECONDS:
+            return self.available
+        async with self._lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= PROPENSITY_CUBE_RELOAD_SECONDS:
+                await self.load()
+        return self.available
+
+    async def load(self) -> None:
+        columns = ", ".join(DIMENSIONS)
+        try:
+            rows = await database.fetch_all(f"""
+                SELECT dims_mask, {columns}, n, successes, no_count, not_established_count, unknown_count
+                FROM eligibility_propensity_cube
+            """)
+            watermark = await database.fetch_val(
+                "SELECT last_transaction_id FROM eligibility_propensity_cube_state WHERE id = 1"
+            )
+        except Exception as e:
+            logger.warning(f"Propensity cube unavailable, falling back to live queries: {e}")
+            # Retry on the next reload interval rather than on every score
+            self.loaded_at = time.monotonic()
+            return
+
+        cells = {}
+        for row in rows:
+            mask = row["dims_mask"]
+            key = tuple(
+                row[d] if mask & (1 << (len(DIMENSIONS) - 1 - i)) else None
+                for i, d in enumerate(DIMENSIONS)
+            )
+            cells[(mask, key)] = CubeCell(
+                n=row["n"],
+                successes=row["successes"],
+                no_count=row["no_count"],
+                not_established_count=row["not_established_count"],
+                unknown_count=row["unknown_count"]
+            )
+        self.cells = cells
+        self.watermark = watermark or 0
+        self.loaded_at = time.monotonic()
+        logger.info(f"Loaded propensity cube: {len(cells)} cells (watermark={self.watermark})")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Forces a reload on next use (wired to the cache invalidation bus)."""
+        self.loaded_at = None
+
+
+async def refresh_propensity_cube(full: bool = False, lookback: int = PROPENSITY_CUBE_LOOKBACK_IDS) -> Dict[str, Any]:
+    """
+    Adds transactions not yet counted to the cube (or rebuilds it with
+    full=True, e.g. after historical rows were corrected). Safe to run from
+    several schedulers: concurrent runs skip instead of double counting.
+    """
+    columns = ", ".join(DIMENSIONS)
+    # NULL gets its own token so it can't collide with a real '' value in one upsert
+    cell_key = ", ".join(f"COALESCE({d}::text, '<null>')" for d in DIMENSIONS)
+    status_counts = ",\n                ".join(
+        f"COUNT(*) FILTER (WHERE eligibility_status = '{status}')" for status in _STATUS_COLUMNS.values()
+    )
+    # One statement, so the rows counted and the ids marked seen come from the same snapshot
+    upsert = f"""
+        WITH fresh AS (
+            SELECT t.id, {", ".join(f"t.{d}" for d in DIMENSIONS)}, t.eligibility_status
+            FROM eligibility_transactions t
+            WHERE t.id > :from_id AND t.id <= :up_to_id
+                AND NOT EXISTS (
+                    SELECT 1 FROM eligibility_propensity_cube_seen s WHERE s.transaction_id = t.id
+                )
+        ), marked AS (
+            INSERT INTO eligibility_propensity_cube_seen (transaction_id)
+            SELECT id FROM fresh WHERE id > :keep_from_id
+            ON CONFLICT (transaction_id) DO NOTHING
+        )
+        INSERT INTO eligibility_propensity_cube (
+            dims_mask, cell_key, {columns},
+            n, {", ".join(_STATUS_COLUMNS)}, updated_at
+        )
+        SELECT
+            {ALL_DIMS_MASK} - GROUPING({columns}),
+            concat_ws('|', {cell_key}),
+            {columns},
+            COUNT(*),
+            {status_counts},
+            CURRENT_TIMESTAMP
+        FROM fresh
+        GROUP BY CUBE ({columns})
+        ON CONFLICT (dims_mask, cell_key) DO UPDATE SET
+            n = eligibility_propensity_cube.n + EXCLUDED.n,
+            {", ".join(f"{c} = eligibility_propensity_cube.{c} + EXCLUDED.{c}" for c in _STATUS_COLUMNS)},
+            updated_at = EXCLUDED.updated_at
+    """
+
+    async with database.transaction():
+        locked = await database.fetch_val("SELECT pg_try_advisory_xact_lock(:key)", {"key": _REFRESH_LOCK_KEY})
+        if not locked:
+            logger.info("Propensity cube refresh already running elsewhere, skipping")
+            return {"status": "skipped"}
+
+        if full:
+            await database.execute("DELETE FROM eligibility_propensity_cube")
+            await database.execute("DELETE FROM eligibility_propensity_cube_seen")
+            after_id = from_id = tracked_from_id = 0
+        else:
+            state = await database.fetch_one(
+                "SELECT last_transaction_id, tracked_from_id FROM eligibility_propensity_cube_state WHERE id = 1"
+            )
+            after_id = state["last_transaction_id"] if state else 0
+            tracked_from_id = state["tracked_from_id"] if state else 0
+            # Ids at or below tracked_from_id were counted without being recorded as seen
+            from_id = max(after_id - lookback, tracked_from_id, 0)
+        up_to_id = await database.fetch_val("SELECT COALESCE(MAX(id), 0) FROM eligibility_transactions") or 0
+        # The next run re-scans down to here, so only ids above it need remembering
+        keep_from_id = max(up_to_id - lookback, 0)
+
+        if up_to_id > from_id:
+            await database.execute(upsert, {"from_id": from_id, "up_to_id": up_to_id, "keep_from_id": keep_from_id})
+        await database.execute(
+            "DELETE FROM eligibility_propensity_cube_seen WHERE transaction_id <= :keep_from_id",
+            {"keep_from_id": keep_from_id}
+        )
+        await database.execute(
+            """
+            UPDATE eligibility_propensity_cube_state
+            SET last_transaction_id = :up_to_id, tracked_from_id = :tracked_from_id, refreshed_at = CURRENT_TIMESTAMP
+            WHERE id = 1
+            """,
+            {"up_to_id": up_to_id, "tracked_from_id": tracked_from_id}
+        )
+
+    logger.info(
+        f"Propensity cube refreshed ({'full' if full else 'incremental'}): "
+        f"transactions {from_id}..{up_to_id} (watermark was {after_id})"
+    )
+    return {"status": "refreshed", "full": full, "after_id": after_id, "from_id": from_id, "up_to_id": up_to_id}
+
+
+propensity_cube = PropensityCube()
+
+# Reload on every worker after a scheduled refresh
+invalidation_bus.subscribe(InvalidationKind.PROPENSITY_CUBE, propensity_cube.invalidate)
@@ -7,11 +7,14 @@ Implements waterfall/backoff strategy.
 import logging
 from typing import Optional, Dict, Any, List
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
+from nexus.services.eligibility_v2.propensity_cube import propensity_cube
 from nexus.agents.eligibility_v2.models import CaseState, EligibilityStatus, ProductType, ContractStatus, Sex, EventTense
 
 logger = logging.getLogger("nexus.eligibility_v2.propensity_repository")
 
 
+@instrument_repository
 class PropensityRepository:
     """Repository for propensity data queries"""
     
@@ -75,6 +78,13 @@ class PropensityRepository:
         
         logger.info(f"🌊 PROPENSITY WATERFALL: Starting with {len(known_dims)} known dimensions: {list(known_dims.keys())}")
         
+        # Preferred path: in-memory cube, full backoff lattice, no DB queries
+        if await propensity_cube.ensure_loaded():
+            result = propensity_cube.waterfall(known_dims, min_n=min_n)
+            logger.debug(f"🌊 PROPENSITY WATERFALL: Selected level {result.get('backoff_level')} {result.get('backoff_dims')} (n={result.get('sample_size')})")
+            return result
+        
+        # Cube not materialized yet: live aggregates (global + full dimension set only)
         # Try different levels of specificity
         candidates = []
         
@@ -169,10 +179,21 @@ class PropensityRepository:
         Returns:
             Dict mapping EligibilityStatus to probability for each state
         """
+        dims = self.state_dims(case_state, case_state.timing.dos_date, case_state.timing.event_tense)
+        return await self.get_historical_propensity_by_dims(dims)
+    
+    def state_dims(
+        self, case_state: CaseState, dos_date: Any, event_tense: EventTense
+    ) -> Dict[str, str]:
+        """
+        Propensity dimensions for a case scored at the given DOS/tense.
+        Only event_tense and age_bucket depend on the visit, so batch scoring
+        can share one lookup across visits with equal dims.
+        """
         # Extract dimensions from case state
         product_type = case_state.health_plan.product_type.value if case_state.health_plan.product_type != ProductType.UNKNOWN else None
         contract_status = case_state.health_plan.contract_status.value if case_state.health_plan.contract_status != ContractStatus.UNKNOWN else None
-        event_tense = case_state.timing.event_tense.value if case_state.timing.event_tense != EventTense.UNKNOWN else None
+        event_tense = event_tense.value if event_tense != EventTense.UNKNOWN else None
         payer_id = case_state.health_plan.payer_id
         # Handle sex field - could be enum or string
         sex = None
@@ -186,7 +207,7 @@ class PropensityRepository:
         
         # Age bucket
         age_bucket = None
-        if case_state.patient.date_of_birth and case_state.timing.dos_date:
+        if case_state.patient.date_of_birth and dos_date:
             from datetime import date, datetime
             # Handle date_of_birth - could be date, datetime, or string
             dob = case_state.patient.date_of_birth
@@ -202,7 +223,7 @@ class PropensityRepository:
                 dob = dob.date()
             
             # Handle dos_date - could be date or string
-            dos = case_state.timing.dos_date
+            dos = dos_date
             if isinstance(dos, str):
                 try:
                     dos = datetime.fromisoformat(dos).date()
@@ -216,20 +237,20 @@ class PropensityRepository:
             
             if dob and dos:
                 age = (dos - dob).days // 365
-            if age < 18:
-                age_bucket = "0-17"
-            elif age < 26:
-                age_bucket = "18-25"
-            elif age < 36:
-                age_bucket = "26-35"
-            elif age < 46:
-                age_bucket = "36-45"
-            elif age < 56:
-                age_bucket = "46-55"
-            elif age < 66:
-                age_bucket = "56-65"
-            else:
-                age_bucket = "66+"
+                if age < 18:
+                    age_bucket = "0-17"
+                elif age < 26:
+                    age_bucket = "18-25"
+                elif age < 36:
+                    age_bucket = "26-35"
+                elif age < 46:
+                    age_bucket = "36-45"
+                elif age < 56:
+                    age_bucket = "46-55"
+                elif age < 66:
+                    age_bucket = "56-65"
+                else:
+                    age_bucket = "66+"
         
         # Build dimensions dict
         dims = {}
@@ -245,12 +266,25 @@ class PropensityRepository:
             dims["sex"] = sex
         if age_bucket:
             dims["age_bucket"] = age_bucket
-        
-        # Query each state separately
+        return dims
+    
+    async def get_historical_propensity_by_dims(
+        self, dims: Dict[str, str]
+    ) -> Dict[EligibilityStatus, float]:
+        """Normalized 4-state distribution for already-extracted dimensions."""
+        statuses = [EligibilityStatus.YES, EligibilityStatus.NO, EligibilityStatus.NOT_ESTABLISHED, EligibilityStatus.UNKNOWN]
         results = {}
-        for status in [EligibilityStatus.YES, EligibilityStatus.NO, EligibilityStatus.NOT_ESTABLISHED, EligibilityStatus.UNKNOWN]:
-            prob = await self._query_state_propensity(status, dims)
-            results[status] = prob
+        if await propensity_cube.ensure_loaded():
+            # State counts from the best backoff cell
+            best = propensity_cube.waterfall(dims)
+            counts = best.get("state_counts", {})
+            for status in statuses:
+                results[status] = float(counts.get(status.value, 0))
+        else:
+            # Query each state separately
+            for status in statuses:
+                prob = await self._query_state_propensity(status, dims)
+                results[status] = prob
         
         # Normalize to sum to 1.0
         total = sum(results.values())
@@ -0,0 +1,208 @@
+"""
+Risk Rate Table
+
+Materialized coverage-loss and retrospective-denial rates by
+(product_type, event_tense, days bucket), loaded into memory as numpy arrays
+so a risk lookup is an array index and many DOS gaps are looked up at once.
+
+- Storage: eligibility_risk_rates (migration 039), raw per-day counts rebuilt
+  from eligibility_transactions by nexus/scripts/refresh_risk_rates.py on a
+  schedule. Gaps longer than RISK_RATE_MAX_DAYS fold into the last bucket.
+- Smoothing (at load time): each day pools the same window the live queries
+  used (±7 days for coverage loss, ±30 for denials) and adds
+  RISK_RATE_PRIOR_WEIGHT pseudo-observations at the default rate, so sparse
+  windows shrink toward the default instead of jumping to 0 or 1.
+- Denial rates pool all product types, like the live query.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from nexus.modules.cache_invalidation import invalidation_bus, InvalidationKind
+from nexus.modules.database import database
+
+logger = logging.getLogger("nexus.eligibility_v2.risk_rate_table")
+
+RISK_RATE_MAX_DAYS = int(os.getenv("RISK_RATE_MAX_DAYS", "730"))
+RISK_RATE_PRIOR_WEIGHT = float(os.getenv("RISK_RATE_PRIOR_WEIGHT", "20"))
+RISK_RATE_RELOAD_SECONDS = int(os.getenv("RISK_RATE_RELOAD_SECONDS", "300"))
+
+COVERAGE_LOSS_WINDOW_DAYS = 7
+DENIAL_WINDOW_DAYS = 30
+
+# Default rates when there is no history (also the smoothing prior)
+COVERAGE_LOSS_PRIOR = {
+    "MEDICAID": 0.15,      # Higher volatility
+    "MEDICARE": 0.08,
+    "DSNP": 0.12,
+    "COMMERCIAL": 0.05,    # Lower volatility
+    "OTHER": 0.10,
+    "UNKNOWN": 0.10
+}
+DENIAL_PRIOR = 0.10
+
+# Arbitrary constant for pg_try_advisory_xact_lock so only one rebuild runs at a time
+_REFRESH_LOCK_KEY = 70915
+
+Days = Union[int, np.ndarray]
+
+
+def smoothed_rates(
+    n: np.ndarray,
+    events: np.ndarray,
+    window: int,
+    prior: float,
+    prior_weight: float = RISK_RATE_PRIOR_WEIGHT
+) -> np.ndarray:
+    """
+    Rate per day d over the days [max(1, d - window), d + window], shrunk
+    toward prior. n and events are per-day counts indexed by gap in days.
+    """
+    max_day = len(n) - 1
+    cum_n = np.concatenate(([0.0], np.cumsum(n, dtype=np.float64)))
+    cum_events = np.concatenate(([0.0], np.cumsum(events, dtype=np.float64)))
+    days = np.arange(max_day + 1)
+    low = np.maximum(1, days - window)
+    high = np.minimum(max_day, days + window)
+    window_n = cum_n[high + 1] - cum_n[low]
+    window_events = cum_events[high + 1] - cum_events[low]
+    return (window_events + prior_weight * prior) / (window_n + prior_weight)
+
+
+class RiskRateTable:
+    """In-memory smoothed risk rates indexed by DOS gap in days."""
+
+    def __init__(self, max_days: int = RISK_RATE_MAX_DAYS):
+        self.max_days = max_days
+        # product_type -> rate per days_until_dos
+        self.coverage_loss: Dict[str, np.ndarray] = {}
+        # rate per days_since_visit (all product types)
+        self.denial: np.ndarray = np.full(max_days + 1, DENIAL_PRIOR)
+        self.loaded_at: Optional[float] = None
+        self.available = False
+        self._lock = asyncio.Lock()
+
+    def _index(self, days: Days) -> Union[int, np.ndarray]:
+        return np.clip(days, 0, self.max_days)
+
+    def coverage_loss_rates(self, product_type: Optional[str], days_until_dos: Days) -> Union[float, np.ndarray]:
+        """Coverage loss rate(s) for gap(s) > 0. Accepts an int or an array of gaps."""
+        product = product_type or "UNKNOWN"
+        rates = self.coverage_loss.get(product)
+        if rates is None:
+            prior = COVERAGE_LOSS_PRIOR.get(product, 0.10)
+            return np.full(np.shape(days_until_dos), prior) if np.ndim(days_until_dos) else prior
+        result = rates[self._index(days_until_dos)]
+        return float(result) if np.ndim(result) == 0 else result
+
+    def retrospective_denial_rates(self, days_since_visit: Days) -> Union[float, np.ndarray]:
+        """Denial rate(s) for gap(s) > 0. Accepts an int or an array of gaps."""
+        result = self.denial[self._index(days_since_visit)]
+        return float(result) if np.ndim(result) == 0 else result
+
+    async def ensure_loaded(self) -> bool:
+        """
+        Loads the table if it was never loaded or the reload interval passed.
+        Returns whether the rates come from the materialized table.
+        """
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < RISK_RATE_RELOAD_SECONDS:
+            return self.available
+        async with self._lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= RISK_RATE_RELOAD_SECONDS:
+                await self.load()
+        return self.available
+
+    async def load(self) -> None:
+        try:
+            rows = await database.fetch_all(
+                "SELECT product_type, event_tense, days_bucket, n, events FROM eligibility_risk_rates"
+            )
+        except Exception as e:
+            logger.warning(f"Risk rate table unavailable, falling back to live queries: {e}")
+            self.available = False
+            # Retry on the next reload interval rather than on every score
+            self.loaded_at = time.monotonic()
+            return
+
+        size = self.max_days + 1
+        future_counts: Dict[str, np.ndarray] = {}
+        past_counts = np.zeros((2, size))
+        for row in rows:
+            day = min(max(int(row["days_bucket"]), 0), self.max_days)
+            if row["event_tense"] == "FUTURE":
+                counts = future_counts.setdefault(row["product_type"], np.zeros((2, size)))
+            elif row["event_tense"] == "PAST":
+                counts = past_counts
+            else:
+                continue
+            counts[0, day] += row["n"]
+            counts[1, day] += row["events"]
+
+        coverage_loss = {}
+        for product, prior in COVERAGE_LOSS_PRIOR.items():
+            n, events = future_counts.get(product, np.zeros((2, size)))
+            coverage_loss[product] = smoothed_rates(n, events, COVERAGE_LOSS_WINDOW_DAYS, prior)
+        for product, (n, events) in future_counts.items():
+            if product not in coverage_loss:
+                coverage_loss[product] = smoothed_rates(n, events, COVERAGE_LOSS_WINDOW_DAYS, 0.10)
+
+        self.coverage_loss = coverage_loss
+        self.denial = smoothed_rates(past_counts[0], past_counts[1], DENIAL_WINDOW_DAYS, DENIAL_PRIOR)
+        # An empty table (migrated but never refreshed) would serve prior-only
+        # rates; keep the live queries until the first rebuild lands
+        self.available = bool(rows)
+        self.loaded_at = time.monotonic()
+        logger.info(f"Loaded risk rate table: {len(rows)} buckets, {len(coverage_loss)} product types")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Forces a reload on next use (wired to the cache invalidation bus)."""
+        self.loaded_at = None
+
+
+async def refresh_risk_rates(max_days: int = RISK_RATE_MAX_DAYS) -> Dict[str, Any]:
+    """
+    Rebuilds eligibility_risk_rates from eligibility_transactions. Concurrent
+    runs skip instead of rebuilding twice.
+    """
+    async with database.transaction():
+        locked = await database.fetch_val("SELECT pg_try_advisory_xact_lock(:key)", {"key": _REFRESH_LOCK_KEY})
+        if not locked:
+            logger.info("Risk rate rebuild already running elsewhere, skipping")
+            return {"status": "skipped"}
+
+        await database.execute("DELETE FROM eligibility_risk_rates")
+        await database.execute(
+            """
+            INSERT INTO eligibility_risk_rates (product_type, event_tense, days_bucket, n, events, updated_at)
+            SELECT
+                COALESCE(product_type, 'UNKNOWN'),
+                event_tense,
+                LEAST(CASE WHEN event_tense = 'FUTURE' THEN days_until_dos ELSE days_since_visit END, :max_days),
+                COUNT(*),
+                COUNT(*) FILTER (WHERE CASE
+                    WHEN event_tense = 'FUTURE' THEN lost_coverage_before_dos = true
+                    ELSE payment_status = 'DENIED'
+                END),
+                CURRENT_TIMESTAMP
+            FROM eligibility_transactions
+            WHERE eligibility_status = 'YES'
+                AND ((event_tense = 'FUTURE' AND days_until_dos > 0)
+                     OR (event_tense = 'PAST' AND days_since_visit > 0))
+            GROUP BY 1, 2, 3
+            """,
+            {"max_days": max_days}
+        )
+        buckets = await database.fetch_val("SELECT COUNT(*) FROM eligibility_risk_rates") or 0
+
+    logger.info(f"Risk rate table rebuilt: {buckets} buckets")
+    return {"status": "refreshed", "buckets": buckets}
+
+
+risk_rate_table = RiskRateTable()
+
+# Reload on every worker after a scheduled rebuild
+invalidation_bus.subscribe(InvalidationKind.RISK_RATES, risk_rate_table.invalidate)
@@ -6,10 +6,12 @@ import json
 from typing import Optional
 from nexus.agents.eligibility_v2.models import ScoreState
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.eligibility_v2.scoring_repository")
 
 
+@instrument_repository
 class ScoringRepository:
     """Repository for eligibility_score_runs operations"""
     
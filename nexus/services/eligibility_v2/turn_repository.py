@@ -4,10 +4,12 @@ Turn Repository - Manages eligibility_case_turns
 import logging
 from typing import Optional, Dict, Any
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.eligibility_v2.turn_repository")
 
 
+@instrument_repository
 class TurnRepository:
     """Repository for eligibility_case_turns operations"""
     
@@ -6,13 +6,17 @@ Extracted from ShapingManager to separate configuration concerns.
 """
 
 import logging
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 
-from nexus.core.gate_models import GateConfig
+from nexus.core.gate_models import GateConfig, CompiledGateConfig
 from nexus.modules.prompt_manager import prompt_manager
+from nexus.services.gate.prompt_builder import GatePromptBuilder
 
 logger = logging.getLogger("nexus.services.gate.config_loader")
 
+# strategy -> (prompt version, source prompt config, compiled config)
+_compiled_configs: Dict[str, Tuple[Optional[int], Dict[str, Any], CompiledGateConfig]] = {}
+
 
 class GateConfigLoader:
     """Loads and validates gate configurations."""
@@ -21,7 +25,7 @@ class GateConfigLoader:
         self,
         strategy: str,
         session_id: Optional[int] = None
-    ) -> Optional[GateConfig]:
+    ) -> Optional[CompiledGateConfig]:
         """
         Load gate config from prompt.
         
@@ -35,7 +39,7 @@ class GateConfigLoader:
             session_id: Optional session ID for context
             
         Returns:
-            GateConfig object if found, None otherwise
+            CompiledGateConfig (shared, read-only) if found, None otherwise
         """
         prompt_data = await prompt_manager.get_prompt(
             module_name="workflow",
@@ -56,17 +60,39 @@ class GateConfigLoader:
             logger.warning(f"Prompt config does not have GATE_ORDER")
             return None
         
+        return self.compile(strategy, config, prompt_data.get("version"))
+    
+    def compile(self, strategy: str, config: Dict[str, Any], version: Optional[int] = None) -> CompiledGateConfig:
+        """
+        Returns the compiled gate config for a prompt config, compiling it on
+        first use of each (strategy, prompt version).
+        
+        prompt_manager hands out the same config dict until the prompt changes,
+        so a new dict for the same version (in-place edit by a seed script)
+        also recompiles.
+        """
+        cached = _compiled_configs.get(strategy)
+        if cached and cached[0] == version and cached[1] is config:
+            return cached[2]
+        
         gate_config = GateConfig.from_prompt_config(config)
+        compiled = CompiledGateConfig(
+            gate_config,
+            version=version,
+            static_prompt=GatePromptBuilder.render_static_sections(gate_config)
+        )
+        _compiled_configs[strategy] = (version, config, compiled)
         
-        # Log gate config details for debugging
-        logger.info(f"Loaded gate config: {len(gate_config.gates)} gates, order: {gate_config.gate_order}")
-        for gate_key, gate_def in gate_config.gates.items():
-            logger.info(
+        logger.info(
+            f"Compiled gate config for {strategy} v{version}: {len(compiled.gates)} gates, order: {list(compiled.gate_order)}"
+        )
+        for gate_key, gate_def in compiled.gates.items():
+            logger.debug(
                 f"Gate '{gate_key}': question='{gate_def.question[:50]}...', "
                 f"expected_categories={gate_def.expected_categories}"
             )
         
-        return gate_config
+        return compiled
     
     async def validate(self, config: GateConfig) -> List[str]:
         """
@@ -102,7 +128,7 @@ class GateConfigLoader:
         
         return errors
     
-    async def get_default_config(self) -> Optional[GateConfig]:
+    async def get_default_config(self) -> Optional[CompiledGateConfig]:
         """
         Get the default gate configuration (TABULA_RASA strategy).
         
@@ -110,7 +136,3 @@ class GateConfigLoader:
             Default GateConfig or None if not found
         """
         return await self.load("TABULA_RASA")
-
-
-
-
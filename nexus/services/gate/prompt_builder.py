@@ -9,7 +9,7 @@ import json
 import logging
 from typing import Optional, List, Dict
 
-from nexus.core.gate_models import GateConfig, GateState
+from nexus.core.gate_models import GateConfig, GateState, CompiledGateConfig
 
 logger = logging.getLogger("nexus.services.gate.prompt_builder")
 
@@ -41,16 +41,8 @@ class GatePromptBuilder:
         Returns:
             Complete prompt string for LLM
         """
-        parts = []
-        
-        # System instructions
-        parts.append(gate_config.system_instructions)
-        
-        # LLM Role
-        if gate_config.llm_role:
-            parts.append("\n\nYour Role:")
-            for role_item in gate_config.llm_role:
-                parts.append(f"  - {role_item}")
+        static = self.get_static_sections(gate_config)
+        parts = [static["header"]]
         
         # Current state
         if current_state:
@@ -70,20 +62,7 @@ class GatePromptBuilder:
         else:
             parts.append("\n\nCurrent Gate State: (empty - starting fresh)")
         
-        # Gate Definitions (CRITICAL - LLM needs to know valid gate keys)
-        parts.append("\n\nAvailable Gates (you MUST use these exact gate keys):")
-        for gate_key in gate_config.gate_order:
-            gate_def = gate_config.gates.get(gate_key)
-            if not gate_def:
-                continue
-            
-            parts.append(f"\n  Gate Key: '{gate_key}'")
-            parts.append(f"    Question: {gate_def.question}")
-            parts.append(f"    Required: {gate_def.required}")
-            if gate_def.expected_categories:
-                parts.append(f"    Expected Categories: {', '.join(gate_def.expected_categories)}")
-            else:
-                parts.append(f"    Expected Categories: (any value - free text)")
+        parts.append(static["gate_definitions"])
         
         # Conversation history
         if conversation_history:
@@ -102,6 +81,73 @@ class GatePromptBuilder:
         # Current user input
         parts.append(f"\n\nCurrent User Input: {user_text}")
         
+        parts.append(static["instructions"])
+        
+        return "\n".join(parts)
+    
+    def get_static_sections(self, gate_config: GateConfig) -> Dict[str, str]:
+        """
+        Prompt sections that depend only on the gate config.
+        
+        Compiled configs carry them pre-rendered (see GateConfigLoader);
+        plain GateConfigs are rendered on every call.
+        """
+        if isinstance(gate_config, CompiledGateConfig) and gate_config.static_prompt:
+            return gate_config.static_prompt
+        return self.render_static_sections(gate_config)
+    
+    @classmethod
+    def render_static_sections(cls, gate_config: GateConfig) -> Dict[str, str]:
+        """Renders the config-only prompt sections, keyed by position in the prompt."""
+        return {
+            "header": cls._render_header(gate_config),
+            "gate_definitions": cls._render_gate_definitions(gate_config),
+            "instructions": cls._render_instructions(gate_config),
+        }
+    
+    @staticmethod
+    def _render_header(gate_config: GateConfig) -> str:
+        """System instructions and LLM role."""
+        parts = []
+        
+        # System instructions
+        parts.append(gate_config.system_instructions)
+        
+        # LLM Role
+        if gate_config.llm_role:
+            parts.append("\n\nYour Role:")
+            for role_item in gate_config.llm_role:
+                parts.append(f"  - {role_item}")
+        
+        return "\n".join(parts)
+    
+    @staticmethod
+    def _render_gate_definitions(gate_config: GateConfig) -> str:
+        """Available gate keys with their questions and categories."""
+        parts = []
+        
+        # Gate Definitions (CRITICAL - LLM needs to know valid gate keys)
+        parts.append("\n\nAvailable Gates (you MUST use these exact gate keys):")
+        for gate_key in gate_config.gate_order:
+            gate_def = gate_config.gates.get(gate_key)
+            if not gate_def:
+                continue
+            
+            parts.append(f"\n  Gate Key: '{gate_key}'")
+            parts.append(f"    Question: {gate_def.question}")
+            parts.append(f"    Required: {gate_def.required}")
+            if gate_def.expected_categories:
+                parts.append(f"    Expected Categories: {', '.join(gate_def.expected_categories)}")
+            else:
+                parts.append(f"    Expected Categories: (any value - free text)")
+        
+        return "\n".join(parts)
+    
+    @staticmethod
+    def _render_instructions(gate_config: GateConfig) -> str:
+        """Extraction instructions, output schema, JSON template and mandatory logic."""
+        parts = []
+        
         # Explicit instruction for multi-gate extraction
         parts.append("\n\n⚠️ CRITICAL INSTRUCTION:")
         parts.append("The user may provide information for MULTIPLE gates in a single message.")
@@ -185,4 +231,3 @@ class GatePromptBuilder:
         
         return "\n".join(parts)
 
-
@@ -12,10 +12,12 @@ from datetime import datetime
 
 from nexus.core.gate_models import GateState, GateValue, StatusInfo
 from nexus.modules.database import database
+from nexus.modules.metrics import instrument_repository
 
 logger = logging.getLogger("nexus.services.gate.state_repository")
 
 
+@instrument_repository
 class GateStateRepository:
     """Handles all gate state persistence operations."""
     
@@ -35,7 +37,22 @@ class GateStateRepository:
         if not row or "gate_state" not in row or not row["gate_state"]:
             return None
         
-        gate_state_data = row["gate_state"]
+        return self.from_dict(row["gate_state"], session_id)
+    
+    @staticmethod
+    def from_dict(gate_state_data, session_id: Optional[int] = None) -> Optional[GateState]:
+        """
+        Build a GateState from its stored JSON (dict or JSON string).
+        
+        Args:
+            gate_state_data: The gate_state column value
+            session_id: Only used for log messages
+            
+        Returns:
+            GateState object, or None if the value is empty or unparseable
+        """
+        if not gate_state_data:
+            return None
         
         # Parse JSONB if it's a string (PostgreSQL returns JSONB as dict, but handle string case)
         if isinstance(gate_state_data, str):
@@ -78,15 +95,18 @@ class GateStateRepository:
             status=status
         )
     
-    async def save(self, session_id: int, gate_state: GateState) -> None:
+    @staticmethod
+    def to_dict(gate_state: GateState) -> dict:
         """
-        Save gate state to database.
+        Serialize a GateState to its stored JSON shape.
         
         Args:
-            session_id: The session ID to save state for
-            gate_state: The GateState object to save
+            gate_state: The GateState object to serialize
+            
+        Returns:
+            Dict with summary, gates and status
         """
-        gate_state_dict = {
+        return {
             "summary": gate_state.summary,
             "gates": {
                 gate_key: {
@@ -103,16 +123,24 @@ class GateStateRepository:
                 "next_query": gate_state.status.next_query
             }
         }
+    
+    async def save(self, session_id: int, gate_state: GateState) -> None:
+        """
+        Save gate state to database.
         
+        Args:
+            session_id: The session ID to save state for
+            gate_state: The GateState object to save
+        """
         query = """
             UPDATE shaping_sessions 
-            SET gate_state = :gate_state, updated_at = CURRENT_TIMESTAMP 
+            SET gate_state = :gate_state, version = version + 1, updated_at = CURRENT_TIMESTAMP 
             WHERE id = :session_id
         """
         await database.execute(
             query,
             {
-                "gate_state": json.dumps(gate_state_dict),
+                "gate_state": json.dumps(self.to_dict(gate_state)),
                 "session_id": session_id
             }
         )
@@ -141,7 +169,7 @@ class GateStateRepository:
         """
         query = """
             UPDATE shaping_sessions 
-            SET gate_state = NULL, updated_at = CURRENT_TIMESTAMP 
+            SET gate_state = NULL, version = version + 1, updated_at = CURRENT_TIMESTAMP 
             WHERE id = :session_id
         """
         await database.execute(query, {"session_id": session_id})
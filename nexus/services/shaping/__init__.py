@@ -4,9 +4,23 @@ Shaping Services
 Services for managing shaping sessions.
 """
 
+from nexus.services.shaping.message_repository import SessionMessageRepository
 from nexus.services.shaping.session_repository import ShapingSessionRepository
+from nexus.services.shaping.session_unit_of_work import (
+    SessionConflictError,
+    SessionUnitOfWork,
+    ShapingSessionAggregate,
+    current_session,
+)
 
-__all__ = ["ShapingSessionRepository"]
+__all__ = [
+    "SessionMessageRepository",
+    "ShapingSessionRepository",
+    "SessionConflictError",
+    "SessionUnitOfWork",
+    "ShapingSessionAggregate",
+    "current_session",
+]
 
 
 
@@ -0,0 +1,222 @@
+"""
+Session Message Repository
+
+Append-only storage for shaping session transcripts (session_messages table).
+Each message is one row with a per-session sequence number, so appending a
+message is a single INSERT instead of rewriting the whole transcript JSONB.
+
+Message dicts keep the legacy transcript shape:
+    {"role": "user", "content": "...", "timestamp": "now", ...extra fields}
+"""
+import json
+import logging
+from typing import Optional, Dict, Any, List, Iterable, Sequence, Tuple
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.metrics import instrument_repository
+
+logger = logging.getLogger("nexus.shaping.message_repository")
+
+# Retries when two writers race for the same (session_id, seq)
+MAX_APPEND_RETRIES = 3
+
+
+def _split_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Splits a transcript message into row columns."""
+    extra = {k: v for k, v in message.items() if k not in ("role", "content")}
+    content = message.get("content", "")
+    if not isinstance(content, str):
+        content = json.dumps(content)
+    return {
+        "role": message.get("role") or "",
+        "content": content or "",
+        "extra": json.dumps(extra, default=str)
+    }
+
+
+def _values_clause(session_id: int, messages: Sequence[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """Builds a multi-row VALUES list (role, content, extra, ord) with ord = 1..n."""
+    values_sql = []
+    values: Dict[str, Any] = {"session_id": session_id}
+    for i, row in enumerate(_split_message(m) for m in messages):
+        values_sql.append(f"(:role_{i}, :content_{i}, CAST(:extra_{i} AS jsonb), {i + 1})")
+        values[f"role_{i}"] = row["role"]
+        values[f"content_{i}"] = row["content"]
+        values[f"extra_{i}"] = row["extra"]
+    return ", ".join(values_sql), values
+
+
+def _row_to_message(row: Any) -> Dict[str, Any]:
+    row_dict = dict(row)
+    extra = parse_jsonb(row_dict.get("extra")) or {}
+    return {"role": row_dict["role"], "content": row_dict["content"], **extra}
+
+
+@instrument_repository
+class SessionMessageRepository:
+    """Repository for session_messages operations"""
+
+    async def append(self, session_id: int, role: str, content: str, **fields: Any) -> int:
+        """
+        Appends one message and returns its sequence number.
+        """
+        seqs = await self.append_many(session_id, [{"role": role, "content": content, **fields}])
+        return seqs[0]
+
+    async def append_many(self, session_id: int, messages: Sequence[Dict[str, Any]]) -> List[int]:
+        """
+        Appends messages in order with one multi-row INSERT.
+        Sequence numbers continue from the session's current tail.
+        """
+        if not messages:
+            return []
+
+        values_sql, values = _values_clause(session_id, messages)
+        query = f"""
+            INSERT INTO session_messages (session_id, seq, role, content, extra)
+            SELECT :session_id, tail.seq + v.ord, v.role, v.content, v.extra
+            FROM (VALUES {values_sql}) AS v(role, content, extra, ord),
+                 (SELECT COALESCE(MAX(seq), 0) AS seq FROM session_messages WHERE session_id = :session_id) AS tail
+            ORDER BY v.ord
+            RETURNING seq
+        """
+
+        last_error = None
+        for attempt in range(MAX_APPEND_RETRIES):
+            try:
+                result = await database.fetch_all(query=query, values=values)
+                return sorted(r["seq"] for r in result)
+            except Exception as e:
+                # Unique (session_id, seq) violation: another writer appended first
+                if "session_messages_session_seq_key" not in str(e):
+                    raise
+                last_error = e
+                logger.debug(f"Append race on session {session_id}, retry {attempt + 1}")
+        raise last_error
+
+    async def get_messages(self, session_id: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the full transcript in order, or None if the session doesn't exist.
+
+        Sessions whose history only exists in the legacy shaping_sessions.transcript
+        column are backfilled on first read.
+        """
+        query = """
+            SELECT role, content, extra
+            FROM session_messages
+            WHERE session_id = :session_id
+            ORDER BY seq
+        """
+        rows = await database.fetch_all(query=query, values={"session_id": session_id})
+        if rows:
+            return [_row_to_message(r) for r in rows]
+
+        legacy = await database.fetch_one(
+            query="SELECT transcript FROM shaping_sessions WHERE id = :session_id",
+            values={"session_id": session_id}
+        )
+        if not legacy:
+            return None
+
+        transcript = parse_jsonb(legacy["transcript"]) or []
+        messages = [m for m in transcript if isinstance(m, dict)] if isinstance(transcript, list) else []
+        if messages:
+            logger.info(f"Backfilling {len(messages)} legacy transcript messages for session {session_id}")
+            await self._backfill(session_id, messages)
+        return messages
+
+    async def _backfill(self, session_id: int, messages: Sequence[Dict[str, Any]]) -> None:
+        """
+        Inserts a legacy transcript at fixed seq 1..n. Concurrent first reads
+        insert the same rows, so the loser's rows are dropped by the conflict
+        clause instead of being appended after the winner's.
+        """
+        values_sql, values = _values_clause(session_id, messages)
+        query = f"""
+            INSERT INTO session_messages (session_id, seq, role, content, extra)
+            SELECT :session_id, v.ord, v.role, v.content, v.extra
+            FROM (VALUES {values_sql}) AS v(role, content, extra, ord)
+            ON CONFLICT (session_id, seq) DO NOTHING
+        """
+        await database.execute(query=query, values=values)
+
+    async def get_tail(
+        self,
+        session_id: int,
+        limit: int,
+        roles: Optional[Iterable[str]] = None,
+        non_empty: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the last `limit` messages (optionally only the given roles,
+        compared case-insensitively) in chronological order. Served by the (session_id, seq) index.
+        """
+        conditions = ["session_id = :session_id"]
+        values: Dict[str, Any] = {"session_id": session_id, "limit": limit}
+        if roles:
+            # Stored roles aren't normalized ("User", "system"); match like the legacy filter did
+            conditions.append("LOWER(role) = ANY(:roles)")
+            values["roles"] = [r.lower() for r in roles]
+        if non_empty:
+            conditions.append("content <> ''")
+
+        query = f"""
+            SELECT role, content, extra
+            FROM session_messages
+            WHERE {" AND ".join(conditions)}
+            ORDER BY seq DESC
+            LIMIT :limit
+        """
+        rows = await database.fetch_all(query=query, values=values)
+        return [_row_to_message(r) for r in reversed(rows)]
+
+    async def count(self, session_id: int) -> int:
+        """Returns the number of stored messages for a session."""
+        query = "SELECT COUNT(*) FROM session_messages WHERE session_id = :session_id"
+        return await database.fetch_val(query=query, values={"session_id": session_id})
+
+    async def update_last_message(self, session_id: int, role: str, fields: Dict[str, Any]) -> bool:
+        """
+        Merges extra fields (e.g. original_value) into the latest message with `role`.
+        """
+        query = """
+            UPDATE session_messages
+            SET extra = extra || CAST(:patch AS jsonb)
+            WHERE id = (
+                SELECT id FROM session_messages
+                WHERE session_id = :session_id AND role = :role
+                ORDER BY seq DESC
+                LIMIT 1
+            )
+            RETURNING id
+        """
+        result = await database.fetch_one(query=query, values={
+            "session_id": session_id,
+            "role": role,
+            "patch": json.dumps(fields, default=str)
+        })
+        return result is not None
+
+    async def sync_transcript(self, session_id: int, transcript: List[Dict[str, Any]]) -> int:
+        """
+        Compatibility path for callers that still hold a whole transcript list:
+        appends only the messages past the stored tail. Returns the number appended.
+        """
+        stored = await self.count(session_id)
+        new_messages = [m for m in transcript[stored:] if isinstance(m, dict)]
+        if new_messages:
+            await self.append_many(session_id, new_messages)
+        return len(new_messages)
+
+    async def get_recent_by_role(self, role: str, days: int) -> List[str]:
+        """
+        Returns message contents for one role across all sessions in the last N days.
+        """
+        query = """
+            SELECT content
+            FROM session_messages
+            WHERE role = :role
+              AND created_at >= NOW() - make_interval(days => :days)
+            ORDER BY created_at DESC
+        """
+        rows = await database.fetch_all(query=query, values={"role": role, "days": days})
+        return [r["content"] for r in rows]
@@ -3,15 +3,27 @@ Shaping Session Repository
 
 Manages shaping_sessions table operations.
 """
+import json
 import logging
-from typing import Optional, Dict, Any
-from nexus.modules.database import database
+from typing import Optional, Dict, Any, List
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.metrics import instrument_repository
+from nexus.services.shaping.message_repository import SessionMessageRepository
+from nexus.services.shaping.session_unit_of_work import SessionUnitOfWork
 
 logger = logging.getLogger("nexus.shaping.session_repository")
 
 
+@instrument_repository
 class ShapingSessionRepository:
     """Repository for shaping_sessions operations"""
+
+    def __init__(self, message_repository: Optional[SessionMessageRepository] = None):
+        self.messages = message_repository or SessionMessageRepository()
+    
+    def unit_of_work(self, session_id: int) -> SessionUnitOfWork:
+        """Per-turn unit of work: one load, one flush (see session_unit_of_work)"""
+        return SessionUnitOfWork(session_id, self.messages)
     
     async def create_simple(self, user_id: str) -> int:
         """Create a simple session with minimal initial data"""
@@ -29,12 +41,41 @@ class ShapingSessionRepository:
         result = await database.fetch_one(query=query, values={"session_id": session_id})
         return result["exists"] if result else False
     
+    async def get(self, session_id: int) -> Optional[Dict[str, Any]]:
+        """Get a session row with its transcript assembled from session_messages"""
+        query = "SELECT * FROM shaping_sessions WHERE id = :session_id"
+        result = await database.fetch_one(query=query, values={"session_id": session_id})
+        if not result:
+            return None
+        session = dict(result)
+        for column in ("draft_plan", "rag_citations", "gate_state"):
+            if column in session:
+                session[column] = parse_jsonb(session[column])
+        session["transcript"] = await self.messages.get_messages(session_id) or []
+        return session
+    
     async def get_transcript(self, session_id: int) -> Optional[Dict[str, Any]]:
         """Get session transcript"""
-        query = "SELECT transcript FROM shaping_sessions WHERE id = :session_id"
-        result = await database.fetch_one(query=query, values={"session_id": session_id})
-        if result and result["transcript"]:
-            import json
-            transcript = result["transcript"] if isinstance(result["transcript"], dict) else json.loads(result["transcript"])
+        transcript = await self.messages.get_messages(session_id)
+        if transcript:
             return {"transcript": transcript}
         return None
+    
+    async def update_transcript(self, session_id: int, transcript: List[Dict[str, Any]]) -> None:
+        """
+        Persist a transcript held in memory. Only messages past the stored
+        tail are appended - existing messages are never rewritten.
+        """
+        await self.messages.sync_transcript(session_id, transcript)
+    
+    async def update_draft_plan(self, session_id: int, draft_plan: Dict[str, Any]) -> None:
+        """Persist the draft plan outside a unit of work"""
+        query = """
+            UPDATE shaping_sessions
+            SET draft_plan = CAST(:draft_plan AS jsonb), version = version + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE id = :session_id
+        """
+        await database.execute(query=query, values={
+            "session_id": session_id,
+            "draft_plan": json.dumps(draft_plan, default=str)
+        })
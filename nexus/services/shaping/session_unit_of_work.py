@@ -0,0 +1,222 @@
+"""
+Shaping Session Unit of Work
+
+One chat turn (ShapingManager.append_message) reads and writes the same
+shaping_sessions row many times: transcript, RAG citations, iteration count,
+strategy, gate state and draft plan. SessionUnitOfWork loads all of it as one
+ShapingSessionAggregate in a single query (transcript included), records
+changes in memory during the turn, and flushes them at the end: one UPDATE of
+the dirty columns plus one INSERT of the new transcript messages, in one
+transaction.
+
+The UPDATE is guarded by shaping_sessions.version (optimistic concurrency).
+If another turn for the same session flushed first, nothing is written and
+SessionConflictError is raised. Every other writer of shaping_sessions (gate
+edits, draft plan updates, planning phase decisions) bumps version as well, so
+an edit made while a turn is running is not silently overwritten.
+
+While the unit of work is open, current_session(session_id) returns its
+aggregate so nested helpers read and write the in-memory state instead of the
+database.
+"""
+import copy
+import json
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Set
+
+from nexus.core.gate_models import GateState
+from nexus.modules.database import database, parse_jsonb
+from nexus.services.gate.state_repository import GateStateRepository
+from nexus.services.shaping.message_repository import SessionMessageRepository, _row_to_message
+
+logger = logging.getLogger("nexus.shaping.session_unit_of_work")
+
+_current_session: ContextVar[Optional["ShapingSessionAggregate"]] = ContextVar("shaping_session", default=None)
+
+
+class SessionConflictError(Exception):
+    """Another turn updated the session since this turn loaded it."""
+
+
+@dataclass
+class ShapingSessionAggregate:
+    """In-memory state of one shaping session for the duration of a turn."""
+    session_id: int
+    user_id: Optional[str]
+    status: Optional[str]
+    strategy: Optional[str]
+    rag_citations: List[Any]
+    draft_plan: Dict[str, Any]
+    gate_state: Optional[GateState]
+    iteration_count: int
+    max_iterations: int
+    version: int
+    transcript: List[Dict[str, Any]]
+    # Messages already stored in session_messages (the transcript prefix)
+    stored_messages: int = 0
+    dirty: Set[str] = field(default_factory=set)
+    # Set when the unit of work exits, so tasks spawned during the turn
+    # (which inherit the context) fall back to direct writes
+    closed: bool = False
+
+    def set_gate_state(self, gate_state: Optional[GateState]) -> None:
+        self.gate_state = copy.deepcopy(gate_state)
+        self.dirty.add("gate_state")
+
+    def set_draft_plan(self, draft_plan: Dict[str, Any]) -> None:
+        self.draft_plan = draft_plan
+        self.dirty.add("draft_plan")
+
+    def increment_iteration(self) -> None:
+        self.iteration_count += 1
+        self.dirty.add("iteration_count")
+
+    def set_transcript(self, transcript: List[Dict[str, Any]]) -> None:
+        """Messages past the stored prefix are appended on flush."""
+        self.transcript = list(transcript)
+        self.dirty.add("transcript")
+
+    def pending_messages(self) -> List[Dict[str, Any]]:
+        if "transcript" not in self.dirty:
+            return []
+        return [m for m in self.transcript[self.stored_messages:] if isinstance(m, dict)]
+
+
+def current_session(session_id: int) -> Optional[ShapingSessionAggregate]:
+    """The aggregate of the open unit of work for session_id, if any."""
+    session = _current_session.get()
+    if session is not None and session.session_id == session_id and not session.closed:
+        return session
+    return None
+
+
+class SessionUnitOfWork:
+    """
+    async with SessionUnitOfWork(session_id) as session:
+        ...  # session is None if the session doesn't exist
+
+    Changes are flushed when the block exits, also when it raises (writes
+    made before the failure were persisted before this existed too).
+    """
+
+    LOAD_QUERY = """
+        SELECT s.id, s.user_id, s.status, s.consultant_strategy, s.rag_citations,
+               s.draft_plan, s.gate_state,
+               COALESCE(s.consultant_iteration_count, 0) AS iteration_count,
+               COALESCE(s.max_iterations, 15) AS max_iterations,
+               s.version,
+               COALESCE((
+                   SELECT json_agg(json_build_object('role', m.role, 'content', m.content, 'extra', m.extra) ORDER BY m.seq)
+                   FROM session_messages m
+                   WHERE m.session_id = s.id
+               ), '[]') AS messages,
+               CASE WHEN jsonb_typeof(s.transcript) = 'array' THEN jsonb_array_length(s.transcript) ELSE 0 END AS legacy_messages
+        FROM shaping_sessions s
+        WHERE s.id = :session_id
+    """
+
+    def __init__(self, session_id: int, message_repository: Optional[SessionMessageRepository] = None):
+        self.session_id = session_id
+        self.messages = message_repository or SessionMessageRepository()
+        self.session: Optional[ShapingSessionAggregate] = None
+        # Database round trips made by this unit of work (load + flush)
+        self.round_trips = 0
+        self._token = None
+
+    async def load(self) -> Optional[ShapingSessionAggregate]:
+        row = await database.fetch_one(query=self.LOAD_QUERY, values={"session_id": self.session_id})
+        self.round_trips += 1
+        if not row:
+            return None
+        row = dict(row)
+
+        transcript = [_row_to_message(m) for m in parse_jsonb(row["messages"]) or []]
+        if not transcript and row.get("legacy_messages"):
+            # History only in the legacy transcript column: backfill it
+            transcript = await self.messages.get_messages(self.session_id) or []
+            self.round_trips += 3
+
+        return ShapingSessionAggregate(
+            session_id=self.session_id,
+            user_id=row.get("user_id"),
+            status=row.get("status"),
+            strategy=row.get("consultant_strategy"),
+            rag_citations=parse_jsonb(row.get("rag_citations")) or [],
+            draft_plan=parse_jsonb(row.get("draft_plan")) or {},
+            gate_state=GateStateRepository.from_dict(row.get("gate_state"), self.session_id),
+            iteration_count=row.get("iteration_count") or 0,
+            max_iterations=row.get("max_iterations") or 15,
+            version=row.get("version") or 0,
+            transcript=transcript,
+            stored_messages=len(transcript)
+        )
+
+    async def flush(self) -> bool:
+        """
+        Writes the dirty fields and new messages in one transaction.
+        Returns False if there was nothing to write.
+        """
+        session = self.session
+        if session is None or not session.dirty:
+            return False
+
+        assignments = ["version = version + 1", "updated_at = CURRENT_TIMESTAMP"]
+        values: Dict[str, Any] = {"session_id": session.session_id, "version": session.version}
+        if "gate_state" in session.dirty:
+            assignments.append("gate_state = CAST(:gate_state AS jsonb)")
+            values["gate_state"] = json.dumps(GateStateRepository.to_dict(session.gate_state)) if session.gate_state else None
+        if "draft_plan" in session.dirty:
+            assignments.append("draft_plan = CAST(:draft_plan AS jsonb)")
+            values["draft_plan"] = json.dumps(session.draft_plan, default=str)
+        if "iteration_count" in session.dirty:
+            assignments.append("consultant_iteration_count = :iteration_count")
+            values["iteration_count"] = session.iteration_count
+
+        query = f"""
+            UPDATE shaping_sessions
+            SET {", ".join(assignments)}
+            WHERE id = :session_id AND version = :version
+            RETURNING version
+        """
+        pending = session.pending_messages()
+
+        async with database.transaction():
+            new_version = await database.fetch_val(query=query, values=values)
+            self.round_trips += 1
+            if new_version is None:
+                raise SessionConflictError(
+                    f"Shaping session {session.session_id} was updated by another turn (expected version {session.version})"
+                )
+            if pending:
+                await self.messages.append_many(session.session_id, pending)
+                self.round_trips += 1
+
+        session.version = new_version
+        session.stored_messages += len(pending)
+        session.dirty.clear()
+        return True
+
+    async def __aenter__(self) -> Optional[ShapingSessionAggregate]:
+        self.session = await self.load()
+        if self.session is not None:
+            self._token = _current_session.set(self.session)
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if self._token is not None:
+            _current_session.reset(self._token)
+            self._token = None
+        try:
+            await self.flush()
+        except Exception as e:
+            if exc_type is None:
+                raise
+            # Don't mask the turn's own error
+            logger.error(f"Failed to flush shaping session {self.session_id} after error: {e}")
+        finally:
+            if self.session is not None:
+                self.session.closed = True
+        logger.debug(f"Shaping session {self.session_id} turn: {self.round_trips} session DB round trips")
+        return False
@@ -28,11 +28,10 @@ class EMRPatientDemographicsRetriever(NexusTool):
     async def run_async(self, patient_id: str) -> Dict[str, Any]:
         """Async method to retrieve demographics directly"""
         try:
-            # Use PatientSimulator directly to generate synthetic patient data
-            from nexus.tools.eligibility.patient_simulator import PatientSimulator
+            # Synthetic patient data, generated once per patient and shared by all EMR tools
+            from nexus.tools.eligibility.patient_record_cache import patient_record_cache
             
-            simulator = PatientSimulator()
-            patient_data = simulator.generate_synthetic_patient(patient_id)
+            patient_data = await patient_record_cache.get(patient_id)
             demographics = patient_data.get("demographics")
             
             # Handle test scenario where demographics is None
@@ -71,11 +70,10 @@ class EMRPatientInsuranceInfoRetriever(NexusTool):
     async def run_async(self, patient_id: str) -> Dict[str, Any]:
         """Async method to retrieve insurance directly"""
         try:
-            # Use PatientSimulator directly to generate synthetic patient data
-            from nexus.tools.eligibility.patient_simulator import PatientSimulator
+            # Synthetic patient data, generated once per patient and shared by all EMR tools
+            from nexus.tools.eligibility.patient_record_cache import patient_record_cache
             
-            simulator = PatientSimulator()
-            patient_data = simulator.generate_synthetic_patient(patient_id)
+            patient_data = await patient_record_cache.get(patient_id)
             health_plan = patient_data.get("health_plan")
             
             # Handle test scenario where health_plan is None
@@ -135,12 +133,11 @@ class EMRPatientVisitsRetriever(NexusTool):
     async def _fetch_visits(self, patient_id: str, lookback_days: int, lookahead_days: int) -> list:
         """Async method to fetch visits"""
         try:
-            # Use PatientSimulator directly to generate synthetic patient data
-            from nexus.tools.eligibility.patient_simulator import PatientSimulator
+            # Synthetic patient data, generated once per patient and shared by all EMR tools
+            from nexus.tools.eligibility.patient_record_cache import patient_record_cache
             from datetime import date, timedelta
             
-            simulator = PatientSimulator()
-            patient_data = simulator.generate_synthetic_patient(patient_id)
+            patient_data = await patient_record_cache.get(patient_id)
             visits = patient_data.get("visits", [])
             
             # Filter by date range
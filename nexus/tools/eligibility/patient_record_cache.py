@@ -0,0 +1,170 @@
+"""
+Patient Record Cache
+
+Shared cache of patient records (demographics, health_plan, visits) in front
+of PatientSimulator. The EMR retrievers and patient_profile_manager all read
+through it, so one turn generates (or loads) a patient once instead of once
+per tool.
+
+- Memory: LRU bounded by PATIENT_RECORD_CACHE_MAX_ENTRIES, entries expire after
+  PATIENT_RECORD_CACHE_TTL_SECONDS. Generated records are keyed by patient and
+  day since visit and birth dates are relative to today.
+- Backing store (PATIENT_RECORD_STORE): optional second level checked before
+  generating, e.g. "patient_profiles" to share records across workers through
+  Postgres. Any PatientRecordStore can be passed in directly.
+- Single-flight: concurrent misses for the same patient share one load.
+- Callers get copies; cached records are never handed out for mutation.
+"""
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from nexus.modules.database import database, parse_jsonb
+from nexus.modules.ttl_cache import TTLCache, hit_rate
+from nexus.tools.eligibility.patient_simulator import PatientSimulator
+
+logger = logging.getLogger("nexus.tools.eligibility.patient_record_cache")
+
+PATIENT_RECORD_CACHE_TTL_SECONDS = int(os.getenv("PATIENT_RECORD_CACHE_TTL_SECONDS", "3600"))
+PATIENT_RECORD_CACHE_MAX_ENTRIES = int(os.getenv("PATIENT_RECORD_CACHE_MAX_ENTRIES", "5000"))
+PATIENT_RECORD_STORE = os.getenv("PATIENT_RECORD_STORE", "").strip().lower()
+
+CacheKey = Tuple[str, str]
+
+
+class PatientRecordStore(ABC):
+    """Backing store interface. Implementations must not raise on a miss."""
+
+    @abstractmethod
+    async def load(self, patient_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def save(self, patient_id: str, record: Dict[str, Any]) -> None:
+        pass
+
+
+class PatientProfilesStore(PatientRecordStore):
+    """Stores records in the patient_profiles table used by patient_profile_manager."""
+
+    async def load(self, patient_id: str) -> Optional[Dict[str, Any]]:
+        row = await database.fetch_one(
+            query="SELECT profile_data FROM patient_profiles WHERE patient_id = :patient_id",
+            values={"patient_id": patient_id}
+        )
+        if not row or not row["profile_data"]:
+            return None
+        return parse_jsonb(row["profile_data"])
+
+    async def save(self, patient_id: str, record: Dict[str, Any]) -> None:
+        await database.execute(
+            query="""
+                INSERT INTO patient_profiles (patient_id, profile_data, created_at, updated_at)
+                VALUES (:patient_id, CAST(:profile_data AS jsonb), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                ON CONFLICT (patient_id)
+                DO UPDATE SET
+                    profile_data = EXCLUDED.profile_data,
+                    updated_at = CURRENT_TIMESTAMP
+            """,
+            values={"patient_id": patient_id, "profile_data": json.dumps(record, default=str)}
+        )
+
+
+def _store_from_env() -> Optional[PatientRecordStore]:
+    if PATIENT_RECORD_STORE in ("", "none", "memory"):
+        return None
+    if PATIENT_RECORD_STORE == "patient_profiles":
+        return PatientProfilesStore()
+    logger.warning(f"Unknown PATIENT_RECORD_STORE '{PATIENT_RECORD_STORE}', using memory only")
+    return None
+
+
+class PatientRecordCache:
+    """TTL + LRU cache of patient records with an optional backing store."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = PATIENT_RECORD_CACHE_TTL_SECONDS,
+        max_entries: int = PATIENT_RECORD_CACHE_MAX_ENTRIES,
+        store: Optional[PatientRecordStore] = None,
+        simulator: Optional[PatientSimulator] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.store = store
+        self.simulator = simulator or PatientSimulator()
+        self._memory = TTLCache(ttl_seconds, max_entries)
+        self._stats = {
+            "hits": 0,
+            "store_hits": 0,
+            "generated": 0,
+            "store_errors": 0
+        }
+
+    @staticmethod
+    def make_key(patient_id: str) -> CacheKey:
+        return (patient_id.strip(), date.today().isoformat())
+
+    async def get(self, patient_id: str) -> Dict[str, Any]:
+        """Returns a copy of the patient's record, loading or generating it once."""
+        key = self.make_key(patient_id)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._stats["hits"] += 1
+            return cached
+
+        record, _ = await self._memory.load_once(key, lambda: self._load(key))
+        return record
+
+    async def _load(self, key: CacheKey) -> Dict[str, Any]:
+        patient_id = key[0]
+        if self.store is not None:
+            try:
+                stored = await self.store.load(patient_id)
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logger.debug(f"Patient record store lookup failed for {patient_id}, generating: {e}")
+                stored = None
+            if stored is not None:
+                self._stats["store_hits"] += 1
+                self._memory.put(key, stored)
+                return stored
+
+        record = self._generate(key)
+        if self.store is not None:
+            try:
+                await self.store.save(patient_id, record)
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logger.warning(f"Failed to store patient record for {patient_id}: {e}")
+        return record
+
+    def _generate(self, key: CacheKey) -> Dict[str, Any]:
+        record = self.simulator.generate_synthetic_patient(key[0])
+        self._stats["generated"] += 1
+        self._memory.put(key, record)
+        return record
+
+    def invalidate(self, patient_id: Optional[str] = None) -> int:
+        """Drops memory entries for one patient (any day) or everything. Returns the count removed."""
+        if patient_id is None:
+            return self._memory.invalidate()
+        patient_key = patient_id.strip()
+        return self._memory.invalidate(lambda k: k[0] == patient_key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["store_hits"] + self._stats["generated"]
+        hits = self._stats["hits"] + self._stats["store_hits"]
+        return {
+            **self._stats,
+            **self._memory.get_stats(),
+            "hit_rate": hit_rate(hits, lookups),
+            "store": type(self.store).__name__ if self.store else None
+        }
+
+
+patient_record_cache = PatientRecordCache(store=_store_from_env())
@@ -3,6 +3,7 @@ Patient Simulator
 
 Generates synthetic patient data for testing.
 """
+import hashlib
 import logging
 import random
 from typing import Dict, Any, Optional
@@ -16,8 +17,9 @@ class PatientSimulator:
     
     def _get_seeded_random(self, patient_id: str):
         """Get seeded random generator for deterministic data"""
-        # Use patient_id as seed
-        seed = hash(patient_id) % (2**32)
+        # Digest of patient_id, not hash(): str hashes are salted per process,
+        # which would give each worker a different patient
+        seed = int.from_bytes(hashlib.sha256(patient_id.encode("utf-8")).digest()[:4], "big")
         return random.Random(seed)
     
     def generate_synthetic_patient(
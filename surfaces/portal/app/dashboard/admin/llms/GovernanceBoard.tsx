@@ -54,7 +54,15 @@ export default function GovernanceBoard() {
     const handleSync = async () => {
         setIsSyncing(true);
         try {
-            await fetch(`${API_URL}/api/admin/ai/catalog/sync`, { method: "POST" });
+            const res = await fetch(`${API_URL}/api/admin/ai/catalog/sync`, { method: "POST" });
+            // Sync runs in the background: poll the job until it finishes
+            const { job } = await res.json();
+            let status = job?.status;
+            while (status === "RUNNING") {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                const jobRes = await fetch(`${API_URL}/api/admin/ai/catalog/sync/${job.job_id}`);
+                status = jobRes.ok ? (await jobRes.json()).status : "FAILED";
+            }
             // After sync, refresh data to get new models
             await fetchData();
         } catch (e) {
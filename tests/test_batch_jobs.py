@@ -0,0 +1,186 @@
+"""
+Tests for deterministic bulk eligibility scoring jobs.
+"""
+import asyncio
+import contextlib
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.agents.eligibility_v2.models import CaseState, ScoreState
+from nexus.agents.eligibility_v2.orchestrator import EligibilityOrchestrator
+from nexus.services.eligibility_v2.batch_job_repository import BatchJobRepository
+
+
+class FakeBatchJobRepository:
+    def __init__(self, stored=()):
+        self.jobs = {}
+        self.stored = {p: None for p in stored}
+        self.writes = []
+        self.statuses = []
+
+    async def create_job(self, job_id, patient_ids, concurrency):
+        self.jobs.setdefault(job_id, {
+            "job_id": job_id, "status": "PENDING", "patient_ids": list(dict.fromkeys(patient_ids)),
+            "total": len(set(patient_ids)), "completed": 0, "failed": 0
+        })
+        return self.jobs[job_id]
+
+    async def claim_job(self, job_id):
+        if self.jobs[job_id]["status"] == "RUNNING":
+            return False
+        self.jobs[job_id]["status"] = "RUNNING"
+        return True
+
+    async def get_job(self, job_id, include_patients=True):
+        return self.jobs.get(job_id)
+
+    async def get_completed_patient_ids(self, job_id):
+        return set(self.stored)
+
+    async def save_results(self, job_id, results):
+        self.writes.append([patient_id for patient_id, _, _ in results])
+        for patient_id, _, score_state in results:
+            self.stored[patient_id] = score_state
+
+    async def update_status(self, job_id, status, **kwargs):
+        self.statuses.append(status)
+
+
+def _orchestrator(repo):
+    orchestrator = EligibilityOrchestrator()
+    orchestrator.batch_job_repo = repo
+    active = {"now": 0, "max": 0}
+
+    async def score_patient(patient_id):
+        if patient_id == "MRN_BAD":
+            raise RuntimeError("EMR unavailable")
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.001)
+        active["now"] -= 1
+        return CaseState(), ScoreState(base_probability=0.9, base_confidence=0.8)
+
+    orchestrator.score_patient = score_patient
+    return orchestrator, active
+
+
+def test_batch_job_bulk_writes_with_bounded_concurrency():
+    async def run():
+        repo = FakeBatchJobRepository()
+        orchestrator, active = _orchestrator(repo)
+        patient_ids = [f"MRN{i}" for i in range(25)] + ["MRN_BAD"]
+        progress = []
+
+        with patch("nexus.agents.eligibility_v2.orchestrator.BATCH_JOB_FLUSH_SIZE", 10):
+            result = await orchestrator.run_batch_job("job-1", patient_ids, concurrency=4, on_progress=progress.append)
+
+        assert result["completed"] == 25 and result["failed"] == 1
+        assert active["max"] <= 4
+        assert [len(w) for w in repo.writes] == [10, 10, 5]
+        assert progress[-1]["status"] == "COMPLETE"
+        assert repo.statuses[0] == "RUNNING" and repo.statuses[-1] == "COMPLETE"
+
+    asyncio.run(run())
+
+
+def test_batch_job_resume_skips_stored_patients():
+    async def run():
+        repo = FakeBatchJobRepository(stored=["MRN0", "MRN1"])
+        orchestrator, _ = _orchestrator(repo)
+        repo.jobs["job-2"] = {"job_id": "job-2", "patient_ids": ["MRN0", "MRN1", "MRN2"]}
+
+        result = await orchestrator.run_batch_job("job-2")
+
+        assert repo.writes == [["MRN2"]]
+        assert result["resumed_from"] == 2
+        assert result["completed"] == 3
+
+    asyncio.run(run())
+
+
+def test_save_results_uses_one_insert_per_table():
+    async def run():
+        db = MagicMock()
+        db.transaction = MagicMock(return_value=contextlib.AsyncExitStack())
+        db.fetch_all = AsyncMock(return_value=[
+            {"id": 11, "case_id": "batch:job-3:MRN1"},
+            {"id": 12, "case_id": "batch:job-3:MRN2"},
+        ])
+        db.execute = AsyncMock()
+        results = [
+            (p, CaseState(), ScoreState(base_probability=0.5, base_confidence=0.6))
+            for p in ("MRN1", "MRN2")
+        ]
+
+        with patch("nexus.services.eligibility_v2.batch_job_repository.database", db):
+            await BatchJobRepository().save_results("job-3", results)
+
+        assert db.fetch_all.await_count == 1
+        assert db.execute.await_count == 1
+        values = db.execute.await_args.kwargs["values"]
+        assert (values["case_pk_0"], values["patient_0"]) == (11, "MRN1")
+        assert (values["case_pk_1"], values["patient_1"]) == (12, "MRN2")
+        assert values["job_id"] == "job-3"
+
+    asyncio.run(run())
+
+
+def test_router_starts_a_job_only_for_the_claimant():
+    async def run():
+        from fastapi import HTTPException
+        from nexus.routers import eligibility_v2_router as router
+
+        repo = FakeBatchJobRepository()
+        started = []
+        request = router.BatchJobRequest(patient_ids=["MRN1", "MRN2"], job_id="job-4")
+        with patch.object(router.orchestrator, "batch_job_repo", repo), \
+             patch.object(router, "_start_batch_task", lambda job_id, c: started.append(job_id)):
+            # Two workers receiving the same POST: only one wins the claim
+            await router.create_batch_job(request)
+            await router.create_batch_job(request)
+            assert started == ["job-4"]
+
+            try:
+                await router.resume_batch_job("job-4")
+                assert False, "resume of a running job must be rejected"
+            except HTTPException as e:
+                assert e.status_code == 409
+
+            try:
+                await router.create_batch_job(router.BatchJobRequest(patient_ids=["MRN3"], job_id="job-4"))
+                assert False, "a different patient list for an existing job must be rejected"
+            except HTTPException as e:
+                assert e.status_code == 409
+
+    asyncio.run(run())
+
+
+def test_claim_job_is_one_conditional_update():
+    async def run():
+        db = MagicMock()
+        db.fetch_one = AsyncMock(side_effect=[{"job_id": "job-5"}, None])
+        with patch("nexus.services.eligibility_v2.batch_job_repository.database", db):
+            repo = BatchJobRepository()
+            assert await repo.claim_job("job-5")
+            assert not await repo.claim_job("job-5")
+
+        query = db.fetch_one.await_args.kwargs["query"]
+        assert "status <> 'RUNNING'" in query and "RETURNING job_id" in query
+
+    asyncio.run(run())
+
+
+def test_process_events_without_session_do_not_warn(caplog):
+    async def run():
+        orchestrator = EligibilityOrchestrator()
+        with caplog.at_level("WARNING"), \
+             patch("nexus.agents.eligibility_v2.orchestrator.event_sink") as sink:
+            await orchestrator._emit_process_event(None, "patient_loading", "in_progress", "Loading")
+        assert not sink.submit.called
+        assert not [r for r in caplog.records if r.name == "nexus.eligibility_v2.orchestrator" and r.levelname == "WARNING"]
+
+    asyncio.run(run())
@@ -0,0 +1,103 @@
+"""
+Tests that batch visit scoring matches the per-visit scorer exactly.
+"""
+import asyncio
+import sys
+import os
+import time
+from copy import deepcopy
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.agents.eligibility_v2.models import (
+    CaseState, EligibilityStatus, EvidenceStrength, EventTense, ProductType, Sex
+)
+from nexus.agents.eligibility_v2.scorer import EligibilityScorer
+from nexus.services.eligibility_v2.propensity_cube import CubeCell, DIMENSIONS, PropensityCube, dims_mask
+
+
+def _cube():
+    cube = PropensityCube()
+    cells = [
+        ({}, CubeCell(n=1000, successes=700, no_count=200, not_established_count=60, unknown_count=40)),
+        ({"event_tense": "FUTURE"}, CubeCell(n=400, successes=300, no_count=60, not_established_count=30, unknown_count=10)),
+        ({"event_tense": "PAST"}, CubeCell(n=600, successes=400, no_count=140, not_established_count=30, unknown_count=30)),
+    ]
+    for dims, cell in cells:
+        cube.cells[(dims_mask(list(dims)), tuple(dims.get(d) for d in DIMENSIONS))] = cell
+    cube.loaded_at = time.monotonic()
+    return cube
+
+
+async def _fetch_one(query, values):
+    # Rates vary with the day window so lookups are visit-specific
+    if "loss_rate" in query:
+        return {"loss_rate": 0.01 * (values["max_days"] % 13 + 1)}
+    if "denial_rate" in query:
+        return {"denial_rate": 0.005 * (values["max_days"] % 17 + 1)}
+    return {"error_rate": 0.037}
+
+
+def _case(checked: bool) -> CaseState:
+    case_state = CaseState()
+    case_state.health_plan.payer_id = "P1"
+    case_state.health_plan.product_type = ProductType.MEDICAID
+    case_state.patient.date_of_birth = date(1980, 5, 1)
+    case_state.patient.sex = Sex.FEMALE
+    if checked:
+        case_state.eligibility_check.checked = True
+        case_state.eligibility_truth.status = EligibilityStatus.YES
+        case_state.eligibility_truth.evidence_strength = EvidenceStrength.HIGH
+    return case_state
+
+
+def _visits():
+    today = date.today()
+    offsets = [-170, -90, -45, -10, 0, 3, 30, 30, 95, 180]
+    return [
+        (today + timedelta(days=d), EventTense.FUTURE if d > 0 else EventTense.PAST)
+        for d in offsets
+    ]
+
+
+def test_score_batch_matches_per_visit_scores():
+    async def run():
+        db = AsyncMock()
+        db.fetch_one.side_effect = _fetch_one
+        with patch("nexus.agents.eligibility_v2.risk_probability_calculator.database", db), \
+             patch("nexus.services.eligibility_v2.propensity_repository.propensity_cube", _cube()):
+            scorer = EligibilityScorer()
+            for checked in (True, False):
+                case_state = _case(checked)
+
+                db.fetch_one.reset_mock()
+                expected = []
+                for dos_date, event_tense in _visits():
+                    temp = deepcopy(case_state)
+                    temp.timing.dos_date = dos_date
+                    temp.timing.event_tense = event_tense
+                    expected.append(await scorer.score(temp))
+                per_visit_queries = db.fetch_one.await_count
+
+                db.fetch_one.reset_mock()
+                actual = await scorer.score_batch(case_state, _visits())
+                batch_queries = db.fetch_one.await_count
+
+                assert len(actual) == len(expected)
+                for got, want in zip(actual, expected):
+                    assert got.state_probabilities == want.state_probabilities
+                    assert got.risk_probabilities == want.risk_probabilities
+                    assert got.base_probability == want.base_probability
+                    assert got.calculation_explanation == want.calculation_explanation
+                    assert got.calculation_human_readable == want.calculation_human_readable
+                # Payer/provider lookups and the repeated 30-day visit are shared
+                assert batch_queries < per_visit_queries
+
+    asyncio.run(run())
+
+
+def test_score_batch_empty():
+    assert asyncio.run(EligibilityScorer().score_batch(CaseState(), [])) == []
@@ -0,0 +1,76 @@
+"""
+Tests for the cross-worker cache invalidation bus.
+"""
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexus.modules.cache_invalidation import (
+    CacheInvalidationBus,
+    InvalidationEvent,
+    InvalidationKind,
+    PROCESS_ID,
+)
+
+
+def test_publish_evicts_locally_and_notifies():
+    async def run():
+        bus = CacheInvalidationBus()
+        evicted = []
+        bus.subscribe(InvalidationKind.PROMPT, evicted.append)
+
+        listener = AsyncMock()
+        with patch("nexus.services.database.notify_listener.notify_listener", listener):
+            await bus.publish(InvalidationKind.PROMPT, "workflow:eligibility:TABULA_RASA:gate")
+
+        assert evicted == ["workflow:eligibility:TABULA_RASA:gate"]
+        channel, payload = listener.publish.await_args.args
+        assert channel == bus.channel
+        assert InvalidationEvent.from_payload(payload).kind == InvalidationKind.PROMPT
+
+    asyncio.run(run())
+
+
+def test_remote_event_applied_and_own_echo_skipped():
+    async def run():
+        bus = CacheInvalidationBus()
+        evicted = []
+        bus.subscribe(InvalidationKind.PROVIDER, evicted.append)
+
+        await bus._on_payload(InvalidationEvent(InvalidationKind.PROVIDER, "7", origin="other-worker").to_payload())
+        await bus._on_payload(InvalidationEvent(InvalidationKind.PROVIDER, "8", origin=PROCESS_ID).to_payload())
+        await bus._on_payload("not json")
+
+        assert evicted == ["7"]
+
+    asyncio.run(run())
+
+
+def test_all_event_flushes_every_kind():
+    async def run():
+        bus = CacheInvalidationBus()
+        calls = []
+
+        async def async_handler(key):
+            calls.append(("provider", key))
+
+        bus.subscribe(InvalidationKind.PROMPT, lambda key: calls.append(("prompt", key)))
+        bus.subscribe(InvalidationKind.PROVIDER, async_handler)
+
+        await bus._on_reconnect()
+
+        assert sorted(calls) == [("prompt", None), ("provider", None)]
+
+    asyncio.run(run())
+
+
+def test_unknown_kind_rejected():
+    bus = CacheInvalidationBus()
+    try:
+        bus.subscribe("gate_configs", lambda key: None)
+    except ValueError:
+        return
+    assert False, "expected ValueError"
@@ -0,0 +1,106 @@
+"""
+Tests for the ConfigManager resolved-context cache.
+"""
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.config_manager import ConfigManager
+
+
+PROVIDER_ROW = {
+    "id": 1,
+    "name": "openai",
+    "provider_type": "openai_compatible",
+    "base_url": None,
+    "is_active": True,
+}
+SECRET_ROWS = [{"config_key": "api_key", "encrypted_value": "sk-plain", "is_secret": False}]
+
+
+def _patched():
+    db = AsyncMock()
+    db.fetch_one.return_value = PROVIDER_ROW
+    db.fetch_all.return_value = SECRET_ROWS
+    governance = AsyncMock()
+    governance.resolve_model.side_effect = lambda *a: {
+        "model_id": "gpt-4o", "provider_name": "openai", "source": "system_global_default"
+    }
+    return db, governance
+
+
+def test_warm_context_skips_database():
+    async def run():
+        manager = ConfigManager(cache_ttl=60)
+        db, governance = _patched()
+        with patch("nexus.modules.config_manager.database", db), \
+             patch("nexus.modules.llm_governance.llm_governance", governance):
+            first = await manager.resolve_app_context("chat", "u1")
+            second = await manager.resolve_app_context("chat", "u1")
+
+        assert first == second
+        assert first["api_key"] == "sk-plain"
+        assert governance.resolve_model.await_count == 1
+        assert db.fetch_one.await_count == 1
+        assert db.fetch_all.await_count == 1
+
+    asyncio.run(run())
+
+
+def test_invalidate_forces_reload():
+    async def run():
+        manager = ConfigManager(cache_ttl=60)
+        db, governance = _patched()
+        with patch("nexus.modules.config_manager.database", db), \
+             patch("nexus.modules.llm_governance.llm_governance", governance):
+            await manager.resolve_app_context("chat", "u1")
+            manager.invalidate_cache("test")
+            await manager.resolve_app_context("chat", "u1")
+
+        assert governance.resolve_model.await_count == 2
+
+    asyncio.run(run())
+
+
+def test_cached_context_is_not_shared_by_reference():
+    async def run():
+        manager = ConfigManager(cache_ttl=60)
+        db, governance = _patched()
+        with patch("nexus.modules.config_manager.database", db), \
+             patch("nexus.modules.llm_governance.llm_governance", governance):
+            first = await manager.resolve_app_context("chat", "u1")
+            first["model_id"] = "mutated"
+            second = await manager.resolve_app_context("chat", "u1")
+
+        assert second["model_id"] == "gpt-4o"
+
+    asyncio.run(run())
+
+
+def test_toggling_a_model_drops_cached_contexts():
+    async def run():
+        from nexus.modules import config_manager as config_module
+        from nexus.modules.llm_service import LLMService
+
+        manager = ConfigManager(cache_ttl=60)
+        db, governance = _patched()
+        db.fetch_val.return_value = 1  # provider_id of the toggled model
+        listener = AsyncMock()
+        with patch("nexus.modules.config_manager.database", db), \
+             patch("nexus.modules.llm_service.database", db), \
+             patch("nexus.modules.llm_governance.llm_governance", governance), \
+             patch.object(config_module, "config_manager", manager), \
+             patch("nexus.services.database.notify_listener.notify_listener", listener):
+            await manager.resolve_app_context("chat", "u1")
+            await LLMService().toggle_model_active(5, False)
+            await manager.resolve_app_context("chat", "u1")
+
+        assert governance.resolve_model.await_count == 2
+        # Other workers are told to drop theirs too
+        assert listener.publish.await_count == 1
+
+    asyncio.run(run())
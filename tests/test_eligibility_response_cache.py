@@ -0,0 +1,107 @@
+"""
+Tests for the member-level 270 eligibility response cache.
+"""
+import asyncio
+import sys
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.services.eligibility_v2.eligibility_response_cache import EligibilityResponseCache, dos_window
+
+
+def _counting_fetch(calls, response=None, delay=0.01):
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return dict(response if response is not None else {"insurance_id": "M1", "eligibility_windows": [{"status": "active"}]})
+    return fetch
+
+
+def test_concurrent_lookups_share_one_call_and_ttl_expires():
+    async def run():
+        cache = EligibilityResponseCache(ttl_seconds=60, persist=False)
+        calls = []
+        fetch = _counting_fetch(calls)
+
+        results = await asyncio.gather(*(cache.get_or_fetch("payer-a", "M1", None, fetch) for _ in range(5)))
+        assert len(calls) == 1
+        assert [from_cache for _, from_cache in results] == [False] * 5
+
+        response, from_cache = await cache.get_or_fetch("PAYER-A", "M1", None, fetch)
+        assert from_cache and len(calls) == 1
+        # Callers get copies, not the cached object
+        response["eligibility_windows"].clear()
+        assert (await cache.get_or_fetch("payer-a", "M1", None, fetch))[0]["eligibility_windows"]
+
+        # Different DOS window is a different key
+        await cache.get_or_fetch("payer-a", "M1", date.today() + timedelta(days=400), fetch)
+        assert len(calls) == 2
+
+        later = time.time() + 3600
+        with patch("nexus.modules.ttl_cache.time.time", return_value=later):
+            await cache.get_or_fetch("payer-a", "M1", None, fetch)
+        assert len(calls) == 3
+
+        stats = cache.get_stats()
+        assert stats["coalesced"] == 4
+        assert stats["hits"] == 2
+        assert stats["misses"] == 3
+
+    asyncio.run(run())
+
+
+def test_failures_and_empty_responses_are_not_cached():
+    async def run():
+        cache = EligibilityResponseCache(persist=False)
+
+        async def failing():
+            raise RuntimeError("clearinghouse timeout")
+
+        for _ in range(2):
+            try:
+                await cache.get_or_fetch("p", "M2", None, failing)
+                assert False, "expected error"
+            except RuntimeError:
+                pass
+
+        calls = []
+        await cache.get_or_fetch("p", "M2", None, _counting_fetch(calls, response={}))
+        await cache.get_or_fetch("p", "M2", None, _counting_fetch(calls, response={}))
+        assert len(calls) == 2
+        assert cache.get_stats()["fetch_errors"] == 2
+
+    asyncio.run(run())
+
+
+def test_persisted_response_survives_restart():
+    async def run():
+        stored = {"insurance_id": "M3", "eligibility_windows": []}
+        db = AsyncMock()
+        db.fetch_one.return_value = {
+            "response": '{"insurance_id": "M3", "eligibility_windows": []}',
+            "expires_at": datetime.now(timezone.utc) + timedelta(hours=1)
+        }
+        calls = []
+        with patch("nexus.services.eligibility_v2.eligibility_response_cache.database", db):
+            cache = EligibilityResponseCache(persist=True)
+            response, from_cache = await cache.get_or_fetch("p", "M3", None, _counting_fetch(calls))
+            # Second lookup is served from memory
+            await cache.get_or_fetch("p", "M3", None, _counting_fetch(calls))
+
+        assert response == stored and from_cache
+        assert calls == []
+        assert db.fetch_one.await_count == 1
+        assert cache.get_stats()["persistent_hits"] == 1
+
+    asyncio.run(run())
+
+
+def test_dos_window_buckets_dates():
+    day = date(2026, 3, 10)
+    assert dos_window(day, 30) == dos_window(date.fromordinal(day.toordinal() - day.toordinal() % 30), 30)
+    assert dos_window(day, 1) == "2026-03-10"
@@ -0,0 +1,101 @@
+"""
+Tests for push-based memory event fan-out to SSE subscribers.
+"""
+import asyncio
+import json
+import sys
+import os
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.core.event_hub import SessionEventHub, StreamEvent, Subscription
+from nexus.modules.cache_invalidation import PROCESS_ID
+
+LISTENER = "nexus.services.database.notify_listener.notify_listener"
+
+
+def _event(event_id, session_id=1, bucket="THINKING", payload=None):
+    return StreamEvent(event_id, session_id, bucket, payload or {"message": "hi"}, "2026-01-01T00:00:00+00:00")
+
+
+def test_publish_pushes_to_session_subscribers_and_notifies():
+    async def run():
+        hub = SessionEventHub()
+        mine = hub.subscribe(1)
+        other = hub.subscribe(2)
+        listener = AsyncMock()
+        with patch(LISTENER, listener):
+            await hub.publish([_event(10), _event(11, bucket="ARTIFACTS"), _event(12, bucket="OUTPUT")])
+
+        assert [(await mine.next(0.1)).id, (await mine.next(0.1)).id] == [10, 12]
+        assert await other.next(0.01) is None
+        channel, payload = listener.publish.await_args.args
+        assert channel == hub.channel
+        assert [e["id"] for e in json.loads(payload)["events"]] == [10, 12]
+
+    asyncio.run(run())
+
+
+def test_overflowing_subscriber_is_marked_lagged():
+    subscription = Subscription(1, max_pending=2)
+    for i in range(3):
+        subscription.offer(_event(i))
+    assert subscription.lagged
+    assert subscription.queue.qsize() == 2
+
+
+def test_remote_events_delivered_and_refs_loaded():
+    async def run():
+        hub = SessionEventHub()
+        subscription = hub.subscribe(1)
+        big = _event(21, payload={"blob": "x" * 9000})
+        payloads = hub._encode([_event(20), big, _event(30, session_id=99)])
+
+        db = AsyncMock()
+        db.fetch_all.return_value = [{
+            "id": 21, "session_id": 1, "bucket_type": "THINKING",
+            "payload": json.dumps(big.payload), "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc)
+        }]
+        with patch("nexus.core.event_hub.database", db):
+            for payload in payloads:
+                remote = json.loads(payload)
+                remote["origin"] = "other-worker"
+                await hub._on_payload(json.dumps(remote))
+            await hub._on_payload(json.dumps({"origin": PROCESS_ID, "events": [vars(_event(40))]}))
+
+        received = [(await subscription.next(0.1)).id for _ in range(2)]
+        assert received == [20, 21]
+        assert await subscription.next(0.01) is None
+        assert db.fetch_all.await_args.kwargs["values"] == {"ids": [21]}
+
+    asyncio.run(run())
+
+
+def test_ephemeral_deltas_are_pushed_without_ids():
+    async def run():
+        from nexus.modules.spectacles_endpoints import _format_sse_event
+
+        hub = SessionEventHub()
+        subscription = hub.subscribe(1)
+        with patch(LISTENER, AsyncMock()):
+            await hub.publish_ephemeral(1, "OUTPUT_DELTA", {"stream_id": "s1", "index": 0, "delta": "Hel"})
+
+        event = await subscription.next(0.1)
+        assert event.id is None and event.bucket == "OUTPUT_DELTA"
+        frame = _format_sse_event(event)
+        # No id line, so Last-Event-ID resumes from the last persisted event
+        assert not frame.startswith("id:")
+        assert json.loads(frame[len("data: "):])["type"] == "chat_delta"
+
+        # Remote workers rebuild the event from the NOTIFY payload
+        remote = SessionEventHub()
+        remote_sub = remote.subscribe(1)
+        payload = json.loads(hub._encode([event])[0])
+        payload["origin"] = "other-worker"
+        await remote._on_payload(json.dumps(payload))
+        assert (await remote_sub.next(0.1)).payload["delta"] == "Hel"
+
+    asyncio.run(run())
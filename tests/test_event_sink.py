@@ -0,0 +1,86 @@
+"""
+Tests for the batched memory_events sink.
+"""
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.core.event_sink import MemoryEventSink
+
+DB = "nexus.core.event_sink.database"
+
+
+def test_burst_is_written_in_one_batch():
+    async def run():
+        sink = MemoryEventSink(batch_size=100, flush_interval_ms=20, copy_threshold=1000)
+        db = AsyncMock()
+        with patch(DB, db):
+            for i in range(10):
+                await sink.submit(1, "THINKING", f'{{"i": {i}}}')
+            await sink.close()
+
+        assert db.fetch_all.await_count == 1
+        values = db.fetch_all.await_args.kwargs["values"]
+        assert values["payload_9"] == '{"i": 9}'
+        assert sink.get_stats()["written"] == 10
+
+    asyncio.run(run())
+
+
+def test_thinking_dropped_when_full_but_artifacts_wait():
+    async def run():
+        sink = MemoryEventSink(max_queue=1, batch_size=10, flush_interval_ms=10, copy_threshold=1000)
+        gate = asyncio.Event()
+
+        async def slow_fetch_all(**kwargs):
+            await gate.wait()
+            return []
+
+        db = AsyncMock()
+        db.fetch_all.side_effect = slow_fetch_all
+        with patch(DB, db):
+            await sink.submit(1, "THINKING", "{}")   # taken by the writer, blocked on the DB
+            await asyncio.sleep(0.05)
+            await sink.submit(1, "THINKING", "{}")   # fills the queue
+            assert await sink.submit(1, "THINKING", "{}") is False
+
+            waiter = asyncio.create_task(sink.submit(1, "ARTIFACTS", "{}"))
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            gate.set()
+            assert await waiter is True
+            await sink.close()
+
+        stats = sink.get_stats()
+        assert stats["dropped"] == 1
+        assert stats["written"] == 3
+
+    asyncio.run(run())
+
+
+def test_bad_row_does_not_fail_the_batch():
+    async def run():
+        sink = MemoryEventSink(batch_size=10, flush_interval_ms=20, copy_threshold=1000)
+
+        async def fetch_all(query, values):
+            if len(values) > 4 or values.get("sid_0") == 2:
+                raise Exception('insert violates foreign key constraint "fk_session_id"')
+            return [{"id": 1}]
+
+        db = AsyncMock()
+        db.fetch_all.side_effect = fetch_all
+        with patch(DB, db):
+            await sink.submit(1, "ARTIFACTS", "{}")
+            await sink.submit(2, "ARTIFACTS", "{}")
+            await sink.submit(1, "PERSISTENCE", "{}")
+            await sink.close()
+
+        stats = sink.get_stats()
+        assert stats["written"] == 2
+        assert stats["failed"] == 1
+
+    asyncio.run(run())
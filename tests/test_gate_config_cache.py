@@ -0,0 +1,130 @@
+"""
+Tests for the compiled gate config (cached per prompt version, bitmask gate checks).
+"""
+import asyncio
+import sys
+import os
+from dataclasses import FrozenInstanceError
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.core.gate_models import CompiledGateConfig, GateConfig, GateDecision, GateJsonParser, GateState, GateValue
+from nexus.engines.gate import GateCompletionChecker, GateSelector, GateStateMerger
+from nexus.services.gate import GateConfigLoader, GatePromptBuilder
+
+PROMPT_CONFIG = {
+    "SYSTEM_INSTRUCTIONS": "Collect eligibility requirements.",
+    "LLM_ROLE": ["Ask one question at a time"],
+    "GATE_ORDER": ["1_patient_info", "2_use_case", "3_notes", "4_urgency", "9_undefined"],
+    "GATES": {
+        "1_patient_info": {"question": " Do you have patient info? ", "required": True,
+                           "expected_categories": ["Yes", "No"], "limiting_values": ["No"]},
+        "2_use_case": {"question": "What is the use case?", "required": True,
+                       "expected_categories": ["Clinical", "Billing", "clinical"]},
+        "3_notes": {"question": "Anything else?", "required": False},
+        "4_urgency": {"question": "How urgent?", "required": True, "expected_categories": ["Today", "This Week"]},
+    },
+    "MANDATORY_LOGIC": ["Never skip required gates"],
+    "STRICT_JSON_SCHEMA": {"type": "object"},
+}
+
+
+def _state(**gates):
+    return GateState(summary="", gates={k: GateValue(raw=v, classified=c) for k, (v, c) in gates.items()})
+
+
+def test_compiled_indexes_and_bitmask_selection():
+    compiled = CompiledGateConfig(GateConfig.from_prompt_config(PROMPT_CONFIG))
+    assert compiled.ordered_gates == ("1_patient_info", "2_use_case", "3_notes", "4_urgency")
+    assert compiled.required_mask == 0b1011 and compiled.optional_mask == 0b0100
+
+    selector, checker = GateSelector(), GateCompletionChecker()
+    state = _state(**{"1_patient_info": ("yes", "Yes"), "2_use_case": ("billing", None)})
+    assert compiled.missing_mask(state) == 0b1110
+    assert selector.select_next(compiled, state) == "2_use_case"
+    # A recommendation is only taken when it points at a missing gate
+    assert selector.select_next(compiled, state, llm_recommendation="4_urgency") == "4_urgency"
+    assert selector.select_next(compiled, state, llm_recommendation="1_patient_info") == "2_use_case"
+    assert selector.select_next(compiled, state, llm_recommendation="9_undefined") == "2_use_case"
+    assert checker.get_missing_gates(compiled, state) == ["2_use_case", "4_urgency"]
+    assert checker.check(compiled, state) == (False, GateDecision.FAIL_REQUIRED_MISSING)
+
+    done = _state(**{"1_patient_info": ("y", "Yes"), "2_use_case": ("c", "Clinical"), "4_urgency": ("t", "Today")})
+    assert checker.check(compiled, done) == (True, GateDecision.PASS_REQUIRED_GATES)
+    assert selector.select_next(compiled, done) == "3_notes"
+    assert selector.get_question_for_gate("1_patient_info", compiled) == "Do you have patient info?"
+
+    # Plain GateConfigs give the same answers (compiled on the fly)
+    plain = GateConfig.from_prompt_config(PROMPT_CONFIG)
+    assert selector.select_next(plain, state) == "2_use_case"
+    assert checker.get_missing_gates(plain, state) == ["2_use_case", "4_urgency"]
+
+    # Category lookups: trimmed, case-insensitive, first listed spelling wins
+    assert compiled.match_category("2_use_case", "  CLINICAL ") == "Clinical"
+    assert compiled.match_category("2_use_case", "Dental") is None
+    assert compiled.match_limiting_value("1_patient_info", "no") == "No"
+    assert compiled.match_limiting_value("2_use_case", "Clinical") is None
+
+    try:
+        compiled.gate_order = ["2_use_case"]
+        raise AssertionError("expected a read-only config")
+    except FrozenInstanceError:
+        pass
+
+
+def test_parser_and_merger_use_compiled_config():
+    compiled = CompiledGateConfig(GateConfig.from_prompt_config(PROMPT_CONFIG))
+    result = GateJsonParser().parse(
+        {
+            "summary": "s",
+            "gates": {
+                "1_patient_info": {"raw": "yes", "classified": "Yes"},
+                "2_use_case": {"raw": "dental", "classified": "Dental"},
+                "4_urgency": {"raw": "today", "classified": "Today"},
+            },
+            "status": {"pass": True, "next_gate": None},
+        },
+        compiled,
+        actor="user",
+    )
+    assert result.ok
+    assert result.canonical_state.gates["2_use_case"].classified is None
+    assert result.decision.next_gate == "2_use_case" and result.decision.pass_ is False
+
+    parsed = _state(**{"4_urgency": ("today", "Today"), "1_patient_info": ("yes", "Yes"), "unknown": ("x", "x")})
+    merged = GateStateMerger().merge(None, parsed, compiled, "yes, today")
+    assert list(merged.gates) == ["1_patient_info", "4_urgency"]
+
+
+def test_loader_compiles_once_per_prompt_version():
+    async def run():
+        loader = GateConfigLoader()
+        prompt = {"config": PROMPT_CONFIG, "version": 3}
+        get_prompt = AsyncMock(return_value=prompt)
+
+        with patch("nexus.services.gate.config_loader.prompt_manager.get_prompt", get_prompt), \
+             patch("nexus.services.gate.config_loader._compiled_configs", {}):
+            first = await loader.load("TABULA_RASA")
+            assert await GateConfigLoader().load("TABULA_RASA") is first
+            assert first.version == 3
+
+            prompt["version"] = 4
+            second = await loader.load("TABULA_RASA")
+            assert second is not first and second.version == 4
+
+            # Same version, new config dict (edited in place) also recompiles
+            prompt["config"] = dict(PROMPT_CONFIG, SYSTEM_INSTRUCTIONS="Edited.")
+            third = await loader.load("TABULA_RASA")
+            assert third is not second and third.static_prompt["header"].startswith("Edited.")
+
+        # The pre-rendered sections produce the same prompt as rendering per call
+        state = _state(**{"1_patient_info": ("yes", "Yes")})
+        history = [{"role": "user", "content": "hello"}]
+        builder = GatePromptBuilder()
+        plain = GateConfig.from_prompt_config(prompt["config"])
+        assert builder.build_extraction_prompt("today", third, state, history) == \
+            builder.build_extraction_prompt("today", plain, state, history)
+
+    asyncio.run(run())
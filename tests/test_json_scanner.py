@@ -0,0 +1,111 @@
+"""
+Tests for the single-pass incremental JSON scanner used for LLM responses.
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.core.json_parser import JsonScanner, LLMResponseParser, scan_json, scan_json_stream
+from nexus.core.gate_models import GateConfig, GateJsonParser
+
+RESPONSE = """<thinking>The user wants {"maybe": this}. Use gate 2 next.</thinking>
+Here is the update:
+```json
+{
+  // gate values collected so far
+  "summary": "Needs a {clinical} check // soon, said \\"today\\"",
+  "gates": {
+    "1_patient_info": {"raw": "yes", "classified": "Yes", },  /* from button */
+  },
+  "status": {"pass": false, "next_gate": "2_use_case", "next_query": null},
+}
+```
+Let me know if anything is off."""
+
+EXPECTED = {
+    "summary": 'Needs a {clinical} check // soon, said "today"',
+    "gates": {"1_patient_info": {"raw": "yes", "classified": "Yes"}},
+    "status": {"pass": False, "next_gate": "2_use_case", "next_query": None},
+}
+
+
+def test_single_pass_strips_comments_trailing_commas_and_prose():
+    scanner = scan_json(RESPONSE)
+    assert scanner.complete and scanner.data == EXPECTED
+    assert scanner.fields == EXPECTED
+
+    # Prose braces that aren't JSON are skipped in favour of the real object
+    assert scan_json('Use {name} as a placeholder. {"a": [1, 2,],}').data == {"a": [1, 2]}
+    assert scan_json("no json here").text is None
+
+    # A truncated response is returned for repair instead of being dropped
+    truncated = scan_json('{"plan_name": "Intake", "steps": [{"id": 1}')
+    assert truncated.data is None and truncated.text == '{"plan_name": "Intake", "steps": [{"id": 1}'
+    assert truncated.fields == {"plan_name": "Intake"}
+
+
+def test_chunked_input_matches_whole_text_and_exposes_fields_early():
+    for size in (1, 2, 3, 7, 64):
+        scanner = JsonScanner()
+        seen = []
+        for i in range(0, len(RESPONSE), size):
+            seen.extend(scanner.feed(RESPONSE[i:i + size]))
+        scanner.finish()
+        assert scanner.data == EXPECTED, size
+        assert seen == ["summary", "gates", "status"], size
+
+    # "summary" is available before the rest of the object has arrived
+    partial = JsonScanner()
+    partial.feed(RESPONSE[:RESPONSE.index('"gates"')])
+    assert partial.fields == {"summary": EXPECTED["summary"]} and not partial.complete
+
+    async def deltas():
+        for i in range(0, len(RESPONSE), 5):
+            yield RESPONSE[i:i + 5]
+
+    async def run():
+        fields = []
+
+        async def on_field(key, value):
+            fields.append(key)
+
+        scanner = await scan_json_stream(deltas(), on_field)
+        assert scanner.data == EXPECTED and fields == ["summary", "gates", "status"]
+
+    asyncio.run(run())
+
+
+def test_parsers_share_the_scanner():
+    result = LLMResponseParser().extract_json(RESPONSE, normalize=False)
+    assert result.success and result.data == EXPECTED
+
+    gate_config = GateConfig.from_prompt_config({
+        "GATE_ORDER": ["1_patient_info", "2_use_case"],
+        "GATES": {
+            "1_patient_info": {"question": "Patient info?", "required": True, "expected_categories": ["Yes", "No"]},
+            "2_use_case": {"question": "Use case?", "required": False, "expected_categories": ["Clinical"]},
+        },
+    })
+    parsed = GateJsonParser().parse(RESPONSE, gate_config)
+    assert parsed.ok and parsed.canonical_state.gates["1_patient_info"].classified == "Yes"
+    # The system decision overrides the LLM's status
+    assert parsed.decision.pass_ is True and parsed.canonical_state.status.next_gate is None
+
+
+
+def test_unterminated_thinking_block_is_scanned_as_text():
+    # Truncated output: the closing tag never arrives
+    assert scan_json('<thinking>reasoning {"x":1}').data == {"x": 1}
+    assert LLMResponseParser().extract_json('<thinking>reasoning {"x":1}', normalize=False).data == {"x": 1}
+
+    scanner = JsonScanner()
+    for chunk in ("<think", 'ing>reasoning {"x"', ":1} </thin"):
+        scanner.feed(chunk)
+    scanner.finish()
+    assert scanner.data == {"x": 1}
+
+    # A closed block still hides its contents
+    assert scan_json('<thinking>{"x":1}</thinking> no object here').data is None
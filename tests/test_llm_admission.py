@@ -0,0 +1,123 @@
+"""
+Tests for LLM admission control (concurrency, rate buckets, priority, retry).
+"""
+import asyncio
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.llm_admission import (
+    AdmissionLimits, LLMAdmissionController, LLMPriority, TokenBucket,
+    backoff_delay, is_retryable, with_llm_priority
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def test_in_flight_limit_and_priority_order():
+    async def run():
+        controller = LLMAdmissionController(AdmissionLimits(max_in_flight=1, rpm=0, tpm=0), overrides={})
+        release_first = asyncio.Event()
+        order = []
+
+        async def call(name, wait=None):
+            order.append(name)
+            if wait:
+                await wait.wait()
+            return name
+
+        first = asyncio.create_task(controller.run("vertex", "flash", lambda: call("first", release_first), module_id="chat"))
+        await asyncio.sleep(0)
+        # Queued behind the in-flight call: background first, then interactive
+        background = asyncio.create_task(with_llm_priority(
+            LLMPriority.BACKGROUND, controller.run("vertex", "flash", lambda: call("background"), module_id="chat")
+        ))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(controller.run("vertex", "flash", lambda: call("interactive"), module_id="chat"))
+        await asyncio.sleep(0)
+
+        stats = controller.get_stats()["vertex/flash"]
+        assert stats["in_flight"] == 1 and stats["queue_depth"] == 2
+
+        release_first.set()
+        await asyncio.gather(first, background, interactive)
+        assert order == ["first", "interactive", "background"]
+
+        stats = controller.get_stats()["vertex/flash"]
+        assert stats["in_flight"] == 0 and stats["queued"] == 2
+        assert stats["queue_wait_ms"]["max"] > 0
+
+    asyncio.run(run())
+
+
+def test_token_bucket_charges_actual_usage():
+    now = [0.0]
+    bucket = TokenBucket(600, clock=lambda: now[0])  # 10 tokens/second
+    bucket.take(500)
+    assert bucket.wait_time(100) == 0
+    bucket.take(300)  # usage beyond the reservation puts the bucket in debt
+    assert bucket.wait_time(100) == 30.0
+    now[0] = 30.0
+    assert bucket.wait_time(100) == 0
+    # Larger than one minute of budget waits for a full bucket, not forever
+    assert bucket.wait_time(10_000) == 50.0
+
+
+def test_retries_retryable_errors_with_backoff():
+    async def run():
+        controller = LLMAdmissionController(AdmissionLimits(max_in_flight=1, rpm=0, tpm=0), overrides={}, max_attempts=3)
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise RateLimited("quota")
+            return "ok"
+
+        async def invalid():
+            raise ValueError("bad request")
+
+        delays = []
+
+        def no_wait(attempt, retry_after=None):
+            delays.append(backoff_delay(attempt, retry_after))
+            return 0
+
+        with patch("nexus.modules.llm_admission.backoff_delay", side_effect=no_wait):
+            assert await controller.run("openai", "gpt", flaky) == "ok"
+            assert len(delays) == 2
+            # Full jitter: uniform up to base * 2^(attempt - 1)
+            assert 0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0
+
+            try:
+                await controller.run("openai", "gpt", invalid)
+                raise AssertionError("non-retryable error should propagate")
+            except ValueError:
+                pass
+            assert len(delays) == 2
+
+        stats = controller.get_stats()["openai/gpt"]
+        assert stats["retries"] == 2 and stats["failures"] == 1 and stats["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_retryable_classification_and_limit_overrides():
+    assert is_retryable(RateLimited())
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(type("ResourceExhausted", (Exception,), {})())
+    assert not is_retryable(ValueError("bad prompt"))
+
+    controller = LLMAdmissionController(
+        AdmissionLimits(max_in_flight=8, rpm=0, tpm=0),
+        overrides={"vertex": {"max_in_flight": 2, "rpm": 60}, "vertex/pro": {"tpm": 1000}}
+    )
+    assert controller.limits_for("vertex", "pro") == AdmissionLimits(max_in_flight=2, rpm=60, tpm=1000)
+    assert controller.limits_for("vertex", "flash") == AdmissionLimits(max_in_flight=2, rpm=60, tpm=0)
+    assert controller.limits_for("ollama", "llama") == AdmissionLimits(max_in_flight=8, rpm=0, tpm=0)
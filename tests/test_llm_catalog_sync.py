@@ -0,0 +1,163 @@
+"""
+Tests for background LLM catalog sync (parallel probes, batched upsert, job status).
+"""
+import asyncio
+import contextlib
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.llm_service import LLMService
+
+
+def test_probes_run_bounded_in_parallel_with_timeouts():
+    async def run():
+        service = LLMService()
+        in_flight = 0
+        max_in_flight = 0
+        calls = {}
+
+        async def ping(model_id):
+            nonlocal in_flight, max_in_flight
+            calls[model_id] = calls.get(model_id, 0) + 1
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                if model_id == "hung":
+                    await asyncio.sleep(10)
+                if model_id == "gone":
+                    raise ValueError("404 model not found")
+                await asyncio.sleep(0.01)
+            finally:
+                in_flight -= 1
+
+        probes = {"total": 0, "succeeded": 0, "failed": 0, "timed_out": 0}
+        with patch("nexus.modules.llm_service.SYNC_PROBE_CONCURRENCY", 2), \
+             patch("nexus.modules.llm_service.SYNC_PROBE_TIMEOUT_SECONDS", 0.05), \
+             patch("nexus.modules.llm_service.SYNC_PROBE_SAMPLES", 3):
+            latencies = await service._probe_models(["a", "b", "c", "hung", "gone"], ping, probes)
+
+        assert max_in_flight == 2
+        assert latencies["hung"] is None and latencies["gone"] is None
+        assert calls["a"] == 3 and calls["gone"] == 1
+        assert latencies["a"]["samples"] == 3
+        assert 0 < latencies["a"]["p50"] <= latencies["a"]["p95"]
+        assert probes == {"total": 5, "succeeded": 3, "failed": 1, "timed_out": 1}
+
+    asyncio.run(run())
+
+
+def test_upsert_models_batches_updates_and_inserts():
+    async def run():
+        db = MagicMock()
+        db.transaction = MagicMock(return_value=contextlib.AsyncExitStack())
+        db.fetch_all = AsyncMock(return_value=[{"id": 7, "model_id": "gpt-4o"}])
+        db.execute_many = AsyncMock()
+        models = [
+            {"model_id": "gpt-4o", "display_name": "GPT-4o", "description": "", "latency_tier": "fast",
+             "input_cost": 0.0, "output_cost": 0.0, "capabilities": ["vision"], "is_recommended": True,
+             **LLMService._latency_fields({"p50": 300, "p95": 450, "samples": 3})},
+            {"model_id": "gpt-4o-mini", "display_name": "GPT-4o Mini", "description": "", "latency_tier": "balanced",
+             "input_cost": 0.0, "output_cost": 0.0, "capabilities": [], "is_recommended": False},
+        ]
+
+        with patch("nexus.modules.llm_service.database", db):
+            assert await LLMService()._upsert_models(3, models) == 2
+
+        assert db.fetch_all.await_count == 1
+        assert db.execute_many.await_count == 2
+        (update_sql, updates), (insert_sql, inserts) = [c.args for c in db.execute_many.await_args_list]
+        assert "UPDATE llm_models" in update_sql and "INSERT INTO llm_models" in insert_sql
+        assert updates == [{**updates[0], "id": 7, "lat": 300, "p50": 300, "p95": 450, "samples": 3}]
+        assert inserts[0]["mid"] == "gpt-4o-mini" and inserts[0]["pid"] == 3
+        assert inserts[0]["p50"] is None and inserts[0]["act"] is False
+
+    asyncio.run(run())
+
+
+class FakeSyncJobRepository:
+    """In-memory stand-in for llm_sync_jobs; RUNNING is unique like the partial index."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    async def expire_stale(self, stale_seconds):
+        return 0
+
+    async def claim(self, job_id, progress):
+        if any(j["status"] == "RUNNING" for j in self.jobs.values()):
+            return None
+        self.jobs[job_id] = {"job_id": job_id, "status": "RUNNING", "finished_at": None,
+                             "duration_ms": None, **progress, "error": None}
+        return dict(self.jobs[job_id])
+
+    async def get(self, job_id):
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def get_running(self):
+        return next((dict(j) for j in self.jobs.values() if j["status"] == "RUNNING"), None)
+
+    async def save_progress(self, job_id, progress):
+        self.jobs[job_id].update(progress)
+
+    async def finish(self, job_id, status, progress, duration_ms, error=None):
+        self.jobs[job_id].update(progress, status=status, duration_ms=duration_ms, error=error, finished_at="now")
+
+    async def prune(self, keep):
+        pass
+
+
+def test_sync_job_runs_in_background_and_reports_status():
+    async def run():
+        repo = FakeSyncJobRepository()
+        # Two workers sharing one job table
+        service, other_worker = LLMService(), LLMService()
+        service.sync_jobs = other_worker.sync_jobs = repo
+        release = asyncio.Event()
+
+        async def slow_sync(job):
+            job["models_synced"] = 2
+            await release.wait()
+            job["models_synced"] = 4
+            return job
+
+        with patch.object(service, "sync_models", side_effect=slow_sync), \
+             patch("nexus.modules.llm_service.SYNC_JOB_PROGRESS_SECONDS", 0.01):
+            job = await service.start_sync_job()
+            assert job["status"] == "RUNNING"
+            # A trigger on another worker while running returns the same job
+            assert (await other_worker.start_sync_job())["job_id"] == job["job_id"]
+            assert not other_worker._sync_tasks
+
+            # Progress is visible to a worker that didn't start the job
+            await asyncio.sleep(0.05)
+            assert (await other_worker.get_sync_job(job["job_id"]))["models_synced"] == 2
+
+            release.set()
+            await asyncio.gather(*service._sync_tasks)
+
+        status = await other_worker.get_sync_job(job["job_id"])
+        assert status["status"] == "COMPLETE" and status["models_synced"] == 4
+        assert status["duration_ms"] is not None and status["finished_at"]
+        assert await service.get_sync_job("sync-missing") is None
+
+    asyncio.run(run())
+
+
+def test_sync_job_claim_is_one_insert_guarded_by_the_running_index():
+    async def run():
+        from nexus.modules.llm_sync_job_repository import LLMSyncJobRepository
+
+        db = AsyncMock()
+        db.fetch_one.return_value = None
+        with patch("nexus.modules.llm_sync_job_repository.database", db):
+            assert await LLMSyncJobRepository().claim("sync-1", {"models_synced": 0}) is None
+
+        query = db.fetch_one.await_args.kwargs["query"]
+        assert "INSERT INTO llm_sync_jobs" in query and "ON CONFLICT DO NOTHING" in query
+
+    asyncio.run(run())
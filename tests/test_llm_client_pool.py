@@ -0,0 +1,78 @@
+"""
+Tests for the pooled LLM provider client registry.
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexus.modules.llm_client_pool import ProviderClientRegistry, credential_fingerprint
+
+
+def test_openai_client_is_reused():
+    async def run():
+        registry = ProviderClientRegistry()
+        first = registry.get_openai_client("openai", "sk-test", None, "gpt-4o")
+        second = registry.get_openai_client("openai", "sk-test", None, "gpt-4o")
+        assert first is second
+
+        stats = registry.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert len(stats["pools"]) == 1
+        await registry.close()
+
+    asyncio.run(run())
+
+
+def test_models_share_http_pool():
+    async def run():
+        registry = ProviderClientRegistry()
+        registry.get_openai_client("openai", "sk-test", None, "gpt-4o")
+        registry.get_openai_client("openai", "sk-test", None, "gpt-4o-mini")
+
+        stats = registry.get_stats()
+        assert stats["clients"] == 2
+        assert len(stats["pools"]) == 1
+        await registry.close()
+
+    asyncio.run(run())
+
+
+def test_credential_change_rebuilds_clients():
+    async def run():
+        registry = ProviderClientRegistry()
+        old = registry.get_openai_client("openai", "sk-old", None, "gpt-4o")
+        new = registry.get_openai_client("openai", "sk-new", None, "gpt-4o")
+        assert old is not new
+
+        stats = registry.get_stats()
+        assert stats["rebuilds"] == 1
+        assert stats["clients"] == 1
+        assert stats["pools"][0]["fingerprint"] == credential_fingerprint("sk-new")
+        await registry.close()
+
+    asyncio.run(run())
+
+
+def test_fingerprint_does_not_leak_secret():
+    fingerprint = credential_fingerprint("sk-very-secret-value")
+    assert "secret" not in fingerprint
+    assert len(fingerprint) == 16
+
+
+def test_retired_pool_closes_after_grace_period():
+    async def run():
+        registry = ProviderClientRegistry(retire_grace=0.01)
+        old = registry.get_openai_client("openai", "sk-old", None, "gpt-4o")
+        registry.invalidate("openai")
+        assert registry.get_stats()["retired_pools"] == 1
+        assert not old._client.is_closed
+
+        await asyncio.sleep(0.05)
+        assert registry.get_stats()["retired_pools"] == 0
+        assert old._client.is_closed
+        await registry.close()
+
+    asyncio.run(run())
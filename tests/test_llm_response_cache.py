@@ -0,0 +1,89 @@
+"""
+Tests for the exact-match LLM response cache.
+"""
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.llm_response_cache import LLMResponseCache, prompt_hash
+from nexus.modules.llm_service import LLMService
+
+MODEL_CONTEXT = {"model_id": "llama3.1", "provider_name": "ollama", "module_id": "workflow"}
+
+
+def test_prompt_hash_is_canonical():
+    messages = [{"role": "user", "content": "hi"}]
+    a = prompt_hash("ollama/llama3.1", messages, {"temperature": 0.2, "top_p": 0.9})
+    b = prompt_hash("ollama/llama3.1", messages, {"top_p": 0.9, "temperature": 0.2})
+    assert a == b and len(a) == 64
+    assert a != prompt_hash("ollama/llama3.1", messages, {"temperature": 0.3, "top_p": 0.9})
+    assert a != prompt_hash("openai/llama3.1", messages, {"temperature": 0.2, "top_p": 0.9})
+
+
+def test_concurrent_identical_prompts_share_one_call():
+    async def run():
+        cache = LLMResponseCache(modules={"workflow"}, persist=False)
+        service = LLMService()
+        calls = 0
+
+        async def fake_generate(prompt, system_instruction, model_context, generation_config):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return f"answer to {prompt}", {"total_tokens": 120}
+
+        with patch("nexus.modules.llm_service.llm_response_cache", cache), \
+             patch.object(service, "_generate_text", side_effect=fake_generate):
+            results = await asyncio.gather(*[
+                service.generate_text("plan", "sys", dict(MODEL_CONTEXT), return_metadata=True)
+                for _ in range(5)
+            ])
+            again = await service.generate_text("plan", "sys", dict(MODEL_CONTEXT))
+            # Modules that did not opt in always call the provider
+            await service.generate_text("plan", "sys", {**MODEL_CONTEXT, "module_id": "chat"})
+
+        assert calls == 2
+        assert again == "answer to plan"
+        hashes = {metadata["prompt_hash"] for _, metadata in results}
+        assert len(hashes) == 1
+        assert sum(metadata["cached"] for _, metadata in results) == 4
+
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 4
+        assert stats["hits"] == 1
+        assert stats["tokens_saved"] == 5 * 120
+
+    asyncio.run(run())
+
+
+def test_errors_are_not_cached_and_hits_are_persisted():
+    async def run():
+        db = AsyncMock()
+        db.fetch_one.return_value = None
+        cache = LLMResponseCache(modules={"*"}, persist=True)
+        service = LLMService()
+        outcomes = [("Error: timeout", {"error": "timeout"}), ("ok", {"total_tokens": 40})]
+
+        async def fake_generate(*args):
+            return outcomes.pop(0)
+
+        with patch("nexus.modules.llm_response_cache.database", db), \
+             patch("nexus.modules.llm_service.llm_response_cache", cache), \
+             patch.object(service, "_generate_text", side_effect=fake_generate):
+            first = await service.generate_text("q", None, dict(MODEL_CONTEXT))
+            second = await service.generate_text("q", None, dict(MODEL_CONTEXT))
+            third = await service.generate_text("q", None, dict(MODEL_CONTEXT))
+
+        assert (first, second, third) == ("Error: timeout", "ok", "ok")
+        assert cache.get_stats()["uncacheable"] == 1
+        # Only the successful response is written through
+        assert db.execute.await_count == 1
+        values = db.execute.await_args.kwargs["values"]
+        assert values["module_id"] == "workflow" and values["tokens"] == 40
+
+    asyncio.run(run())
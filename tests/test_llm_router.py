@@ -0,0 +1,126 @@
+"""
+Tests for LLM routing (hedged requests, failover, circuit breakers).
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.llm_router import CircuitBreaker, LLMRouter
+
+PRIMARY = {"provider_name": "vertex", "model_id": "gemini-2.5-flash"}
+SECONDARY = {"provider_name": "openai", "model_id": "gpt-4o-mini"}
+
+
+def test_hedge_fires_after_delay_and_cancels_loser():
+    async def run():
+        router = LLMRouter(persist=False)
+        cancelled = []
+
+        async def call(candidate):
+            try:
+                if candidate is PRIMARY:
+                    await asyncio.sleep(10)
+                return candidate["model_id"]
+            except asyncio.CancelledError:
+                cancelled.append(candidate["model_id"])
+                raise
+
+        result, winner = await router.run([PRIMARY, SECONDARY], call, hedge={"enabled": True, "min_ms": 20})
+        assert result == "gpt-4o-mini" and winner is SECONDARY
+        assert cancelled == ["gemini-2.5-flash"]
+
+        stats = router.get_stats()
+        assert stats["hedges"] == 1 and stats["hedge_wins"] == 1 and stats["failovers"] == 0
+        # The cancelled primary is neither a success nor a failure
+        assert stats["breakers"]["vertex"]["consecutive_failures"] == 0
+
+    asyncio.run(run())
+
+
+def test_fast_primary_is_not_hedged_and_hedge_delay_tracks_p95():
+    async def run():
+        router = LLMRouter(persist=False)
+        calls = []
+
+        async def call(candidate):
+            calls.append(candidate["model_id"])
+            return "ok"
+
+        assert await router.run([PRIMARY, SECONDARY], call, hedge={"enabled": True, "min_ms": 50}) == ("ok", PRIMARY)
+        assert calls == ["gemini-2.5-flash"]
+
+        # Catalog latency seeds the threshold until live samples exist
+        seeded = dict(SECONDARY, last_latency_ms=3000)
+        router.latency.seed(seeded)
+        assert router.hedge_delay(seeded, {"enabled": True, "min_ms": 500}) == 3.0
+        assert router.hedge_delay(seeded, {"enabled": False, "min_ms": 500}) is None
+        assert router.hedge_delay(PRIMARY, None) is None
+
+        local = {"provider_name": "ollama", "model_id": "llama3.1"}
+        for ms in [100] * 18 + [900] * 2:
+            router.latency.record(local, ms)
+        assert router.hedge_delay(local, {"min_ms": 200}) == 0.9
+        assert router.hedge_delay(local, {"min_ms": 1500}) == 1.5
+
+    asyncio.run(run())
+
+
+def test_failover_on_error_and_breaker_skips_failing_provider():
+    async def run():
+        router = LLMRouter(breaker_failures=2, breaker_cooldown=60, persist=False)
+        calls = []
+
+        async def call(candidate):
+            calls.append(candidate["provider_name"])
+            if candidate is PRIMARY:
+                raise ConnectionError("vertex down")
+            return "ok"
+
+        for _ in range(2):
+            assert await router.run([PRIMARY, SECONDARY], call) == ("ok", SECONDARY)
+        assert calls == ["vertex", "openai", "vertex", "openai"]
+
+        # Breaker is open: vertex is skipped without a call
+        assert await router.run([PRIMARY, SECONDARY], call) == ("ok", SECONDARY)
+        assert calls[-1] == "openai" and calls.count("vertex") == 2
+
+        stats = router.get_stats()
+        assert stats["failovers"] == 2 and stats["failover_wins"] == 2 and stats["breaker_skips"] == 1
+        assert stats["breakers"]["vertex"]["state"] == "open"
+
+        # Every candidate failing raises the last error
+        async def failing(candidate):
+            raise ConnectionError(candidate["provider_name"])
+
+        try:
+            await router.run([SECONDARY], failing)
+            raise AssertionError("expected the provider error")
+        except ConnectionError as e:
+            assert str(e) == "openai"
+
+    asyncio.run(run())
+
+
+def test_breaker_half_open_allows_single_trial():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=30, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 30.0
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 60.0
+    assert breaker.allow()
+    breaker.release()  # cancelled trial frees the slot
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
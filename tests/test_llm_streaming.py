@@ -0,0 +1,106 @@
+"""
+Tests for streamed LLM output (token deltas, TTFT, OUTPUT_DELTA emission).
+"""
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.core.base_agent import BaseAgent
+from nexus.modules.llm_response_cache import LLMResponseCache
+from nexus.modules.llm_service import LLMService
+from nexus.modules.llm_streaming import StreamMetrics
+
+MODEL_CONTEXT = {"model_id": "llama3.1", "provider_name": "ollama", "module_id": "conversational"}
+
+
+def _openai_client(tokens):
+    async def chunks():
+        for token in tokens:
+            await asyncio.sleep(0)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: chunks())
+    return client
+
+
+def test_stream_text_yields_deltas_and_records_ttft():
+    async def run():
+        metrics = StreamMetrics()
+        cache = LLMResponseCache(modules={"conversational"}, persist=False)
+        client = _openai_client(["Hel", "lo", "", " world"])
+        service = LLMService()
+
+        with patch("nexus.modules.llm_client_pool.client_registry.get_openai_client", return_value=client), \
+             patch("nexus.modules.llm_service.llm_response_cache", cache), \
+             patch("nexus.modules.llm_streaming.stream_metrics", metrics):
+            stream = await service.stream_text("hi", "be brief", dict(MODEL_CONTEXT))
+            deltas = [d async for d in stream]
+            assert deltas == ["Hel", "lo", " world"]
+            assert stream.text == "Hello world"
+            assert stream.ttft_ms is not None and stream.metadata["cached"] is False
+            assert client.chat.completions.create.await_args.kwargs["stream"] is True
+
+            # The completed stream was cached: the replay is one delta, no provider call
+            replay = await service.stream_text("hi", "be brief", dict(MODEL_CONTEXT))
+            assert await replay.collect() == "Hello world"
+            assert replay.cached and replay.prompt_hash == stream.prompt_hash
+            assert client.chat.completions.create.await_count == 1
+
+        stats = metrics.get_stats()
+        assert stats["completed"] == 2 and stats["cached"] == 1
+        assert stats["ttft_ms"]["samples"] == 1
+        assert "ollama" in stats["ttft_ms"]["last_by_provider"]
+
+    asyncio.run(run())
+
+
+def test_emit_output_stream_sends_deltas_and_persists_once():
+    async def run():
+        async def deltas():
+            for token in ["The ", "plan ", "is ready."]:
+                yield token
+
+        agent = BaseAgent(session_id=7)
+        with patch("nexus.core.base_agent.session_manager.broadcast", new_callable=AsyncMock) as broadcast, \
+             patch("nexus.core.base_agent.event_hub.publish_ephemeral", new_callable=AsyncMock) as publish, \
+             patch("nexus.core.base_agent.OUTPUT_DELTA_FLUSH_MS", 0), \
+             patch.object(agent, "_persist_event", new_callable=AsyncMock, return_value=42) as persist:
+            memory_event_id = await agent.emit_output_stream(deltas(), {"role": "system"})
+
+        assert memory_event_id == 42
+        sent = [c.args[1] for c in broadcast.await_args_list]
+        delta_events = [e["payload"] for e in sent if e["bucket"] == "OUTPUT_DELTA"]
+        assert "".join(d["delta"] for d in delta_events) == "The plan is ready."
+        assert [d["index"] for d in delta_events] == list(range(len(delta_events)))
+        assert publish.await_count == len(delta_events)
+
+        # Only the final OUTPUT is persisted, under the same stream_id
+        persist.assert_awaited_once()
+        bucket, payload = persist.await_args.args
+        assert bucket == "OUTPUT" and payload["content"] == "The plan is ready."
+        assert payload["stream_id"] == delta_events[0]["stream_id"]
+
+    asyncio.run(run())
+
+
+def test_emit_output_stream_falls_back_when_provider_fails():
+    async def run():
+        async def failing():
+            yield "partial"
+            raise RuntimeError("provider reset")
+
+        agent = BaseAgent(session_id=7)
+        with patch("nexus.core.base_agent.session_manager.broadcast", new_callable=AsyncMock), \
+             patch("nexus.core.base_agent.event_hub.publish_ephemeral", new_callable=AsyncMock), \
+             patch.object(agent, "_persist_event", new_callable=AsyncMock, return_value=9) as persist:
+            await agent.emit_output_stream(failing(), {"role": "system"}, fallback_content="raw reply")
+
+        assert persist.await_args.args[1]["content"] == "raw reply"
+
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+"""
+Tests for the in-process metrics registry and its Prometheus export.
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.metrics import MetricsRegistry, instrument_repository, metrics
+from nexus.modules.metrics_utils import percentile
+from nexus.modules.llm_admission import AdmissionLimits, LLMAdmissionController
+
+
+def test_counters_gauges_and_histograms_render_as_prometheus_text():
+    registry = MetricsRegistry()
+    calls = registry.counter("test_calls_total", "Calls", ("route",))
+    calls.labels("/a").inc()
+    calls.labels("/a").inc(2)
+    calls.labels('say "hi"').inc()
+    depth = registry.gauge("test_depth", "Depth")
+    depth.set_function(lambda: 7)
+    latency = registry.histogram("test_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    # Registering the same name again returns the existing metric
+    assert registry.counter("test_calls_total", "Calls", ("route",)) is calls
+
+    text = registry.render_prometheus()
+    assert "# TYPE test_calls_total counter" in text
+    assert 'test_calls_total{route="/a"} 3' in text
+    assert 'test_calls_total{route="say \\"hi\\""} 1' in text
+    assert "test_depth 7" in text
+    assert 'test_seconds_bucket{le="0.1"} 2' in text
+    assert 'test_seconds_bucket{le="1"} 3' in text
+    assert 'test_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_seconds_count 4" in text and "test_seconds_sum 3.65" in text
+
+    try:
+        calls.labels("/a", "extra")
+        raise AssertionError("expected a label mismatch")
+    except ValueError:
+        pass
+
+
+def test_repository_methods_and_llm_calls_are_timed():
+    @instrument_repository
+    class WidgetRepository:
+        async def get_widget(self, widget_id):
+            return {"id": widget_id}
+
+        async def _helper(self):
+            return None
+
+    async def run():
+        assert await WidgetRepository().get_widget(3) == {"id": 3}
+
+        controller = LLMAdmissionController(default_limits=AdmissionLimits(max_in_flight=0), overrides={})
+
+        async def call():
+            return {"total_tokens": 120}
+
+        await controller.run("test-provider", "test-model", call, usage=lambda r: r["total_tokens"])
+        async with controller.slot("test-provider", "test-model") as usage:
+            usage["total_tokens"] = 30
+
+    asyncio.run(run())
+
+    text = metrics.render_prometheus()
+    assert 'nexus_db_query_seconds_count{repository="WidgetRepository",method="get_widget"} 1' in text
+    assert 'method="_helper"' not in text
+    assert 'nexus_llm_call_seconds_count{provider="test-provider",model="test-model",outcome="ok"} 2' in text
+    assert 'nexus_llm_tokens_total{provider="test-provider",model="test-model"} 150' in text
+
+    # Queue depths and connection counts are read at scrape time
+    from nexus.core.event_sink import event_sink  # noqa: F401
+    from nexus.modules.session_manager import session_manager  # noqa: F401
+    text = metrics.render_prometheus()
+    assert "nexus_emit_queue_depth 0" in text and "nexus_ws_connections 0" in text
+
+
+def test_percentile_is_nearest_rank():
+    samples = [40.04, 10.0, 30.0, 20.0]
+    assert percentile(samples, 0.5) == 30.0
+    assert percentile(samples, 0.95) == 40.0
+    assert percentile(samples, 0.95, ndigits=None) == 40.04
+    assert percentile([], 0.5) is None and percentile(None, 0.5) is None
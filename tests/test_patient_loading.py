@@ -0,0 +1,90 @@
+"""
+Tests for the concurrent patient data loading pipeline.
+"""
+import asyncio
+import sys
+import os
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.agents.eligibility_v2.models import CaseState
+from nexus.agents.eligibility_v2.orchestrator import EligibilityOrchestrator
+
+GATE1 = "nexus.tools.eligibility.gate1_data_retrieval"
+FETCH_DELAY = 0.05
+
+
+def _tool(result, log, name):
+    class FakeTool:
+        async def run_async(self, *args, **kwargs):
+            log.append((name, "start", time.perf_counter()))
+            await asyncio.sleep(FETCH_DELAY)
+            log.append((name, "end", time.perf_counter()))
+            return result
+    return FakeTool
+
+
+def _load(demographics, insurance, visits):
+    log = []
+    orchestrator = EligibilityOrchestrator()
+
+    async def check(case_state, session_id=None):
+        log.append(("eligibility_check", "start", case_state.patient.member_id))
+        await asyncio.sleep(FETCH_DELAY)
+        return {"member_id": case_state.patient.member_id, "eligibility_windows": []}
+
+    async def score_visits(case_state, visit_infos, scorer):
+        log.append(("visit_scoring", "start", time.perf_counter()))
+        return visit_infos
+
+    orchestrator._check_and_perform_eligibility_check = check
+    orchestrator._compute_visits_eligibility_and_probability = score_visits
+    orchestrator._deterministically_update_case_state = lambda case_state, **kwargs: case_state
+
+    async def run():
+        timings = {}
+        with patch(f"{GATE1}.EMRPatientDemographicsRetriever", _tool(demographics, log, "demographics")), \
+                patch(f"{GATE1}.EMRPatientInsuranceInfoRetriever", _tool(insurance, log, "insurance")), \
+                patch(f"{GATE1}.EMRPatientVisitsRetriever", _tool(visits, log, "visits")):
+            case_state = await orchestrator._load_patient_data(CaseState(), "MRN1", stage_timings=timings)
+        return case_state, timings
+
+    case_state, timings = asyncio.run(run())
+    return case_state, timings, log
+
+
+def test_fetches_overlap_and_stages_are_timed():
+    visit_date = (date.today() + timedelta(days=10)).isoformat()
+    case_state, timings, log = _load(
+        {"first_name": "Ada", "last_name": "Lovelace", "member_id": "DEMO1", "sex": "female"},
+        {"payer_name": "Acme Health", "payer_id": "ACME", "member_id": "INS1"},
+        [{"visit_id": "V1", "visit_date": visit_date, "status": "scheduled"}]
+    )
+
+    starts = {name: t for name, kind, t in log if kind == "start"}
+    ends = {name: t for name, kind, t in log if kind == "end"}
+    # All three EMR fetches are in flight before any of them returns
+    assert max(starts[n] for n in ("demographics", "insurance", "visits")) < min(ends.values())
+    # Insurance member ID wins over demographics
+    assert starts["eligibility_check"] == "INS1"
+    assert case_state.patient.member_id == "INS1"
+    assert case_state.patient.first_name == "Ada"
+    assert [v.visit_id for v in case_state.timing.related_visits] == ["V1"]
+
+    assert set(timings) >= {"demographics", "insurance", "visits", "eligibility_check", "total"}
+    # Critical path is fetch + 270, not the sum of all stages
+    assert timings["total"] < timings["demographics"] + timings["insurance"] + timings["visits"] + timings["eligibility_check"]
+
+
+def test_member_id_falls_back_to_demographics():
+    case_state, _, log = _load(
+        {"first_name": "Ada", "last_name": "Lovelace", "member_id": "DEMO1"},
+        {"payer_name": "Acme Health"},
+        []
+    )
+    assert ("eligibility_check", "start", "DEMO1") in log
+    assert case_state.patient.member_id == "DEMO1"
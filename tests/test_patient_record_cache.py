@@ -0,0 +1,107 @@
+"""
+Tests for the shared patient record cache and the deterministic simulator seed.
+"""
+import asyncio
+import subprocess
+import sys
+import os
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.tools.eligibility.gate1_data_retrieval import (
+    EMRPatientDemographicsRetriever,
+    EMRPatientInsuranceInfoRetriever,
+    EMRPatientVisitsRetriever
+)
+from nexus.tools.eligibility.patient_record_cache import PatientRecordCache, PatientRecordStore
+from nexus.tools.eligibility.patient_simulator import PatientSimulator
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CountingSimulator(PatientSimulator):
+    def __init__(self):
+        self.calls = 0
+
+    def generate_synthetic_patient(self, patient_id, seed_data=None):
+        self.calls += 1
+        return super().generate_synthetic_patient(patient_id, seed_data)
+
+
+class FakeStore(PatientRecordStore):
+    def __init__(self, records=None):
+        self.records = dict(records or {})
+        self.saved = []
+
+    async def load(self, patient_id):
+        return self.records.get(patient_id)
+
+    async def save(self, patient_id, record):
+        self.saved.append(patient_id)
+        self.records[patient_id] = record
+
+
+def test_simulator_seed_is_stable_across_processes():
+    script = (
+        "from nexus.tools.eligibility.patient_simulator import PatientSimulator; "
+        "print(PatientSimulator().generate_synthetic_patient('MRN424242')['demographics'])"
+    )
+    outputs = set()
+    for hash_seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=PROJECT_ROOT, env=env,
+            capture_output=True, text=True, check=True
+        )
+        outputs.add(result.stdout.strip())
+    assert len(outputs) == 1
+
+
+def test_retrievers_share_one_generated_record():
+    async def run():
+        simulator = CountingSimulator()
+        cache = PatientRecordCache(simulator=simulator)
+        with patch("nexus.tools.eligibility.patient_record_cache.patient_record_cache", cache):
+            demographics, insurance, visits = await asyncio.gather(
+                EMRPatientDemographicsRetriever().run_async("MRN777"),
+                EMRPatientInsuranceInfoRetriever().run_async("MRN777"),
+                EMRPatientVisitsRetriever().run_async("MRN777", lookback_days=180, lookahead_days=180)
+            )
+        assert simulator.calls == 1
+        assert demographics["member_id"] == insurance["member_id"]
+        assert visits
+        stats = cache.get_stats()
+        assert stats["generated"] == 1 and stats["hits"] + stats["coalesced"] == 2
+
+    asyncio.run(run())
+
+
+def test_ttl_lru_and_backing_store():
+    async def run():
+        simulator = CountingSimulator()
+        stored = {"demographics": None, "health_plan": None, "visits": []}
+        store = FakeStore({"MRN1": stored})
+        cache = PatientRecordCache(ttl_seconds=60, max_entries=2, store=store, simulator=simulator)
+
+        assert await cache.get("MRN1") == stored
+        assert simulator.calls == 0
+
+        # Misses in the store are generated once and written back
+        record = await cache.get("MRN2")
+        record["visits"].clear()
+        assert (await cache.get("MRN2"))["visits"]
+        assert store.saved == ["MRN2"]
+
+        await cache.get("MRN3")
+        assert cache.get_stats()["evictions"] == 1
+
+        later = time.time() + 120
+        with patch("nexus.modules.ttl_cache.time.time", return_value=later):
+            await cache.get("MRN3")
+        assert simulator.calls == 2
+        assert cache.get_stats()["store_hits"] == 2
+
+    asyncio.run(run())
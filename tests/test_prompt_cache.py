@@ -0,0 +1,83 @@
+"""
+Tests for the versioned PromptManager cache.
+"""
+import asyncio
+import json
+import sys
+import os
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.prompt_manager import PromptManager
+
+CONFIG = {"ROLE": "gate agent", "GATE_ORDER": ["1_patient"], "GENERATION_CONFIG": {"temperature": 0.2}}
+UPDATED_AT = datetime(2026, 1, 1)
+
+
+def _row(version=1, config=CONFIG, updated_at=UPDATED_AT):
+    return {
+        "prompt_config": json.dumps(config),
+        "version": version,
+        "description": "gate",
+        "updated_at": updated_at,
+    }
+
+
+def _get(manager):
+    return manager.get_prompt("workflow", "eligibility", "TABULA_RASA", "gate")
+
+
+def test_second_call_served_from_cache():
+    async def run():
+        manager = PromptManager(revalidate_seconds=60)
+        db = AsyncMock()
+        db.fetch_one.return_value = _row()
+        with patch("nexus.modules.prompt_manager.database", db):
+            first = await _get(manager)
+            second = await _get(manager)
+
+        assert first["config"] == CONFIG
+        assert second["version"] == 1
+        assert second["generation_config"] == {"temperature": 0.2}
+        assert db.fetch_one.await_count == 1
+
+    asyncio.run(run())
+
+
+def test_stale_entry_revalidated_by_version_only():
+    async def run():
+        manager = PromptManager(revalidate_seconds=0)
+        db = AsyncMock()
+        db.fetch_one.side_effect = [
+            _row(),                                        # initial load
+            {"version": 1, "updated_at": UPDATED_AT},      # version check: unchanged
+            {"version": 2, "updated_at": UPDATED_AT},      # version check: changed
+            _row(version=2, config={"ROLE": "v2"}),        # reload
+        ]
+        with patch("nexus.modules.prompt_manager.database", db):
+            await _get(manager)
+            unchanged = await _get(manager)
+            changed = await _get(manager)
+
+        assert unchanged["version"] == 1
+        assert changed["version"] == 2
+        assert changed["config"] == {"ROLE": "v2"}
+
+    asyncio.run(run())
+
+
+def test_invalidate_drops_entry_and_misses_are_not_cached():
+    async def run():
+        manager = PromptManager(revalidate_seconds=60)
+        db = AsyncMock()
+        db.fetch_one.side_effect = [None, _row(), _row(version=2)]
+        with patch("nexus.modules.prompt_manager.database", db):
+            assert await _get(manager) is None
+            assert (await _get(manager))["version"] == 1
+            manager.invalidate("workflow:eligibility:TABULA_RASA:gate")
+            assert (await _get(manager))["version"] == 2
+
+    asyncio.run(run())
@@ -0,0 +1,131 @@
+"""
+Tests for the in-memory propensity cube waterfall.
+"""
+import asyncio
+import sys
+import os
+import time
+import contextlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.services.eligibility_v2.propensity_cube import (
+    CubeCell,
+    DIMENSIONS,
+    PropensityCube,
+    dims_mask,
+    refresh_propensity_cube,
+    wilson_interval,
+)
+
+
+def _cube(cells):
+    cube = PropensityCube()
+    for dims, cell in cells:
+        key = tuple(dims.get(d) for d in DIMENSIONS)
+        cube.cells[(dims_mask(list(dims)), key)] = cell
+    cube.loaded_at = time.monotonic()
+    return cube
+
+
+def test_wilson_interval_bounds():
+    low, high = wilson_interval(80, 100)
+    assert 0.70 < low < 0.80 < high < 0.88
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_waterfall_backs_off_to_first_level_with_enough_data():
+    cube = _cube([
+        ({}, CubeCell(n=1000, successes=700)),
+        ({"payer_id": "P1", "product_type": "MEDICAID"}, CubeCell(n=5, successes=5)),
+        ({"payer_id": "P1"}, CubeCell(n=40, successes=30)),
+        ({"product_type": "MEDICAID"}, CubeCell(n=300, successes=150, no_count=120, unknown_count=30)),
+    ])
+
+    result = cube.waterfall({"payer_id": "P1", "product_type": "MEDICAID"}, min_n=20)
+
+    assert cube.available
+    assert result["backoff_level"] == 1
+    # Narrower interval wins within a level
+    assert result["backoff_dims"] == ["product_type"]
+    assert result["probability"] == 0.5
+    assert result["state_counts"] == {"YES": 150, "NO": 120, "NOT_ESTABLISHED": 0, "UNKNOWN": 30}
+    assert [(p["level"], p["sample_size"], p["status"]) for p in result["backoff_path"]] == [
+        (2, 5, "insufficient"), (1, 40, "found"), (1, 300, "found")
+    ]
+
+
+def test_waterfall_payload_matches_score_state_models():
+    from nexus.agents.eligibility_v2.models import ScoreState
+
+    cube = _cube([({}, CubeCell(n=1000, successes=700)), ({"payer_id": "P1"}, CubeCell(n=8, successes=6))])
+
+    result = cube.waterfall({"payer_id": "P1", "sex": "F"}, min_n=20)
+
+    score = ScoreState(
+        base_probability=result["probability"],
+        base_confidence=result["combined_confidence"],
+        probability_interval=result["probability_interval"],
+        volatility=result["volatility"],
+        sample_size=result["sample_size"],
+        backoff_path=result["backoff_path"],
+        backoff_level=result["backoff_level"],
+        backoff_dims=result["backoff_dims"]
+    )
+    assert score.backoff_level == 0
+    assert score.probability_interval.lower_bound < 0.7 < score.probability_interval.upper_bound
+    assert score.probability_interval.confidence_level == 0.95
+    assert 0.0 < score.volatility.volatility_score < 0.1
+    assert [(s.dimensions_str, s.status) for s in score.backoff_path] == [
+        ("payer_id, sex", "no_data"), ("payer_id", "insufficient"), ("sex", "no_data"), ("", "found")
+    ]
+    assert score.backoff_path[1].probability == 0.75 and score.backoff_path[0].probability is None
+
+
+def test_repository_uses_cube_without_queries():
+    async def run():
+        from nexus.services.eligibility_v2.propensity_repository import PropensityRepository
+
+        cube = _cube([({}, CubeCell(n=500, successes=400)), ({"payer_id": "P1"}, CubeCell(n=50, successes=10))])
+        db = AsyncMock()
+        with patch("nexus.services.eligibility_v2.propensity_repository.propensity_cube", cube), \
+             patch("nexus.services.eligibility_v2.propensity_repository.database", db):
+            result = await PropensityRepository().get_propensity_with_volatility(payer_id="P1", sex="F")
+
+        assert result["probability"] == 0.2
+        assert result["backoff_dims"] == ["payer_id"]
+        assert result["probability_interval"]["lower_bound"] < 0.2 < result["probability_interval"]["upper_bound"]
+        assert db.fetch_one.await_count == 0
+
+    asyncio.run(run())
+
+
+def test_incremental_refresh_rescans_below_watermark():
+    async def run():
+        db = MagicMock()
+        db.transaction = MagicMock(return_value=contextlib.AsyncExitStack())
+        db.fetch_val = AsyncMock(side_effect=[True, 1500])  # advisory lock, MAX(id)
+        db.fetch_one = AsyncMock(return_value={"last_transaction_id": 1000, "tracked_from_id": 0})
+        db.execute = AsyncMock()
+        with patch("nexus.services.eligibility_v2.propensity_cube.database", db):
+            result = await refresh_propensity_cube(lookback=100)
+
+        # Ids allocated before the last run but committed after it are re-scanned
+        assert result["from_id"] == 900 and result["up_to_id"] == 1500
+        upsert, values = db.execute.await_args_list[0].args
+        assert "eligibility_propensity_cube_seen" in upsert and "NOT EXISTS" in upsert
+        assert values == {"from_id": 900, "up_to_id": 1500, "keep_from_id": 1400}
+        # Seen ids the next run won't re-scan are pruned
+        assert db.execute.await_args_list[1].args[1] == {"keep_from_id": 1400}
+
+        # Right after migration 045 the lookback stops at ids that were never recorded
+        db.transaction = MagicMock(return_value=contextlib.AsyncExitStack())
+        db.fetch_val = AsyncMock(side_effect=[True, 1500])
+        db.fetch_one = AsyncMock(return_value={"last_transaction_id": 1000, "tracked_from_id": 1000})
+        with patch("nexus.services.eligibility_v2.propensity_cube.database", db):
+            result = await refresh_propensity_cube(lookback=100)
+        assert result["from_id"] == 1000
+
+    asyncio.run(run())
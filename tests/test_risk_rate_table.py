@@ -0,0 +1,122 @@
+"""
+Tests for the materialized, smoothed risk rate table.
+"""
+import asyncio
+import sys
+import os
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.agents.eligibility_v2.models import CaseState, EventTense, ProductType
+from nexus.agents.eligibility_v2.risk_probability_calculator import RiskProbabilityCalculator
+from nexus.services.eligibility_v2.risk_rate_table import (
+    COVERAGE_LOSS_PRIOR, DENIAL_PRIOR, RiskRateTable, smoothed_rates
+)
+
+ROWS = [
+    {"product_type": "MEDICAID", "event_tense": "FUTURE", "days_bucket": 10, "n": 40, "events": 20},
+    {"product_type": "MEDICAID", "event_tense": "FUTURE", "days_bucket": 14, "n": 60, "events": 6},
+    {"product_type": "MEDICAID", "event_tense": "FUTURE", "days_bucket": 90, "n": 10, "events": 10},
+    {"product_type": "COMMERCIAL", "event_tense": "PAST", "days_bucket": 30, "n": 100, "events": 5},
+    {"product_type": "MEDICAID", "event_tense": "PAST", "days_bucket": 45, "n": 100, "events": 15},
+]
+
+
+async def _load_table():
+    table = RiskRateTable(max_days=120)
+    db = AsyncMock()
+    db.fetch_all.return_value = ROWS
+    with patch("nexus.services.eligibility_v2.risk_rate_table.database", db):
+        assert await table.ensure_loaded()
+        # Within the reload interval nothing is queried again
+        assert await table.ensure_loaded()
+    assert db.fetch_all.await_count == 1
+    return table
+
+
+def test_smoothed_rates_match_windowed_counts():
+    rng = np.random.default_rng(7)
+    n = rng.integers(0, 20, size=50).astype(float)
+    events = np.minimum(n, rng.integers(0, 5, size=50))
+
+    raw = smoothed_rates(n, events, window=7, prior=0.1, prior_weight=0)
+    for day in (1, 5, 20, 49):
+        low, high = max(1, day - 7), min(49, day + 7)
+        window_n = n[low:high + 1].sum()
+        if window_n:
+            assert raw[day] == events[low:high + 1].sum() / window_n
+
+    # With no data the smoothed rate is the prior
+    assert np.allclose(smoothed_rates(np.zeros(10), np.zeros(10), 7, 0.15), 0.15)
+
+
+def test_vectorized_lookups_match_scalar_lookups():
+    table = asyncio.run(_load_table())
+    days = np.array([1, 10, 12, 21, 90, 500])
+
+    rates = table.coverage_loss_rates("MEDICAID", days)
+    assert rates.tolist() == [table.coverage_loss_rates("MEDICAID", int(d)) for d in days]
+    # 10 and 14 share the ±7 window: (20 + 6 + 20*0.15) / (40 + 60 + 20)
+    assert rates[1] == (26 + 20 * COVERAGE_LOSS_PRIOR["MEDICAID"]) / (100 + 20)
+    # Gaps past max_days use the last bucket
+    assert rates[-1] == table.coverage_loss_rates("MEDICAID", 120)
+    # Product types without history fall back to their default rate
+    assert table.coverage_loss_rates("DSNP", 10) == COVERAGE_LOSS_PRIOR["DSNP"]
+    assert table.coverage_loss_rates("NEW_PRODUCT", days).tolist() == [0.10] * len(days)
+
+    # Denials pool all product types
+    assert table.retrospective_denial_rates(40) == (20 + 20 * DENIAL_PRIOR) / (200 + 20)
+
+
+def test_calculator_reads_rates_without_per_gap_queries():
+    async def run():
+        table = await _load_table()
+        db = AsyncMock()
+        db.fetch_one.return_value = {"error_rate": 0.04}
+        case_state = CaseState()
+        case_state.health_plan.payer_id = "P1"
+        case_state.health_plan.product_type = ProductType.MEDICAID
+        today = date.today()
+        visits = [(today + timedelta(days=d), EventTense.FUTURE if d > 0 else EventTense.PAST) for d in (12, 90, -40, 0)]
+
+        with patch("nexus.agents.eligibility_v2.risk_probability_calculator.risk_rate_table", table), \
+             patch("nexus.agents.eligibility_v2.risk_probability_calculator.database", db):
+            calculator = RiskProbabilityCalculator()
+            batch = await calculator.compute_risk_probabilities_batch(case_state, visits)
+            assert db.fetch_one.await_count == 1  # payer error rate only
+
+            for (dos_date, event_tense), risks in zip(visits, batch):
+                case_state.timing.dos_date = dos_date
+                case_state.timing.event_tense = event_tense
+                assert await calculator.compute_risk_probabilities(case_state) == risks
+
+        assert batch[0]["coverage_loss"] == table.coverage_loss_rates("MEDICAID", 12)
+        assert batch[2]["retrospective_denial"] == table.retrospective_denial_rates(40)
+        assert batch[3]["retrospective_denial"] == 0.0
+
+    asyncio.run(run())
+
+
+def test_empty_table_falls_back_to_live_queries():
+    async def run():
+        table = RiskRateTable(max_days=120)
+        db = AsyncMock()
+        db.fetch_all.return_value = []
+        with patch("nexus.services.eligibility_v2.risk_rate_table.database", db):
+            # Migrated but never refreshed: not treated as available
+            assert not await table.ensure_loaded()
+
+        live_db = AsyncMock()
+        live_db.fetch_one.return_value = {"denial_rate": 0.42}
+        with patch("nexus.agents.eligibility_v2.risk_probability_calculator.risk_rate_table", table), \
+             patch("nexus.agents.eligibility_v2.risk_probability_calculator.database", live_db):
+            calculator = RiskProbabilityCalculator()
+            assert await calculator._retrospective_denial_rate(40) == 0.42
+        assert live_db.fetch_one.await_count == 1
+
+    asyncio.run(run())
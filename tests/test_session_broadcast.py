@@ -0,0 +1,88 @@
+"""
+Tests for SessionManager broadcast backends and per-connection writers.
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexus.modules.session_manager import SessionManager
+from nexus.modules.ws_broadcast import InProcessBackend, LocalBroker, LocalBrokerBackend, PgNotifyBackend
+
+
+class FakeWebSocket:
+    def __init__(self, block: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._gate = asyncio.Event()
+        if not block:
+            self._gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        await self._gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_broadcast_reaches_sockets_on_other_workers():
+    async def run():
+        broker = LocalBroker()
+        worker_a = SessionManager(backend=LocalBrokerBackend(broker))
+        worker_b = SessionManager(backend=LocalBrokerBackend(broker))
+        ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(1, ws_a)
+        await worker_b.connect(1, ws_b)
+
+        await worker_a.broadcast(1, {"bucket": "OUTPUT"})
+        await asyncio.sleep(0.01)
+
+        assert ws_a.sent == [{"bucket": "OUTPUT"}]
+        assert ws_b.sent == [{"bucket": "OUTPUT"}]
+
+    asyncio.run(run())
+
+
+def test_slow_client_does_not_block_and_is_disconnected():
+    async def run():
+        manager = SessionManager(backend=InProcessBackend())
+        fast, slow = FakeWebSocket(), FakeWebSocket(block=True)
+        await manager.connect(1, fast)
+        await manager.connect(1, slow)
+
+        for i in range(300):
+            await asyncio.wait_for(manager.broadcast(1, {"i": i}), timeout=0.1)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 300
+        assert slow.closed_with == 1013
+        assert manager.active_connections[1] == [fast]
+        assert manager.get_stats()["slow_disconnects"] == 1
+
+    asyncio.run(run())
+
+
+def test_pg_backend_chunks_large_payloads():
+    async def run():
+        sender, receiver = PgNotifyBackend(), PgNotifyBackend()
+        received = []
+        receiver.bind(lambda session_id, data: received.append((session_id, data)))
+
+        data = {"bucket": "ARTIFACTS", "payload": {"plan": "é" * 20000}}
+        payloads = sender._encode(7, data)
+        assert len(payloads) > 1
+        assert all(len(p.encode("utf-8")) <= 7900 for p in payloads)
+
+        for payload in reversed(payloads):
+            await receiver._on_payload(payload)
+        await sender._on_payload(payloads[0])  # own echo ignored
+
+        assert received == [(7, data)]
+
+    asyncio.run(run())
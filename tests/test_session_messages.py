@@ -0,0 +1,127 @@
+"""
+Tests for append-only session message storage.
+"""
+import asyncio
+import json
+import sys
+import os
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.services.shaping.message_repository import SessionMessageRepository
+
+DB = "nexus.services.shaping.message_repository.database"
+
+
+def test_append_many_is_one_insert_with_extra_fields():
+    async def run():
+        db = AsyncMock()
+        db.fetch_all.return_value = [{"seq": 4}, {"seq": 3}]
+        with patch(DB, db):
+            seqs = await SessionMessageRepository().append_many(7, [
+                {"role": "user", "content": "Insured", "original_value": "insured", "timestamp": "now"},
+                {"role": "system", "content": "Got it"},
+            ])
+
+        assert seqs == [3, 4]
+        assert db.fetch_all.await_count == 1
+        values = db.fetch_all.await_args.kwargs["values"]
+        assert values["role_0"] == "user"
+        assert json.loads(values["extra_0"]) == {"original_value": "insured", "timestamp": "now"}
+        assert json.loads(values["extra_1"]) == {}
+
+    asyncio.run(run())
+
+
+def test_append_retries_on_seq_conflict():
+    async def run():
+        db = AsyncMock()
+        db.fetch_all.side_effect = [
+            Exception('duplicate key value violates unique constraint "session_messages_session_seq_key"'),
+            [{"seq": 2}],
+        ]
+        with patch(DB, db):
+            seq = await SessionMessageRepository().append(7, "user", "hello")
+
+        assert seq == 2
+        assert db.fetch_all.await_count == 2
+
+    asyncio.run(run())
+
+
+def test_get_messages_backfills_legacy_transcript():
+    async def run():
+        legacy = [{"role": "user", "content": "hi", "timestamp": "now"}, {"role": "system", "content": "hello"}]
+        db = AsyncMock()
+        db.fetch_all.return_value = []
+        db.fetch_one.return_value = {"transcript": json.dumps(legacy)}
+        with patch(DB, db):
+            messages = await SessionMessageRepository().get_messages(7)
+
+        assert messages == legacy
+        insert = db.execute.await_args.kwargs
+        assert insert["values"]["content_1"] == "hello"
+        # Fixed seq 1..n, so a concurrent backfill can't append the transcript twice
+        assert "ON CONFLICT (session_id, seq) DO NOTHING" in insert["query"]
+        assert "MAX(seq)" not in insert["query"]
+
+    asyncio.run(run())
+
+
+def test_concurrent_backfills_insert_identical_rows():
+    async def run():
+        legacy = [{"role": "user", "content": "hi"}, {"role": "system", "content": "hello"}]
+        db = AsyncMock()
+        db.fetch_all.return_value = []
+        db.fetch_one.return_value = {"transcript": json.dumps(legacy)}
+        repo = SessionMessageRepository()
+        with patch(DB, db):
+            first, second = await asyncio.gather(repo.get_messages(7), repo.get_messages(7))
+
+        assert first == second == legacy
+        assert db.execute.await_count == 2
+        a, b = (call.kwargs for call in db.execute.await_args_list)
+        assert a == b
+
+    asyncio.run(run())
+
+
+def test_sync_transcript_appends_only_new_tail():
+    async def run():
+        db = AsyncMock()
+        db.fetch_val.return_value = 2
+        db.fetch_all.return_value = [{"seq": 3}]
+        transcript = [
+            {"role": "user", "content": "a"},
+            {"role": "system", "content": "b"},
+            {"role": "system", "content": "", "completion_status": {"is_complete": True}},
+        ]
+        with patch(DB, db):
+            appended = await SessionMessageRepository().sync_transcript(7, transcript)
+
+        assert appended == 1
+        values = db.fetch_all.await_args.kwargs["values"]
+        assert "role_1" not in values
+        assert json.loads(values["extra_0"]) == {"completion_status": {"is_complete": True}}
+
+    asyncio.run(run())
+
+
+def test_get_tail_matches_roles_case_insensitively():
+    async def run():
+        db = AsyncMock()
+        db.fetch_all.return_value = [
+            {"role": "system", "content": "b", "extra": "{}"},
+            {"role": "User", "content": "a", "extra": "{}"},
+        ]
+        with patch(DB, db):
+            messages = await SessionMessageRepository().get_tail(7, 10, roles=("user", "System"))
+
+        assert [m["content"] for m in messages] == ["a", "b"]
+        kwargs = db.fetch_all.await_args.kwargs
+        assert "LOWER(role) = ANY(:roles)" in kwargs["query"]
+        assert kwargs["values"]["roles"] == ["user", "system"]
+
+    asyncio.run(run())
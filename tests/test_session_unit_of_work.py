@@ -0,0 +1,143 @@
+"""
+Tests for the per-turn shaping session unit of work.
+"""
+import asyncio
+import contextlib
+import json
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.core.gate_models import GateState, GateValue, StatusInfo
+from nexus.modules.shaping_manager import ShapingManager
+from nexus.services.shaping import SessionConflictError, SessionUnitOfWork, current_session
+
+DB = "nexus.services.shaping.session_unit_of_work.database"
+
+SESSION_ROW = {
+    "id": 7,
+    "user_id": "u1",
+    "status": "GATHERING",
+    "consultant_strategy": "EVIDENCE_BASED",
+    "rag_citations": json.dumps([{"doc": "manual"}]),
+    "draft_plan": json.dumps({"gates": []}),
+    "gate_state": {"summary": "s", "gates": {"1_patient_info": {"raw": "yes"}}, "status": {"pass": False, "next_gate": "2_use_case"}},
+    "iteration_count": 2,
+    "max_iterations": 15,
+    "version": 4,
+    "messages": json.dumps([{"role": "user", "content": "hi", "extra": {"timestamp": "now"}}]),
+    "legacy_messages": 0,
+}
+
+
+def _db(update_returns):
+    db = MagicMock()
+    db.transaction = MagicMock(return_value=contextlib.AsyncExitStack())
+    db.fetch_one = AsyncMock(return_value=SESSION_ROW)
+    db.fetch_val = AsyncMock(return_value=update_returns)
+    return db
+
+
+def test_turn_loads_once_and_flushes_dirty_fields_in_one_update():
+    async def run():
+        db = _db(update_returns=5)
+        messages = MagicMock()
+        messages.append_many = AsyncMock()
+        manager = ShapingManager()
+        manager.state_repository = MagicMock()
+
+        with patch(DB, db):
+            uow = SessionUnitOfWork(7, messages)
+            async with uow as session:
+                assert session.transcript == [{"role": "user", "content": "hi", "timestamp": "now"}]
+                assert session.rag_citations == [{"doc": "manual"}] and session.strategy == "EVIDENCE_BASED"
+
+                # ShapingManager helpers read and write the aggregate, not the database
+                state = await manager._load_gate_state(7)
+                assert state.status.next_gate == "2_use_case"
+                state.status = StatusInfo(pass_=False, next_gate="3_ehr_strategy", next_query=None)
+                await manager._save_gate_state(7, state)
+                await manager._save_draft_plan(7, {"gates": ["a"]})
+                await manager._save_transcript(7, session.transcript + [{"role": "system", "content": "next?"}])
+                session.increment_iteration()
+                assert manager.state_repository.save.call_count == 0
+
+            assert current_session(7) is None
+
+        assert db.fetch_one.await_count == 1 and db.fetch_val.await_count == 1
+        query = db.fetch_val.await_args.kwargs["query"]
+        values = db.fetch_val.await_args.kwargs["values"]
+        assert "version = :version" in query and "rag_citations" not in query
+        assert values["version"] == 4 and values["iteration_count"] == 3
+        assert json.loads(values["gate_state"])["status"]["next_gate"] == "3_ehr_strategy"
+        assert json.loads(values["draft_plan"]) == {"gates": ["a"]}
+        messages.append_many.assert_awaited_once_with(7, [{"role": "system", "content": "next?"}])
+        assert uow.round_trips == 3 and session.version == 5
+
+    asyncio.run(run())
+
+
+def test_conflicting_version_raises_and_writes_no_messages():
+    async def run():
+        db = _db(update_returns=None)
+        messages = MagicMock()
+        messages.append_many = AsyncMock()
+
+        with patch(DB, db):
+            try:
+                async with SessionUnitOfWork(7, messages) as session:
+                    session.set_gate_state(GateState(summary="", gates={"g": GateValue(raw="x")}, status=StatusInfo(pass_=False)))
+                    session.set_transcript(session.transcript + [{"role": "system", "content": "late"}])
+                raise AssertionError("expected a conflict")
+            except SessionConflictError:
+                pass
+
+        messages.append_many.assert_not_awaited()
+
+    asyncio.run(run())
+
+
+def test_clean_turn_and_missing_session_skip_the_flush():
+    async def run():
+        db = _db(update_returns=5)
+        with patch(DB, db):
+            async with SessionUnitOfWork(7) as session:
+                assert session.iteration_count == 2
+            db.fetch_one.return_value = None
+            async with SessionUnitOfWork(8) as missing:
+                assert missing is None
+        db.fetch_val.assert_not_awaited()
+
+    asyncio.run(run())
+
+
+def test_out_of_turn_writers_bump_version():
+    async def run():
+        from nexus.core.base_agent import BaseAgent
+        from nexus.services.gate.state_repository import GateStateRepository
+
+        state = GateState(summary="edited", gates={}, status=StatusInfo(pass_=False, next_gate=None, next_query=None))
+        db = AsyncMock()
+        with patch("nexus.services.gate.state_repository.database", db), \
+             patch("nexus.core.base_agent.database", db):
+            await GateStateRepository().save(7, state)
+            await BaseAgent(session_id=7)._persist_draft_plan({"data": {"gates": []}})
+
+        # A turn that loaded the old version now gets SessionConflictError on flush
+        assert db.execute.await_count == 2
+        for call in db.execute.await_args_list:
+            assert "version = version + 1" in call.kwargs.get("query", call.args[0] if call.args else "")
+
+        # Inside a turn the draft plan goes to the aggregate instead
+        turn_db = _db(update_returns=5)
+        direct_db = AsyncMock()
+        with patch(DB, turn_db), patch("nexus.core.base_agent.database", direct_db):
+            async with SessionUnitOfWork(7, MagicMock(append_many=AsyncMock())) as session:
+                await BaseAgent(session_id=7)._persist_draft_plan({"data": {"gates": ["g1"]}})
+                assert session.draft_plan == {"gates": ["g1"]}
+        assert direct_db.execute.await_count == 0
+
+    asyncio.run(run())
@@ -0,0 +1,128 @@
+"""
+Tests for span tracing (nested spans, ring buffer, waterfall, batched persistence).
+"""
+import asyncio
+import json
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mobius_test")
+
+from nexus.modules.metrics import instrument_repository
+from nexus.modules.tracing import Tracer
+
+
+@instrument_repository
+class NoteRepository:
+    async def get_note(self, note_id):
+        await asyncio.sleep(0)
+        return note_id
+
+
+def test_nested_spans_follow_awaits_and_tasks():
+    tracer = Tracer(enabled=True, ring_size=100, persist=False)
+
+    async def call_llm():
+        with tracer.span("llm.call", model="gemini") as span:
+            await asyncio.sleep(0)
+            span.set(total_tokens=42)
+
+    @tracer.traced("shaping.chat_turn", root=True, session_arg="session_id")
+    async def handle(session_id, message):
+        await NoteRepository().get_note(1)
+        await asyncio.gather(call_llm(), asyncio.create_task(call_llm()))
+        with tracer.span("gate.parse"):
+            raise ValueError("bad json")
+
+    async def run():
+        # Outside a trace, spans are no-ops
+        with tracer.span("db.orphan") as orphan:
+            assert orphan is None
+        await NoteRepository().get_note(2)
+        try:
+            await handle(7, "hi")
+            raise AssertionError("expected the turn to fail")
+        except ValueError:
+            pass
+        assert tracer.current() is None
+
+    with patch("nexus.modules.metrics.tracer", tracer):
+        asyncio.run(run())
+
+    [root] = tracer.recent_traces(session=7)
+    assert root["name"] == "shaping.chat_turn" and root["status"] == "error"
+    assert len(tracer._ring) == 5  # The orphan repository call was not recorded
+
+    waterfall = tracer.waterfall(tracer.get_spans(root["trace_id"]))
+    names = [(s["name"], s["depth"]) for s in waterfall["spans"]]
+    assert names[0] == ("shaping.chat_turn", 0)
+    assert sorted(names[1:]) == [
+        ("db.NoteRepository.get_note", 1), ("gate.parse", 1), ("llm.call", 1), ("llm.call", 1)
+    ]
+    assert all(s["offset_ms"] >= 0 for s in waterfall["spans"])
+    parse = next(s for s in waterfall["spans"] if s["name"] == "gate.parse")
+    assert parse["status"] == "error" and parse["attributes"]["error"] == "ValueError: bad json"
+    assert {s["attributes"].get("total_tokens") for s in waterfall["spans"] if s["name"] == "llm.call"} == {42}
+    assert all(s["session"] == "7" for s in tracer.get_spans(root["trace_id"]))
+
+
+def test_detached_spans_and_nested_traces():
+    tracer = Tracer(enabled=True, ring_size=100, persist=False)
+
+    async def stream():
+        # A stream's span is not current while the consumer runs between deltas
+        span = tracer.start("llm.stream")
+        for delta in ("a", "b"):
+            yield delta
+        tracer.end(span)
+
+    async def run():
+        with tracer.trace("eligibility.turn", session="case-1") as turn:
+            async for _ in stream():
+                assert tracer.current() is turn
+            # A traced entry point called inside a turn becomes a child span
+            with tracer.trace("gate.execute") as child:
+                assert child.parent_id == turn.span_id and child.trace_id == turn.trace_id
+
+    asyncio.run(run())
+    spans = {s["name"]: s for s in tracer._ring}
+    assert spans["llm.stream"]["parent_id"] == spans["eligibility.turn"]["span_id"]
+    assert spans["gate.execute"]["session"] == "case-1"
+    assert [r["name"] for r in tracer.recent_traces()] == ["eligibility.turn"]
+
+    disabled = Tracer(enabled=False)
+    with disabled.trace("turn") as span:
+        assert span is None
+
+
+def test_spans_are_written_to_trace_spans_in_batches():
+    async def run():
+        tracer = Tracer(enabled=True, ring_size=100, persist=True, batch_size=3, flush_seconds=60)
+        db = MagicMock()
+        db.execute_many = AsyncMock()
+        with patch("nexus.modules.database.database", db):
+            with tracer.trace("shaping.chat_turn", session=3):
+                with tracer.span("llm.call"):
+                    pass
+            # Two spans: below the batch size, nothing written yet
+            await asyncio.sleep(0)
+            db.execute_many.assert_not_awaited()
+
+            with tracer.trace("shaping.chat_turn", session=3):
+                pass
+            await asyncio.sleep(0)
+            assert db.execute_many.await_count == 1
+            rows = db.execute_many.await_args.args[1]
+            assert [r["name"] for r in rows] == ["llm.call", "shaping.chat_turn", "shaping.chat_turn"]
+            assert rows[0]["session_key"] == "3" and json.loads(rows[0]["attributes"]) == {}
+
+            # Shutdown writes the remainder
+            with tracer.trace("shaping.chat_turn", session=3):
+                pass
+            await tracer.close()
+            assert db.execute_many.await_count == 2
+        assert tracer.get_stats()["written"] == 4
+
+    asyncio.run(run())